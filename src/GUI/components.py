@@ -270,6 +270,39 @@ class LoadingIndicator(ctk.CTkFrame):
         )
         self.status_label.pack(pady=(0, 15))
 
+    def set_progress(self, fraction, text=None):
+        """
+        Mostrar un progreso concreto (0 a 1) en lugar de la animación.
+
+        Parameters
+        ----------
+        fraction : float
+            Parte completada.
+        text : str, opcional
+            Texto de estado a mostrar.
+        """
+        if self.progress_bar.cget("mode") != "determinate":
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+        self.progress_bar.set(max(0.0, min(1.0, fraction)))
+        self.status_label.configure(
+            text=text or f"Progreso: {fraction:.0%}")
+
+    def add_cancel_button(self, command):
+        """Añadir un botón para cancelar la operación en curso"""
+        self.cancel_button = ctk.CTkButton(
+            self,
+            text="Cancelar",
+            command=command,
+            font=("Orbitron", 11, "bold"),
+            height=28,
+            corner_radius=6,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            hover_color=AppTheme.HOVER_ACCENT,
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        self.cancel_button.pack(pady=(0, 15))
+
     def stop(self):
         """Detener la animación"""
         self.progress_bar.stop()
@@ -5,9 +5,13 @@ Este módulo se encarga de mostrar los datos en una tabla Treeview.
 
 import tkinter as tk
 from tkinter import ttk
+import customtkinter as ctk
 import pandas as pd
 
-from .components import AppTheme
+from data_analysis import (
+    DatasetSearchIndex, ColumnStatsCache, histogram_sparkline
+)
+from .components import AppTheme, AppConfig, UploadButton
 
 
 class DataDisplayManager:
@@ -20,13 +24,29 @@ class DataDisplayManager:
     - Insertar datos
     - Configurar scrollbars
     - Manejar scroll con rueda del ratón
+    - Buscar valores y saltar a la fila encontrada
+    - Mostrar estadísticas de cada columna desde su encabezado
     """
 
-    def __init__(self, container, dataframe):
+    # Máximo de coincidencias listadas en el desplegable de resultados
+    MAX_LISTED_HITS = 500
+    # Opción del selector de columna que busca en todo el dataset
+    ALL_COLUMNS = "Todas las columnas"
+
+    def __init__(self, container, dataframe, column_stats=None):
 
         self.container = container
         self.dataframe = dataframe
         self.tree = None
+        # Caché compartida con la app para no recalcular al redibujar
+        self.column_stats = column_stats or ColumnStatsCache(dataframe)
+        self._tooltip = None
+        self._tooltip_column = None
+        # El índice se crea vacío y se rellena al buscar; como se crea un
+        # gestor nuevo cada vez que cambian los datos, nunca queda obsoleto
+        self.search_index = DatasetSearchIndex(dataframe)
+        self._hits = []
+        self._hit_position = -1
 
     def display(self):
         """
@@ -38,10 +58,12 @@ class DataDisplayManager:
         3. Insertar los datos
         4. Configurar scroll
         """
+        self._create_search_bar()
         self.tree = self._create_treeview_widget()
         self._configure_treeview()
         self._populate_treeview()
         self._setup_mouse_wheel_scroll()
+        self._setup_header_stats()
 
     # ================================================================
     # CREAR TREEVIEW : Tabla con scrollbars
@@ -198,7 +220,8 @@ class DataDisplayManager:
             tag = "evenrow" if index % 2 == 0 else "oddrow"
 
             # Insertar fila en el Treeview
-            self.tree.insert("", "end", text=str(index),
+            # iid = posición de la fila (para saltar a ella al buscar)
+            self.tree.insert("", "end", iid=str(index), text=str(index),
                              values=values, tags=(tag,))
 
         # Configurar colores alternados.
@@ -284,3 +307,329 @@ class DataDisplayManager:
         self.tree.bind("<MouseWheel>", on_mousewheel)  # Windows/Mac
         self.tree.bind("<Button-4>", on_mousewheel)    # Linux scroll arriba
         self.tree.bind("<Button-5>", on_mousewheel)    # Linux scroll abajo
+
+    # ================================================================
+    # BÚSQUEDA : Buscar valores y saltar a la fila
+    # ================================================================
+
+    def _create_search_bar(self):
+        """Crear la barra de búsqueda encima de la tabla"""
+        search_frame = ctk.CTkFrame(self.container, fg_color="transparent")
+        search_frame.pack(fill="x", padx=8, pady=(8, 0))
+
+        # Campo de texto (Enter también lanza la búsqueda)
+        self.search_entry = ctk.CTkEntry(
+            search_frame,
+            placeholder_text="Buscar valor (ID, texto...)",
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER,
+            height=32
+        )
+        self.search_entry.pack(side="left", fill="x", expand=True)
+        self.search_entry.bind("<Return>", lambda event: self._run_search())
+
+        # Columna en la que buscar
+        self.search_column_menu = ctk.CTkOptionMenu(
+            search_frame,
+            values=[self.ALL_COLUMNS] + [
+                str(col) for col in self.dataframe.columns],
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT,
+            dropdown_fg_color=AppTheme.SECONDARY_BACKGROUND,
+            dropdown_hover_color=AppTheme.TERTIARY_BACKGROUND,
+            width=180
+        )
+        self.search_column_menu.pack(side="left", padx=(8, 0))
+
+        # Coincidencia exacta o búsqueda de texto
+        self.exact_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            search_frame,
+            text="Exacta",
+            variable=self.exact_var,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT,
+            border_color=AppTheme.BORDER
+        ).pack(side="left", padx=(8, 0))
+
+        UploadButton(
+            search_frame,
+            text="Buscar",
+            command=self._run_search,
+            width=90
+        ).pack(side="left", padx=(8, 0))
+
+        # Navegación entre resultados
+        for text, step in (("◀", -1), ("▶", 1)):
+            ctk.CTkButton(
+                search_frame,
+                text=text,
+                width=32,
+                height=32,
+                command=lambda s=step: self._jump_to_hit(
+                    self._hit_position + s),
+                fg_color=AppTheme.TERTIARY_BACKGROUND,
+                hover_color=AppTheme.HOVER_ACCENT
+            ).pack(side="left", padx=(6, 0))
+
+        # Lista de coincidencias (seleccionar una salta a su fila)
+        self.hits_menu = ctk.CTkOptionMenu(
+            search_frame,
+            values=["Sin resultados"],
+            command=self._on_hit_selected,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT,
+            dropdown_fg_color=AppTheme.SECONDARY_BACKGROUND,
+            dropdown_hover_color=AppTheme.TERTIARY_BACKGROUND,
+            width=140
+        )
+        self.hits_menu.pack(side="left", padx=(8, 0))
+
+        self.search_result_label = ctk.CTkLabel(
+            search_frame,
+            text="",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT
+        )
+        self.search_result_label.pack(side="left", padx=(8, 0))
+
+    def _run_search(self):
+        """Buscar el texto introducido y saltar a la primera coincidencia"""
+        column = self.search_column_menu.get()
+        columns = None if column == self.ALL_COLUMNS else [
+            col for col in self.dataframe.columns if str(col) == column]
+
+        self._hits = self.search_index.find(
+            self.search_entry.get(),
+            columns=columns,
+            exact=self.exact_var.get()
+        ).tolist()
+        self._hit_position = -1
+
+        total = len(self._hits)
+        listed = self._hits[:self.MAX_LISTED_HITS]
+        self.hits_menu.configure(
+            values=[f"Fila {row}" for row in listed] or ["Sin resultados"])
+        self.hits_menu.set(f"Fila {listed[0]}" if listed
+                           else "Sin resultados")
+
+        if total == 0:
+            self.search_result_label.configure(
+                text="0 coincidencias", text_color=AppTheme.WARNING)
+            return
+
+        self._jump_to_hit(0)
+
+    def _on_hit_selected(self, value):
+        """Saltar a la fila elegida en la lista de coincidencias"""
+        if not value.startswith("Fila "):
+            return
+        row = int(value.split(" ")[1])
+        self._jump_to_hit(self._hits.index(row))
+
+    def _jump_to_hit(self, position):
+        """
+        Mostrar y seleccionar la coincidencia número `position`.
+
+        Las posiciones fuera de rango dan la vuelta (tras la última
+        coincidencia se vuelve a la primera).
+        """
+        if not self._hits or self.tree is None:
+            return
+
+        self._hit_position = position % len(self._hits)
+        iid = str(self._hits[self._hit_position])
+
+        self.tree.see(iid)
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+
+        self.search_result_label.configure(
+            text=f"{self._hit_position + 1} / {len(self._hits):,} "
+            "coincidencias",
+            text_color=AppTheme.SUCCES
+        )
+
+    # ================================================================
+    # ESTADÍSTICAS POR COLUMNA : Al pasar el ratón o pulsar el encabezado
+    # ================================================================
+
+    def _setup_header_stats(self):
+        """
+        Conectar los encabezados con las estadísticas de su columna.
+
+        - Pasar el ratón: resumen en un tooltip.
+        - Clic: ventana con el detalle y el histograma.
+
+        Las estadísticas se calculan la primera vez que se piden.
+        """
+        for column in self.dataframe.columns:
+            self.tree.heading(
+                column,
+                command=lambda c=column: ColumnStatsWindow(
+                    self.container, c, self.column_stats.get(c))
+            )
+
+        self.tree.bind("<Motion>", self._on_tree_motion, add="+")
+        self.tree.bind("<Leave>", lambda event: self._hide_tooltip(),
+                       add="+")
+
+    def _on_tree_motion(self, event):
+        """Mostrar u ocultar el tooltip según la posición del ratón"""
+        column = self._heading_column_at(event.x, event.y)
+        if column is None:
+            self._hide_tooltip()
+            return
+
+        if column != self._tooltip_column:
+            self._hide_tooltip()
+            self._show_tooltip(column, event.x_root, event.y_root)
+
+    def _heading_column_at(self, x, y):
+        """Columna del DataFrame cuyo encabezado está en (x, y), o None"""
+        if self.tree.identify_region(x, y) != "heading":
+            return None
+
+        # identify_column devuelve "#N" ("#0" es la columna del índice)
+        position = int(self.tree.identify_column(x)[1:]) - 1
+        if position < 0 or position >= len(self.dataframe.columns):
+            return None
+        return self.dataframe.columns[position]
+
+    def _show_tooltip(self, column, x_root, y_root):
+        """Crear el tooltip con el resumen de la columna"""
+        stats = self.column_stats.get(column)
+
+        self._tooltip = tk.Toplevel(self.tree)
+        self._tooltip.wm_overrideredirect(True)
+        self._tooltip.wm_geometry(f"+{x_root + 12}+{y_root + 18}")
+
+        tk.Label(
+            self._tooltip,
+            text=format_column_stats(column, stats),
+            justify="left",
+            bg=AppTheme.TERTIARY_BACKGROUND,
+            fg=AppTheme.PRIMARY_TEXT,
+            font=("Consolas", 11),
+            padx=10,
+            pady=6
+        ).pack()
+        self._tooltip_column = column
+
+    def _hide_tooltip(self):
+        """Destruir el tooltip si está visible"""
+        if self._tooltip is not None:
+            try:
+                self._tooltip.destroy()
+            except Exception:
+                pass
+        self._tooltip = None
+        self._tooltip_column = None
+
+
+def format_column_stats(column, stats):
+    """
+    Texto con el resumen de una columna (tooltip y ventana de detalle).
+
+    Parameters
+    ----------
+    column : str
+        Nombre de la columna.
+    stats : dict
+        Resultado de ColumnStatsCache.get.
+    """
+    def fmt(value):
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:,.4f}"
+        return str(value)
+
+    lines = [
+        f"{column}  ({stats['dtype']})",
+        f"Mín: {fmt(stats['min'])}   Máx: {fmt(stats['max'])}",
+        f"Media: {fmt(stats['mean'])}",
+        f"Distintos: {stats['distinct']:,}   N/A: {stats['nan']:,}"
+    ]
+    sparkline = histogram_sparkline(stats["histogram"])
+    if sparkline:
+        lines.append(sparkline)
+    return "\n".join(lines)
+
+
+class ColumnStatsWindow(ctk.CTkToplevel):
+    """
+    Ventana con las estadísticas de una columna y su histograma.
+
+    Parameters
+    ----------
+    master : widget
+        Widget padre.
+    column : str
+        Nombre de la columna.
+    stats : dict
+        Resultado de ColumnStatsCache.get.
+    """
+
+    HISTOGRAM_WIDTH = 360
+    HISTOGRAM_HEIGHT = 120
+
+    def __init__(self, master, column, stats):
+        super().__init__(master)
+        self.title(f"Estadísticas: {column}")
+        self.resizable(False, False)
+        self.configure(fg_color=AppTheme.SECONDARY_BACKGROUND)
+
+        ctk.CTkLabel(
+            self,
+            text=format_column_stats(column, stats),
+            font=AppConfig.MONO_FONT,
+            text_color=AppTheme.PRIMARY_TEXT,
+            justify="left"
+        ).pack(padx=20, pady=(15, 10), anchor="w")
+
+        if stats["histogram"] is not None:
+            self._draw_histogram(stats["histogram"])
+
+        ctk.CTkButton(
+            self,
+            text="ACEPTAR",
+            font=("Orbitron", 10, "bold"),
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT,
+            height=32,
+            corner_radius=6,
+            command=self.destroy
+        ).pack(padx=20, pady=(0, 15), anchor="e")
+
+        self.transient(master.winfo_toplevel())
+
+    def _draw_histogram(self, counts):
+        """Dibujar el histograma como barras en un Canvas"""
+        canvas = tk.Canvas(
+            self,
+            width=self.HISTOGRAM_WIDTH,
+            height=self.HISTOGRAM_HEIGHT,
+            bg=AppTheme.PRIMARY_BACKGROUND,
+            highlightthickness=0
+        )
+        canvas.pack(padx=20, pady=(0, 15))
+
+        top = max(counts.max(), 1)
+        bar_width = self.HISTOGRAM_WIDTH / len(counts)
+        for i, count in enumerate(counts):
+            height = (self.HISTOGRAM_HEIGHT - 10) * count / top
+            canvas.create_rectangle(
+                i * bar_width + 2,
+                self.HISTOGRAM_HEIGHT - height,
+                (i + 1) * bar_width - 2,
+                self.HISTOGRAM_HEIGHT,
+                fill=AppTheme.PRIMARY_ACCENT,
+                outline=""
+            )
@@ -1,5 +1,10 @@
 import customtkinter as ctk
-from sklearn.model_selection import train_test_split
+import numpy as np
+from pandas.api.types import is_datetime64_any_dtype
+from modeling import (
+    DEFAULT_BINS, CrossValidation, GramCache, RollingOrigin, group_codes,
+    quantile_bins, random_split, temporal_split
+)
 from .components import (Panel,
                          NotificationWindow, AppTheme, AppConfig, UploadButton)
 
@@ -9,15 +14,41 @@ class DataSplitPanel(ctk.CTkFrame):
     Panel para dividir el DataFrame (ya preprocesado) en entrenamiento y test.
     - Control de % de train (test = 1 - train)
     - Semilla configurable (aleatorio reproducible)
-    - Guarda los subconjuntos en la app: app.train_df y app.test_df
+    - Guarda la división en la app (app.data_split): posiciones de las
+      filas de cada conjunto, sin copiar el DataFrame
+    - Reparto aleatorio, estratificado por cuantiles de la salida, por
+      grupos de una columna (todas sus filas al mismo conjunto) o
+      temporal (las filas más recientes de una columna de fechas a test)
+    - Conserva la matriz de Gram del entrenamiento (app.gram_cache)
+      mientras no cambien los datos ni la división, para reajustar al
+      instante con otras columnas
+    - Validación cruzada opcional (app.cross_validation): k-fold, k-fold
+      repetido, shuffle-split (con la fracción de test del slider) o
+      backtest con origen móvil sobre una columna de fechas
     - Muestra tamaños y notificaciones
     """
 
+    # Evaluación del modelo (etiqueta -> método de CrossValidation)
+    EVALUATION_LABELS = {
+        "Entrenamiento/test": None,
+        "K-fold": "kfold",
+        "K-fold repetido": "repeated",
+        "Shuffle-split": "shuffle",
+        "Backtest (origen móvil)": "backtest"
+    }
+
+    # Reparto de las filas (etiqueta -> modo)
+    SPLIT_LABELS = {
+        "Aleatorio": None,
+        "Estratificado (salida)": "stratified",
+        "Por grupos": "grouped",
+        "Temporal (fecha)": "temporal"
+    }
+
     def __init__(self, master, app):
         super().__init__(master)
         self.app = app
-        self.train_df = None
-        self.test_df = None
+        self.split = None
         self._create_ui()
 
     # ---------------- UI ----------------
@@ -105,6 +136,79 @@ class DataSplitPanel(ctk.CTkFrame):
             text_color=AppTheme.DIM_TEXT,
         ).pack(side="right")
 
+        # Validación cruzada
+        cv_frame = ctk.CTkFrame(panel, fg_color="transparent")
+        cv_frame.pack(fill="x", padx=20, pady=(0, 6))
+
+        ctk.CTkLabel(
+            cv_frame,
+            text="Evaluación:",
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 8))
+
+        self.evaluation_var = ctk.StringVar(
+            value=next(iter(self.EVALUATION_LABELS)))
+        ctk.CTkOptionMenu(
+            cv_frame,
+            values=list(self.EVALUATION_LABELS),
+            variable=self.evaluation_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left", padx=(0, 15))
+
+        self.folds_entry = self._create_number_entry(
+            cv_frame, "Particiones:", "5")
+        self.repeats_entry = self._create_number_entry(
+            cv_frame, "Repeticiones:", "3")
+
+        # Reparto: estratificado o por grupos
+        mode_frame = ctk.CTkFrame(panel, fg_color="transparent")
+        mode_frame.pack(fill="x", padx=20, pady=(0, 6))
+
+        ctk.CTkLabel(
+            mode_frame,
+            text="Reparto:",
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 8))
+
+        self.split_mode_var = ctk.StringVar(
+            value=next(iter(self.SPLIT_LABELS)))
+        ctk.CTkOptionMenu(
+            mode_frame,
+            values=list(self.SPLIT_LABELS),
+            variable=self.split_mode_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left", padx=(0, 15))
+
+        ctk.CTkLabel(
+            mode_frame,
+            text="Columna (grupo/fecha):",
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 8))
+
+        df = getattr(self.app, "preprocessed_df", None)
+        group_columns = [str(col) for col in df.columns] if (
+            df is not None) else []
+        self.group_var = ctk.StringVar(
+            value=group_columns[0] if group_columns else "")
+        ctk.CTkOptionMenu(
+            mode_frame,
+            values=group_columns or [""],
+            variable=self.group_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left")
+
         # Resultado
         self.result_label = ctk.CTkLabel(
             panel,
@@ -114,6 +218,26 @@ class DataSplitPanel(ctk.CTkFrame):
         )
         self.result_label.pack(pady=(4, 12))
 
+    def _create_number_entry(self, master, text, default):
+        """Etiqueta y campo numérico en línea"""
+        ctk.CTkLabel(
+            master,
+            text=text,
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 8))
+
+        entry = ctk.CTkEntry(
+            master,
+            width=60,
+            height=32,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER
+        )
+        entry.insert(0, default)
+        entry.pack(side="left", padx=(0, 15))
+        return entry
+
     def _update_label(self, value):
         """Actualizar el label con el porcentaje actual"""
         self.slider_label.configure(
@@ -188,21 +312,133 @@ class DataSplitPanel(ctk.CTkFrame):
                 "error")
             return
 
-        # División aleatoria reproducible
-        train_df, test_df = train_test_split(
-            df, train_size=train_size, random_state=random_state, shuffle=True
-        )
+        mode = self.SPLIT_LABELS[self.split_mode_var.get()]
+        group_column = self._group_column(df) if mode == "grouped" else None
+        if mode == "grouped" and group_column is None:
+            NotificationWindow(
+                self.app,
+                "Columna de grupo",
+                "Seleccione una columna del dataset para agrupar las filas.",
+                "error"
+            )
+            return
 
-        # Guardar internamente para historias posteriores (entrenar/evaluar)
-        self.app.train_df = train_df
-        self.app.test_df = test_df
-        self.train_df = train_df
-        self.test_df = test_df
+        # Columna de fechas para el reparto temporal o el backtest
+        time_column = None
+        method = self.EVALUATION_LABELS[self.evaluation_var.get()]
+        if mode == "temporal" or method == "backtest":
+            time_column = self._group_column(df)
+            if (time_column is None
+                    or not is_datetime64_any_dtype(df[time_column])):
+                NotificationWindow(
+                    self.app,
+                    "Columna de fecha",
+                    "El reparto temporal y el backtest necesitan una "
+                    "columna de fechas.",
+                    "error"
+                )
+                return
+
+        validation = self._cross_validation(
+            len(df), 1 - train_size, random_state, mode, group_column,
+            time_column)
+        if validation is False:
+            return
+
+        # Estratos (cuantiles de la salida) o grupos de cada fila
+        strata = groups = None
+        if mode == "stratified":
+            output = self.app.selection_panel.columna_salida
+            strata = quantile_bins(df[output], DEFAULT_BINS)
+        elif mode == "grouped":
+            groups = group_codes(df[group_column])
+
+        # División reproducible (solo posiciones de filas; al entrenar se
+        # reúnen las columnas del modelo)
+        try:
+            if mode == "temporal":
+                split = temporal_split(df[time_column], train_size)
+            else:
+                split = random_split(
+                    len(df), train_size, random_state, strata, groups)
+        except ValueError as error:
+            NotificationWindow(self.app, "Error", str(error), "error")
+            return
+        self.app.data_split = split
+        self.app.cross_validation = validation
+        # Misma división sobre los mismos datos (p. ej. solo han cambiado
+        # las columnas de entrada): se reutilizan los productos cruzados
+        cache = getattr(self.app, "gram_cache", None)
+        if cache is None or not cache.matches(df, split):
+            self.app.gram_cache = GramCache(df, split)
+            # La búsqueda de entradas valida con una parte del
+            # entrenamiento, no con el test
+            holdout = split.holdout(seed=random_state)
+            self.app.search_gram = GramCache(df, holdout)
+            self.app.validation_gram = GramCache(df, holdout, rows="test")
+        self.split = split
 
         # Feedback visual
-        self.result_label.configure(
-            text=f"Entrenamiento: {len(train_df)} filas "
-            f"| Test: {len(test_df)} filas"
-        )
+        text = (f"Entrenamiento: {split.n_train} filas "
+                f"| Test: {split.n_test} filas")
+        if groups is not None:
+            train_groups = np.unique(groups[split.train]).size
+            test_groups = np.unique(groups[split.test]).size
+            text += (f"\nGrupos de {group_column}: {train_groups} en "
+                     f"entrenamiento | {test_groups} en test")
+        if mode == "temporal":
+            dates = df[time_column]
+            text += (f"\nTest desde {dates.iloc[split.test].min()} "
+                     f"({split.n_rows - split.n_train - split.n_test} "
+                     "filas sin fecha)")
+        if validation is not None:
+            text += f"\nValidación cruzada: {validation.describe()}"
+        self.result_label.configure(text=text)
 
         self.app.set_split_completed()
+
+    def _group_column(self, df):
+        """Columna de agrupación elegida (None si no existe)"""
+        names = {str(col): col for col in df.columns}
+        return names.get(self.group_var.get())
+
+    def _cross_validation(self, n_rows, test_size, seed, mode=None,
+                          group_column=None, time_column=None):
+        """
+        Validación cruzada elegida en el panel.
+
+        Con el backtest, las particiones son el número de cortes sobre
+        time_column.
+
+        Returns
+        -------
+        CrossValidation, RollingOrigin, None o False
+            None si solo se usa entrenamiento/test y False si los
+            valores no son válidos (ya se ha avisado al usuario).
+        """
+        method = self.EVALUATION_LABELS[self.evaluation_var.get()]
+        if method is None:
+            return None
+
+        try:
+            n_splits = int(self.folds_entry.get())
+            n_repeats = int(self.repeats_entry.get())
+        except ValueError:
+            n_splits = n_repeats = 0
+
+        if not 2 <= n_splits <= min(n_rows, 50) or not 1 <= n_repeats <= 20:
+            NotificationWindow(
+                self.app,
+                "Validación cruzada",
+                "Las particiones deben estar entre 2 y 50 (sin superar "
+                "el número de filas) y las repeticiones entre 1 y 20.",
+                "error"
+            )
+            return False
+
+        if method == "backtest":
+            return RollingOrigin(time_column, n_splits)
+        return CrossValidation(
+            method, n_splits, n_repeats, test_size, seed,
+            n_bins=DEFAULT_BINS if mode == "stratified" else None,
+            group_column=group_column)
@@ -9,15 +9,33 @@ Compatible con el formato extendido:
     "r2": [r2_train, r2_test],
     "mse": [mse_train, mse_test],
     "col_entrada": list[str],
-    "col_salida": str
+    "col_salida": str,
+    "preprocessing": list[dict]  (opcional, PreprocessingPipeline)
+    "features": dict  (opcional, DesignMatrix: codificación, fechas, escalado)
+    "cross_validation": dict  (opcional, resumen de la validación cruzada)
+    "recursive": dict  (opcional, RecursiveLeastSquares para actualizar)
+    "regularization": dict  (opcional, penalización y α elegido)
 }
+
+Si el modelo guarda sus estadísticos ("recursive"), se puede actualizar
+con un archivo de filas nuevas sin volver a entrenar: las filas pasan
+por el mismo preprocesado y la misma matriz de diseño, se aplica el paso
+de mínimos cuadrados recursivos y las métricas se recalculan desde los
+estadísticos. El modelo actualizado se guarda en un archivo nuevo.
 """
 
+from pathlib import Path
+
 import joblib
 import customtkinter as ctk
 from tkinter import filedialog
-from .components import AppTheme, AppConfig, Panel, NotificationWindow, UploadButton
+from .components import (AppTheme, AppConfig, Panel, NotificationWindow,
+                         UploadButton, LoadingIndicator)
 from .predict_gui import PredictionSection
+from data_import import iter_chunks
+from data_import.importer import import_data
+from modeling import RecursiveLeastSquares, update_chunks
+from preprocessing import DesignMatrix, PreprocessingPipeline
 
 
 class LoadModelPanel(ctk.CTkFrame):
@@ -32,6 +50,10 @@ class LoadModelPanel(ctk.CTkFrame):
         super().__init__(master)
         self.app = app
         self.result_container = None
+        self.data = None
+        self.file_path = None
+        self.current_task = None
+        self.loading_indicator = None
         self._create_ui()
 
     # ================================================================
@@ -130,6 +152,8 @@ class LoadModelPanel(ctk.CTkFrame):
         for widget in self.result_container.winfo_children():
             widget.destroy()
 
+        self.data = data
+        self.file_path = file_path
         model = data.get("model")
         desc = data.get("desc", "Sin descripción guardada.")
         r2 = data.get("r2")
@@ -137,10 +161,15 @@ class LoadModelPanel(ctk.CTkFrame):
         cols_in = data.get("col_entrada", [])
         col_out = data.get("col_salida", "Variable de salida desconocida")
 
+        # Matriz de diseño guardada (modelos antiguos: entradas numéricas)
+        design = (DesignMatrix.from_config(data["features"])
+                  if data.get("features") else DesignMatrix(cols_in))
+
         # Fórmula (si el modelo es lineal)
         if hasattr(model, "coef_") and hasattr(model, "intercept_"):
             coef_str = " + ".join(
-                f"{coef:.4f}*{col}" for coef, col in zip(model.coef_, cols_in)
+                f"{coef:.4f}*{col}"
+                for coef, col in zip(model.coef_, design.feature_names)
             )
             formula = f"y = {coef_str} + {model.intercept_:.4f}"
         else:
@@ -169,6 +198,29 @@ class LoadModelPanel(ctk.CTkFrame):
                 f"  ECM Entrenamiento: {mse[0]:.4f}\n"
                 f"  ECM Test:          {mse[1]:.4f}"
             )
+            # Media ± desviación de cada métrica entre particiones
+            validation = data.get("cross_validation")
+            if validation:
+                r2_cv, mse_cv = validation["r2"], validation["mse"]
+                metrics_text += (
+                    f"\n\n Validación cruzada: {validation['description']}"
+                    f"\n  R²:  {r2_cv[0]:.4f} ± {r2_cv[1]:.4f}"
+                    f"\n  ECM: {mse_cv[0]:.4f} ± {mse_cv[1]:.4f}"
+                )
+            regularization = data.get("regularization")
+            if regularization:
+                mse_reg = regularization["mse"]
+                metrics_text += (
+                    f"\n\n Regularización: {regularization['description']}"
+                    f"\n  ECM validación: {mse_reg[0]:.4f} ± "
+                    f"{mse_reg[1]:.4f}"
+                )
+            recursive = data.get("recursive")
+            if recursive and recursive.get("rows_added"):
+                metrics_text += (
+                    f"\n\n Actualizado con {recursive['rows_added']} "
+                    f"filas nuevas (olvido λ = {recursive['forgetting']})"
+                )
             ctk.CTkLabel(
                 info_panel,
                 text=metrics_text,
@@ -183,6 +235,8 @@ class LoadModelPanel(ctk.CTkFrame):
             f" Columnas de entrada: {', '.join(cols_in)}\n"
             f" Columna de salida: {col_out}"
         )
+        if design.describe():
+            cols_text += "\n Transformación: " + "; ".join(design.describe())
         ctk.CTkLabel(
             info_panel,
             text=cols_text,
@@ -191,6 +245,23 @@ class LoadModelPanel(ctk.CTkFrame):
             justify="left",
         ).pack(pady=(0, 20), padx=25, anchor="w")
 
+        # Pasos de preprocesado aplicados antes de entrenar
+        pipeline = PreprocessingPipeline.from_config(
+            data.get("preprocessing", []))
+        if len(pipeline):
+            steps_text = " Preprocesado:\n\n" + "\n".join(
+                f"  {i}. {line}"
+                for i, line in enumerate(pipeline.describe(), start=1)
+            )
+            ctk.CTkLabel(
+                info_panel,
+                text=steps_text,
+                font=AppConfig.BODY_FONT,
+                text_color=AppTheme.SECONDARY_TEXT,
+                justify="left",
+                wraplength=900,
+            ).pack(pady=(0, 20), padx=25, anchor="w")
+
         # Descripción guardada
         desc_panel = Panel(info_panel, "Descripción Guardada")
         desc_panel.pack(fill="x", padx=20, pady=(10, 20))
@@ -207,10 +278,221 @@ class LoadModelPanel(ctk.CTkFrame):
         desc_box.configure(state="disabled")
         desc_box.pack(fill="both", expand=True, padx=15, pady=15)
 
+        if data.get("recursive") and hasattr(model, "coef_"):
+            self._create_update_section(info_panel)
+
         # Actualizar ruta en interfaz
         self.path_label.configure(text=file_path,
                                   text_color=AppTheme.PRIMARY_ACCENT)
         self.update_idletasks()
 
-        prediction_panel = PredictionSection(self.app, self.result_container, cols_in, formula)
+        prediction_panel = PredictionSection(
+            self.app, self.result_container, cols_in, formula,
+            model=model, design=design)
         prediction_panel.display_data()
+
+    # ================================================================
+    # ACTUALIZACIÓN CON FILAS NUEVAS
+    # ================================================================
+
+    def _create_update_section(self, master):
+        """Factor de olvido y botones para actualizar y guardar"""
+        update_panel = Panel(master, "Actualizar con Filas Nuevas")
+        update_panel.pack(fill="x", padx=20, pady=(0, 20))
+
+        row = ctk.CTkFrame(update_panel, fg_color="transparent")
+        row.pack(fill="x", padx=15, pady=15)
+
+        ctk.CTkLabel(
+            row,
+            text="Factor de olvido (0-1]:",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT,
+        ).pack(side="left", padx=(0, 10))
+
+        self.forgetting_entry = ctk.CTkEntry(row, width=80)
+        self.forgetting_entry.insert(
+            0, str(self.data["recursive"].get("forgetting", 1.0)))
+        self.forgetting_entry.pack(side="left", padx=(0, 15))
+
+        UploadButton(
+            row, text="Añadir Filas", command=self._update_model
+        ).pack(side="left", padx=(0, 15))
+
+        self.save_update_button = ctk.CTkButton(
+            row,
+            text="💾 Guardar Actualizado",
+            command=self._save_updated_model,
+            font=("Orbitron", 12, "bold"),
+            height=AppConfig.BUTTON_HEIGHT,
+            corner_radius=6,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT,
+            text_color="#ffffff",
+            state=("normal" if self.data["recursive"].get("rows_added")
+                   else "disabled"),
+        )
+        self.save_update_button.pack(side="left")
+
+    def _update_model(self):
+        """Elegir el archivo de filas nuevas y actualizar en segundo plano"""
+        try:
+            forgetting = float(self.forgetting_entry.get())
+            if not 0 < forgetting <= 1:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "El factor de olvido debe ser un número entre 0 "
+                "(sin incluir) y 1.",
+                "warning",
+            )
+            return
+
+        file_path = filedialog.askopenfilename(
+            title="Seleccionar filas nuevas",
+            filetypes=AppConfig.ALLOWED_EXTENTIONS,
+        )
+        if not file_path:
+            return
+
+        data = self.data
+        output = data["col_salida"]
+        design = (DesignMatrix.from_config(data["features"])
+                  if data.get("features")
+                  else DesignMatrix(data["col_entrada"]))
+        pipeline = PreprocessingPipeline.from_config(
+            data.get("preprocessing", []))
+
+        def job(context=None):
+            model = RecursiveLeastSquares.from_config(data["recursive"])
+            model.forgetting = forgetting
+            chunks = _new_row_chunks(file_path, pipeline, context)
+            new_scores = update_chunks(model, chunks, output, design,
+                                       context)
+            return model, new_scores
+
+        def on_done(result):
+            self._hide_loading_indicator()
+            self._show_update(*result)
+
+        def on_error(error):
+            self._hide_loading_indicator()
+            NotificationWindow(
+                self.app,
+                "Error al actualizar",
+                f"No se pudo actualizar el modelo:\n\n{error}",
+                "error",
+            )
+
+        runner = getattr(self.app, "task_runner", None)
+        if runner is None:
+            try:
+                on_done(job())
+            except (ValueError, RuntimeError, KeyError) as error:
+                on_error(error)
+            return
+
+        self.loading_indicator = LoadingIndicator(self.app)
+        self.loading_indicator.label.configure(text="Actualizando modelo...")
+        self.loading_indicator.status_label.configure(
+            text="Añadiendo las filas nuevas.")
+        self.loading_indicator.add_cancel_button(self._cancel_task)
+        self.loading_indicator.place(relx=0.5, rely=0.5, anchor="center")
+        self.current_task = runner.submit(
+            job,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancel=self._hide_loading_indicator,
+        )
+
+    def _show_update(self, model, new_scores):
+        """Sustituir modelo y métricas por los actualizados"""
+        if not self.winfo_exists():
+            return
+        data = dict(self.data)
+        r2_train, mse_train = model.score()
+        test = model.test_score()
+        r2_test, mse_test = (test if test is not None
+                             else (data["r2"][1], data["mse"][1]))
+        data["model"] = model.to_model()
+        data["r2"] = [r2_train, r2_test]
+        data["mse"] = [mse_train, mse_test]
+        data["recursive"] = model.to_config()
+        # La validación cruzada era del modelo anterior
+        data["cross_validation"] = None
+        self._display_model_info(data, self.file_path)
+
+        r2_new, mse_new = new_scores
+        NotificationWindow(
+            self.app,
+            "Modelo Actualizado",
+            "Filas nuevas con el modelo anterior:\n"
+            f"R²: {r2_new:.4f}   ECM: {mse_new:.4f}\n\n"
+            "Guarda el modelo para conservar la actualización.",
+            "success",
+        )
+
+    def _save_updated_model(self):
+        """Guardar el modelo actualizado en un archivo nuevo"""
+        original = Path(self.file_path)
+        file_path = filedialog.asksaveasfilename(
+            title="Guardar modelo actualizado",
+            initialdir=str(original.parent),
+            initialfile=f"{original.stem}_actualizado.joblib",
+            defaultextension=".joblib",
+            filetypes=[("Modelos de regresión (.joblib)", "*.joblib")],
+        )
+        if not file_path:
+            return
+        try:
+            joblib.dump(self.data, file_path, compress=3)
+            self.path_label.configure(text=file_path)
+            self.file_path = file_path
+            NotificationWindow(
+                self.app,
+                "Éxito",
+                "Modelo actualizado guardado correctamente",
+                "success",
+            )
+        except Exception as e:
+            NotificationWindow(
+                self.app,
+                "Error",
+                f"Error al guardar el modelo:\n{str(e)}",
+                "error",
+            )
+
+    def _cancel_task(self):
+        """Pedir la cancelación de la actualización en curso"""
+        if self.current_task is None:
+            return
+        self.current_task.cancel()
+        if self.loading_indicator is not None:
+            self.loading_indicator.cancel_button.configure(state="disabled")
+            self.loading_indicator.status_label.configure(
+                text="Cancelando...")
+
+    def _hide_loading_indicator(self):
+        if self.loading_indicator is not None:
+            try:
+                self.loading_indicator.stop()
+                self.loading_indicator.destroy()
+            except Exception:
+                pass
+            self.loading_indicator = None
+
+
+def _new_row_chunks(file_path, pipeline, context=None):
+    """
+    Filas nuevas por bloques, con el preprocesado del modelo aplicado.
+
+    CSV y SQLite se leen por bloques; Excel se lee entero.
+    """
+    if Path(file_path).suffix.lower() in [".xlsx", ".xls"]:
+        chunks = [import_data(file_path)[0]]
+    else:
+        chunks = iter_chunks(file_path)
+    for chunk in chunks:
+        yield pipeline.transform(chunk, context) if len(pipeline) else chunk
@@ -13,11 +13,16 @@ from .components import (
 from .selection_columns import SelectionPanel
 from .data_display import DataDisplayManager
 from data_import.importer import import_data
+from data_analysis import DatasetProfile
 from .data_split import DataSplitPanel
 from .desc_model import DescriptBox
 from .model_linear import LinearModelPanel
 from .load_model import LoadModelPanel
 from .splash_screen import show_splash_screen
+from .tasks import BackgroundTask, TaskRunner
+
+# Espera (ms) tras la carga antes de precalcular el perfil del dataset
+PROFILE_DELAY_MS = 300
 
 
 class DataLoaderApp(ctk.CTk):
@@ -39,10 +44,21 @@ class DataLoaderApp(ctk.CTk):
         self.current_dataframe = None    # Los datos (DataFrame)
         self.loading_indicator = None    # Círculo de carga
         self.display_manager = None      # Gestor de la tabla
+        self.profile = None              # Diagnósticos del dataset (caché)
+        self.profile_task = None         # Precálculo del perfil en 2º plano
+        self.task_runner = TaskRunner(self)  # Tareas largas cancelables
+        self.training_task = None  # Entrenamiento del modelo en curso
         self.is_preprocessed = False
         self.preprocessed_df = None
-        self.train_df = None
-        self.test_df = None
+        self.data_split = None  # Posiciones de train/test (sin copias)
+        self.gram_cache = None  # Productos cruzados del entrenamiento
+        # Productos cruzados de la búsqueda de entradas: ajuste y
+        # validación, ambas dentro del entrenamiento
+        self.search_gram = None
+        self.validation_gram = None
+        self.cross_validation = None  # Validación cruzada elegida
+        # Penalización y l1_ratio que conserva el siguiente panel del modelo
+        self.model_settings = None
         self._split_panel_frame = None  # contenedor para recrear el panel
         self.selection_panel = None
         self.selection_frame = None  # Frame exterior del panel de seleccion
@@ -336,6 +352,9 @@ class DataLoaderApp(ctk.CTk):
         if not file_path:
             return
 
+        # El perfil del dataset anterior ya no sirve
+        self._cancel_profiling()
+
         self._show_loading_indicator()
         self.upload_button.configure(state="disabled", text="Cargando...")
 
@@ -460,12 +479,16 @@ class DataLoaderApp(ctk.CTk):
         # Guardar los datos en variables de instancia
         self.current_file_path = file_path
         self.current_dataframe = dataframe
+        self.profile = DatasetProfile(dataframe)
+        self._start_profiling()
 
         # Reset de estado de procesamiento y split
         self.is_preprocessed = False
         self.preprocessed_df = None
-        self.train_df = None
-        self.test_df = None
+        self.data_split = None
+        self.gram_cache = None
+        self.search_gram = None
+        self.validation_gram = None
         if (self._split_panel_frame is not None and
            self._split_panel_frame.winfo_exists()):
             self._split_panel_frame.destroy()
@@ -597,6 +620,11 @@ class DataLoaderApp(ctk.CTk):
         """Registrar el dataframe preprocesado y mostrar el panel"""
         self.is_preprocessed = True
         self.preprocessed_df = df
+        # Las posiciones de una división anterior ya no son válidas
+        self.data_split = None
+        self.gram_cache = None
+        self.search_gram = None
+        self.validation_gram = None
 
         # IMPORTANTE: Destruir el panel del modelo si existe
         # (porque al cambiar el preprocesamiento,
@@ -718,14 +746,48 @@ class DataLoaderApp(ctk.CTk):
         )
         self.table_container.pack(fill="both", expand=True)
 
+        # Las estadísticas deben referirse al DataFrame mostrado
+        # (el preprocesado ya descarta las columnas que modifica)
+        if self.profile is None:
+            self.profile = DatasetProfile(dataframe)
+        elif self.profile.dataframe is not dataframe:
+            self.profile.invalidate(dataframe)
+
         # Crear gestor de visualización y mostrar datos
         self.display_manager = DataDisplayManager(
             self.table_container,
-            dataframe
+            dataframe,
+            self.profile.column_stats
         )
         # Este método hace todo el trabajo
         self.display_manager.display()
 
+    # ================================================================
+    # PERFIL DEL DATASET EN SEGUNDO PLANO
+    # ================================================================
+
+    def _start_profiling(self):
+        """
+        Precalcular el perfil del dataset mientras la app está ociosa.
+
+        NaN, tipos, correlaciones y matriz de Gram quedan listos para la
+        selección, el preprocesado y el entrenamiento.
+        """
+        self._cancel_profiling()
+        self.profile_task = BackgroundTask(
+            self,
+            self.profile.warm_up,
+            low_priority=True
+        )
+        # Empezar cuando la tabla ya esté dibujada
+        self.profile_task.start(delay_ms=PROFILE_DELAY_MS)
+
+    def _cancel_profiling(self):
+        """Detener el precálculo en curso (nueva carga, preprocesado...)"""
+        if self.profile_task is not None:
+            self.profile_task.cancel()
+            self.profile_task = None
+
     # ================================================================
     # PANEL DEL MODELO LINEAL
     # ================================================================
@@ -770,7 +832,10 @@ class DataLoaderApp(ctk.CTk):
                 pass
             self._split_panel_frame = None
 
-        #  Destruir el panel del modelo lineal si existe
+        #  Cancelar el entrenamiento en curso y destruir el panel del
+        #  modelo lineal si existe
+        if self.training_task is not None:
+            self.training_task.cancel()
         if hasattr(self, "_model_panel_frame") and self._model_panel_frame:
             try:
                 self._model_panel_frame.destroy()
@@ -779,8 +844,10 @@ class DataLoaderApp(ctk.CTk):
             self._model_panel_frame = None
 
         #  Reiniciar estado interno
-        self.train_df = None
-        self.test_df = None
+        self.data_split = None
+        self.gram_cache = None
+        self.search_gram = None
+        self.validation_gram = None
         self.is_preprocessed = False
         self.preprocessed_df = None
 
@@ -813,11 +880,16 @@ class DataLoaderApp(ctk.CTk):
             pass
 
         try:
-            # Limpiar referencias a dataframes
+            # Detener tareas en curso y limpiar referencias a dataframes
+            self._cancel_profiling()
+            self.task_runner.shutdown()
             self.current_dataframe = None
+            self.profile = None
             self.preprocessed_df = None
-            self.train_df = None
-            self.test_df = None
+            self.data_split = None
+            self.gram_cache = None
+            self.search_gram = None
+            self.validation_gram = None
         except Exception:
             pass
 
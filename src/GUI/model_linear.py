@@ -2,18 +2,24 @@ import customtkinter as ctk
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from .components import Panel, NotificationWindow, AppTheme, AppConfig
+from .components import (Panel, NotificationWindow, AppTheme, AppConfig,
+                         LoadingIndicator)
 from .desc_model import DescriptBox
 import joblib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
 from pathlib import Path
 from datetime import datetime
 from tkinter import filedialog
 from .components import Panel, UploadButton, NotificationWindow, AppTheme, AppConfig
 from .desc_model import DescriptBox
 from .predict_gui import PredictionSection
+from .predict_model import predict_batch
+from preprocessing import DesignMatrix
+from modeling import (
+    CRITERION_COLUMNS, CV_NAMES, MAX_RECURSIVE_FEATURES, CrossValidation,
+    FeatureSearch, RecursiveLeastSquares, RegularizedRegression,
+    train_linear_model
+)
 
 
 class LinearModelPanel(ctk.CTkFrame):
@@ -21,8 +27,38 @@ class LinearModelPanel(ctk.CTkFrame):
     Panel para la creación y evaluación de un modelo de regresión lineal.
     Permite entrenar el modelo con los datos de entrenamiento, evaluar con test
     y mostrar fórmula, métricas y representación gráfica si procede.
+    Propone además los mejores conjuntos de entradas numéricas (búsqueda
+    sobre la matriz de Gram del entrenamiento) para usarlos con un clic,
+    y permite ajustar Ridge, Lasso o ElasticNet con la penalización
+    elegida por validación cruzada (se dibuja la ruta de coeficientes).
     """
 
+    # Búsqueda de entradas (etiqueta -> método de FeatureSearch)
+    SEARCH_LABELS = {
+        "Hacia delante": "forward",
+        "Hacia atrás": "backward",
+        "Todos los subconjuntos": "exhaustive"
+    }
+
+    # Criterio de la búsqueda (etiqueta -> criterio)
+    CRITERION_LABELS = {
+        "BIC": "bic",
+        "AIC": "aic",
+        "R² ajustado": "adj_r2",
+        "ECM de validación": "val_mse"
+    }
+
+    # Conjuntos de entradas mostrados tras una búsqueda
+    SEARCH_TOP = 5
+
+    # Tipo de modelo (etiqueta -> penalización; None = mínimos cuadrados)
+    PENALTY_LABELS = {
+        "Mínimos cuadrados": None,
+        "Ridge": "ridge",
+        "Lasso": "lasso",
+        "ElasticNet": "elasticnet"
+    }
+
     def __init__(self, master, app):
         """
         Inicializa el panel y su interfaz.
@@ -38,6 +74,16 @@ class LinearModelPanel(ctk.CTkFrame):
         self.app = app
         # Cachear canvas para evitar lags
         self.current_canvas = None
+        # Indicador de carga de la última tarea lanzada; el panel solo
+        # tiene una tarea en marcha (entrenamiento o búsqueda)
+        self.loading_indicator = None
+        self.training_task = None
+        self.search_task = None
+        # Penalización del modelo (None = mínimos cuadrados); al cambiar
+        # de entradas desde la búsqueda se conserva la elegida
+        settings = getattr(app, "model_settings", None)
+        app.model_settings = None
+        self.penalty, self.l1_ratio = settings or (None, 0.5)
         self._create_ui()
         self._train_model()
 
@@ -161,51 +207,10 @@ class LinearModelPanel(ctk.CTkFrame):
         2. Métricas de entrenamiento
         3. Métricas de test
         """
-        # Limpiar resultados anteriores
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
-
         # ═══════════════════════════════════════════════════════════
         # 1. PANEL DE FÓRMULA
         # ═══════════════════════════════════════════════════════════
-        formula_panel = ctk.CTkFrame(
-            self.results_container,
-            fg_color=AppTheme.SECONDARY_BACKGROUND,
-            corner_radius=8,
-            border_width=1,
-            border_color=AppTheme.BORDER
-        )
-        formula_panel.pack(fill="x", pady=(0, 12))
-
-        # Título de la sección
-        formula_title = ctk.CTkLabel(
-            formula_panel,
-            text="Fórmula Del Modelo",
-            font=("Orbitron", 13, "bold"),
-            text_color=AppTheme.PRIMARY_TEXT,
-            fg_color=AppTheme.TERTIARY_BACKGROUND,
-            corner_radius=6
-        )
-        formula_title.pack(pady=(12, 8), padx=15, anchor="w")
-
-        # Separador
-        separator = ctk.CTkFrame(
-            formula_panel,
-            height=1,
-            fg_color=AppTheme.BORDER
-        )
-        separator.pack(fill="x", padx=15, pady=(0, 12))
-
-        # Fórmula con wraplength ajustado para columna más estrecha
-        formula_label = ctk.CTkLabel(
-            formula_panel,
-            text=formula,
-            font=AppConfig.MONO_FONT,
-            text_color=AppTheme.PRIMARY_TEXT,
-            wraplength=400,  # Ajustado para columna izquierda
-            anchor="center"
-        )
-        formula_label.pack(pady=(0, 15), padx=15, anchor="center")
+        self._create_formula_panel(formula)
 
         # ═══════════════════════════════════════════════════════════
         # 2. PANEL DE MÉTRICAS DE ENTRENAMIENTO
@@ -269,6 +274,149 @@ class LinearModelPanel(ctk.CTkFrame):
         self._create_metric_row(
             test_panel, "ECM", mse_test, mse_train, is_ecm=True)
 
+    def _display_cv_results(self, formula, result):
+        """
+        Muestra la fórmula y los resultados de la validación cruzada.
+
+        Sustituye a las métricas de entrenamiento/test: R² y ECM de cada
+        partición (media ± desviación) y la dispersión de los
+        coeficientes entre particiones.
+
+        Parameters
+        ----------
+        formula : str
+            Fórmula del modelo ajustado con el conjunto de entrenamiento.
+        result : CrossValidationResult
+            Métricas y coeficientes por partición.
+        """
+        self._create_formula_panel(formula)
+
+        # ═══════════════════════════════════════════════════════════
+        # 2. RESUMEN DE LAS PARTICIONES
+        # ═══════════════════════════════════════════════════════════
+        validation = result.validation
+        summary_panel = self._create_results_section(
+            f"Validación Cruzada ({CV_NAMES[validation.method]})")
+
+        summary = result.summary()
+        for metric, name in (("r2", "R²"), ("mse", "ECM")):
+            row = summary.loc[metric]
+            ctk.CTkLabel(
+                summary_panel,
+                text=(f"{name}: {row['media']:.4f} ± "
+                      f"{row['desviación']:.4f}  "
+                      f"[{row['mínimo']:.4f}, {row['máximo']:.4f}]"),
+                font=AppConfig.MONO_FONT,
+                text_color=AppTheme.PRIMARY_TEXT
+            ).pack(padx=15, pady=2, anchor="w")
+
+        # Métricas de cada partición
+        # (partición y repetición, u origen y fecha de corte en el
+        # backtest)
+        first, second = result.scores.columns[:2]
+        width = max(len(second), *(
+            len(str(value)) for value in result.scores[second]))
+        lines = [f"{first.capitalize():>9} {second.capitalize():>{width}} "
+                 f"{'R²':>10} {'ECM':>12}"]
+        for row in result.scores.itertuples(index=False):
+            lines.append(f"{row[0]:>9} {str(row[1]):>{width}} "
+                         f"{row.r2:>10.4f} {row.mse:>12.4g}")
+        self._create_text_table(summary_panel, lines)
+
+        # ═══════════════════════════════════════════════════════════
+        # 3. DISPERSIÓN DE LOS COEFICIENTES
+        # ═══════════════════════════════════════════════════════════
+        coef_panel = self._create_results_section(
+            "Coeficientes Entre Particiones")
+        lines = [f"{'Variable':<24} {'Media':>11} {'Desv.':>10}"]
+        spread = result.coefficient_spread()
+        for name, row in spread.iterrows():
+            lines.append(f"{str(name)[:24]:<24} {row['media']:>11.4g} "
+                         f"{row['desviación']:>10.3g}")
+        self._create_text_table(coef_panel, lines)
+
+    def _create_results_section(self, title):
+        """Recuadro con título en la columna de resultados"""
+        section = ctk.CTkFrame(
+            self.results_container,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            corner_radius=8,
+            border_width=1,
+            border_color=AppTheme.BORDER
+        )
+        section.pack(fill="x", pady=(0, 12))
+
+        ctk.CTkLabel(
+            section,
+            text=title,
+            font=("Orbitron", 12, "bold"),
+            text_color=AppTheme.PRIMARY_TEXT,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            corner_radius=6
+        ).pack(pady=(12, 8), padx=15, anchor="w")
+
+        ctk.CTkFrame(section, height=1, fg_color=AppTheme.BORDER).pack(
+            fill="x", padx=15, pady=(0, 10))
+        return section
+
+    def _create_text_table(self, master, lines):
+        """Tabla de texto de solo lectura (con scroll si es larga)"""
+        table = ctk.CTkTextbox(
+            master,
+            height=min(len(lines), 10) * 20 + 10,
+            font=AppConfig.MONO_FONT,
+            fg_color=AppTheme.PRIMARY_BACKGROUND,
+            wrap="none"
+        )
+        table.insert("1.0", "\n".join(lines))
+        table.configure(state="disabled")
+        table.pack(fill="x", padx=15, pady=(6, 12))
+
+    def _create_formula_panel(self, formula):
+        """Limpia la columna izquierda y muestra la fórmula del modelo"""
+        # Limpiar resultados anteriores
+        for widget in self.results_container.winfo_children():
+            widget.destroy()
+
+        formula_panel = ctk.CTkFrame(
+            self.results_container,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            corner_radius=8,
+            border_width=1,
+            border_color=AppTheme.BORDER
+        )
+        formula_panel.pack(fill="x", pady=(0, 12))
+
+        # Título de la sección
+        formula_title = ctk.CTkLabel(
+            formula_panel,
+            text="Fórmula Del Modelo",
+            font=("Orbitron", 13, "bold"),
+            text_color=AppTheme.PRIMARY_TEXT,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            corner_radius=6
+        )
+        formula_title.pack(pady=(12, 8), padx=15, anchor="w")
+
+        # Separador
+        separator = ctk.CTkFrame(
+            formula_panel,
+            height=1,
+            fg_color=AppTheme.BORDER
+        )
+        separator.pack(fill="x", padx=15, pady=(0, 12))
+
+        # Fórmula con wraplength ajustado para columna más estrecha
+        formula_label = ctk.CTkLabel(
+            formula_panel,
+            text=formula,
+            font=AppConfig.MONO_FONT,
+            text_color=AppTheme.PRIMARY_TEXT,
+            wraplength=400,  # Ajustado para columna izquierda
+            anchor="center"
+        )
+        formula_label.pack(pady=(0, 15), padx=15, anchor="center")
+
     def _create_metric_row(self,
                            parent,
                            metric_name,
@@ -385,7 +533,9 @@ class LinearModelPanel(ctk.CTkFrame):
             widget.destroy()
 
         # Crear el panel de predicción
-        prediction_panel = PredictionSection(self.app, master, self.app.selection_panel.columnas_entrada, formula)
+        prediction_panel = PredictionSection(
+            self.app, master, self.app.selection_panel.columnas_entrada,
+            formula, model=self.model, design=self.design)
         prediction_panel.display_data()
 
     def _create_test_evaluation_graph(self, y_test, y_pred_test, y_label):
@@ -565,15 +715,17 @@ class LinearModelPanel(ctk.CTkFrame):
         """
         Entrena el modelo de regresión lineal y muestra resultados.
 
-        - Ajusta el modelo solo con el conjunto de entrenamiento.
-        - Calcula predicciones y métricas en train y test.
-        - Muestra fórmula y resultados numéricos.
-        - Dibuja la recta si solo hay una variable de entrada.
+        El ajuste, las predicciones, las métricas y la validación cruzada
+        se calculan en el TaskRunner de la aplicación, con progreso y
+        botón de cancelar; solo el dibujo de los resultados vuelve al
+        hilo principal. Un entrenamiento nuevo cancela el que siga en
+        curso. Sin TaskRunner se entrena en el hilo principal.
         """
         # ===================================
         # VALIDACIÓN: Verificar que los datos están divididos
         # ===================================
-        if self.app.train_df is None or self.app.test_df is None:
+        split = getattr(self.app, "data_split", None)
+        if split is None or self.app.preprocessed_df is None:
             NotificationWindow(
                 self.app,
                 "Error",
@@ -583,48 +735,468 @@ class LinearModelPanel(ctk.CTkFrame):
             return
 
         # ===================================
-        # OBTENER DATOS CON LAS COLUMNAS SELECCIONADAS
+        # CONFIGURACIÓN (se lee aquí, en el hilo principal)
         # ===================================
-        X_train = self.app.train_df[self.app.selection_panel.columnas_entrada]
-        y_train = self.app.train_df[self.app.selection_panel.columna_salida]
-        X_test = self.app.test_df[self.app.selection_panel.columnas_entrada]
-        y_test = self.app.test_df[self.app.selection_panel.columna_salida]
+        # La división guarda posiciones de filas: solo se reúnen las
+        # columnas del modelo. Las codificaciones se aprenden solo con
+        # entrenamiento y se guardan con el modelo para repetirlas al
+        # predecir
+        columnas_entrada = list(self.app.selection_panel.columnas_entrada)
+        columna_salida = self.app.selection_panel.columna_salida
+        encodings = dict(getattr(self.app.selection_panel, "encodings", {}))
+        scaling = getattr(self.app.selection_panel, "scaling", None)
+        datetimes = dict(getattr(self.app.selection_panel, "datetimes", {}))
+        validation = getattr(self.app, "cross_validation", None)
+        gram = getattr(self.app, "gram_cache", None)
+        df = self.app.preprocessed_df
+        # Con penalización, las particiones elegidas sirven para elegir α
+        # (el backtest no: se usa k-fold)
+        regularization = None
+        if self.penalty is not None:
+            regularization = RegularizedRegression(
+                self.penalty, self.l1_ratio,
+                validation=(validation
+                            if isinstance(validation, CrossValidation)
+                            else None))
+
+        def job(context=None):
+            return train_linear_model(
+                df, split, columnas_entrada, columna_salida,
+                lambda: DesignMatrix(
+                    columnas_entrada, encodings, scaling, datetimes),
+                validation, context, gram, regularization)
+
+        runner = getattr(self.app, "task_runner", None)
+        if runner is None:
+            self._show_training(job())
+            return
 
-        # ===================================
-        # ENTRENAR EL MODELO
-        # ===================================
-        model = LinearRegression()
-        model.fit(X_train, y_train)
+        # Solo un entrenamiento a la vez en toda la aplicación
+        previous = getattr(self.app, "training_task", None)
+        if previous is not None:
+            previous.cancel()
+        self._cancel_search()
+
+        indicator = self._show_progress()
+        task = None
+
+        def finish():
+            self._hide_loading_indicator(indicator)
+            if getattr(self.app, "training_task", None) is task:
+                self.app.training_task = None
+            if self.training_task is task:
+                self.training_task = None
+
+        def on_done(result):
+            finish()
+            self._show_training(result)
+
+        def on_error(error):
+            finish()
+            if self.winfo_exists():
+                NotificationWindow(self.app, "Error", str(error), "error")
+
+        def on_cancel():
+            # Sustituido por otro entrenamiento: no lo ha pedido el usuario
+            replaced = getattr(self.app, "training_task", None) is not task
+            finish()
+            if not replaced and self.winfo_exists():
+                NotificationWindow(
+                    self.app,
+                    "Entrenamiento Cancelado",
+                    "Se canceló la creación del modelo.",
+                    "info"
+                )
+
+        task = runner.submit(
+            job,
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=lambda *args: self._on_progress(indicator, *args),
+            on_cancel=on_cancel
+        )
+        indicator.add_cancel_button(
+            lambda: self._cancel_task(task, indicator))
+        self.training_task = task
+        self.app.training_task = task
+
+    def _show_progress(self, text="Creando modelo...",
+                       status="Por favor espere mientras se entrena el "
+                              "modelo."):
+        """
+        Indicador de carga con barra de progreso de una tarea.
+
+        Sustituye al que hubiera (su tarea ya se ha cancelado o
+        terminado); el botón de cancelar lo añade quien lanza la tarea.
+        """
+        self._hide_loading_indicator(self.loading_indicator)
+        indicator = LoadingIndicator(self.app)
+        indicator.label.configure(text=text)
+        indicator.status_label.configure(text=status)
+        indicator.place(relx=0.5, rely=0.5, anchor="center")
+        self.loading_indicator = indicator
+        return indicator
+
+    def _on_progress(self, indicator, fraction, message=None):
+        if indicator is self.loading_indicator:
+            indicator.set_progress(fraction, message)
+
+    def _cancel_task(self, task, indicator):
+        """Pedir la cancelación de la tarea de un indicador"""
+        task.cancel()
+        if indicator is self.loading_indicator:
+            indicator.cancel_button.configure(state="disabled")
+            indicator.status_label.configure(text="Cancelando...")
+
+    def _hide_loading_indicator(self, indicator):
+        """Quitar el indicador de una tarea (si sigue en pantalla)"""
+        if indicator is None:
+            return
+        try:
+            indicator.stop()
+            indicator.destroy()
+        except Exception:
+            pass
+        if indicator is self.loading_indicator:
+            self.loading_indicator = None
+
+    # ============================================================
+    # BÚSQUEDA DE ENTRADAS
+    # ============================================================
+
+    def _create_regularization_section(self):
+        """Tipo de modelo, mezcla L1 y α elegido (si hay penalización)"""
+        section = self._create_results_section("Regularización")
+        controls = ctk.CTkFrame(section, fg_color="transparent")
+        controls.pack(fill="x", padx=15, pady=(0, 6))
+
+        current = next(label for label, penalty
+                       in self.PENALTY_LABELS.items()
+                       if penalty == self.penalty)
+        self.penalty_var = ctk.StringVar(value=current)
+        ctk.CTkOptionMenu(
+            controls,
+            values=list(self.PENALTY_LABELS),
+            variable=self.penalty_var,
+            width=170,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left", padx=(0, 8))
+
+        ctk.CTkLabel(
+            controls,
+            text="Mezcla L1:",
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 4))
+        self.l1_ratio_entry = ctk.CTkEntry(
+            controls,
+            width=55,
+            height=30,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER
+        )
+        self.l1_ratio_entry.insert(0, f"{self.l1_ratio:g}")
+        self.l1_ratio_entry.pack(side="left", padx=(0, 8))
+
+        ctk.CTkButton(
+            controls,
+            text="Reentrenar",
+            command=self._retrain_with_penalty,
+            font=AppConfig.BODY_FONT,
+            height=30,
+            width=100,
+            corner_radius=6,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="right")
+
+        path = getattr(self, "path", None)
+        if path is None:
+            return
+        summary = path.summary().iloc[path.best_index]
+        ctk.CTkLabel(
+            section,
+            text=(f"{path.regularization.describe()}: α = {path.alpha:.4g}\n"
+                  f"ECM validación: {summary['mse']:.4g} ± "
+                  f"{summary['desviación']:.3g}\n"
+                  f"Coeficientes no nulos: {int(summary['no_nulos'])} de "
+                  f"{len(path.feature_names)}"),
+            font=AppConfig.MONO_FONT,
+            text_color=AppTheme.PRIMARY_TEXT,
+            justify="left"
+        ).pack(padx=15, pady=(0, 12), anchor="w")
+
+    def _retrain_with_penalty(self):
+        """Volver a entrenar con el tipo de modelo elegido"""
+        penalty = self.PENALTY_LABELS[self.penalty_var.get()]
+        try:
+            l1_ratio = float(self.l1_ratio_entry.get())
+            if penalty == "elasticnet" and not 0 < l1_ratio <= 1:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "La mezcla L1 debe ser un número entre 0 (sin incluir) y 1.",
+                "warning"
+            )
+            return
+        self.penalty = penalty
+        self.l1_ratio = l1_ratio
+        self._train_model()
+
+    def _search_candidates(self):
+        """Entradas numéricas sin transformar que puede evaluar la búsqueda"""
+        gram = getattr(self.app, "gram_cache", None)
+        if gram is None:
+            return []
+        transformers = self.design.transformers
+        return [column for column in self.app.selection_panel.columnas_entrada
+                if column in gram.columns and column not in transformers]
+
+    def _create_search_section(self):
+        """Controles de la búsqueda de entradas (con 2 o más candidatas)"""
+        candidates = self._search_candidates()
+        if len(candidates) < 2:
+            return
+
+        section = self._create_results_section("Búsqueda de Entradas")
+        controls = ctk.CTkFrame(section, fg_color="transparent")
+        controls.pack(fill="x", padx=15, pady=(0, 6))
+
+        self.search_method_var = ctk.StringVar(
+            value=next(iter(self.SEARCH_LABELS)))
+        self.criterion_var = ctk.StringVar(
+            value=next(iter(self.CRITERION_LABELS)))
+        for variable, labels in ((self.search_method_var, self.SEARCH_LABELS),
+                                 (self.criterion_var, self.CRITERION_LABELS)):
+            ctk.CTkOptionMenu(
+                controls,
+                values=list(labels),
+                variable=variable,
+                width=150,
+                font=AppConfig.BODY_FONT,
+                fg_color=AppTheme.SECONDARY_BACKGROUND,
+                button_color=AppTheme.PRIMARY_ACCENT,
+                button_hover_color=AppTheme.HOVER_ACCENT
+            ).pack(side="left", padx=(0, 8))
+
+        ctk.CTkLabel(
+            controls,
+            text="Máx.:",
+            font=AppConfig.BODY_FONT
+        ).pack(side="left", padx=(0, 4))
+        self.search_size_entry = ctk.CTkEntry(
+            controls,
+            width=45,
+            height=30,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER
+        )
+        self.search_size_entry.insert(0, str(min(len(candidates), 4)))
+        self.search_size_entry.pack(side="left", padx=(0, 8))
+
+        ctk.CTkButton(
+            controls,
+            text="Buscar",
+            command=self._search_inputs,
+            font=AppConfig.BODY_FONT,
+            height=30,
+            width=80,
+            corner_radius=6,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="right")
+
+        self.search_results = ctk.CTkFrame(section, fg_color="transparent")
+        self.search_results.pack(fill="x", padx=15, pady=(0, 12))
+
+    def _search_inputs(self):
+        """Lanzar la búsqueda de entradas en segundo plano"""
+        try:
+            max_size = int(self.search_size_entry.get())
+            if max_size < 1:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "El máximo de entradas debe ser un entero mayor que 0.",
+                "warning"
+            )
+            return
+
+        method = self.SEARCH_LABELS[self.search_method_var.get()]
+        criterion = self.CRITERION_LABELS[self.criterion_var.get()]
+        gram, validation = self.app.gram_cache, None
+        if criterion == "val_mse":
+            # Ajuste y validación dentro del entrenamiento: el test sigue
+            # siendo una estimación independiente del modelo elegido
+            gram = getattr(self.app, "search_gram", None) or gram
+            validation = getattr(self.app, "validation_gram", None)
+        candidates = self._search_candidates()
+        output = self.app.selection_panel.columna_salida
+
+        def job(context=None):
+            search = FeatureSearch(gram, output, candidates, criterion,
+                                   validation)
+            return search.run(method, max_size, self.SEARCH_TOP, context)
+
+        indicator = task = None
+
+        def finish():
+            self._hide_loading_indicator(indicator)
+            if self.search_task is task:
+                self.search_task = None
+
+        def on_done(table):
+            finish()
+            self._show_search_results(table.head(self.SEARCH_TOP), criterion)
+
+        def on_error(error):
+            finish()
+            NotificationWindow(
+                self.app, "Búsqueda de entradas", str(error), "warning")
+
+        runner = getattr(self.app, "task_runner", None)
+        if runner is None:
+            try:
+                on_done(job())
+            except ValueError as error:
+                on_error(error)
+            return
+
+        # Una búsqueda nueva sustituye a la anterior y al entrenamiento
+        # de este panel que siga en marcha
+        self._cancel_search()
+        if self.training_task is not None:
+            if getattr(self.app, "training_task", None) is self.training_task:
+                self.app.training_task = None
+            self.training_task.cancel()
+            self.training_task = None
+
+        indicator = self._show_progress("Buscando entradas...",
+                                        "Evaluando conjuntos de entradas.")
+        task = runner.submit(
+            job,
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=lambda *args: self._on_progress(indicator, *args),
+            on_cancel=finish
+        )
+        indicator.add_cancel_button(
+            lambda: self._cancel_task(task, indicator))
+        self.search_task = task
+
+    def _cancel_search(self):
+        """Cancelar la búsqueda de entradas en curso, si la hay"""
+        if self.search_task is not None:
+            self.search_task.cancel()
+            self.search_task = None
+
+    def _show_search_results(self, table, criterion):
+        """Mejores conjuntos de entradas, cada uno con botón para usarlo"""
+        for widget in self.search_results.winfo_children():
+            widget.destroy()
+
+        column = CRITERION_COLUMNS[criterion]
+        for row in table.itertuples(index=False):
+            line = ctk.CTkFrame(self.search_results, fg_color="transparent")
+            line.pack(fill="x", pady=2)
+            value = getattr(row, column)
+            ctk.CTkLabel(
+                line,
+                text=(f"{', '.join(map(str, row.entradas))}  "
+                      f"({self.criterion_var.get()}: {value:.4g}, "
+                      f"R²: {row.r2:.4f})"),
+                font=AppConfig.MONO_FONT,
+                text_color=AppTheme.PRIMARY_TEXT,
+                anchor="w",
+                justify="left"
+            ).pack(side="left", fill="x", expand=True)
+            ctk.CTkButton(
+                line,
+                text="Usar",
+                command=lambda inputs=row.entradas: self._use_inputs(inputs),
+                font=AppConfig.BODY_FONT,
+                height=26,
+                width=60,
+                corner_radius=6,
+                fg_color=AppTheme.TERTIARY_BACKGROUND,
+                hover_color=AppTheme.HOVER_ACCENT
+            ).pack(side="right")
+
+    def _use_inputs(self, inputs):
+        """
+        Entrenar de nuevo con otras entradas (misma división y salida).
+
+        El reajuste sale de la matriz de Gram en caché, así que es
+        inmediato. La penalización elegida se mantiene.
+        """
+        panel = self.app.selection_panel
+        order = list(panel.columnas_entrada)
+        panel.columnas_entrada = sorted(inputs, key=order.index)
+        panel.encodings = {
+            column: method
+            for column, method in getattr(panel, "encodings", {}).items()
+            if column in inputs}
+        panel.datetimes = {
+            column: features
+            for column, features in getattr(panel, "datetimes", {}).items()
+            if column in inputs}
+        if hasattr(panel, "frame_entrada"):
+            panel.frame_entrada.set(panel.columnas_entrada)
+        self.app.model_settings = (self.penalty, self.l1_ratio)
+        # Este panel se sustituye por uno nuevo fuera de su callback
+        self.app.after(0, self.app.set_split_completed)
+
+    def _show_training(self, result):
+        """
+        Muestra el modelo entrenado (en el hilo principal).
+
+        - Muestra fórmula y resultados numéricos.
+        - Dibuja la recta si solo hay una variable de entrada.
+
+        Parameters
+        ----------
+        result : TrainingResult
+            Modelo, métricas y validación cruzada calculados.
+        """
+        # Un entrenamiento sustituido puede terminar con el panel cerrado
+        if not self.winfo_exists():
+            return
+
+        columnas_entrada = self.app.selection_panel.columnas_entrada
+        columna_salida = self.app.selection_panel.columna_salida
+        model = result.model
+        y_test = result.test[columna_salida]
 
         # Almacenar el modelo en el panel para guardarlo después
         self.model = model
-
-        # ===================================
-        # CALCULAR PREDICCIONES
-        # ===================================
-        y_pred_train = model.predict(X_train)
-        y_pred_test = model.predict(X_test)
+        self.design = result.design
+        # Los estadísticos para actualizar el modelo guardado se
+        # calculan al guardarlo (ver _recursive_config)
+        self.result = result
+        self.path = result.path
 
         # Almacenar para la gráfica de evaluación
         self.y_test = y_test
-        self.y_pred_test = y_pred_test
+        self.y_pred_test = result.y_pred_test
 
-        # ===================================
-        # CALCULAR MÉTRICAS
-        # ===================================
-        r2_train = r2_score(y_train, y_pred_train)
-        r2_test = r2_score(y_test, y_pred_test)
-        mse_train = mean_squared_error(y_train, y_pred_train)
-        mse_test = mean_squared_error(y_test, y_pred_test)
-
-        self.r2 = [r2_train, r2_test]
-        self.mse = [mse_train, mse_test]
+        self.r2 = result.r2
+        self.mse = result.mse
+        r2_train, r2_test = result.r2
+        mse_train, mse_test = result.mse
 
         # ===================================
         # CONSTRUIR FÓRMULA
         # ===================================
         coef_terms = []
-        for coef, col in zip(model.coef_, X_train.columns):
+        for coef, col in zip(model.coef_, self.design.feature_names):
             # Formatear cada término con su signo
             if coef >= 0:
                 coef_terms.append(f"{coef:.4f} * {col}")
@@ -634,27 +1206,43 @@ class LinearModelPanel(ctk.CTkFrame):
         # Construir fórmula completa
         intercept = model.intercept_
         if intercept >= 0:
-            formula = f"{self.app.selection_panel.columna_salida} = {' + '.join(coef_terms)} + {intercept:.4f}"
+            formula = f"{columna_salida} = {' + '.join(coef_terms)} + {intercept:.4f}"
         else:
-            formula = f"{self.app.selection_panel.columna_salida} = {' + '.join(coef_terms)} - {abs(intercept):.4f}"
+            formula = f"{columna_salida} = {' + '.join(coef_terms)} - {abs(intercept):.4f}"
 
         # ===================================
         # MOSTRAR RESULTADOS (fórmula y métricas)
         # ===================================
-        self._display_results(formula, r2_train, r2_test, mse_train, mse_test)
+        # Con validación cruzada se muestran las métricas por partición
+        # en lugar del único par de entrenamiento/test
+        self.cv_result = result.cv_result
+        if result.cv_error is not None:
+            NotificationWindow(
+                self.app, "Validación cruzada", str(result.cv_error),
+                "warning")
+        if self.cv_result is not None:
+            self._display_cv_results(formula, self.cv_result)
+        else:
+            self._display_results(
+                formula, r2_train, r2_test, mse_train, mse_test)
+        self._create_regularization_section()
+        self._create_search_section()
 
         # ===================================
-        # GRÁFICO (solo si hay 1 variable de entrada)
+        # GRÁFICO (ruta de regularización, o recta si hay 1 variable)
         # ===================================
-        if X_train.shape[1] == 1:
+        if self.path is not None:
+            self._plot_regularization_path(self.path)
+        elif (len(self.design.feature_names) == 1
+                and not self.design.transformers):
             self._plot_graph(
-                X_train,
-                y_train,
-                X_test,
+                result.train[columnas_entrada],
+                result.train[columna_salida],
+                result.test[columnas_entrada],
                 y_test,
-                y_pred_test,  # IMPORTANTE: Pasar las predicciones
+                result.y_pred_test,  # IMPORTANTE: Pasar las predicciones
                 model,
-                self.app.selection_panel.columna_salida
+                columna_salida
             )
         else:
             # Si hay múltiples variables, ocultar el frame del gráfico
@@ -674,7 +1262,7 @@ class LinearModelPanel(ctk.CTkFrame):
         self._create_description_panel(
             formula,
             r2_test,
-            self.app.selection_panel.columna_salida
+            columna_salida
         )
 
         self._create_prediction_panel(self.prediction_frame, formula)
@@ -684,8 +1272,8 @@ class LinearModelPanel(ctk.CTkFrame):
         # ===================================
         self._create_test_evaluation_graph(
             y_test,
-            y_pred_test,
-            self.app.selection_panel.columna_salida
+            result.y_pred_test,
+            columna_salida
         )
 
         # ===================================
@@ -835,7 +1423,8 @@ class LinearModelPanel(ctk.CTkFrame):
         )
         # Convertir a DataFrame con el mismo nombre de columna
         x_range_df = pd.DataFrame(x_range, columns=X_train.columns)
-        y_line = model.predict(x_range_df)
+        # Misma transformación (escalado) que en el entrenamiento
+        y_line = predict_batch(x_range_df, model, self.design)
 
         ax.plot(
             x_range,
@@ -878,6 +1467,107 @@ class LinearModelPanel(ctk.CTkFrame):
         # Cerrar la figura de matplotlib para liberar recursos
         plt.close(fig)
 
+    # ============================================================
+    # GRÁFICO: RUTA DE REGULARIZACIÓN
+    # ============================================================
+
+    def _plot_regularization_path(self, path):
+        """
+        Dibuja los coeficientes y el ECM de validación para cada α.
+
+        Los coeficientes se muestran estandarizados (multiplicados por la
+        desviación típica de su columna) para que sean comparables; la
+        línea vertical marca el α elegido.
+
+        Parameters
+        ----------
+        path : RegularizationPath
+            Ruta calculada en el entrenamiento.
+        """
+        for widget in self.graph_frame.winfo_children():
+            widget.destroy()
+        # Un entrenamiento anterior con varias entradas pudo ocultarlo
+        self.graph_frame.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
+
+        graph_container = ctk.CTkFrame(
+            self.graph_frame,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            corner_radius=8,
+            border_width=1,
+            border_color=AppTheme.BORDER
+        )
+        graph_container.pack(fill="both", expand=True)
+
+        ctk.CTkLabel(
+            graph_container,
+            text="Ruta de Regularización",
+            font=("Orbitron", 13, "bold"),
+            text_color=AppTheme.PRIMARY_TEXT,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            corner_radius=6
+        ).pack(pady=(12, 8), padx=15, anchor="w")
+
+        ctk.CTkFrame(graph_container, height=1, fg_color=AppTheme.BORDER).pack(
+            fill="x", padx=15, pady=(0, 12))
+
+        plot_frame = ctk.CTkFrame(
+            graph_container,
+            fg_color=AppTheme.PRIMARY_BACKGROUND,
+            corner_radius=6
+        )
+        plot_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+
+        fig, (ax_coef, ax_error) = plt.subplots(1, 2, figsize=(8, 3.8),
+                                                dpi=85)
+
+        # Coeficientes estandarizados frente a α
+        standardized = path.coefs * path.scale
+        for i, name in enumerate(path.feature_names):
+            ax_coef.plot(path.alphas, standardized[:, i], linewidth=1.5,
+                         label=name)
+        ax_coef.axhline(0, color="#858585", linewidth=0.8)
+        ax_coef.set_ylabel("Coeficiente (estandarizado)", fontsize=9,
+                           fontweight='bold')
+        if len(path.feature_names) <= 8:
+            ax_coef.legend(loc='best', fontsize=7, framealpha=0.9)
+
+        # ECM de validación: media ± desviación entre particiones
+        summary = path.summary()
+        ax_error.plot(path.alphas, summary["mse"], color="#dc5539",
+                      linewidth=2, label="ECM validación")
+        if summary["desviación"].notna().all():
+            ax_error.fill_between(
+                path.alphas,
+                summary["mse"] - summary["desviación"],
+                summary["mse"] + summary["desviación"],
+                color="#dc5539", alpha=0.2)
+        ax_error.set_ylabel("ECM de validación", fontsize=9,
+                            fontweight='bold')
+
+        for ax in (ax_coef, ax_error):
+            ax.set_xscale("log")
+            ax.axvline(path.alpha, color="#4da6ff", linestyle="--",
+                       linewidth=1.5)
+            ax.set_xlabel("α", fontsize=10, fontweight='bold')
+            ax.grid(True, alpha=0.25, linestyle='--')
+            # Penalización decreciente de izquierda a derecha
+            ax.invert_xaxis()
+
+        plt.tight_layout()
+
+        if self.current_canvas is not None:
+            try:
+                self.current_canvas.get_tk_widget().destroy()
+            except Exception:
+                pass
+
+        self.current_canvas = FigureCanvasTkAgg(fig, master=plot_frame)
+        self.current_canvas.draw()
+        canvas_widget = self.current_canvas.get_tk_widget()
+        canvas_widget.pack(fill="both", expand=True, padx=5, pady=5)
+        canvas_widget.configure(takefocus=0)
+        plt.close(fig)
+
     # ============================================================
     # GUARDAR MODELO
     # ============================================================
@@ -887,6 +1577,9 @@ class LinearModelPanel(ctk.CTkFrame):
         Guarda un modelo entrenado en un archivo .joblib.
 
         Abre un diálogo para que el usuario elija dónde guardar el archivo.
+        Los estadísticos para añadir filas nuevas y la escritura se hacen
+        en el TaskRunner, con progreso y cancelación como el
+        entrenamiento.
 
         Parameters
         ----------
@@ -898,7 +1591,7 @@ class LinearModelPanel(ctk.CTkFrame):
         Returns
         -------
         str or None
-            Ruta donde se guardó el modelo, o None si el usuario canceló.
+            Ruta donde se guarda el modelo, o None si el usuario canceló.
         """
         folder_path = filedialog.askdirectory(
             parent=master,
@@ -919,42 +1612,121 @@ class LinearModelPanel(ctk.CTkFrame):
         file_name = f"modelo_{timestamp}.joblib"
         file_path = Path(folder_path) / file_name
 
-        try:
-            desc = self.desc_box.get().strip()
-            if desc == "":
-
-                NotificationWindow(
-                    master,
-                    "Información",
-                    "La descripción del modelo está vacía",
-                    "info"
-                )
+        desc = self.desc_box.get().strip()
+        if desc == "":
 
-            data_to_save = {
-                "model": self.model,
-                "desc": desc,
-                "r2": self.r2,
-                "mse": self.mse,
-                "col_entrada": self.app.selection_panel.columnas_entrada,
-                "col_salida": self.app.selection_panel.columna_salida
-            }
+            NotificationWindow(
+                master,
+                "Información",
+                "La descripción del modelo está vacía",
+                "info"
+            )
 
+        data_to_save = {
+            "model": self.model,
+            "desc": desc,
+            "r2": self.r2,
+            "mse": self.mse,
+            "col_entrada": self.app.selection_panel.columnas_entrada,
+            "col_salida": self.app.selection_panel.columna_salida,
+            # Plan de preprocesado para repetirlo sobre datos nuevos
+            "preprocessing": self._preprocessing_config(),
+            # Codificación y escalado de las entradas (estadísticas
+            # del entrenamiento, se repiten al predecir)
+            "features": self.design.to_config(),
+            # Resumen de la validación cruzada (si se hizo)
+            "cross_validation": (self.cv_result.to_config()
+                                 if self.cv_result is not None else None),
+            # Estadísticos suficientes para actualizar el modelo con
+            # filas nuevas sin volver a entrenar (se calculan en job)
+            "recursive": None,
+            # Penalización y α elegido (si el modelo es regularizado)
+            "regularization": (self.path.to_config()
+                               if self.path is not None else None)
+        }
+        result = self.result if self._supports_update(master) else None
+        output = self.app.selection_panel.columna_salida
+
+        def job(context=None):
+            if result is not None:
+                if context is not None:
+                    context.report(0.0, "Calculando los estadísticos...")
+                data_to_save["recursive"] = _recursive_config(
+                    result, output, context)
+            if context is not None:
+                context.report(0.9, "Escribiendo el archivo...")
             joblib.dump(data_to_save, file_path, compress=compress)
+            return str(file_path)
+
+        indicator = None
+
+        def on_done(path):
+            self._hide_loading_indicator(indicator)
             NotificationWindow(
                 master,
                 "Éxito",
                 "Modelo guardado correctamente",
                 "success"
             )
-            return str(file_path)
-        except Exception as e:
+
+        def on_error(error):
+            self._hide_loading_indicator(indicator)
             NotificationWindow(
                 master,
                 "Error",
-                f"Error al guardar el modelo:\n{str(e)}",
+                f"Error al guardar el modelo:\n{str(error)}",
                 "error"
             )
-            return None
+
+        runner = getattr(self.app, "task_runner", None)
+        if runner is None:
+            try:
+                on_done(job())
+            except Exception as error:
+                on_error(error)
+                return None
+            return str(file_path)
+
+        indicator = self._show_progress(
+            "Guardando modelo...",
+            "Calculando los datos para añadir filas nuevas.")
+        task = runner.submit(
+            job,
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=lambda *args: self._on_progress(indicator, *args),
+            on_cancel=lambda: self._hide_loading_indicator(indicator)
+        )
+        indicator.add_cancel_button(
+            lambda: self._cancel_task(task, indicator))
+        return str(file_path)
+
+    def _preprocessing_config(self):
+        """Pasos de preprocesado aplicados a los datos de entrenamiento"""
+        pipeline = getattr(self.app.selection_panel, "pipeline", None)
+        return pipeline.to_config() if pipeline is not None else []
+
+    def _supports_update(self, master):
+        """
+        Indica si el modelo se guarda con el estado para añadir filas
+        nuevas. Ese estado es denso (p x p), así que se omite, avisando,
+        con demasiadas columnas de diseño.
+        """
+        result = getattr(self, "result", None)
+        if result is None or result.path is not None:
+            return False
+        n_features = len(self.design.feature_names)
+        if n_features > MAX_RECURSIVE_FEATURES:
+            NotificationWindow(
+                master,
+                "Información",
+                f"El modelo tiene {n_features} columnas de diseño (máximo "
+                f"{MAX_RECURSIVE_FEATURES}): se guarda sin la opción de "
+                "añadir filas nuevas.",
+                "info"
+            )
+            return False
+        return True
 
     def _create_save_button(self, master):
         """Crea el botón para guardar el modelo"""
@@ -970,3 +1742,14 @@ class LinearModelPanel(ctk.CTkFrame):
             text_color="#ffffff"
         )
         self.save_button.pack(pady=15)
+
+
+def _recursive_config(result, output, context=None):
+    """
+    Estado inicial de la actualización con filas nuevas (se ejecuta en
+    el TaskRunner al guardar).
+    """
+    statistics, test_statistics = result.sufficient_statistics(
+        output, context)
+    return RecursiveLeastSquares(
+        statistics, test_statistics=test_statistics).to_config()
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+import pandas as pd
 from .components import (AppTheme, AppConfig,
                          Panel,
                          UploadButton,
@@ -8,11 +9,22 @@ from .predict_model import predict_result
 
 class PredictionSection():
 
-    def __init__(self, app, master, col_entrada, formula):
+    def __init__(self, app, master, col_entrada, formula, model=None,
+                 design=None):
         self.app = app
         self.master = master
         self.col_entrada = col_entrada
         self.formula = formula
+        # Con modelo y matriz de diseño se predice con la misma
+        # transformación del entrenamiento (entradas categóricas)
+        self.model = model
+        self.design = design
+        self.categories = {
+            col: [str(category) for category in encoder.categories]
+            for col, encoder in (design.encoders.items() if design else [])
+        }
+        # Entradas de fecha: se escriben como texto y se convierten
+        self.dates = set(design.expanders) if design else set()
 
         self._create_predict_panel()
         self._create_empty_panel()
@@ -21,22 +33,32 @@ class PredictionSection():
         vals_list = []
         warning = False
         print("List of entries:", self.multiple_entries.entries)
-        for entry in self.multiple_entries.entries:
-            if self._is_entry_num(entry):
+        for col, entry in zip(self.col_entrada,
+                              self.multiple_entries.entries):
+            if col in self.categories and entry.get().strip():
+                vals_list.append(entry.get().strip())
+            elif col in self.dates and self._is_entry_date(entry):
+                vals_list.append(entry.get().strip())
+            elif (col not in self.categories and col not in self.dates
+                  and self._is_entry_num(entry)):
                 vals_list.append(entry.get())
             else:
                 warning = True
 
         if warning:
             NotificationWindow(self.app,
-                               "Valores no numéricos detectados",
-                               "Todas las entradas tienen que contener "
-                               "valores numéricos\n(Ej: 53.94)",
+                               "Valores no válidos detectados",
+                               "Las entradas numéricas tienen que contener "
+                               "valores numéricos\n(Ej: 53.94), las "
+                               "categóricas una categoría y las de "
+                               "fecha\nuna fecha (Ej: 2024-05-31 14:00).",
                                "warning")
         else:
             result_text = predict_result(self.col_entrada,
                                          vals_list,
-                                         self.formula)
+                                         self.formula,
+                                         self.model,
+                                         self.design)
             self.result_label.configure(text=result_text)
 
     def _is_entry_num(self, entry):
@@ -49,6 +71,16 @@ class PredictionSection():
         else:
             return True
 
+    def _is_entry_date(self, entry):
+        try:
+            valid = not pd.isna(
+                pd.to_datetime(entry.get().strip(), format="mixed"))
+        except (ValueError, TypeError):
+            valid = False
+        if not valid:
+            entry.delete(0, 'end')
+        return valid
+
     def _create_predict_panel(self):
         self.predict_section = ctk.CTkFrame(self.master)
         self.predict_section.pack(fill="x", expand=True)
@@ -77,7 +109,9 @@ class PredictionSection():
                              fg_color=AppTheme.TERTIARY_BACKGROUND)
         title.pack(fill="x", pady=(5, 10), padx=15, anchor="n")
         self.multiple_entries = MultipleEntriesFrame(self.entries_frame,
-                                                     self.col_entrada)
+                                                     self.col_entrada,
+                                                     self.categories,
+                                                     self.dates)
 
     def _create_result_section(self):
         self.result_frame = ctk.CTkFrame(self.predict_content)
@@ -168,9 +202,11 @@ class PredictionSection():
 
 
 class MultipleEntriesFrame():
-    def __init__(self, master, model):
+    def __init__(self, master, model, categories=None, dates=None):
         self.master = master
         self.model = model
+        self.categories = categories or {}
+        self.dates = dates or set()
         self.entries = []
 
         for col in model:
@@ -181,8 +217,19 @@ class MultipleEntriesFrame():
         entry_frame.pack(padx=10, pady=(0, 10), anchor="w")
         label = ctk.CTkLabel(entry_frame, width=200, text=col)
         label.pack(side="left", padx=10)
+        if col in self.categories:
+            # Columna categórica: elegir entre las categorías aprendidas
+            entry = ctk.CTkComboBox(entry_frame,
+                                    values=self.categories[col],
+                                    fg_color=AppTheme.SECONDARY_BACKGROUND,
+                                    border_color=AppTheme.BORDER)
+            entry.pack(side="left")
+            self.entries.append(entry)
+            return
+        placeholder = ("AAAA-MM-DD hh:mm" if col in self.dates
+                       else "Introduzca la entrada")
         entry = ctk.CTkEntry(entry_frame,
-                             placeholder_text="Introduzca la entrada",
+                             placeholder_text=placeholder,
                              fg_color=AppTheme.SECONDARY_BACKGROUND,
                              border_color=AppTheme.BORDER)
         entry.pack(side="left")
@@ -1,3 +1,6 @@
+import pandas as pd
+
+
 def _from_col_to_val(entry_cols, entry_vals):
     result_list = []
     for col in entry_cols:
@@ -8,7 +11,23 @@ def _from_col_to_val(entry_cols, entry_vals):
     return result_list
 
 
-def predict_result(entry_cols, entry_vals, formula):
+def predict_result(entry_cols, entry_vals, formula, model=None, design=None):
+    """
+    Calcular la predicción para los valores introducidos.
+
+    Con `model` y `design` (matriz de diseño guardada con el modelo) las
+    entradas se transforman igual que al entrenar, incluidas las
+    categóricas; sin ellos se evalúa la fórmula de texto.
+    """
+    if model is not None and design is not None:
+        salida = formula.split(" = ")[0]
+        row = pd.DataFrame({
+            col: [_parse_value(col, val, design)]
+            for col, val in zip(entry_cols, entry_vals)
+        })
+        result = predict_batch(row, model, design)[0]
+        return salida + " = " + str(result)
+
     print("Cols:", entry_cols, "Vals:", entry_vals)
     values = _from_col_to_val(entry_cols, entry_vals)
     salida, tmp = formula.split(" = ")
@@ -19,4 +38,28 @@ def predict_result(entry_cols, entry_vals, formula):
     return salida + " = " + str(result)
 
 
+def predict_batch(dataframe, model, design):
+    """
+    Predecir varias filas a la vez.
+
+    Se aplica la transformación guardada con el modelo (codificación y
+    escalado con las estadísticas del entrenamiento), sin recalcularla.
+    """
+    return model.predict(design.transform(dataframe))
+
+
+def _parse_value(col, val, design):
+    """Convertir el texto introducido al tipo de la columna"""
+    if col in design.expanders:
+        return pd.to_datetime(val, format="mixed")
+    encoder = design.encoders.get(col)
+    if encoder is None:
+        return float(val)
+    # Las categorías pueden no ser texto (p. ej. códigos numéricos)
+    for category in encoder.categories:
+        if str(category) == val:
+            return category
+    return val
+
+
 # print(predict_result(list("pepino"), list("676967"), "noseq = 1 * p + 2* e + 0 * p + 1 * i + 2* n + 3 * o"))
@@ -7,8 +7,14 @@ y preprocesar datos con valores faltantes.
 
 import customtkinter as ctk
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
-import threading
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+from data_analysis import CorrelationRanker
+from preprocessing import (
+    DropDuplicates, DropMissingRows, FillMissing, KNNFill, OutlierFilter,
+    PreprocessingHistory, PreprocessingPipeline, count_duplicates,
+    count_outliers,
+    DEFAULT_THRESHOLDS, STRATEGIES, STRATEGY_NAMES, NUMERIC_ONLY
+)
 from .components import (
     NotificationWindow, Panel, AppTheme,
     AppConfig, UploadButton, LoadingIndicator
@@ -16,24 +22,111 @@ from .components import (
 
 
 # ================================================================
-# FRAME DE CHECKBOXES SCROLLABLE
+# MODELO DE LISTA DE COLUMNAS (SIN WIDGETS)
 # ================================================================
 
-class ScrollableCheckboxFrame(ctk.CTkScrollableFrame):
+class ColumnListModel:
     """
-    Frame scrollable con checkboxes para selección múltiple de columnas.
+    Estado de una lista de columnas filtrable por nombre.
 
-    Parámetros
+    Guarda la selección en un set (no en una variable Tk por columna),
+    así que el coste no depende de cuántas columnas tenga el dataset.
+
+    Parameters
+    ----------
+    columns : iterable
+        Nombres de las columnas en su orden original.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.selected = set()
+        self._names = [str(col).lower() for col in self.columns]
+        self._filter_text = ""
+        # Orden de presentación (posiciones en self.columns)
+        self._order = list(range(len(self.columns)))
+        # Posiciones de las columnas que pasan el filtro, en ese orden
+        self.visible = list(self._order)
+
+    def filter(self, text):
+        """
+        Filtrar las columnas cuyo nombre contiene `text`.
+
+        El filtrado es incremental: si el texto nuevo amplía el anterior
+        (el usuario sigue escribiendo) solo se revisan las columnas que
+        ya estaban visibles.
+        """
+        text = text.strip().lower()
+        if text.startswith(self._filter_text):
+            candidates = self.visible
+        else:
+            candidates = self._order
+
+        self.visible = [i for i in candidates if text in self._names[i]]
+        self._filter_text = text
+
+    def reorder(self, first):
+        """
+        Mostrar primero las columnas de `first` (en ese orden).
+
+        El resto conserva el orden original. No afecta a get(), que
+        siempre devuelve la selección en el orden del DataFrame.
+        """
+        positions = {col: i for i, col in enumerate(self.columns)}
+        head = [positions[col] for col in first if col in positions]
+        in_head = set(head)
+        self._order = head + [
+            i for i in range(len(self.columns)) if i not in in_head]
+        self.visible = [
+            i for i in self._order if self._filter_text in self._names[i]]
+
+    def visible_columns(self, start, count):
+        """Columnas visibles en las posiciones [start, start + count)"""
+        return [self.columns[i] for i in self.visible[start:start + count]]
+
+    def toggle(self, column):
+        """Marcar o desmarcar una columna"""
+        if column in self.selected:
+            self.selected.discard(column)
+        else:
+            self.selected.add(column)
+
+    def get(self):
+        """Columnas seleccionadas en el orden del DataFrame"""
+        return [col for col in self.columns if col in self.selected]
+
+    def set(self, columns):
+        """Sustituir la selección (se ignoran columnas desconocidas)"""
+        known = set(self.columns)
+        self.selected = {col for col in columns if col in known}
+
+
+# ================================================================
+# LISTA VIRTUALIZADA DE COLUMNAS
+# ================================================================
+
+class VirtualColumnList(ctk.CTkFrame):
+    """
+    Lista de columnas con filtro que solo crea los widgets visibles.
+
+    En vez de un widget por columna se crea un número fijo de filas
+    (`visible_rows`) y al hacer scroll se les asignan otras columnas.
+    Por defecto cada fila es una etiqueta de solo lectura; las
+    subclases deciden qué widget es cada fila (checkbox, radio button).
+
+    Parameters
     ----------
     master : widget
         Widget padre
     title : str
-        Título del frame
+        Título del frame (puede ser "")
     dataframe : pd.DataFrame
         DataFrame del que extraer las columnas
+    visible_rows : int
+        Número de filas que se dibujan a la vez
     """
 
-    def __init__(self, master, title, dataframe):
+    def __init__(self, master, title, dataframe, visible_rows=8):
         super().__init__(
             master,
             fg_color=AppTheme.PRIMARY_BACKGROUND,
@@ -42,42 +135,186 @@ class ScrollableCheckboxFrame(ctk.CTkScrollableFrame):
             border_color=AppTheme.BORDER
         )
 
-        self.checkboxes = {}
         self.dataframe = dataframe
-        self.has_title = bool(title)
+        self.model = ColumnListModel(dataframe.columns)
+        self.visible_rows = visible_rows
+        self.offset = 0  # Primera columna visible (dentro del filtro)
 
         # Título (opcional)
         if title:
-            title_label = ctk.CTkLabel(
+            ctk.CTkLabel(
                 self,
                 text=title,
                 font=("Orbitron", 13, "bold"),
                 text_color=AppTheme.PRIMARY_TEXT
-            )
-            title_label.pack(pady=(15, 10), padx=15, anchor="w")
+            ).pack(pady=(15, 10), padx=15, anchor="w")
+
+        # Filtro incremental por nombre
+        self.filter_entry = ctk.CTkEntry(
+            self,
+            placeholder_text=f"Filtrar {len(self.model.columns)} columnas...",
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER,
+            height=30
+        )
+        self.filter_entry.pack(fill="x", padx=10, pady=(10, 5))
+        self.filter_entry.bind("<KeyRelease>", self._on_filter_changed)
+
+        # Filas + scrollbar
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=(10, 4), pady=(0, 8))
+        body.grid_columnconfigure(0, weight=1)
+
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, rowspan=visible_rows,
+                            sticky="ns")
+
+        self.rows = []
+        for i in range(visible_rows):
+            row = self._create_row(body, i)
+            row.grid(row=i, column=0, sticky="w", padx=10, pady=2)
+            self._bind_mouse_wheel(row)
+            self.rows.append(row)
+        self._bind_mouse_wheel(body)
+
+        self._refresh()
+
+    # ---------------- Redefinibles por las subclases ----------------
+    def _create_row(self, parent, index):
+        """Crear el widget de la fila `index` (una etiqueta)"""
+        return ctk.CTkLabel(
+            parent,
+            text="",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.PRIMARY_TEXT,
+            anchor="w"
+        )
 
-        # Crear checkboxes para cada columna
-        for i, column in enumerate(dataframe.columns):
-            # Si no hay título, agregar padding extra al primer checkbox
-            pady_top = 15 if (not self.has_title and i == 0) else 5
-            self._create_checkbox(column, pady_top)
+    def _bind_row(self, row, column):
+        """Mostrar `column` en el widget `row`"""
+        row.configure(text=self._row_label(column))
+
+    def _row_label(self, column):
+        """Texto de la fila de una columna"""
+        return str(column)
+
+    # ---------------- Dibujo y scroll ----------------
+    def _refresh(self):
+        """Asignar las columnas visibles a los widgets de fila"""
+        total = len(self.model.visible)
+        max_offset = max(total - self.visible_rows, 0)
+        self.offset = min(max(self.offset, 0), max_offset)
+
+        columns = self.model.visible_columns(self.offset, self.visible_rows)
+        self._row_columns = columns
+        for row, column in zip(self.rows, columns):
+            self._bind_row(row, column)
+            row.grid()
+        for row in self.rows[len(columns):]:
+            row.grid_remove()
+
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total,
+                               (self.offset + len(columns)) / total)
+
+    def _scroll_to(self, offset):
+        self.offset = int(offset)
+        self._refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Callback de la scrollbar ('moveto' o 'scroll')"""
+        if action == "moveto":
+            self._scroll_to(float(value) * len(self.model.visible))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_to(self.offset + int(value) * step)
+
+    def _bind_mouse_wheel(self, widget):
+        """Scroll con la rueda (Windows/Mac y Linux)"""
+        widget.bind("<MouseWheel>", self._on_mouse_wheel, add="+")
+        widget.bind("<Button-4>", self._on_mouse_wheel, add="+")
+        widget.bind("<Button-5>", self._on_mouse_wheel, add="+")
+
+    def _on_mouse_wheel(self, event):
+        if getattr(event, "num", None) in (4, 5):
+            direction = -1 if event.num == 4 else 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self._scroll_to(self.offset + direction)
+        return "break"
 
-    def _create_checkbox(self, column, pady_top=5):
-        """Crear un checkbox para una columna"""
-        var = ctk.BooleanVar(value=False)
+    def _on_filter_changed(self, event=None):
+        self.model.filter(self.filter_entry.get())
+        self._scroll_to(0)
 
-        checkbox = ctk.CTkCheckBox(
-            self,
-            text=column,
-            variable=var,
+
+# ================================================================
+# FRAME DE CHECKBOXES SCROLLABLE
+# ================================================================
+
+class ScrollableCheckboxFrame(VirtualColumnList):
+    """
+    Lista virtualizada con checkboxes para selección múltiple de columnas.
+
+    Parámetros
+    ----------
+    master : widget
+        Widget padre
+    title : str
+        Título del frame
+    dataframe : pd.DataFrame
+        DataFrame del que extraer las columnas
+    """
+
+    def __init__(self, master, title, dataframe, visible_rows=8):
+        self.annotations = {}
+        super().__init__(master, title, dataframe, visible_rows)
+
+    def _row_label(self, column):
+        note = self.annotations.get(column)
+        return f"{column}   {note}" if note else str(column)
+
+    def set_annotations(self, annotations, order=None):
+        """
+        Mostrar un texto junto a cada columna (p. ej. su correlación).
+
+        Parameters
+        ----------
+        annotations : dict
+            Columna -> texto a mostrar junto a su nombre.
+        order : list, opcional
+            Columnas que se listan primero, en ese orden.
+        """
+        self.annotations = annotations
+        if order is not None:
+            self.model.reorder(order)
+        self._scroll_to(0)
+
+    def _create_row(self, parent, index):
+        """Crear un checkbox reutilizable para la fila `index`"""
+        return ctk.CTkCheckBox(
+            parent,
+            text="",
+            command=lambda i=index: self._on_row_toggled(i),
             font=AppConfig.BODY_FONT,
             fg_color=AppTheme.PRIMARY_ACCENT,
             hover_color=AppTheme.HOVER_ACCENT,
             border_color=AppTheme.BORDER
         )
-        checkbox.pack(pady=(pady_top, 5), padx=20, anchor="w")
 
-        self.checkboxes[column] = var
+    def _bind_row(self, row, column):
+        row.configure(text=self._row_label(column))
+        if column in self.model.selected:
+            row.select()
+        else:
+            row.deselect()
+
+    def _on_row_toggled(self, index):
+        """Actualizar la selección al pulsar el checkbox de una fila"""
+        self.model.toggle(self._row_columns[index])
 
     def get(self):
         """
@@ -88,7 +325,7 @@ class ScrollableCheckboxFrame(ctk.CTkScrollableFrame):
         list
             Lista con nombres de columnas seleccionadas
         """
-        return [col for col, var in self.checkboxes.items() if var.get()]
+        return self.model.get()
 
     def set(self, columns):
         """
@@ -99,17 +336,17 @@ class ScrollableCheckboxFrame(ctk.CTkScrollableFrame):
         columns : list
             Lista de columnas a seleccionar
         """
-        for col, var in self.checkboxes.items():
-            var.set(col in columns)
+        self.model.set(columns)
+        self._refresh()
 
 
 # ================================================================
 # FRAME DE SELECCIÓN SIMPLE DE COLUMNA
 # ================================================================
 
-class ColumnFrame(ctk.CTkFrame):
+class ColumnFrame(VirtualColumnList):
     """
-    Frame con menú desplegable para seleccionar una columna.
+    Lista virtualizada con filtro para seleccionar una sola columna.
 
     Parámetros
     ----------
@@ -123,49 +360,45 @@ class ColumnFrame(ctk.CTkFrame):
         Función callback cuando se selecciona una columna
     """
 
-    def __init__(self, master, title, dataframe, command=None):
-        super().__init__(
-            master,
-            fg_color=AppTheme.PRIMARY_BACKGROUND,
-            corner_radius=6,
-            border_width=1,
+    def __init__(self, master, title, dataframe, command=None,
+                 visible_rows=4):
+        self.command = command
+        self.value = dataframe.columns[0] if len(dataframe.columns) else ""
+        super().__init__(master, title, dataframe, visible_rows)
+
+    def _create_row(self, parent, index):
+        """Crear un radio button reutilizable para la fila `index`"""
+        return ctk.CTkRadioButton(
+            parent,
+            text="",
+            command=lambda i=index: self._on_row_selected(i),
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT,
             border_color=AppTheme.BORDER
         )
 
-        # Título (opcional)
-        if title:
-            self.label = ctk.CTkLabel(
-                self,
-                text=title,
-                font=("Orbitron", 13, "bold"),
-                text_color=AppTheme.PRIMARY_TEXT
-            )
-            self.label.pack(padx=15, pady=(15, 10), anchor="w")
+    def _bind_row(self, row, column):
+        row.configure(text=self._row_label(column))
+        if column == self.value:
+            row.select()
+        else:
+            row.deselect()
 
-        # Menú desplegable
-        columnas = list(dataframe.columns)
-        self.option_menu = ctk.CTkOptionMenu(
-            self,
-            values=columnas,
-            command=command,
-            font=AppConfig.BODY_FONT,
-            fg_color=AppTheme.SECONDARY_BACKGROUND,
-            button_color=AppTheme.PRIMARY_ACCENT,
-            button_hover_color=AppTheme.HOVER_ACCENT,
-            dropdown_fg_color=AppTheme.SECONDARY_BACKGROUND,
-            dropdown_hover_color=AppTheme.TERTIARY_BACKGROUND
-        )
-        # Si no hay título, agregar padding arriba
-        pady_top = 0 if title else 15
-        self.option_menu.pack(padx=15, pady=(pady_top, 15), fill="x")
+    def _on_row_selected(self, index):
+        """Guardar la columna pulsada y avisar al callback"""
+        self.set(self._row_columns[index])
+        if self.command is not None:
+            self.command(self.value)
 
     def get(self):
         """Obtener la columna seleccionada"""
-        return self.option_menu.get()
+        return self.value
 
     def set(self, value):
         """Establecer la columna seleccionada"""
-        self.option_menu.set(value)
+        self.value = value
+        self._refresh()
 
 
 # ================================================================
@@ -188,6 +421,32 @@ class PreprocessingPanel:
         Panel padre con acceso al DataFrame
     """
 
+    # Estrategias del selector por columna (etiqueta -> estrategia)
+    STRATEGY_LABELS = {
+        "Media": "mean",
+        "Mediana": "median",
+        "Moda": "mode",
+        "Valor anterior": "ffill",
+        "Valor siguiente": "bfill",
+        "Interpolación": "interpolate",
+        "Constante": "constant"
+    }
+
+    # Vecinos por defecto en la imputación KNN
+    KNN_K = 5
+
+    # Métodos y acciones para valores atípicos (etiqueta -> valor)
+    OUTLIER_METHOD_LABELS = {
+        "Rango intercuartílico (IQR)": "iqr",
+        "Puntuación z": "zscore",
+        "Desviación mediana (MAD)": "mad"
+    }
+    OUTLIER_ACTION_LABELS = {
+        "Eliminar filas": "drop",
+        "Recortar a los límites": "clip"
+    }
+    OUTLIER_HINT = "Pulse 'Vista previa' para contar los valores atípicos."
+
     def __init__(self, master, selected_columns, app, master_panel):
         self.master = master
         self.selected_columns = selected_columns
@@ -195,6 +454,7 @@ class PreprocessingPanel:
         self.master_panel = master_panel
         self.elements = []
         self.nas_stats = None
+        self.column_strategy_vars = {}
 
     def _create_preprocessing_panel(self):
         """Crear el panel principal de preprocesamiento"""
@@ -209,11 +469,25 @@ class PreprocessingPanel:
         # Solo mostrar opciones y botones de preprocesamiento si hay NaN
         if nas_total > 0:
             self._create_options_section(preprocessing_panel)
+            self._create_outlier_section(preprocessing_panel)
+            self._create_duplicates_section(preprocessing_panel)
             self._create_action_buttons(preprocessing_panel)
         else:
             # Si no hay NaN, mostrar botón para continuar directamente
             self._continue_without_preprocessing()
 
+            # Los valores atípicos y los duplicados se pueden tratar
+            # igualmente
+            self._create_outlier_section(preprocessing_panel)
+            self._create_duplicates_section(preprocessing_panel)
+
+            # Aun así se pueden deshacer los pasos ya aplicados
+            if self._history().can_undo:
+                button_frame = ctk.CTkFrame(
+                    preprocessing_panel, fg_color="transparent")
+                button_frame.pack(fill="x", padx=15, pady=(0, 15))
+                self._create_history_buttons(button_frame)
+
         return preprocessing_panel
 
     def _create_na_stats_section(self, master):
@@ -228,9 +502,7 @@ class PreprocessingPanel:
         stats_frame.pack(fill="x", padx=15, pady=(10, 10))
 
         # Calcular estadísticas
-        self.nas_stats = self._count_nan_df(
-            self.master_panel.df[self.selected_columns]
-        )
+        self.nas_stats = self._count_nan_columns(self.selected_columns)
         nas_total = self._sum_nan(self.nas_stats)
         nas_columns = self._nan_columns(self.nas_stats)
 
@@ -262,9 +534,19 @@ class PreprocessingPanel:
             text_color=color,
             justify="left"
         )
-        self.stats_label.pack(pady=(0, 12), padx=15, anchor="w")
+        self.stats_label.pack(pady=(0, 4), padx=15, anchor="w")
         self.elements.append(self.stats_label)
 
+        # Filas repetidas en el dataset completo
+        self.duplicates_label = ctk.CTkLabel(
+            stats_frame,
+            text="",
+            font=AppConfig.BODY_FONT,
+            justify="left"
+        )
+        self.duplicates_label.pack(pady=(0, 12), padx=15, anchor="w")
+        self._update_duplicates_label()
+
     def _create_options_section(self, master):
         """Crear sección con opciones de preprocesamiento"""
         options_frame = ctk.CTkFrame(
@@ -293,7 +575,13 @@ class PreprocessingPanel:
             ("Eliminar filas", "drop"),
             ("Rellenar con Media", "mean"),
             ("Rellenar con Mediana", "median"),
-            ("Rellenar con Constante", "constant")
+            ("Rellenar con Moda", "mode"),
+            ("Rellenar con valor anterior", "ffill"),
+            ("Rellenar con valor siguiente", "bfill"),
+            ("Interpolación lineal", "interpolate"),
+            ("Vecinos más cercanos (KNN)", "knn"),
+            ("Rellenar con Constante", "constant"),
+            ("Estrategia por columna", "by_column")
         ]
 
         for text, value in optiones:
@@ -318,7 +606,196 @@ class PreprocessingPanel:
             border_color=AppTheme.BORDER,
             height=32
         )
-        self.constant_entry.pack(pady=(5, 15), padx=40, fill="x")
+        self.constant_entry.pack(pady=(5, 10), padx=40, fill="x")
+
+        # Campo de entrada para el número de vecinos (KNN)
+        self.knn_entry = ctk.CTkEntry(
+            options_frame,
+            placeholder_text=f"Vecinos KNN (por defecto {self.KNN_K})",
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER,
+            height=32
+        )
+        self.knn_entry.pack(pady=(0, 10), padx=40, fill="x")
+
+        self._create_column_strategies(options_frame)
+
+    def _create_column_strategies(self, master):
+        """Selector de estrategia para cada columna con valores faltantes"""
+        nan_columns = self._nan_columns(self.nas_stats or [])
+        self.column_strategy_vars = {}
+        if not nan_columns:
+            return
+
+        strategies_frame = ctk.CTkScrollableFrame(
+            master,
+            fg_color="transparent",
+            height=min(32 * len(nan_columns), 160),
+            label_text="Estrategia por columna",
+            label_font=AppConfig.BODY_FONT
+        )
+        strategies_frame.pack(pady=(0, 15), padx=40, fill="x")
+
+        labels = list(self.STRATEGY_LABELS)
+        for row, column in enumerate(nan_columns):
+            ctk.CTkLabel(
+                strategies_frame,
+                text=column,
+                font=AppConfig.BODY_FONT,
+                text_color=AppTheme.SECONDARY_TEXT,
+                anchor="w"
+            ).grid(row=row, column=0, sticky="w", padx=(0, 10), pady=2)
+
+            numeric = is_numeric_dtype(self.master_panel.df[column])
+            var = ctk.StringVar(value="Media" if numeric else "Moda")
+            ctk.CTkOptionMenu(
+                strategies_frame,
+                values=labels,
+                variable=var,
+                width=170,
+                font=AppConfig.BODY_FONT,
+                fg_color=AppTheme.SECONDARY_BACKGROUND,
+                button_color=AppTheme.PRIMARY_ACCENT,
+                button_hover_color=AppTheme.HOVER_ACCENT
+            ).grid(row=row, column=1, sticky="e", pady=2)
+            self.column_strategy_vars[column] = var
+
+    def _create_outlier_section(self, master):
+        """Crear sección para detectar y tratar valores atípicos"""
+        if not self._numeric_selected_columns():
+            return
+
+        outlier_frame = ctk.CTkFrame(
+            master,
+            fg_color=AppTheme.PRIMARY_BACKGROUND,
+            corner_radius=6,
+            border_width=1,
+            border_color=AppTheme.BORDER
+        )
+        outlier_frame.pack(fill="x", padx=15, pady=(0, 10))
+
+        title_label = ctk.CTkLabel(
+            outlier_frame,
+            text="Valores Atípicos",
+            font=("Orbitron", 13, "bold"),
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        title_label.pack(pady=(12, 8), padx=15, anchor="w")
+
+        # Método, umbral y acción en una fila
+        settings_frame = ctk.CTkFrame(outlier_frame, fg_color="transparent")
+        settings_frame.pack(fill="x", padx=20, pady=(0, 8))
+
+        self.outlier_method_var = ctk.StringVar(
+            value=next(iter(self.OUTLIER_METHOD_LABELS)))
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=list(self.OUTLIER_METHOD_LABELS),
+            variable=self.outlier_method_var,
+            width=210,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left", padx=(0, 8))
+
+        self.outlier_threshold_entry = ctk.CTkEntry(
+            settings_frame,
+            placeholder_text="Umbral (por defecto)",
+            width=150,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER,
+            height=32
+        )
+        self.outlier_threshold_entry.pack(side="left", padx=(0, 8))
+
+        self.outlier_action_var = ctk.StringVar(
+            value=next(iter(self.OUTLIER_ACTION_LABELS)))
+        ctk.CTkOptionMenu(
+            settings_frame,
+            values=list(self.OUTLIER_ACTION_LABELS),
+            variable=self.outlier_action_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left")
+
+        # Resultado de la vista previa
+        self.outlier_label = ctk.CTkLabel(
+            outlier_frame,
+            text=self.OUTLIER_HINT,
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT,
+            justify="left"
+        )
+        self.outlier_label.pack(pady=(0, 8), padx=15, anchor="w")
+
+        button_frame = ctk.CTkFrame(outlier_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=15, pady=(0, 12))
+
+        self.outlier_button = UploadButton(
+            button_frame,
+            text="Tratar atípicos",
+            command=lambda: self._apply_preprocessing("outliers")
+        )
+        self.outlier_button.pack(side="right", padx=(10, 0))
+
+        preview_button = ctk.CTkButton(
+            button_frame,
+            text="Vista previa",
+            command=self._preview_outliers,
+            font=("Orbitron", 11, "bold"),
+            height=AppConfig.BUTTON_HEIGHT,
+            corner_radius=6,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            hover_color=AppTheme.HOVER_ACCENT,
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        preview_button.pack(side="right")
+
+    def _create_duplicates_section(self, master):
+        """Crear sección para eliminar filas duplicadas"""
+        duplicates_frame = ctk.CTkFrame(
+            master,
+            fg_color=AppTheme.PRIMARY_BACKGROUND,
+            corner_radius=6,
+            border_width=1,
+            border_color=AppTheme.BORDER
+        )
+        duplicates_frame.pack(fill="x", padx=15, pady=(0, 10))
+
+        title_label = ctk.CTkLabel(
+            duplicates_frame,
+            text="Filas Duplicadas",
+            font=("Orbitron", 13, "bold"),
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        title_label.pack(pady=(12, 8), padx=15, anchor="w")
+
+        button_frame = ctk.CTkFrame(duplicates_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=15, pady=(0, 12))
+
+        # Por defecto una fila es duplicada si repite todas las columnas
+        self.duplicates_subset_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            button_frame,
+            text="Comparar solo las columnas seleccionadas",
+            variable=self.duplicates_subset_var,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left")
+
+        self.duplicates_button = UploadButton(
+            button_frame,
+            text="Eliminar duplicados",
+            command=lambda: self._apply_preprocessing("duplicates")
+        )
+        self.duplicates_button.pack(side="right", padx=(10, 0))
 
     def _create_action_buttons(self, master):
         """Crear botones de acción"""
@@ -333,6 +810,8 @@ class PreprocessingPanel:
         )
         self.apply_button.pack(side="right", padx=(10, 0))
 
+        self._create_history_buttons(button_frame)
+
         # Botón Resetear
         reset_button = ctk.CTkButton(
             button_frame,
@@ -347,6 +826,37 @@ class PreprocessingPanel:
         )
         reset_button.pack(side="right")
 
+    def _create_history_buttons(self, button_frame):
+        """Botones para deshacer/rehacer pasos ya aplicados"""
+        self.undo_button = ctk.CTkButton(
+            button_frame,
+            text="↶ Deshacer",
+            width=90,
+            command=self._undo_preprocessing,
+            font=("Orbitron", 11, "bold"),
+            height=AppConfig.BUTTON_HEIGHT,
+            corner_radius=6,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            hover_color=AppTheme.HOVER_ACCENT,
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        self.undo_button.pack(side="left", padx=(0, 6))
+
+        self.redo_button = ctk.CTkButton(
+            button_frame,
+            text="Rehacer ↷",
+            width=90,
+            command=self._redo_preprocessing,
+            font=("Orbitron", 11, "bold"),
+            height=AppConfig.BUTTON_HEIGHT,
+            corner_radius=6,
+            fg_color=AppTheme.TERTIARY_BACKGROUND,
+            hover_color=AppTheme.HOVER_ACCENT,
+            text_color=AppTheme.PRIMARY_TEXT
+        )
+        self.redo_button.pack(side="left", padx=(0, 6))
+        self._update_history_buttons()
+
     def _continue_without_preprocessing(self):
         """Continuar cuando no hay valores faltantes e ir directo a división"""
         # Registrar el dataframe como preprocesado (aunque no se modificó)
@@ -360,67 +870,133 @@ class PreprocessingPanel:
             "success"
         )
 
-    def _apply_preprocessing(self):
-        self.apply_button.configure(state="disabled")
-
-        # Crear indicador con texto personalizado
-        self.loading_indicator = LoadingIndicator(self.app)
-        self.loading_indicator.label.configure(text="Procesando datos...")
-        self.loading_indicator.status_label.configure(
-            text="Por favor espere mientras se aplican los cambios.")
-        self.loading_indicator.place(relx=0.5, rely=0.5, anchor="center")
-
-        # Forzar actualización de GUI antes de bloquear
-        self.app.update_idletasks()
+    def _apply_preprocessing(self, option=None):
+        """
+        Aplicar la opción seleccionada en el ejecutor de tareas.
 
-        # Ejecutar en un hilo secundario
-        thread = threading.Thread(
-            # Función a ejecutar en segundo plano
-            target=self._apply_preprocessing_thread,
-            args=(),
-            daemon=True
-        )
-        thread.start()
+        La validación y la preparación del paso se hacen en el hilo
+        principal; el trabajo pesado (ajuste e imputación) va al
+        TaskRunner con progreso y un botón para cancelarlo. Si se
+        cancela o falla, los datos no cambian.
 
-    def _apply_preprocessing_thread(self):
-        """Aplicar el preprocesamiento según
-          la opción seleccionada (en hilo)."""
-        option = self.option_var.get()
+        Parameters
+        ----------
+        option : str, opcional
+            Opción a aplicar (por defecto la marcada en el panel).
+        """
+        option = option or self.option_var.get()
 
-        # Validar selección
         # Validar selección
         if not option:
-            self.app.after(0, lambda: NotificationWindow(
+            NotificationWindow(
                 self.app,
                 "Error de Validación",
                 "Debe seleccionar una opción de preprocesamiento.",
                 "warning"
-            ))
-            self.app.after(0, self._hide_loading_indicator)
-            self.app.after(
-                0, lambda: self.apply_button.configure(state="normal"))
+            )
             return
 
         # Verificar valores faltantes
-        df_subset = self.master_panel.df[self.selected_columns]
-        if not df_subset.isnull().any().any():
-            self.app.after(0, lambda: NotificationWindow(
+        if (option not in ("outliers", "duplicates")
+                and not self._count_nan_columns(self.selected_columns)):
+            NotificationWindow(
                 self.app,
                 "Sin Valores Faltantes",
                 "Las columnas seleccionadas no contienen valores faltantes.",
                 "info"
-            ))
-            self.app.after(0, self._hide_loading_indicator)
-            self.app.after(
-                0, lambda: self.apply_button.configure(state="normal"))
+            )
+            return
+
+        if getattr(self.app, "task_runner", None) is None:
+            self._apply_preprocessing_logic(option)
             return
 
-        #  Ejecutar la lógica del preprocesado en el hilo principal
-        self.app.after(0, lambda: self._apply_preprocessing_logic(option))
+        self._cancel_profiling()
+        self._submit_job(self._build_job(option))
 
-        #  Al terminar, cerrar el indicador y reactivar botón
-        self.app.after(0, self._hide_loading_indicator)
-        self.app.after(0, lambda: self.apply_button.configure(state="normal"))
+    def _submit_job(self, job):
+        """Ejecutar un paso preparado en el TaskRunner de la aplicación"""
+        if job is None:
+            return
+        step, columns, message = job
+
+        self._set_running(True)
+        self._show_progress()
+
+        history = self._history()
+        self._pipeline().add(step)
+        df = self.master_panel.df
+
+        def on_done(result):
+            self._hide_loading_indicator()
+            self._set_running(False)
+            self.master_panel.df = result
+            self._finish_preprocessing(columns, message(step))
+
+        def on_error(error):
+            self._hide_loading_indicator()
+            self._set_running(False)
+            NotificationWindow(self.app, "Error", str(error), "warning")
+
+        def on_cancel():
+            # Si no llegó a empezar, el paso sigue pendiente
+            self._pipeline().discard_pending()
+            self._hide_loading_indicator()
+            self._set_running(False)
+            NotificationWindow(
+                self.app,
+                "Preprocesado Cancelado",
+                "Se canceló el preprocesado. Los datos no han cambiado.",
+                "info"
+            )
+
+        self.preprocessing_task = self.app.task_runner.submit(
+            lambda context: history.apply(df, context=context),
+            on_done=on_done,
+            on_error=on_error,
+            on_progress=self._on_progress,
+            on_cancel=on_cancel
+        )
+
+    def _show_progress(self):
+        """Indicador de carga con barra de progreso y botón de cancelar"""
+        self.loading_indicator = LoadingIndicator(self.app)
+        self.loading_indicator.label.configure(text="Procesando datos...")
+        self.loading_indicator.status_label.configure(
+            text="Por favor espere mientras se aplican los cambios.")
+        self.loading_indicator.add_cancel_button(self._cancel_task)
+        self.loading_indicator.place(relx=0.5, rely=0.5, anchor="center")
+
+    def _on_progress(self, fraction, message=None):
+        if getattr(self, "loading_indicator", None) is not None:
+            self.loading_indicator.set_progress(fraction, message)
+
+    def _cancel_task(self):
+        """Pedir la cancelación del preprocesado en curso"""
+        task = getattr(self, "preprocessing_task", None)
+        if task is None:
+            return
+        task.cancel()
+        if getattr(self, "loading_indicator", None) is not None:
+            self.loading_indicator.cancel_button.configure(state="disabled")
+            self.loading_indicator.status_label.configure(
+                text="Cancelando...")
+
+    def _set_running(self, running):
+        """Bloquear los botones mientras hay un preprocesado en curso"""
+        if not running:
+            self.preprocessing_task = None
+        state = "disabled" if running else "normal"
+        for button in ("apply_button", "outlier_button",
+                       "duplicates_button"):
+            if hasattr(self, button):
+                getattr(self, button).configure(state=state)
+        if running:
+            for button in ("undo_button", "redo_button"):
+                if hasattr(self, button):
+                    getattr(self, button).configure(state="disabled")
+        else:
+            self._update_history_buttons()
 
     def _hide_loading_indicator(self):
         if hasattr(self, "loading_indicator") and self.loading_indicator:
@@ -432,122 +1008,288 @@ class PreprocessingPanel:
             self.loading_indicator = None
 
     def _apply_preprocessing_logic(self, option):
-        """Aplica el preprocesamiento sin modificar la GUI directamente."""
+        """
+        Aplicar el preprocesamiento en el hilo principal, sin progreso.
+
+        Se usa cuando la aplicación no tiene ejecutor de tareas.
+        """
+        self._cancel_profiling()
+        job = self._build_job(option)
+        if job is None:
+            return
+
+        step, columns, message = job
+        try:
+            self._run_step(step)
+        except ValueError as error:
+            # P. ej. KNN sin filas completas que usar como referencia
+            NotificationWindow(self.app, "Error", str(error), "warning")
+            return
+        self._finish_preprocessing(columns, message(step))
+
+    def _cancel_profiling(self):
+        """El precálculo del perfil no debe leer los datos mientras cambian"""
+        cancel_profiling = getattr(self.app, "_cancel_profiling", None)
+        if cancel_profiling is not None:
+            cancel_profiling()
+
+    def _build_job(self, option):
+        """
+        Preparar el paso de una opción (validación en el hilo principal).
+
+        Returns
+        -------
+        tuple or None
+            (paso, columnas modificadas, mensaje(paso) -> str) o None si
+            la opción no es válida (ya se ha avisado al usuario).
+        """
         if option == "drop":
-            self._drop_na()
-        elif option == "mean":
-            self._fill_with_mean()
-        elif option == "median":
-            self._fill_with_median()
-        elif option == "constant":
-            self._fill_with_constant()
+            return self._drop_na()
+        if option == "constant":
+            return self._fill_with_constant()
+        if option == "by_column":
+            return self._fill_by_column()
+        if option == "knn":
+            return self._fill_with_knn()
+        if option in STRATEGIES:
+            return self._fill_with_strategy(option)
+        if option == "outliers":
+            return self._filter_outliers()
+        if option == "duplicates":
+            return self._drop_duplicates()
+        return None
 
     def _drop_na(self):
         """Eliminar filas con valores faltantes"""
-        rows_before = len(self.master_panel.df)
-        self.master_panel.df = self.master_panel.df.dropna(
-            subset=self.selected_columns
+        # Al eliminar filas cambian las estadísticas de todas las columnas
+        return (
+            DropMissingRows(self.selected_columns),
+            None,
+            lambda step: (
+                f"Se eliminaron {step.rows_removed} fila(s) con valores "
+                "faltantes.\n\nFilas restantes: "
+                f"{len(self.master_panel.df):,}"
+            )
         )
-        rows_after = len(self.master_panel.df)
-        rows_deleted = rows_before - rows_after
 
-        # Actualizar aplicación principal
-        self.app.current_dataframe = self.master_panel.df
-        self.app._display_data(self.master_panel.df)
-        self.app._update_statistics(self.master_panel.df)
+    def _fill_with_strategy(self, strategy):
+        """
+        Rellenar valores faltantes con una estrategia común.
 
-        NotificationWindow(
-            self.app,
-            "Preprocesado Completado",
-            f"Se eliminaron {rows_deleted} fila(s) con valores faltantes.\n\n"
-            f"Filas restantes: {rows_after:,}",
-            "success"
+        Media, mediana e interpolación solo se aplican a las columnas
+        numéricas; moda y relleno anterior/siguiente a todas.
+        """
+        name = STRATEGY_NAMES[strategy]
+        if strategy in NUMERIC_ONLY:
+            columns = self._numeric_selected_columns()
+            if not columns:
+                NotificationWindow(
+                    self.app,
+                    "Error",
+                    "No hay columnas numéricas en "
+                    f"la selección para calcular la {name}.",
+                    "warning"
+                )
+                return None
+        else:
+            columns = list(self.selected_columns)
+
+        return (
+            FillMissing(columns, strategy),
+            columns,
+            lambda step: ("Se rellenaron valores faltantes "
+                          f"con {name} en {len(columns)} columna(s).")
         )
 
-        # Actualizar estadísticas
-        self._update_stats()
-        self.app.set_preprocessed_df(self.master_panel.df)
+    def _fill_with_constant(self):
+        """Rellenar valores faltantes con una constante"""
+        constant = self._constant_value()
+        if constant is None:
+            return None
 
-    def _fill_with_mean(self):
-        """Rellenar valores faltantes con la media"""
-        df = self.master_panel.df
-        numeric_cols = df[self.selected_columns].select_dtypes(
-            include=['number']
-        ).columns.tolist()
+        # Rellenar solo columnas seleccionadas
+        return (
+            FillMissing(self.selected_columns, "constant", constant),
+            self.selected_columns,
+            lambda step: f"Se rellenaron valores faltantes con: '{constant}'"
+        )
+
+    def _fill_with_knn(self):
+        """
+        Rellenar con la media de los k vecinos más cercanos.
 
-        if not numeric_cols:
+        La distancia usa las columnas numéricas seleccionadas, por lo que
+        conviene seleccionar también las relacionadas con la que falta.
+        """
+        columns = self._numeric_selected_columns()
+        if not columns:
             NotificationWindow(
                 self.app,
                 "Error",
-                "No hay columnas numéricas en la"
-                " selección para calcular la media.",
+                "No hay columnas numéricas en la selección para KNN.",
                 "warning"
             )
-            return
+            return None
 
-        for col in numeric_cols:
-            if df[col].isnull().any():
-                mean_value = df[col].mean()
-                df[col] = df[col].fillna(mean_value)
-
-        # Actualizar aplicación principal
-        self.app.current_dataframe = df
-        self.app._display_data(df)
-        self.app._update_statistics(df)
+        text = self.knn_entry.get().strip() if hasattr(
+            self, "knn_entry") else ""
+        try:
+            k = int(text) if text else self.KNN_K
+            if k < 1:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "El número de vecinos debe ser un entero mayor que 0.",
+                "warning"
+            )
+            return None
 
-        NotificationWindow(
-            self.app,
-            "Preprocesado Completado",
-            "Se rellenaron valores faltantes"
-            f" con la media en {len(numeric_cols)} columna(s).",
-            "success"
+        return (
+            KNNFill(columns, k),
+            columns,
+            lambda step: (f"Se rellenaron valores faltantes con {k} vecinos "
+                          f"más cercanos en {len(columns)} columna(s).")
         )
 
-        # Actualizar estadísticas
-        self._update_stats()
-        self.app.set_preprocessed_df(self.master_panel.df)
-
-    def _fill_with_median(self):
-        """Rellenar valores faltantes con la mediana"""
-        df = self.master_panel.df
-        numeric_cols = df[self.selected_columns].select_dtypes(
-            include=['number']
-        ).columns.tolist()
-
-        if not numeric_cols:
+    def _fill_by_column(self):
+        """Rellenar cada columna con la estrategia elegida para ella"""
+        strategies = {
+            column: self.STRATEGY_LABELS[var.get()]
+            for column, var in self.column_strategy_vars.items()
+        }
+        if not strategies:
+            return None
+
+        invalid = [
+            column for column, strategy in strategies.items()
+            if strategy in NUMERIC_ONLY
+            and column not in self._numeric_selected_columns()
+        ]
+        if invalid:
             NotificationWindow(
                 self.app,
                 "Error",
-                "No hay columnas numéricas en "
-                "la selección para calcular la mediana.",
+                "Media, mediana e interpolación solo se aplican a columnas "
+                f"numéricas:\n\n{', '.join(invalid)}",
                 "warning"
             )
+            return None
+
+        constant = None
+        if "constant" in strategies.values():
+            constant = self._constant_value()
+            if constant is None:
+                return None
+
+        return (
+            FillMissing(list(strategies), strategies, constant),
+            list(strategies),
+            lambda step: ("Se rellenaron valores faltantes en "
+                          f"{len(strategies)} columna(s) con su estrategia.")
+        )
+
+    def _filter_outliers(self):
+        """Eliminar o recortar valores atípicos de las columnas numéricas"""
+        settings = self._outlier_settings()
+        if settings is None:
+            return None
+
+        columns, method, threshold = settings
+        action = self.OUTLIER_ACTION_LABELS[self.outlier_action_var.get()]
+        step = OutlierFilter(columns, method, threshold, action)
+
+        if action == "drop":
+            return (
+                step,
+                None,
+                lambda step: (
+                    f"Se eliminaron {step.rows_removed} fila(s) con "
+                    "valores atípicos.\n\nFilas restantes: "
+                    f"{len(self.master_panel.df):,}"
+                )
+            )
+        return (
+            step,
+            columns,
+            lambda step: (f"Se recortaron {step.clipped} valor(es) atípicos "
+                          f"en {len(columns)} columna(s).")
+        )
+
+    def _drop_duplicates(self):
+        """Eliminar las filas que repiten una fila anterior"""
+        subset = getattr(self, "duplicates_subset_var", None)
+        columns = (self.selected_columns
+                   if subset is not None and subset.get() else None)
+        if not self._count_duplicates(columns):
+            NotificationWindow(
+                self.app,
+                "Sin Duplicados",
+                "No hay filas duplicadas que eliminar.",
+                "info"
+            )
+            return None
+
+        return (
+            DropDuplicates(columns),
+            None,
+            lambda step: (
+                f"Se eliminaron {step.rows_removed} fila(s) duplicada(s)."
+                f"\n\nFilas restantes: {len(self.master_panel.df):,}"
+            )
+        )
+
+    def _preview_outliers(self):
+        """Contar los atípicos con la configuración actual sin aplicarla"""
+        settings = self._outlier_settings()
+        if settings is None:
             return
 
-        for col in numeric_cols:
-            if df[col].isnull().any():
-                median_value = df[col].median()
-                df[col] = df[col].fillna(median_value)
+        columns, method, threshold = settings
+        counts, rows = count_outliers(
+            self.master_panel.df, columns, method, threshold)
+        affected = counts[counts > 0]
 
-        # Actualizar aplicación principal
-        self.app.current_dataframe = df
-        self.app._display_data(df)
-        self.app._update_statistics(df)
+        if affected.empty:
+            text = "✓ No hay valores atípicos con esta configuración"
+            color = AppTheme.SUCCES
+        else:
+            detail = ", ".join(
+                f"{column} ({count:,})" for column, count in affected.items())
+            text = (f"Atípicos: {int(affected.sum()):,} en {rows:,} fila(s)"
+                    f"\nColumnas afectadas: {detail}")
+            color = AppTheme.WARNING
+        self.outlier_label.configure(text=text, text_color=color)
 
-        NotificationWindow(
-            self.app,
-            "Preprocesado Completado",
-            "Se rellenaron valores faltantes "
-            f"con la mediana en {len(numeric_cols)} columna(s).",
-            "success"
-        )
+    def _outlier_settings(self):
+        """
+        Leer columnas, método y umbral de la sección de atípicos.
 
-        # Actualizar estadísticas
-        self._update_stats()
-        self.app.set_preprocessed_df(self.master_panel.df)
+        Returns
+        -------
+        tuple or None
+            (columnas, método, umbral) o None si el umbral no es válido.
+        """
+        columns = self._numeric_selected_columns()
+        method = self.OUTLIER_METHOD_LABELS[self.outlier_method_var.get()]
+        text = self.outlier_threshold_entry.get().strip()
+        try:
+            threshold = float(text) if text else DEFAULT_THRESHOLDS[method]
+            if threshold <= 0:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "El umbral debe ser un número mayor que 0.",
+                "warning"
+            )
+            return None
+        return columns, method, threshold
 
-    def _fill_with_constant(self):
-        """Rellenar valores faltantes con una constante"""
+    def _constant_value(self):
+        """Leer la constante de relleno (número si es posible)"""
         constant = self.constant_entry.get().strip()
 
         if not constant:
@@ -557,20 +1299,110 @@ class PreprocessingPanel:
                 "Debe introducir un valor constante.",
                 "warning"
             )
-            return
-
-        df = self.master_panel.df
+            return None
 
         # Intentar convertir a número
         try:
-            constant = float(constant)
+            return float(constant)
         except ValueError:
-            pass  # Usar como string
+            return constant  # Usar como string
 
-        # Rellenar solo columnas seleccionadas
-        for col in self.selected_columns:
-            if df[col].isnull().any():
-                df[col] = df[col].fillna(constant)
+    def _numeric_selected_columns(self):
+        """Columnas seleccionadas de tipo numérico"""
+        return self.master_panel.df[self.selected_columns].select_dtypes(
+            include=['number']
+        ).columns.tolist()
+
+    def _pipeline(self):
+        """Pipeline de preprocesado asociado al DataFrame del panel"""
+        pipeline = getattr(self.master_panel, "pipeline", None)
+        if pipeline is None:
+            pipeline = PreprocessingPipeline()
+            self.master_panel.pipeline = pipeline
+        return pipeline
+
+    def _history(self):
+        """Historial de deshacer/rehacer del pipeline del panel"""
+        history = getattr(self.master_panel, "history", None)
+        if history is None:
+            history = PreprocessingHistory(self._pipeline())
+            self.master_panel.history = history
+        return history
+
+    def _run_step(self, step):
+        """
+        Registrar un paso y ejecutarlo en el momento.
+
+        El resultado es un DataFrame nuevo: las filas se filtran una vez
+        y solo se sustituyen las columnas que cambian. El cambio queda en
+        el historial para poder deshacerlo.
+        """
+        self._pipeline().add(step)
+        self.master_panel.df = self._history().apply(self.master_panel.df)
+
+    def _undo_preprocessing(self):
+        """Volver al estado anterior al último paso aplicado"""
+        history = self._history()
+        if not history.can_undo or self._is_running():
+            return
+        self.master_panel.df = history.undo(self.master_panel.df)
+        self._after_history_change("Se deshizo el último paso.")
+
+    def _redo_preprocessing(self):
+        """Volver a aplicar el último paso deshecho"""
+        history = self._history()
+        if not history.can_redo or self._is_running():
+            return
+        self.master_panel.df = history.redo(self.master_panel.df)
+        self._after_history_change("Se volvió a aplicar el paso.")
+
+    def _is_running(self):
+        return getattr(self, "preprocessing_task", None) is not None
+
+    def _after_history_change(self, message):
+        """Mostrar el estado recuperado al deshacer o rehacer"""
+        self._cancel_profiling()
+
+        df = self.master_panel.df
+        self._invalidate_caches()
+        self.app.current_dataframe = df
+        self.app._display_data(df)
+        self.app._update_statistics(df)
+        self._update_stats()
+        self._update_history_buttons()
+
+        # Con valores faltantes los datos aún no están listos para dividir
+        reset_panels = getattr(self.app, "reset_panels", None)
+        if self.nas_stats and reset_panels is not None:
+            reset_panels()
+        else:
+            self.app.set_preprocessed_df(df)
+
+        NotificationWindow(self.app, "Historial", message, "info")
+
+    def _update_history_buttons(self):
+        """Activar deshacer/rehacer según el historial"""
+        if not hasattr(self, "undo_button"):
+            return
+        history = self._history()
+        self.undo_button.configure(
+            state="normal" if history.can_undo else "disabled")
+        self.redo_button.configure(
+            state="normal" if history.can_redo else "disabled")
+
+    def _finish_preprocessing(self, columns, message):
+        """
+        Propagar el resultado del preprocesado al resto de la aplicación.
+
+        Parameters
+        ----------
+        columns : list or None
+            Columnas modificadas (None si cambian todas las filas).
+        message : str
+            Resumen que se muestra al usuario.
+        """
+        df = self.master_panel.df
+        self._invalidate_caches(columns)
 
         # Actualizar aplicación principal
         self.app.current_dataframe = df
@@ -580,13 +1412,33 @@ class PreprocessingPanel:
         NotificationWindow(
             self.app,
             "Preprocesado Completado",
-            f"Se rellenaron valores faltantes con: '{constant}'",
+            message,
             "success"
         )
 
         # Actualizar estadísticas
         self._update_stats()
-        self.app.set_preprocessed_df(self.master_panel.df)
+        self._update_history_buttons()
+        self.app.set_preprocessed_df(df)
+
+    def _invalidate_caches(self, columns=None):
+        """
+        Descartar los resultados en caché que el preprocesado deja obsoletos.
+
+        Parameters
+        ----------
+        columns : list, opcional
+            Columnas modificadas (None = todas, p. ej. al eliminar filas).
+        """
+        # NaN, tipos, estadísticas por columna y matrices del perfil
+        profile = getattr(self.app, "profile", None)
+        if profile is not None:
+            profile.invalidate(self.master_panel.df, columns)
+
+        # Las correlaciones dependen de todas las filas: se recalculan
+        ranker = getattr(self.master_panel, "ranker", None)
+        if ranker is not None:
+            ranker.invalidate(self.master_panel.df)
 
     def _cancel_preprocessing(self):
         """Cancelar el preprocesamiento"""
@@ -595,9 +1447,7 @@ class PreprocessingPanel:
 
     def _update_stats(self):
         """Actualizar las estadísticas mostradas"""
-        self.nas_stats = self._count_nan_df(
-            self.master_panel.df[self.selected_columns]
-        )
+        self.nas_stats = self._count_nan_columns(self.selected_columns)
         nas_total = self._sum_nan(self.nas_stats)
         nas_columns = self._nan_columns(self.nas_stats)
 
@@ -613,10 +1463,30 @@ class PreprocessingPanel:
             color = AppTheme.SUCCES
 
         self.stats_label.configure(text=info_text, text_color=color)
+        if hasattr(self, "duplicates_label"):
+            self._update_duplicates_label()
+
+        # La vista previa de atípicos ya no corresponde a los datos
+        if hasattr(self, "outlier_label"):
+            self.outlier_label.configure(
+                text=self.OUTLIER_HINT,
+                text_color=AppTheme.SECONDARY_TEXT)
+
+    def _update_duplicates_label(self):
+        """Mostrar cuántas filas completas están repetidas"""
+        duplicates = self._count_duplicates()
+        if duplicates:
+            self.duplicates_label.configure(
+                text=f"Filas duplicadas: {duplicates:,}",
+                text_color=AppTheme.WARNING)
+        else:
+            self.duplicates_label.configure(
+                text="✓ No hay filas duplicadas",
+                text_color=AppTheme.SUCCES)
 
-    def _detect_nan(self, df):
+    def _detect_nan(self, columns):
         """Detectar y notificar valores NaN"""
-        nas_columns = self._count_nan_df(df)
+        nas_columns = self._count_nan_columns(columns)
         nas_total = self._sum_nan(nas_columns)
 
         if nas_columns:
@@ -629,6 +1499,30 @@ class PreprocessingPanel:
             )
 
     # Métodos auxiliares
+    def _profile(self):
+        """Perfil de la app, solo si describe el DataFrame del panel"""
+        profile = getattr(self.app, "profile", None)
+        if profile is not None and profile.dataframe is self.master_panel.df:
+            return profile
+        return None
+
+    def _count_nan_columns(self, columns):
+        """Contar NaN por columna (del perfil precalculado si existe)"""
+        profile = self._profile()
+        if profile is None:
+            return self._count_nan_df(self.master_panel.df[columns])
+
+        counts = profile.nan_counts(columns)
+        return [[count, column]
+                for column, count in counts.items() if count > 0]
+
+    def _count_duplicates(self, columns=None):
+        """Filas repetidas (del perfil precalculado si existe)"""
+        profile = self._profile()
+        if profile is None:
+            return count_duplicates(self.master_panel.df, columns)
+        return profile.duplicate_count(columns)
+
     def _count_nan_df(self, df):
         """Contar valores NaN por columna"""
         nas_columns = []
@@ -667,12 +1561,44 @@ class SelectionPanel:
         Referencia a la aplicación principal
     """
 
+    # Memoria máxima del historial de deshacer del preprocesado (bytes)
+    HISTORY_MAX_BYTES = 256 * 1024 ** 2
+
+    # Codificación de las entradas categóricas (etiqueta -> método)
+    ENCODING_LABELS = {
+        "One-hot (dispersa)": "onehot",
+        "Ordinal": "ordinal",
+        "Media del objetivo": "target"
+    }
+
+    # Escalado de las entradas numéricas (etiqueta -> método)
+    SCALING_LABELS = {
+        "Sin escalado": None,
+        "Estandarización": "standard",
+        "Min-max [0, 1]": "minmax"
+    }
+
+    # Variables generadas a partir de las entradas de fecha
+    DATETIME_LABELS = {
+        "Todas": None,
+        "Tendencia (segundos)": ("epoch",),
+        "Calendario": ("year", "month", "dayofweek", "hour"),
+        "Tendencia y cíclicas": ("epoch", "cyclic")
+    }
+
     def __init__(self, master, df, app):
         self.master = master
         self.df = df
         self.app = app
         self.col_entrada = []
         self.processed_df = None
+        self.ranker = None  # Ranking por correlación (se crea al usarlo)
+        self.encodings = {}  # Entrada categórica -> codificación
+        self.datetimes = {}  # Entrada de fecha -> variables generadas
+        self.scaling = None  # Escalado de las entradas numéricas
+        self.pipeline = PreprocessingPipeline()  # Pasos aplicados a df
+        self.history = PreprocessingHistory(
+            self.pipeline, self.HISTORY_MAX_BYTES)  # Deshacer/rehacer
 
     def _crear_interfaz(self):
         """Crear la interfaz de selección de datos"""
@@ -682,7 +1608,7 @@ class SelectionPanel:
         main_container = ctk.CTkFrame(
             select_panel,
             fg_color="transparent",
-            height=350
+            height=420
         )
         main_container.pack(fill="x", padx=10, pady=10)
         main_container.pack_propagate(False)
@@ -716,7 +1642,10 @@ class SelectionPanel:
         )
         entrada_title.pack(fill="x", padx=8, pady=8)
 
-        # Frame scrollable de checkboxes (con aislamiento de scroll)
+        # Sugerencias por correlación con la salida (debajo de la lista)
+        self._create_ranking_bar(entrada_container)
+
+        # Lista virtualizada de checkboxes
         self.frame_entrada = ScrollableCheckboxFrame(
             entrada_container,
             "",  # Sin título porque ya lo tiene el contenedor
@@ -751,7 +1680,8 @@ class SelectionPanel:
         self.frame_salida = ColumnFrame(
             salida_container,
             "",  # Sin título porque ya lo tiene el contenedor
-            self.df
+            self.df,
+            command=lambda column: self._show_input_ranking()
         )
         self.frame_salida.pack(fill="x", padx=8, pady=(0, 8))
 
@@ -765,6 +1695,79 @@ class SelectionPanel:
         )
         button_container.pack(fill="both", expand=True, padx=6, pady=(0, 8))
 
+        # Codificación de las entradas no numéricas
+        encoding_frame = ctk.CTkFrame(button_container, fg_color="transparent")
+        encoding_frame.pack(fill="x", padx=8, pady=(4, 0))
+
+        ctk.CTkLabel(
+            encoding_frame,
+            text="Entradas categóricas:",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT
+        ).pack(side="left", padx=(0, 8))
+
+        self.encoding_var = ctk.StringVar(
+            value=next(iter(self.ENCODING_LABELS)))
+        ctk.CTkOptionMenu(
+            encoding_frame,
+            values=list(self.ENCODING_LABELS),
+            variable=self.encoding_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left")
+
+        # Escalado de las entradas numéricas (se ajusta con train)
+        scaling_frame = ctk.CTkFrame(button_container, fg_color="transparent")
+        scaling_frame.pack(fill="x", padx=8, pady=(4, 0))
+
+        ctk.CTkLabel(
+            scaling_frame,
+            text="Escalado de entradas:",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT
+        ).pack(side="left", padx=(0, 8))
+
+        self.scaling_var = ctk.StringVar(value=next(iter(self.SCALING_LABELS)))
+        ctk.CTkOptionMenu(
+            scaling_frame,
+            values=list(self.SCALING_LABELS),
+            variable=self.scaling_var,
+            width=180,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT
+        ).pack(side="left")
+
+        # Variables de las entradas de fecha (solo si hay fechas)
+        if any(is_datetime64_any_dtype(dtype) for dtype in self.df.dtypes):
+            datetime_frame = ctk.CTkFrame(
+                button_container, fg_color="transparent")
+            datetime_frame.pack(fill="x", padx=8, pady=(4, 0))
+
+            ctk.CTkLabel(
+                datetime_frame,
+                text="Entradas de fecha:",
+                font=AppConfig.BODY_FONT,
+                text_color=AppTheme.SECONDARY_TEXT
+            ).pack(side="left", padx=(0, 8))
+
+            self.datetime_var = ctk.StringVar(
+                value=next(iter(self.DATETIME_LABELS)))
+            ctk.CTkOptionMenu(
+                datetime_frame,
+                values=list(self.DATETIME_LABELS),
+                variable=self.datetime_var,
+                width=180,
+                font=AppConfig.BODY_FONT,
+                fg_color=AppTheme.SECONDARY_BACKGROUND,
+                button_color=AppTheme.PRIMARY_ACCENT,
+                button_hover_color=AppTheme.HOVER_ACCENT
+            ).pack(side="left")
+
         self.button = UploadButton(
             button_container,
             text="Confirmar",
@@ -772,8 +1775,141 @@ class SelectionPanel:
         )
         self.button.place(relx=0.5, rely=0.6, anchor="center")
 
+        # Ranking inicial para la salida seleccionada por defecto
+        self._show_input_ranking()
+
         return select_panel
 
+    # ================================================================
+    # SUGERENCIAS DE ENTRADAS POR CORRELACIÓN
+    # ================================================================
+
+    def _create_ranking_bar(self, master):
+        """Crear la barra con el método de correlación y 'top k'"""
+        ranking_bar = ctk.CTkFrame(master, fg_color="transparent")
+        ranking_bar.pack(side="bottom", fill="x", padx=8, pady=(0, 8))
+
+        self.ranking_method = ctk.CTkOptionMenu(
+            ranking_bar,
+            values=["Pearson", "Spearman"],
+            command=lambda value: self._show_input_ranking(),
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            button_color=AppTheme.PRIMARY_ACCENT,
+            button_hover_color=AppTheme.HOVER_ACCENT,
+            dropdown_fg_color=AppTheme.SECONDARY_BACKGROUND,
+            dropdown_hover_color=AppTheme.TERTIARY_BACKGROUND,
+            width=120
+        )
+        self.ranking_method.pack(side="left")
+
+        self.top_k_button = ctk.CTkButton(
+            ranking_bar,
+            text="Seleccionar top k",
+            command=self._select_top_k,
+            font=AppConfig.BODY_FONT,
+            height=30,
+            corner_radius=6,
+            fg_color=AppTheme.PRIMARY_ACCENT,
+            hover_color=AppTheme.HOVER_ACCENT
+        )
+        self.top_k_button.pack(side="right")
+
+        self.top_k_entry = ctk.CTkEntry(
+            ranking_bar,
+            width=50,
+            height=30,
+            font=AppConfig.BODY_FONT,
+            fg_color=AppTheme.SECONDARY_BACKGROUND,
+            border_color=AppTheme.BORDER
+        )
+        self.top_k_entry.insert(0, "3")
+        self.top_k_entry.pack(side="right", padx=(0, 8))
+
+        ctk.CTkLabel(
+            ranking_bar,
+            text="k:",
+            font=AppConfig.BODY_FONT,
+            text_color=AppTheme.SECONDARY_TEXT
+        ).pack(side="right", padx=(0, 4))
+
+    def _current_ranking(self):
+        """
+        Ranking de entradas para la salida seleccionada.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            None si la salida no es numérica (no se puede correlacionar).
+        """
+        output = self.frame_salida.get()
+        if output not in self.df.columns or not self._is_numeric(output):
+            return None
+
+        if self.ranker is None:
+            # El perfil comparte la matriz de correlaciones precalculada
+            profile = self._profile()
+            self.ranker = (profile.ranker if profile is not None
+                           else CorrelationRanker(self.df))
+        method = self.ranking_method.get().lower()
+        return self.ranker.rank(output, method)
+
+    def _show_input_ranking(self):
+        """Anotar cada checkbox con su correlación con la salida"""
+        ranking = self._current_ranking()
+        if ranking is None:
+            self.frame_entrada.set_annotations({})
+            return
+
+        annotations = {
+            row.Index: f"|r|={row.abs_corr:.2f}  NA {row.missing:.0%}"
+            for row in ranking.itertuples()
+        }
+        self.frame_entrada.set_annotations(
+            annotations, order=list(ranking.index))
+
+    def _select_top_k(self):
+        """Seleccionar las k entradas mejor correlacionadas con la salida"""
+        try:
+            k = int(self.top_k_entry.get())
+            if k < 1:
+                raise ValueError
+        except ValueError:
+            NotificationWindow(
+                self.app,
+                "Valor incorrecto",
+                "k debe ser un número entero mayor que 0.",
+                "warning"
+            )
+            return
+
+        ranking = self._current_ranking()
+        if ranking is None:
+            NotificationWindow(
+                self.app,
+                "Salida no numérica",
+                "Seleccione una columna de salida numérica para "
+                "sugerir entradas.",
+                "warning"
+            )
+            return
+
+        self.frame_entrada.set(list(ranking.index[:k]))
+
+    def _profile(self):
+        """Perfil de la app, solo si describe el DataFrame del panel"""
+        profile = getattr(self.app, "profile", None)
+        if profile is not None and profile.dataframe is self.df:
+            return profile
+        return None
+
+    def _is_numeric(self, column):
+        """Comprobar el tipo de una columna (del perfil si existe)"""
+        profile = self._profile()
+        if profile is not None:
+            return profile.is_numeric(column)
+        return is_numeric_dtype(self.df[column])
+
     def button_callback(self):
         """Callback del botón de procesar datos"""
         columnas_entrada = self.frame_entrada.get()
@@ -790,23 +1926,34 @@ class SelectionPanel:
         self.columnas_entrada = columnas_entrada
         self.columna_salida = self.frame_salida.get()
 
-        # Validar que todas las columnas sean numéricas
-        columnas_invalidas = [
-            col for col in self.columnas_entrada + [self.columna_salida]
-            if not is_numeric_dtype(self.df[col])
-        ]
-
-        if columnas_invalidas:
+        # La salida tiene que ser numérica; las entradas categóricas se
+        # codifican y las de fecha se expanden al entrenar
+        if not self._is_numeric(self.columna_salida):
             NotificationWindow(
                 self.app,
                 "Error de Tipo de Datos",
-                f"Las siguientes columnas contienen valores no numéricos:\n\n"
-                f"{', '.join(columnas_invalidas)}\n\n"
-                "Solo se permiten columnas numéricas.",
+                "La columna de salida contiene valores no numéricos:\n\n"
+                f"{self.columna_salida}\n\n"
+                "Solo se permite una columna numérica como salida.",
                 "error"
             )
             return
 
+        method = self.ENCODING_LABELS[self.encoding_var.get()] if hasattr(
+            self, "encoding_var") else "onehot"
+        features = self.DATETIME_LABELS[self.datetime_var.get()] if hasattr(
+            self, "datetime_var") else None
+        self.datetimes = {
+            col: features for col in self.columnas_entrada
+            if is_datetime64_any_dtype(self.df[col])
+        }
+        self.encodings = {
+            col: method for col in self.columnas_entrada
+            if not self._is_numeric(col) and col not in self.datetimes
+        }
+        self.scaling = self.SCALING_LABELS[self.scaling_var.get()] if hasattr(
+            self, "scaling_var") else None
+
         # Reiniciar paneles previos si existen
         if hasattr(self.app, "reset_panels"):
             self.app.reset_panels()
@@ -872,7 +2019,7 @@ class SelectionPanel:
         )
 
         # Detectar NaN y crear panel
-        self.pre_panel._detect_nan(self.df[columnas_procesar])
+        self.pre_panel._detect_nan(columnas_procesar)
         self.pre_options = self.pre_panel._create_preprocessing_panel()
         self.pre_options.pack(fill="both", expand=True)
 
@@ -0,0 +1,297 @@
+"""
+Tareas en segundo plano que se pueden cancelar.
+
+Tkinter no es seguro entre hilos: el trabajo se hace en un hilo aparte
+y el resultado se entrega en el hilo principal con `after`.
+
+- BackgroundTask: un hilo suelto (p. ej. el precálculo del perfil).
+- TaskRunner: ejecutor compartido para trabajos largos con progreso,
+  cancelación y reparto del trabajo en bloques paralelos.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+# Niceness aplicada a los hilos de baja prioridad (solo Linux)
+LOW_PRIORITY_NICE = 10
+
+# Intervalo mínimo entre dos avisos de progreso a la interfaz (segundos)
+PROGRESS_INTERVAL = 0.1
+
+
+class BackgroundTask:
+    """
+    Ejecutar una función en un hilo aparte con posibilidad de cancelarla.
+
+    La función recibe un threading.Event que debe consultar de vez en
+    cuando; al cancelarse puede salir lanzando CancelledError.
+
+    Parameters
+    ----------
+    app : ctk.CTk
+        Ventana principal (se usa para volver al hilo de la interfaz).
+    target : callable
+        Función a ejecutar: target(cancel_event) -> resultado.
+    on_done : callable, opcional
+        Se llama en el hilo principal con el resultado.
+    on_error : callable, opcional
+        Se llama en el hilo principal con la excepción producida.
+    low_priority : bool
+        Bajar la prioridad del hilo para no competir con la interfaz.
+    """
+
+    def __init__(self, app, target, on_done=None, on_error=None,
+                 low_priority=False):
+        self.app = app
+        self.target = target
+        self.on_done = on_done
+        self.on_error = on_error
+        self.low_priority = low_priority
+        self.cancel_event = threading.Event()
+        self._thread = None
+
+    @property
+    def cancelled(self):
+        """Indica si se ha pedido cancelar la tarea"""
+        return self.cancel_event.is_set()
+
+    def start(self, delay_ms=0):
+        """
+        Lanzar la tarea cuando la interfaz quede libre.
+
+        Parameters
+        ----------
+        delay_ms : int
+            Espera adicional antes de empezar (deja que la interfaz
+            termine de dibujarse tras una carga).
+        """
+        self.app.after(delay_ms, lambda: self.app.after_idle(self._launch))
+
+    def cancel(self):
+        """Pedir la cancelación (se detiene en su próxima comprobación)"""
+        self.cancel_event.set()
+
+    def is_running(self):
+        """Indica si el hilo de la tarea sigue activo"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _launch(self):
+        if self.cancelled:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        if self.low_priority:
+            _lower_thread_priority()
+
+        try:
+            result = self.target(self.cancel_event)
+        except CancelledError:
+            return
+        except Exception as error:
+            if self.on_error is not None and not self.cancelled:
+                self._deliver(self.on_error, error)
+            return
+
+        if self.on_done is not None and not self.cancelled:
+            self._deliver(self.on_done, result)
+
+    def _deliver(self, callback, value):
+        """Llamar al callback en el hilo principal (si la app sigue viva)"""
+        try:
+            self.app.after(0, lambda: None if self.cancelled
+                           else callback(value))
+        except RuntimeError:
+            # La ventana ya se ha cerrado
+            pass
+
+
+def _lower_thread_priority():
+    """Bajar la prioridad del hilo actual si el sistema lo permite"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(),
+                       LOW_PRIORITY_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+class TaskContext:
+    """
+    Lo que ve una tarea del TaskRunner mientras se ejecuta.
+
+    Permite comprobar la cancelación, informar del progreso y repartir
+    trabajo en bloques paralelos. Es el "contexto" que aceptan
+    PreprocessingPipeline y PreprocessingHistory.
+    """
+
+    def __init__(self, runner, handle, on_progress=None):
+        self._runner = runner
+        self._handle = handle
+        self._on_progress = on_progress
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self):
+        return self._handle.cancelled
+
+    def check(self):
+        """Lanzar CancelledError si se ha pedido cancelar"""
+        if self._handle.cancelled:
+            raise CancelledError()
+
+    def report(self, fraction, message=None):
+        """
+        Informar del progreso (0 a 1) en el hilo principal.
+
+        Los avisos se limitan a uno cada PROGRESS_INTERVAL segundos para
+        no saturar la cola de eventos de Tk.
+        """
+        self.check()
+        if self._on_progress is None:
+            return
+        now = time.monotonic()
+        if fraction < 1 and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        self._runner._deliver(
+            self._on_progress, (fraction, message), handle=self._handle)
+
+    def map(self, function, items):
+        """
+        Aplicar `function` a cada elemento en paralelo (en orden).
+
+        NumPy y pandas liberan el GIL en las operaciones pesadas, así que
+        los bloques de columnas se procesan realmente a la vez.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            self.check()
+            return [function(item) for item in items]
+
+        futures = [self._runner._chunks.submit(function, item)
+                   for item in items]
+        results = []
+        try:
+            for done, future in enumerate(futures, start=1):
+                results.append(future.result())
+                self.report(done / len(futures))
+        finally:
+            for future in futures:
+                future.cancel()
+        return results
+
+
+class TaskHandle:
+    """Referencia a una tarea enviada al TaskRunner"""
+
+    def __init__(self):
+        self._cancel = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Pedir la cancelación (la tarea para en su próxima comprobación)"""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class TaskRunner:
+    """
+    Ejecutor compartido de tareas largas de la aplicación.
+
+    La función de la tarea se ejecuta en un hilo del ejecutor y recibe un
+    TaskContext. Los callbacks (resultado, error, progreso, cancelación)
+    se llaman siempre en el hilo principal y, de los tres finales
+    (on_done, on_error, on_cancel), siempre exactamente uno. Una tarea
+    que ya ha terminado entrega su resultado aunque se pida cancelarla
+    tarde, porque sus efectos ya se han producido.
+
+    Parameters
+    ----------
+    app : ctk.CTk
+        Ventana principal.
+    max_workers : int, opcional
+        Hilos para los bloques paralelos (por defecto, núcleos).
+    """
+
+    def __init__(self, app, max_workers=None):
+        self.app = app
+        workers = max_workers or os.cpu_count() or 1
+        self._tasks = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lunex-task")
+        # Ejecutor aparte para los bloques: una tarea que espera a sus
+        # bloques no puede bloquear los hilos que los ejecutan
+        self._chunks = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="lunex-chunk")
+
+    def submit(self, target, on_done=None, on_error=None, on_progress=None,
+               on_cancel=None):
+        """
+        Enviar una tarea.
+
+        Parameters
+        ----------
+        target : callable
+            target(context) -> resultado.
+        on_done, on_error, on_progress, on_cancel : callable, opcional
+            on_done(resultado), on_error(excepción),
+            on_progress(fracción, mensaje) y on_cancel().
+
+        Returns
+        -------
+        TaskHandle
+        """
+        handle = TaskHandle()
+        context = TaskContext(self, handle, on_progress)
+
+        def run():
+            try:
+                result = target(context)
+            except CancelledError:
+                self._deliver(on_cancel, ())
+                return
+            except Exception as error:
+                self._deliver(on_error, (error,))
+                return
+            self._deliver(on_done, (result,))
+
+        handle.future = self._tasks.submit(run)
+        # Cancelada antes de empezar: run() no llega a ejecutarse
+        handle.future.add_done_callback(
+            lambda future: future.cancelled() and self._deliver(
+                on_cancel, ()))
+        return handle
+
+    def shutdown(self):
+        """Cancelar lo pendiente y liberar los hilos"""
+        self._tasks.shutdown(wait=False, cancel_futures=True)
+        self._chunks.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, callback, args, handle=None):
+        """
+        Llamar al callback en el hilo principal.
+
+        Si se indica `handle`, la llamada se omite cuando la tarea se ha
+        cancelado mientras tanto (avisos de progreso).
+        """
+        if callback is None:
+            return
+
+        def call():
+            if handle is None or not handle.cancelled:
+                callback(*args)
+        try:
+            self.app.after(0, call)
+        except RuntimeError:
+            # La ventana ya se ha cerrado
+            pass
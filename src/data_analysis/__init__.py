@@ -0,0 +1,28 @@
+"""
+Paquete data_analysis
+---------------------
+Módulo encargado del análisis de los datos ya cargados en la aplicación.
+
+Módulos:
+- search.py: índice de búsqueda por columna (valor exacto y texto).
+- column_stats.py: estadísticas por columna calculadas bajo demanda.
+- correlation.py: correlaciones con NaN y ranking de columnas de entrada.
+- profile.py: perfil del dataset (NaN, tipos, correlaciones, Gram)
+  precalculado en segundo plano.
+
+Clases principales expuestas:
+- DatasetSearchIndex(dataframe)
+- ColumnStatsCache(dataframe)
+- CorrelationRanker(dataframe)
+- DatasetProfile(dataframe)
+"""
+
+from .search import DatasetSearchIndex
+from .column_stats import ColumnStatsCache, histogram_sparkline
+from .correlation import CorrelationRanker, pairwise_correlation
+from .profile import DatasetProfile
+
+__all__ = [
+    "DatasetSearchIndex", "ColumnStatsCache", "histogram_sparkline",
+    "CorrelationRanker", "pairwise_correlation", "DatasetProfile"
+]
@@ -0,0 +1,171 @@
+"""
+Estadísticas por columna calculadas bajo demanda.
+
+Con cientos de columnas no compensa calcularlo todo al cargar el
+archivo: cada columna se resume la primera vez que se pide (al pasar
+el ratón o pulsar su encabezado) y el resultado se guarda hasta que el
+preprocesado modifique esa columna. Como DatasetProfile, la caché lleva
+un número de versión: un cálculo que termina después de invalidarla (p.
+ej. el precálculo en segundo plano) no se guarda.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype, is_datetime64_any_dtype, is_numeric_dtype
+)
+
+# Número de barras del mini histograma
+HISTOGRAM_BINS = 12
+
+# Caracteres usados para dibujar el histograma en texto
+_BARS = "▁▂▃▄▅▆▇█"
+
+
+class ColumnStatsCache:
+    """
+    Caché perezosa de estadísticas por columna.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos de los que se calculan las estadísticas.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def get(self, column):
+        """
+        Obtener las estadísticas de una columna (calculándolas si hace falta).
+
+        Returns
+        -------
+        dict
+            Claves: dtype, count, nan, distinct, min, max, mean y
+            histogram (recuentos por intervalo). min/max/mean e histogram
+            son None cuando la columna no es numérica ni de fechas.
+        """
+        stats = self._stats.get(column)
+        if stats is None:
+            with self._lock:
+                version, dataframe = self._version, self.dataframe
+            stats = compute_column_stats(dataframe[column])
+            with self._lock:
+                if version == self._version:
+                    self._stats[column] = stats
+        return stats
+
+    def is_cached(self, column):
+        """Indica si la columna ya tiene estadísticas calculadas"""
+        return column in self._stats
+
+    def invalidate(self, dataframe=None, columns=None):
+        """
+        Descartar estadísticas obsoletas.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame, opcional
+            Nuevo DataFrame si el preprocesado lo ha sustituido.
+        columns : list, opcional
+            Columnas modificadas. Si es None se descartan todas (por
+            ejemplo, al eliminar filas cambian todas las columnas).
+        """
+        with self._lock:
+            self._version += 1
+            if dataframe is not None:
+                self.dataframe = dataframe
+
+            if columns is None:
+                self._stats.clear()
+            else:
+                for column in columns:
+                    self._stats.pop(column, None)
+
+
+def compute_column_stats(series):
+    """
+    Resumir una columna con una sola conversión a NumPy.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Columna a resumir.
+
+    Returns
+    -------
+    dict
+        Ver ColumnStatsCache.get.
+    """
+    stats = {
+        "dtype": str(series.dtype),
+        "count": 0,
+        "nan": 0,
+        "distinct": 0,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "histogram": None
+    }
+
+    if is_datetime64_any_dtype(series):
+        # Las fechas se resumen sobre su representación int64 (ns)
+        values = series.to_numpy(dtype="datetime64[ns]")
+        missing = np.isnat(values)
+        valid = values[~missing].view("int64")
+        to_value = pd.Timestamp
+    elif is_numeric_dtype(series) and not is_bool_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(values)
+        valid = values[~missing]
+        to_value = float
+    else:
+        missing = series.isna().to_numpy()
+        stats["nan"] = int(missing.sum())
+        stats["count"] = len(series) - stats["nan"]
+        stats["distinct"] = int(series.nunique(dropna=True))
+        return stats
+
+    stats["nan"] = int(missing.sum())
+    stats["count"] = int(valid.size)
+    if valid.size == 0:
+        return stats
+
+    stats["distinct"] = int(pd.unique(valid).size)
+    stats["min"] = to_value(valid.min())
+    stats["max"] = to_value(valid.max())
+    stats["mean"] = to_value(valid.mean())
+
+    counts, _ = np.histogram(valid, bins=HISTOGRAM_BINS)
+    stats["histogram"] = counts
+    return stats
+
+
+def histogram_sparkline(counts):
+    """
+    Dibujar un histograma como una línea de texto (p. ej. "▁▃▇█▅▂").
+
+    Parameters
+    ----------
+    counts : array-like
+        Recuentos por intervalo.
+
+    Returns
+    -------
+    str
+        Una barra por intervalo; cadena vacía si no hay recuentos.
+    """
+    if counts is None or len(counts) == 0:
+        return ""
+    counts = np.asarray(counts, dtype=float)
+    top = counts.max()
+    if top == 0:
+        return _BARS[0] * len(counts)
+    levels = np.ceil(counts / top * (len(_BARS) - 1)).astype(int)
+    return "".join(_BARS[level] for level in levels)
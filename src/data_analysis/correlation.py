@@ -0,0 +1,182 @@
+"""
+Correlaciones con valores faltantes y ranking de columnas de entrada.
+
+Todas las correlaciones se calculan con productos de matrices sobre los
+datos con los NaN puestos a cero y una matriz de máscaras, de modo que
+cada par de columnas usa solo las filas donde ambas tienen valor
+(pares completos) sin recorrer las columnas una a una.
+"""
+
+import warnings
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+
+def numeric_columns(dataframe):
+    """Columnas numéricas (sin booleanas) de un DataFrame"""
+    return [
+        col for col in dataframe.columns
+        if is_numeric_dtype(dataframe[col])
+        and not is_bool_dtype(dataframe[col])
+    ]
+
+
+def pairwise_correlation(X, Y, chunk_size=None, cancel=None):
+    """
+    Correlación de Pearson entre las columnas de X y las de Y.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Matriz n x p (puede contener NaN).
+    Y : np.ndarray
+        Matriz n x q (puede contener NaN).
+    chunk_size : int, opcional
+        Si se indica, las sumas se acumulan por bloques de filas (menos
+        memoria temporal y posibilidad de cancelar entre bloques).
+    cancel : threading.Event, opcional
+        Si se activa, se lanza CancelledError entre bloques.
+
+    Returns
+    -------
+    np.ndarray
+        Matriz p x q. El elemento (i, j) usa solo las filas donde X[:, i]
+        e Y[:, j] tienen valor; es NaN si hay menos de 2 filas o alguna
+        de las dos columnas es constante en ellas.
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+
+    # Centrar antes de sumar evita la cancelación numérica con columnas
+    # de media grande (p. ej. fechas en segundos)
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_x = np.nan_to_num(np.nanmean(X, axis=0))
+        mean_y = np.nan_to_num(np.nanmean(Y, axis=0))
+
+    p, q = X.shape[1], Y.shape[1]
+    sums = [np.zeros((p, q)) for _ in range(6)]
+    step = chunk_size or max(len(X), 1)
+
+    for start in range(0, len(X), step):
+        if cancel is not None and cancel.is_set():
+            raise CancelledError()
+
+        x = X[start:start + step]
+        y = Y[start:start + step]
+        mask_x = ~np.isnan(x)
+        mask_y = ~np.isnan(y)
+        x0 = np.where(mask_x, x - mean_x, 0.0)
+        y0 = np.where(mask_y, y - mean_y, 0.0)
+        mx = mask_x.astype(float)
+        my = mask_y.astype(float)
+
+        sums[0] += mx.T @ my
+        sums[1] += x0.T @ my
+        sums[2] += mx.T @ y0
+        sums[3] += (x0 * x0).T @ my
+        sums[4] += mx.T @ (y0 * y0)
+        sums[5] += x0.T @ y0
+
+    n, sum_x, sum_y, sum_xx, sum_yy, sum_xy = sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_yy - sum_y ** 2 / n
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr[(n < 2) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CorrelationRanker:
+    """
+    Ranking de columnas de entrada candidatas frente a una de salida.
+
+    Cada ranking se calcula en una sola pasada matricial y se guarda por
+    (columna de salida, método) hasta que cambien los datos. Si ya se
+    dispone de la matriz de correlaciones completa (`correlation_matrix`,
+    la rellena DatasetProfile), el ranking de Pearson se lee de ella.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos cargados.
+    """
+
+    METHODS = ("pearson", "spearman")
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self.correlation_matrix = None
+        self._cache = {}
+
+    def rank(self, output, method="pearson"):
+        """
+        Ordenar las columnas numéricas según su relación con `output`.
+
+        Parameters
+        ----------
+        output : str
+            Columna de salida (debe ser numérica).
+        method : str
+            "pearson" o "spearman". Spearman es Pearson sobre rangos; con
+            valores faltantes los rangos se calculan por columna, así que
+            es una aproximación del Spearman por pares completos.
+
+        Returns
+        -------
+        pd.DataFrame
+            Una fila por columna candidata, ordenado de mejor a peor, con:
+            corr (correlación con signo), abs_corr, missing (proporción
+            de NaN) y score = abs_corr * (1 - missing).
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Método de correlación no válido: {method}")
+
+        key = (output, method)
+        if key not in self._cache:
+            self._cache[key] = self._compute(output, method)
+        return self._cache[key]
+
+    def invalidate(self, dataframe=None):
+        """Descartar los rankings (los datos han cambiado)"""
+        if dataframe is not None:
+            self.dataframe = dataframe
+        self.correlation_matrix = None
+        self._cache.clear()
+
+    def _compute(self, output, method):
+        candidates = [
+            col for col in numeric_columns(self.dataframe) if col != output
+        ]
+        matrix = self.correlation_matrix
+        if (method == "pearson" and matrix is not None
+                and output in matrix.columns
+                and set(candidates).issubset(matrix.index)):
+            corr = matrix.loc[candidates, output].to_numpy()
+            missing = (self.dataframe[candidates].isna().mean().to_numpy()
+                       if len(self.dataframe) else np.zeros(len(candidates)))
+        else:
+            block = self.dataframe[candidates + [output]]
+            if method == "spearman":
+                block = block.rank()
+
+            values = block.to_numpy(dtype=float, na_value=np.nan)
+            X, y = values[:, :-1], values[:, -1:]
+
+            corr = pairwise_correlation(X, y)[:, 0]
+            missing = np.isnan(X).mean(axis=0) if len(X) else np.zeros(0)
+        abs_corr = np.abs(corr)
+
+        ranking = pd.DataFrame({
+            "corr": corr,
+            "abs_corr": abs_corr,
+            "missing": missing,
+            "score": np.nan_to_num(abs_corr) * (1.0 - missing)
+        }, index=pd.Index(candidates, name="columna"))
+
+        return ranking.sort_values("score", ascending=False, kind="stable")
@@ -0,0 +1,284 @@
+"""
+Perfil del dataset calculado en segundo plano.
+
+Tras cargar un archivo la aplicación queda ociosa mientras el usuario
+revisa la tabla. Ese tiempo se aprovecha para calcular (en un hilo de
+baja prioridad) los recuentos de NaN y de filas duplicadas, los tipos
+de las columnas y la matriz de correlaciones, de modo que los pasos
+posteriores los encuentren ya calculados. La matriz de Gram solo se
+calcula si se pide: el entrenamiento usa la suya (modeling.GramCache),
+sobre las filas de entrenamiento.
+
+Todos los resultados se guardan con un número de versión: si el
+preprocesado invalida el perfil mientras un cálculo está en marcha, su
+resultado se descarta en lugar de guardarse obsoleto.
+"""
+
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from preprocessing import count_duplicates
+
+from .column_stats import ColumnStatsCache
+from .correlation import CorrelationRanker, pairwise_correlation
+
+# Filas por bloque en los cálculos matriciales (permite cancelar entre
+# bloques sin esperar a que termine una pasada completa)
+CHUNK_ROWS = 50_000
+
+# Nombre de la columna de unos en la matriz de Gram
+INTERCEPT = "const"
+
+
+class DatasetProfile:
+    """
+    Diagnósticos del dataset compartidos por toda la aplicación.
+
+    Cada resultado se calcula la primera vez que se pide (o antes, con
+    `warm_up` en segundo plano) y se guarda hasta que se invalide.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos cargados.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self.column_stats = ColumnStatsCache(dataframe)
+        self.ranker = CorrelationRanker(dataframe)
+
+        self._lock = threading.Lock()
+        self._version = 0
+        self._nan_counts = {}
+        self._duplicates = {}
+        self._numeric = {}
+        self._correlation = None
+        self._gram = None
+
+    # ------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------
+
+    def nan_counts(self, columns=None):
+        """
+        Número de valores faltantes por columna.
+
+        Parameters
+        ----------
+        columns : list, opcional
+            Columnas a consultar (por defecto todas).
+
+        Returns
+        -------
+        pd.Series
+            Recuento de NaN indexado por columna, en el orden pedido.
+        """
+        columns = self._columns(columns)
+        version = self._version
+        known = dict(self._nan_counts)
+        pending = [col for col in columns if col not in known]
+        if pending:
+            counts = self.dataframe[pending].isna().sum()
+            computed = {col: int(counts[col]) for col in pending}
+            known.update(computed)
+            self._store(version, lambda: self._nan_counts.update(computed))
+
+        return pd.Series([known[col] for col in columns],
+                         index=pd.Index(columns), dtype="int64")
+
+    def duplicate_count(self, columns=None):
+        """
+        Filas repetidas según las columnas indicadas (por defecto todas).
+
+        Returns
+        -------
+        int
+            Repeticiones sin contar la primera aparición de cada fila.
+        """
+        key = None if columns is None else tuple(columns)
+        count = self._duplicates.get(key)
+        if count is None:
+            version = self._version
+            count = count_duplicates(self.dataframe, columns)
+            self._store(version, lambda: self._duplicates.__setitem__(
+                key, count))
+        return count
+
+    def is_numeric(self, column):
+        """Indica si la columna es numérica (igual que is_numeric_dtype)"""
+        return self._column_type(column)[0]
+
+    def numeric_columns(self):
+        """Columnas numéricas (sin booleanas) en el orden del DataFrame"""
+        return [
+            col for col in self.dataframe.columns
+            if self._column_type(col) == (True, False)
+        ]
+
+    def correlation_matrix(self, cancel=None):
+        """
+        Correlaciones de Pearson (pares completos) entre columnas numéricas.
+
+        Parameters
+        ----------
+        cancel : threading.Event, opcional
+            Permite interrumpir el cálculo (lanza CancelledError).
+
+        Returns
+        -------
+        pd.DataFrame
+            Matriz simétrica indexada por las columnas numéricas.
+        """
+        if self._correlation is not None:
+            return self._correlation
+
+        version = self._version
+        columns = self.numeric_columns()
+        values = self._numeric_values(columns)
+        corr = pairwise_correlation(
+            values, values, chunk_size=CHUNK_ROWS, cancel=cancel)
+        matrix = pd.DataFrame(corr, index=columns, columns=columns)
+
+        def save():
+            self._correlation = matrix
+            self.ranker.correlation_matrix = matrix
+        self._store(version, save)
+        return matrix
+
+    def gram_matrix(self, cancel=None):
+        """
+        Matriz de Gram Z'Z con Z = [1, columnas numéricas].
+
+        Solo se usan las filas sin valores faltantes en ninguna columna
+        numérica, que son las que podría usar una regresión lineal.
+
+        Parameters
+        ----------
+        cancel : threading.Event, opcional
+            Permite interrumpir el cálculo (lanza CancelledError).
+
+        Returns
+        -------
+        tuple of (pd.DataFrame, int)
+            Matriz de Gram (índice: "const" y columnas numéricas) y el
+            número de filas completas usadas.
+        """
+        if self._gram is not None:
+            return self._gram
+
+        version = self._version
+        columns = self.numeric_columns()
+        values = self._numeric_values(columns)
+        values = values[~np.isnan(values).any(axis=1)]
+
+        size = len(columns) + 1
+        gram = np.zeros((size, size))
+        for start in range(0, len(values), CHUNK_ROWS):
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+            block = values[start:start + CHUNK_ROWS]
+            design = np.hstack([np.ones((len(block), 1)), block])
+            gram += design.T @ design
+
+        labels = [INTERCEPT] + columns
+        result = (pd.DataFrame(gram, index=labels, columns=labels),
+                  len(values))
+
+        def save():
+            self._gram = result
+        self._store(version, save)
+        return result
+
+    # ------------------------------------------------------------
+    # Precálculo e invalidación
+    # ------------------------------------------------------------
+
+    def warm_up(self, cancel=None):
+        """
+        Calcular todo el perfil de una vez (pensado para un hilo aparte).
+
+        Parameters
+        ----------
+        cancel : threading.Event, opcional
+            Se comprueba entre pasos; al activarse se lanza CancelledError.
+        """
+        def check():
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+
+        self.nan_counts()
+        check()
+        self.duplicate_count()
+        check()
+        self.numeric_columns()
+        check()
+        self.correlation_matrix(cancel)
+
+        # Estadísticas de cada columna para el encabezado de la tabla
+        for column in self.dataframe.columns:
+            check()
+            self.column_stats.get(column)
+
+    def invalidate(self, dataframe=None, columns=None):
+        """
+        Descartar los resultados afectados por un cambio en los datos.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame, opcional
+            Nuevo DataFrame si el preprocesado lo ha sustituido.
+        columns : list, opcional
+            Columnas modificadas. Si es None se descarta todo (por
+            ejemplo, al eliminar filas cambian todas las columnas).
+        """
+        with self._lock:
+            self._version += 1
+            if dataframe is not None:
+                self.dataframe = dataframe
+
+            if columns is None:
+                self._nan_counts.clear()
+                self._numeric.clear()
+            else:
+                for column in columns:
+                    self._nan_counts.pop(column, None)
+                    self._numeric.pop(column, None)
+
+            # Las matrices combinan todas las columnas numéricas y los
+            # duplicados dependen de filas completas
+            self._duplicates.clear()
+            self._correlation = None
+            self._gram = None
+
+            self.column_stats.invalidate(self.dataframe, columns)
+            self.ranker.invalidate(self.dataframe)
+
+    def _column_type(self, column):
+        """(es numérica, es booleana) de una columna, guardado en caché"""
+        kind = self._numeric.get(column)
+        if kind is None:
+            version = self._version
+            series = self.dataframe[column]
+            kind = (is_numeric_dtype(series), is_bool_dtype(series))
+            self._store(version, lambda: self._numeric.__setitem__(
+                column, kind))
+        return kind
+
+    def _store(self, version, save):
+        """Guardar un resultado solo si el perfil no ha cambiado entretanto"""
+        with self._lock:
+            if version == self._version:
+                save()
+
+    def _columns(self, columns):
+        if columns is None:
+            return list(self.dataframe.columns)
+        return list(columns)
+
+    def _numeric_values(self, columns):
+        return self.dataframe[columns].to_numpy(dtype=float, na_value=np.nan)
@@ -0,0 +1,145 @@
+"""
+Búsqueda de valores en el dataset cargado.
+
+Proporciona un índice por columna que se construye de forma perezosa
+(solo la primera vez que se consulta cada columna) y se reutiliza en
+las búsquedas siguientes mientras el DataFrame no cambie:
+
+- Coincidencia exacta: tabla hash valor -> posiciones de fila.
+- Búsqueda de texto: subcadena vectorizada sobre el texto de la columna.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+class DatasetSearchIndex:
+    """
+    Índice de búsqueda perezoso sobre las columnas de un DataFrame.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos sobre los que buscar. El índice no se invalida solo: si el
+        DataFrame cambia hay que crear un índice nuevo.
+    """
+
+    def __init__(self, dataframe):
+        self.dataframe = dataframe
+        self._exact = {}   # columna -> (valores únicos, orden, inicios)
+        self._text = {}    # columna -> textos en minúsculas
+
+    def find(self, query, columns=None, exact=False):
+        """
+        Buscar un valor en el dataset.
+
+        Parameters
+        ----------
+        query : str
+            Texto introducido por el usuario.
+        columns : list, opcional
+            Columnas en las que buscar (por defecto todas).
+        exact : bool
+            True para coincidencia exacta del valor, False para buscar
+            el texto como subcadena (sin distinguir mayúsculas).
+
+        Returns
+        -------
+        np.ndarray
+            Posiciones de fila (ordenadas) con al menos una coincidencia.
+        """
+        query = str(query).strip()
+        if not query:
+            return np.empty(0, dtype=np.intp)
+
+        if columns is None:
+            columns = list(self.dataframe.columns)
+
+        hits = np.zeros(len(self.dataframe), dtype=bool)
+        for column in columns:
+            if exact:
+                hits[self._find_exact(column, query)] = True
+            else:
+                hits |= self._find_substring(column, query)
+
+        return np.flatnonzero(hits)
+
+    # ================================================================
+    # COINCIDENCIA EXACTA
+    # ================================================================
+
+    def _find_exact(self, column, query):
+        """Posiciones de fila cuyo valor en la columna es igual a query"""
+        key = self._coerce_query(self.dataframe[column], query)
+        if key is None:
+            return np.empty(0, dtype=np.intp)
+
+        uniques, order, starts = self._exact_index(column)
+        code = uniques.get_indexer([key])[0]
+        if code < 0:
+            return np.empty(0, dtype=np.intp)
+        return order[starts[code]:starts[code + 1]]
+
+    def _exact_index(self, column):
+        """
+        Construir (o reutilizar) la tabla hash de una columna.
+
+        Cada valor se codifica con pd.factorize; ordenar las filas por
+        código deja juntas todas las posiciones de un mismo valor, así
+        que cada consulta es una búsqueda hash más un corte del array.
+        """
+        if column not in self._exact:
+            series = self.dataframe[column]
+            if not (is_numeric_dtype(series) or
+                    is_datetime64_any_dtype(series)):
+                # Texto: comparar siempre sobre su representación str
+                series = series.astype(str).where(series.notna())
+
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            # Los NaN (código -1) quedan al principio tras ordenar
+            starts = np.concatenate(([0], np.cumsum(counts)))
+            starts += np.count_nonzero(codes < 0)
+
+            self._exact[column] = (pd.Index(uniques), order, starts)
+
+        return self._exact[column]
+
+    def _coerce_query(self, series, query):
+        """
+        Convertir el texto buscado al tipo de la columna.
+
+        Devuelve None si el texto no puede representar un valor de la
+        columna (por ejemplo, "abc" en una columna numérica).
+        """
+        if is_numeric_dtype(series):
+            try:
+                return float(query.replace(",", "."))
+            except ValueError:
+                return None
+        if is_datetime64_any_dtype(series):
+            try:
+                return pd.Timestamp(query)
+            except (ValueError, TypeError):
+                return None
+        return query
+
+    # ================================================================
+    # BÚSQUEDA DE TEXTO
+    # ================================================================
+
+    def _find_substring(self, column, query):
+        """Máscara de filas cuyo texto contiene query"""
+        texts = self._text_values(column)
+        return texts.str.contains(
+            query.lower(), regex=False).to_numpy(dtype=bool)
+
+    def _text_values(self, column):
+        """Texto en minúsculas de la columna (los NaN quedan vacíos)"""
+        if column not in self._text:
+            series = self.dataframe[column]
+            texts = series.astype(str).str.lower()
+            self._text[column] = texts.where(series.notna(), "")
+        return self._text[column]
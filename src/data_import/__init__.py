@@ -7,12 +7,15 @@ desde diferentes formatos: CSV, Excel y SQLite.
 Módulos:
 - importer.py: lógica principal de carga y validación de archivos.
 - utils.py: funciones auxiliares para detección y conversión de tipos de datos.
+- chunks.py: lectura por bloques de tablas que no caben en memoria.
 
 Funciones principales expuestas:
 - import_data(file_path: str, preview_rows: int = 5)
+- iter_chunks(file_path, columns=None, chunksize=DEFAULT_CHUNKSIZE)
 """
 
+from .chunks import DEFAULT_CHUNKSIZE, iter_chunks
 from .importer import import_data
 from .utils import coerce_dtypes
 
-__all__ = ["import_data", "coerce_dtypes"]
+__all__ = ["import_data", "coerce_dtypes", "iter_chunks", "DEFAULT_CHUNKSIZE"]
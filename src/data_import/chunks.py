@@ -0,0 +1,79 @@
+"""
+Lectura por bloques de archivos que no caben en memoria.
+
+A diferencia de import_data, que carga la tabla completa, iter_chunks
+devuelve la tabla en DataFrames de `chunksize` filas (y solo con las
+columnas pedidas), de modo que se puede recorrer una tabla de cualquier
+tamaño con la memoria de un bloque. Formatos: CSV y SQLite (la primera
+tabla, como en import_data). Excel no se puede leer por bloques.
+
+Los tipos se infieren en cada bloque (no se aplica coerce_dtypes, que
+decide con la columna completa); las columnas numéricas se leen como
+números y las fechas las convierte la matriz de diseño.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+# Filas por bloque por defecto
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_chunks(file_path, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Recorrer un archivo por bloques de filas.
+
+    Parameters
+    ----------
+    file_path : str
+        Ruta al archivo (.csv, .sqlite, .db).
+    columns : list, opcional
+        Columnas a leer (por defecto todas).
+    chunksize : int
+        Filas por bloque.
+
+    Yields
+    ------
+    pd.DataFrame
+
+    Raises
+    ------
+    RuntimeError
+        Si el archivo no existe, el formato no se puede leer por bloques
+        o la lectura falla.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise RuntimeError(f"El archivo no existe: {file_path}")
+    suffix = path.suffix.lower()
+
+    try:
+        if suffix == ".csv":
+            yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+        elif suffix in [".sqlite", ".db"]:
+            with sqlite3.connect(path) as conn:
+                tables = pd.read_sql_query(
+                    "SELECT name FROM sqlite_master WHERE type='table';", conn
+                )
+                if tables.empty:
+                    raise RuntimeError("La base de datos no contiene tablas.")
+                table_name = _quote(tables.iloc[0, 0])
+                selected = ("*" if columns is None
+                            else ", ".join(_quote(col) for col in columns))
+                yield from pd.read_sql_query(
+                    f"SELECT {selected} FROM {table_name}", conn,
+                    chunksize=chunksize)
+        else:
+            raise RuntimeError(
+                f"Formato no soportado para leer por bloques: {suffix}")
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Error al leer por bloques ({path.name}): {e}")
+
+
+def _quote(name):
+    """Nombre de tabla o columna entre comillas para SQLite"""
+    return '"' + str(name).replace('"', '""') + '"'
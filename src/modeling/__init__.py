@@ -0,0 +1,105 @@
+"""
+Paquete modeling
+----------------
+Módulo encargado de la división de los datos para entrenar y evaluar
+los modelos, independiente de la GUI.
+
+Módulos:
+- split.py: división en entrenamiento y test como posiciones de filas
+  (sin copiar el DataFrame), aleatoria, estratificada por cuantiles de
+  la salida o por grupos, y validación dentro del entrenamiento.
+- cross_validation.py: k-fold, k-fold repetido y shuffle-split con las
+  particiones ajustadas en paralelo.
+- backtest.py: evaluación con origen móvil sobre datos ordenados por
+  fecha.
+- gram.py: productos cruzados del entrenamiento en caché para
+  reajustar con cualquier subconjunto de columnas sin leer los datos.
+- subset_selection.py: búsqueda de entradas hacia delante, hacia atrás
+  o exhaustiva con actualizaciones del factor de Cholesky.
+- training.py: ajuste y evaluación del modelo lineal sin tocar la
+  interfaz (se ejecuta en segundo plano).
+- least_squares.py: mínimos cuadrados incrementales por bloques
+  (estadísticos suficientes centrados, memoria O(p²)) para entrenar y
+  evaluar con tablas que no caben en memoria.
+- regularization.py: Ridge, Lasso y ElasticNet con ruta de
+  penalizaciones (una descomposición espectral para Ridge, descenso por
+  coordenadas con warm start) y α elegido por validación cruzada.
+- recursive.py: actualización de un modelo guardado con filas nuevas
+  (mínimos cuadrados recursivos con olvido exponencial opcional).
+
+Clases principales expuestas:
+- DataSplit(train, test, n_rows)
+- CrossValidation(method="kfold", n_splits=5, n_repeats=3,
+  test_size=0.2, seed=None)
+- CrossValidationResult(validation, scores, coefficients)
+- RollingOrigin(time_column, n_origins=5)
+- IncrementalLeastSquares(n_features)
+- RecursiveLeastSquares(statistics, forgetting=1.0, test_statistics=None)
+- GramCache(dataframe, split, rows="train")
+- FeatureSearch(gram, output, candidates=None, criterion="bic",
+  validation=None)
+- RegularizedRegression(penalty="ridge", l1_ratio=0.5, n_alphas=N_ALPHAS,
+  validation=None)
+- RegularizationPath(regularization, alphas, coefs, intercepts, cv_mse,
+  scale)
+- TrainingResult(model, design, train, test, y_pred_test, r2, mse,
+  cv_result=None, cv_error=None, path=None, gram=None)
+
+Funciones principales expuestas:
+- random_split(n_rows, train_size, seed=None, strata=None, groups=None)
+- temporal_split(times, train_size)
+- time_order(times)
+- linear_model(coef, intercept)
+- fit_chunks(chunks, output, design, fit_design=True, context=None)
+- score_chunks(chunks, output, design, coef, intercept, context=None)
+- update_chunks(model, chunks, output, design, context=None)
+- ridge_path(statistics, alphas)
+- elastic_net_path(statistics, alphas, l1_ratio, tol=CD_TOL,
+  max_iter=CD_MAX_ITER)
+- path_mse(statistics, coefs, intercepts)
+- train_linear_model(dataframe, split, inputs, output, make_design,
+  validation=None, context=None, gram=None, regularization=None)
+- quantile_bins(values, n_bins=DEFAULT_BINS)
+- group_codes(groups)
+- fold_labels(n_rows, n_splits, rng, strata=None, groups=None)
+- gather(dataframe, positions, columns=None)
+"""
+
+from .backtest import RollingOrigin
+from .cross_validation import (
+    CV_METHODS, CV_NAMES, CrossValidation, CrossValidationResult
+)
+from .split import (
+    DEFAULT_BINS, VALIDATION_FRACTION, DataSplit, fold_labels, gather,
+    group_codes, quantile_bins, random_split, temporal_split, time_order
+)
+from .gram import GramCache
+from .subset_selection import (
+    CRITERIA, CRITERION_COLUMNS, CRITERION_NAMES, SEARCH_METHODS,
+    SEARCH_NAMES, FeatureSearch
+)
+from .least_squares import (
+    IncrementalLeastSquares, fit_chunks, linear_model, score_chunks
+)
+from .regularization import (
+    N_ALPHAS, PENALTIES, PENALTY_NAMES, RegularizationPath,
+    RegularizedRegression, elastic_net_path, path_mse, ridge_path
+)
+from .recursive import (
+    MAX_RECURSIVE_FEATURES, RecursiveLeastSquares, update_chunks
+)
+from .training import TrainingResult, train_linear_model
+
+__all__ = [
+    "DataSplit", "CrossValidation", "CrossValidationResult", "gather",
+    "random_split", "quantile_bins", "group_codes", "fold_labels",
+    "temporal_split", "time_order", "RollingOrigin",
+    "IncrementalLeastSquares", "TrainingResult", "train_linear_model",
+    "fit_chunks", "score_chunks", "linear_model", "GramCache",
+    "FeatureSearch", "RecursiveLeastSquares", "update_chunks", "CV_METHODS",
+    "CV_NAMES", "DEFAULT_BINS", "VALIDATION_FRACTION", "CRITERIA",
+    "CRITERION_COLUMNS", "CRITERION_NAMES", "SEARCH_METHODS", "SEARCH_NAMES",
+    "RegularizedRegression", "RegularizationPath", "ridge_path",
+    "elastic_net_path", "path_mse", "N_ALPHAS", "PENALTIES", "PENALTY_NAMES",
+    "MAX_RECURSIVE_FEATURES"
+]
@@ -0,0 +1,150 @@
+"""
+Evaluación con origen móvil (backtest) para datos ordenados en el tiempo.
+
+Las filas se ordenan por una columna de fechas y las más recientes se
+dividen en n ventanas consecutivas del mismo tamaño. En cada origen el
+modelo se entrena con todas las filas anteriores al corte (ventana
+creciente) y se evalúa con la ventana siguiente, como si se hubiera
+usado en ese momento.
+
+El modelo no se reajusta desde cero en cada origen: los estadísticos de
+mínimos cuadrados (IncrementalLeastSquares) se actualizan solo con el
+bloque de filas que entra entre un corte y el siguiente, así que cada
+fila se transforma y se acumula una vez. Para que todas las filas se
+acumulen con las mismas variables, la matriz de diseño (codificación,
+escalado) se ajusta una sola vez con el primer entrenamiento, que no ve
+ninguna fila de test.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error, r2_score
+
+from .cross_validation import CV_NAMES, INTERCEPT, CrossValidationResult
+from .least_squares import IncrementalLeastSquares
+from .split import gather, time_order
+
+
+class RollingOrigin:
+    """
+    Backtest con origen móvil.
+
+    Tiene la misma interfaz que CrossValidation (describe, n_folds,
+    evaluate), así que la GUI lo trata como otra validación.
+
+    Parameters
+    ----------
+    time_column : str
+        Columna de fechas por la que se ordenan las filas.
+    n_origins : int
+        Número de cortes; las filas con fecha se dividen en
+        n_origins + 1 bloques y el primero es el entrenamiento inicial.
+    """
+
+    method = "backtest"
+
+    def __init__(self, time_column, n_origins=5):
+        if n_origins < 1:
+            raise ValueError("Se necesita al menos 1 origen.")
+        self.time_column = time_column
+        self.n_origins = int(n_origins)
+
+    @property
+    def n_folds(self):
+        """Número total de evaluaciones"""
+        return self.n_origins
+
+    def describe(self):
+        return (f"{CV_NAMES[self.method]} ({self.n_origins} cortes por "
+                f"{self.time_column})")
+
+    def cutoffs(self, n_rows):
+        """
+        Posiciones de corte sobre las filas ordenadas por fecha.
+
+        Returns
+        -------
+        np.ndarray of int
+            n_origins + 1 posiciones: el origen i entrena con las filas
+            [0, corte_i) y evalúa con [corte_i, corte_i+1).
+        """
+        horizon = n_rows // (self.n_origins + 1)
+        if horizon < 1:
+            raise ValueError(
+                f"No hay suficientes filas con fecha para {self.n_origins} "
+                "cortes.")
+        return n_rows - horizon * np.arange(self.n_origins, -1, -1)
+
+    def evaluate(self, dataframe, inputs, output, make_design, context=None):
+        """
+        Entrenar y evaluar el modelo en cada origen.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Datos preprocesados (con la columna de fechas).
+        inputs : list
+            Columnas de entrada.
+        output : str
+            Columna de salida.
+        make_design : callable
+            Devuelve una DesignMatrix nueva (sin ajustar).
+        context : TaskContext, opcional
+            Cancelación y progreso.
+
+        Returns
+        -------
+        CrossValidationResult
+            Una fila por origen en scores y coefficients.
+        """
+        columns = list(dict.fromkeys(list(inputs) + [output]))
+        times = dataframe[self.time_column]
+        rows, keys = time_order(times)
+        cutoffs = self.cutoffs(len(rows))
+        # Las filas con la misma fecha que el corte pasan a su ventana
+        # de test: nunca se entrena con una fecha que se evalúa
+        cutoffs[:-1] = np.searchsorted(keys, keys[cutoffs[:-1]], side="left")
+        if cutoffs[0] == 0 or (np.diff(cutoffs) == 0).any():
+            raise ValueError(
+                "Hay demasiadas filas con la misma fecha para "
+                f"{self.n_origins} cortes.")
+
+        first = gather(dataframe, rows[:cutoffs[0]], columns)
+        design = make_design()
+        design.fit(first, first[output])
+        least_squares = IncrementalLeastSquares(len(design.feature_names))
+
+        scores, coefficients = [], []
+        start = 0
+        for number, (cut, end) in enumerate(
+                zip(cutoffs[:-1], cutoffs[1:]), start=1):
+            if context is not None:
+                context.check()
+            # Solo el bloque nuevo entra en los estadísticos
+            block = gather(dataframe, rows[start:cut], columns)
+            least_squares.update(design.transform(block), block[output])
+            start = cut
+            coef, intercept = least_squares.solve()
+
+            test = gather(dataframe, rows[cut:end], columns)
+            predicted = np.asarray(
+                design.transform(test) @ coef).ravel() + intercept
+            scores.append({
+                "origen": number,
+                "corte": str(times.iloc[rows[cut]]),
+                "r2": r2_score(test[output], predicted),
+                "mse": mean_squared_error(test[output], predicted),
+                "n_train": int(cut),
+                "n_test": int(end - cut)
+            })
+            row = dict(zip(design.feature_names, coef))
+            row[INTERCEPT] = intercept
+            coefficients.append(row)
+            if context is not None:
+                context.report(number / self.n_origins,
+                               f"Origen {number}/{self.n_origins}")
+
+        scores = pd.DataFrame(scores)
+        coefficients = pd.DataFrame(
+            coefficients, index=pd.Index(scores["origen"], name="origen"))
+        return CrossValidationResult(self, scores, coefficients)
@@ -0,0 +1,307 @@
+"""
+Validación cruzada del modelo lineal.
+
+- "kfold": k particiones disjuntas; cada una se usa una vez como test.
+- "repeated": k-fold repetido con permutaciones distintas.
+- "shuffle": particiones aleatorias independientes con una fracción fija
+  de test (las filas de test de dos particiones pueden solaparse).
+
+Las particiones no se guardan: se generan bajo demanda como posiciones
+(DataSplit) a partir de una permutación, y cada una reúne solo las
+columnas del modelo. Pueden estratificarse por cuantiles de la salida o
+respetar grupos (ver split.py). Las particiones se ajustan en paralelo
+en un ThreadPoolExecutor (o con el map del contexto de tareas de la
+GUI): NumPy y LAPACK liberan el GIL durante el ajuste. La matriz de diseño
+(codificación, escalado) se ajusta de nuevo con el entrenamiento de
+cada partición para no filtrar información del test.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+from .split import (
+    DataSplit, fold_labels, group_codes, quantile_bins, random_split
+)
+
+CV_METHODS = ("kfold", "repeated", "shuffle")
+
+CV_NAMES = {
+    "kfold": "k-fold",
+    "repeated": "k-fold repetido",
+    "shuffle": "shuffle-split",
+    "backtest": "origen móvil"  # RollingOrigin (backtest.py)
+}
+
+# Nombre del término independiente en la tabla de coeficientes
+INTERCEPT = "const"
+
+
+class CrossValidation:
+    """
+    Esquema de validación cruzada.
+
+    Parameters
+    ----------
+    method : str
+        Uno de CV_METHODS.
+    n_splits : int
+        Particiones por repetición (k) o número de particiones en
+        shuffle-split.
+    n_repeats : int
+        Repeticiones del k-fold repetido (se ignora en los demás).
+    test_size : float
+        Fracción de test en shuffle-split.
+    seed : int, opcional
+        Semilla aleatoria.
+    n_bins : int, opcional
+        Estratificar por este número de cuantiles de la salida.
+    group_column : str, opcional
+        Mantener juntas las filas con el mismo valor en esta columna.
+    """
+
+    def __init__(self, method="kfold", n_splits=5, n_repeats=3,
+                 test_size=0.2, seed=None, n_bins=None, group_column=None):
+        if method not in CV_METHODS:
+            raise ValueError(f"Validación cruzada no válida: {method}")
+        if n_splits < 2:
+            raise ValueError("Se necesitan al menos 2 particiones.")
+        if n_repeats < 1:
+            raise ValueError("Se necesita al menos 1 repetición.")
+        if not 0 < test_size < 1:
+            raise ValueError("La fracción de test debe estar entre 0 y 1.")
+        self.method = method
+        self.n_splits = int(n_splits)
+        self.n_repeats = int(n_repeats) if method == "repeated" else 1
+        self.test_size = float(test_size)
+        self.seed = seed
+        self.n_bins = n_bins
+        self.group_column = group_column
+
+    @property
+    def n_folds(self):
+        """Número total de ajustes"""
+        return self.n_splits * self.n_repeats
+
+    def describe(self):
+        if self.method == "shuffle":
+            text = (f"{CV_NAMES[self.method]} ({self.n_splits} particiones, "
+                    f"{self.test_size:.0%} de test)")
+        elif self.method == "repeated":
+            text = (f"{CV_NAMES[self.method]} (k = {self.n_splits}, "
+                    f"{self.n_repeats} repeticiones)")
+        else:
+            text = f"{CV_NAMES[self.method]} (k = {self.n_splits})"
+        if self.group_column is not None:
+            text += f", por grupos de {self.group_column}"
+        elif self.n_bins:
+            text += f", estratificada ({self.n_bins} cuantiles)"
+        return text
+
+    def folds(self, n_rows, strata=None, groups=None):
+        """
+        Generar las particiones una a una.
+
+        Parameters
+        ----------
+        n_rows : int
+            Filas del DataFrame.
+        strata, groups : np.ndarray of int, opcional
+            Estrato o grupo de cada fila (ver split.random_split).
+
+        Yields
+        ------
+        tuple of (int, DataSplit)
+            Repetición (desde 0) y posiciones de entrenamiento y test.
+        """
+        for repeat, make_split in self._fold_makers(n_rows, strata, groups):
+            yield repeat, make_split()
+
+    def _fold_makers(self, n_rows, strata=None, groups=None):
+        """
+        Funciones que construyen cada partición.
+
+        Solo se guarda la partición de cada fila (una por repetición) o
+        la semilla de cada shuffle-split; las posiciones se crean al
+        usar cada partición.
+
+        Returns
+        -------
+        list of (int, callable)
+            Repetición y función sin argumentos que devuelve el DataSplit.
+        """
+        if n_rows < self.n_splits:
+            raise ValueError(
+                f"No hay suficientes filas para {self.n_splits} particiones.")
+        rng = np.random.default_rng(self.seed)
+        makers = []
+
+        if self.method == "shuffle":
+            train_size = 1 - self.test_size
+            n_test = max(1, int(round(n_rows * self.test_size)))
+            for _ in range(self.n_splits):
+                seed = int(rng.integers(2 ** 32))
+                if strata is None and groups is None:
+                    def make(seed=seed):
+                        order = np.random.default_rng(seed).permutation(
+                            n_rows)
+                        return DataSplit(
+                            order[n_test:], order[:n_test], n_rows)
+                else:
+                    def make(seed=seed):
+                        return random_split(
+                            n_rows, train_size, seed, strata, groups)
+                makers.append((0, make))
+            return makers
+
+        for repeat in range(self.n_repeats):
+            labels = fold_labels(n_rows, self.n_splits, rng, strata, groups)
+            if (np.bincount(labels, minlength=self.n_splits) == 0).any():
+                raise ValueError(
+                    "Los grupos son demasiado desiguales para "
+                    f"{self.n_splits} particiones.")
+            for i in range(self.n_splits):
+                def make(labels=labels, i=i):
+                    test = labels == i
+                    return DataSplit(
+                        np.flatnonzero(~test), np.flatnonzero(test), n_rows)
+                makers.append((repeat, make))
+        return makers
+
+    def labels(self, dataframe, output):
+        """
+        Estratos o grupos de las filas según la configuración.
+
+        Returns
+        -------
+        tuple
+            (strata, groups); cada uno es None o un array de códigos.
+        """
+        if self.group_column is not None:
+            return None, group_codes(dataframe[self.group_column])
+        if self.n_bins:
+            return quantile_bins(dataframe[output], self.n_bins), None
+        return None, None
+
+    def evaluate(self, dataframe, inputs, output, make_design, context=None):
+        """
+        Ajustar y evaluar el modelo en cada partición.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Datos preprocesados.
+        inputs : list
+            Columnas de entrada.
+        output : str
+            Columna de salida.
+        make_design : callable
+            Devuelve una DesignMatrix nueva (sin ajustar) para cada
+            partición.
+        context : TaskContext, opcional
+            Cancelación, progreso y ejecución paralela.
+
+        Returns
+        -------
+        CrossValidationResult
+        """
+        columns = list(dict.fromkeys(list(inputs) + [output]))
+        strata, groups = self.labels(dataframe, output)
+        folds = list(enumerate(
+            self._fold_makers(len(dataframe), strata, groups), start=1))
+
+        def fit(item):
+            number, (repeat, make_split) = item
+            if context is not None:
+                context.check()
+            return number, repeat, _fit_fold(
+                make_split(), dataframe, columns, output, make_design)
+
+        if context is not None:
+            fitted = context.map(fit, folds)
+        else:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                fitted = list(pool.map(fit, folds))
+
+        scores = pd.DataFrame([
+            {"partición": number, "repetición": repeat + 1, **metrics}
+            for number, repeat, (metrics, _) in fitted
+        ])
+        coefficients = pd.DataFrame(
+            [coefs for _, _, (_, coefs) in fitted],
+            index=pd.Index(scores["partición"], name="partición"))
+        return CrossValidationResult(self, scores, coefficients)
+
+
+def _fit_fold(split, dataframe, columns, output, make_design):
+    """Métricas de test y coeficientes de una partición"""
+    train = split.train_frame(dataframe, columns)
+    test = split.test_frame(dataframe, columns)
+
+    design = make_design()
+    X_train = design.fit_transform(train, train[output])
+    model = LinearRegression().fit(X_train, train[output])
+    predicted = model.predict(design.transform(test))
+
+    metrics = {
+        "r2": r2_score(test[output], predicted),
+        "mse": mean_squared_error(test[output], predicted),
+        "n_train": split.n_train,
+        "n_test": split.n_test
+    }
+    # Por nombre: con one-hot una partición puede no ver alguna categoría
+    coefficients = dict(zip(design.feature_names, model.coef_))
+    coefficients[INTERCEPT] = model.intercept_
+    return metrics, coefficients
+
+
+class CrossValidationResult:
+    """
+    Resultados por partición de una validación cruzada.
+
+    Attributes
+    ----------
+    scores : pd.DataFrame
+        Una fila por partición: repetición, r2, mse, n_train y n_test.
+    coefficients : pd.DataFrame
+        Coeficientes de cada partición (columnas: variables y "const").
+    """
+
+    def __init__(self, validation, scores, coefficients):
+        self.validation = validation
+        self.scores = scores
+        self.coefficients = coefficients
+
+    def summary(self):
+        """Media, desviación típica, mínimo y máximo de R² y ECM"""
+        metrics = self.scores[["r2", "mse"]]
+        return pd.DataFrame({
+            "media": metrics.mean(),
+            "desviación": metrics.std(ddof=1),
+            "mínimo": metrics.min(),
+            "máximo": metrics.max()
+        })
+
+    def coefficient_spread(self):
+        """Media, desviación típica, mínimo y máximo de cada coeficiente"""
+        coefficients = self.coefficients
+        return pd.DataFrame({
+            "media": coefficients.mean(),
+            "desviación": coefficients.std(ddof=1),
+            "mínimo": coefficients.min(),
+            "máximo": coefficients.max()
+        })
+
+    def to_config(self):
+        """Resumen serializable (para guardar con el modelo)"""
+        summary = self.summary()
+        return {
+            "method": self.validation.method,
+            "description": self.validation.describe(),
+            "r2": summary.loc["r2"].tolist(),
+            "mse": summary.loc["mse"].tolist()
+        }
@@ -0,0 +1,164 @@
+"""
+Matriz de Gram del entrenamiento en caché para reajustes instantáneos.
+
+Al cambiar las columnas de entrada hay que volver a ajustar el modelo
+con las mismas filas de entrenamiento. GramCache recorre una sola vez
+esas filas y guarda, para todas las columnas numéricas, las medias y
+la matriz de productos cruzados centrada C = Σ(z - z̄)(z - z̄)'. Con
+ella cualquier combinación de entradas I y salida o se ajusta
+resolviendo el sistema C[I, I]·b = C[I, o] de tamaño |I|, sin volver a
+leer los datos; el R² y el ECM de entrenamiento salen de los mismos
+números.
+
+La caché pertenece a un DataFrame y a una división concretos: si cambian
+los datos o las filas de entrenamiento hay que crear otra (ver
+matches). Con rows="test" se calcula lo mismo sobre las filas de test
+de la división; con una división de DataSplit.holdout son las de
+validación, con las que se comparan modelos sin leer los datos ni tocar
+el test (ver subset_selection).
+"""
+
+import threading
+
+import numpy as np
+from pandas.api.types import is_numeric_dtype
+
+from .least_squares import linear_model
+
+# Filas de entrenamiento por bloque al calcular la matriz
+CHUNK_ROWS = 50_000
+
+
+class GramCache:
+    """
+    Productos cruzados de las columnas numéricas del entrenamiento (o
+    del test).
+
+    Se calcula la primera vez que se usa (normalmente en el hilo del
+    entrenamiento) y después solo se consulta.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos preprocesados.
+    split : DataSplit
+        División cuyas filas se usan.
+    rows : str
+        "train" (por defecto) o "test".
+    """
+
+    def __init__(self, dataframe, split, rows="train"):
+        if rows not in ("train", "test"):
+            raise ValueError(f"Filas no válidas: {rows}")
+        self.dataframe = dataframe
+        self.split = split
+        self.rows = rows
+        self.columns = [column for column in dataframe.columns
+                        if is_numeric_dtype(dataframe[column])]
+        self._lock = threading.Lock()
+        self._index = {column: i for i, column in enumerate(self.columns)}
+        self._mean = None
+        self._cross = None
+        self._complete = None
+
+    @property
+    def positions(self):
+        """Posiciones de las filas usadas"""
+        return getattr(self.split, self.rows)
+
+    @property
+    def n_rows(self):
+        return len(self.positions)
+
+    def matches(self, dataframe, split):
+        """Indica si la caché sirve para estos datos y esta división"""
+        return (dataframe is self.dataframe
+                and split.n_rows == self.split.n_rows
+                and np.array_equal(getattr(split, self.rows), self.positions))
+
+    def statistics(self, columns):
+        """
+        Medias y productos cruzados centrados de unas columnas.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (medias, matriz C de las columnas en el orden dado).
+        """
+        if not self.supports(columns):
+            raise ValueError(
+                "Las columnas no son numéricas o tienen valores faltantes.")
+        index = [self._index[column] for column in columns]
+        return self._mean[index], self._cross[np.ix_(index, index)]
+
+    def supports(self, columns):
+        """
+        Indica si se pueden ajustar estas columnas desde la caché: han
+        de ser numéricas y sin faltantes en las filas usadas.
+        """
+        if any(column not in self._index for column in columns):
+            return False
+        self._compute()
+        return all(self._complete[self._index[column]]
+                   for column in columns)
+
+    def fit(self, inputs, output):
+        """
+        Ajustar la regresión de `output` sobre `inputs`.
+
+        Parameters
+        ----------
+        inputs : list
+            Columnas de entrada (numéricas).
+        output : str
+            Columna de salida.
+
+        Returns
+        -------
+        tuple
+            (LinearRegression ajustado, R² de entrenamiento, ECM de
+            entrenamiento).
+        """
+        mean, cross = self.statistics(list(inputs) + [output])
+        sxx, sxy, syy = cross[:-1, :-1], cross[:-1, -1], cross[-1, -1]
+        # Norma mínima si hay columnas constantes o colineales
+        coef = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+        intercept = mean[-1] - mean[:-1] @ coef
+
+        sse = max(float(syy - coef @ sxy), 0.0)
+        r2 = 1 - sse / syy if syy > 0 else float("nan")
+        return linear_model(coef, intercept), r2, sse / self.n_rows
+
+    def _compute(self):
+        """Recorrer las filas una vez (solo la primera llamada)"""
+        with self._lock:
+            if self._cross is not None:
+                return
+            size = len(self.columns)
+            count = 0
+            mean = np.zeros(size)
+            cross = np.zeros((size, size))
+            # Cada columna se recorta por bloque: nunca se copia la tabla
+            series = [self.dataframe[column] for column in self.columns]
+            positions = self.positions
+
+            for start in range(0, len(positions), CHUNK_ROWS):
+                rows = positions[start:start + CHUNK_ROWS]
+                block = np.empty((len(rows), size))
+                for j, values in enumerate(series):
+                    block[:, j] = values.take(rows).to_numpy(
+                        dtype=float, na_value=np.nan)
+                # Bloque centrado y combinado con lo anterior (Chan); un
+                # faltante solo contamina la fila y columna de su columna
+                block_mean = block.mean(axis=0)
+                centered = block - block_mean
+                total = count + len(block)
+                delta = block_mean - mean
+                cross += centered.T @ centered + (
+                    count * len(block) / total) * np.outer(delta, delta)
+                mean += delta * len(block) / total
+                count = total
+
+            self._mean = mean
+            self._complete = np.isfinite(np.diag(cross))
+            self._cross = cross
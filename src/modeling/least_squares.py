@@ -0,0 +1,380 @@
+"""
+Mínimos cuadrados incrementales.
+
+En lugar de guardar las filas, se acumulan por bloques sus estadísticos
+suficientes centrados: número de filas, medias de X e y, Sxx = Σ(x-x̄)(x-x̄)'
+y Sxy = Σ(x-x̄)(y-ȳ). Cada bloque nuevo se combina con lo acumulado con
+la fórmula de Chan (la misma que en preprocessing.scaling), así que
+añadir filas cuesta solo lo que cuesta ese bloque y el ajuste se
+resuelve en cualquier momento con un sistema p x p. Trabajar con datos
+centrados evita la pérdida de precisión de las ecuaciones normales sin
+centrar cuando las columnas tienen magnitudes grandes (p. ej. segundos
+desde 1970); X'X, X'y, y'y y las sumas de columnas se recuperan de ellos
+sin pérdida.
+
+La memoria es O(p²) sea cual sea el número de filas, así que con
+fit_chunks se puede entrenar con tablas que no caben en memoria leyendo
+un bloque cada vez (ver data_import.iter_chunks), y con score_chunks
+calcular R² y ECM de un test igual de grande. La matriz de diseño
+(categorías, escalas) se ajusta antes con una pasada por los bloques.
+
+Las filas pueden llevar pesos y lo acumulado se puede descontar
+(discount) para dar menos peso a lo antiguo; así los usa
+RecursiveLeastSquares para actualizar un modelo guardado.
+"""
+
+import warnings
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+
+
+class IncrementalLeastSquares:
+    """
+    Regresión lineal con término independiente ajustada por bloques.
+
+    Parameters
+    ----------
+    n_features : int
+        Columnas de la matriz de diseño.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = int(n_features)
+        self.count = 0
+        self.mean_x = np.zeros(self.n_features)
+        self.mean_y = 0.0
+        self.sxx = np.zeros((self.n_features, self.n_features))
+        self.sxy = np.zeros(self.n_features)
+        self.syy = 0.0
+
+    @classmethod
+    def from_statistics(cls, count, mean_x, mean_y, sxx, sxy, syy):
+        """Crear a partir de estadísticos centrados ya calculados"""
+        statistics = cls(len(mean_x))
+        statistics.count = count
+        statistics.mean_x = np.array(mean_x, dtype=float)
+        statistics.mean_y = float(mean_y)
+        statistics.sxx = np.array(sxx, dtype=float)
+        statistics.sxy = np.array(sxy, dtype=float)
+        statistics.syy = float(syy)
+        return statistics
+
+    def update(self, X, y, weights=None):
+        """
+        Añadir un bloque de filas.
+
+        Parameters
+        ----------
+        X : np.ndarray or scipy.sparse matrix
+            Matriz de diseño del bloque (n x n_features).
+        y : array-like
+            Salida del bloque.
+        weights : array-like, opcional
+            Peso de cada fila (positivo). Con pesos, count pasa a ser la
+            suma de los pesos y las medias y productos son ponderados.
+        """
+        y = np.asarray(y, dtype=float)
+        size = len(y)
+        if size == 0:
+            return self
+        if weights is not None:
+            return self._update_weighted(X, y, np.asarray(weights, float))
+
+        block_mean_y = y.mean()
+        if sparse.issparse(X):
+            block_mean, block_sxx, block_sxy = _sparse_products(
+                X, y - block_mean_y, np.ones(size))
+        else:
+            X = np.asarray(X, dtype=float)
+            block_mean = X.mean(axis=0)
+            centered = X - block_mean
+            block_sxx = centered.T @ centered
+            block_sxy = centered.T @ (y - block_mean_y)
+        block_syy = float(((y - block_mean_y) ** 2).sum())
+        # Un faltante contaminaría todos los estadísticos acumulados
+        if not (np.isfinite(block_sxx).all() and np.isfinite(block_sxy).all()
+                and np.isfinite(block_syy)):
+            raise ValueError(
+                "El bloque contiene valores faltantes o infinitos.")
+
+        return self._combine(size, block_mean, block_mean_y, block_sxx,
+                             block_sxy, block_syy)
+
+    def _update_weighted(self, X, y, weights):
+        """Añadir un bloque con un peso por fila"""
+        size = float(weights.sum())
+        block_mean_y = weights @ y / size
+        if sparse.issparse(X):
+            block_mean, block_sxx, block_sxy = _sparse_products(
+                X, y - block_mean_y, weights)
+        else:
+            X = np.asarray(X, dtype=float)
+            block_mean = weights @ X / size
+            centered = X - block_mean
+            block_sxx = centered.T @ (centered * weights[:, None])
+            block_sxy = centered.T @ (weights * (y - block_mean_y))
+        block_syy = float(weights @ (y - block_mean_y) ** 2)
+        if not (np.isfinite(block_sxx).all() and np.isfinite(block_sxy).all()
+                and np.isfinite(block_syy)):
+            raise ValueError(
+                "El bloque contiene valores faltantes o infinitos.")
+
+        return self._combine(size, block_mean, block_mean_y, block_sxx,
+                             block_sxy, block_syy)
+
+    def discount(self, factor):
+        """
+        Multiplicar el peso de todas las filas acumuladas por `factor`
+        (olvido exponencial: las medias no cambian, las sumas sí).
+        """
+        self.count *= factor
+        self.sxx *= factor
+        self.sxy *= factor
+        self.syy *= factor
+        return self
+
+    def merge(self, other):
+        """
+        Añadir lo acumulado por otro IncrementalLeastSquares (p. ej. de
+        bloques procesados en paralelo).
+        """
+        if other.n_features != self.n_features:
+            raise ValueError("Los estadísticos tienen distinto número de "
+                             "columnas.")
+        if other.count == 0:
+            return self
+        return self._combine(other.count, other.mean_x, other.mean_y,
+                             other.sxx, other.sxy, other.syy)
+
+    def _combine(self, size, mean_x, mean_y, sxx, sxy, syy):
+        """Combinar estadísticos centrados con lo acumulado (Chan)"""
+        total = self.count + size
+        weight = self.count * size / total
+        delta = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+        self.sxx += sxx + weight * np.outer(delta, delta)
+        self.sxy += sxy + weight * delta * delta_y
+        self.syy += syy + weight * delta_y ** 2
+        self.mean_x += delta * size / total
+        self.mean_y += delta_y * size / total
+        self.count = total
+        return self
+
+    def gram(self):
+        """
+        Estadísticos sin centrar equivalentes.
+
+        Returns
+        -------
+        tuple
+            (X'X, X'y, y'y, sumas de las columnas de X, suma de y).
+        """
+        sum_x = self.count * self.mean_x
+        sum_y = self.count * self.mean_y
+        return (self.sxx + np.outer(sum_x, self.mean_x),
+                self.sxy + sum_x * self.mean_y,
+                self.syy + sum_y * self.mean_y,
+                sum_x, sum_y)
+
+    def solve(self):
+        """
+        Coeficientes de mínimos cuadrados con los datos acumulados.
+
+        Si Sxx es singular (columnas constantes o colineales) se usa la
+        solución de norma mínima, como hace LinearRegression.
+
+        Returns
+        -------
+        tuple of (np.ndarray, float)
+            (coeficientes, término independiente).
+        """
+        if self.count == 0:
+            raise ValueError("No hay filas para ajustar el modelo.")
+        coef = np.linalg.lstsq(self.sxx, self.sxy, rcond=None)[0]
+        intercept = self.mean_y - self.mean_x @ coef
+        return coef, float(intercept)
+
+    def score(self, coef, intercept):
+        """
+        R² y ECM de unos coeficientes sobre las filas acumuladas.
+
+        Con los coeficientes de solve() son las métricas de
+        entrenamiento; con los de otro ajuste, las de test.
+
+        Returns
+        -------
+        tuple of float
+            (r2, mse).
+        """
+        if self.count == 0:
+            raise ValueError("No hay filas para evaluar el modelo.")
+        coef = np.asarray(coef, dtype=float)
+        # Σ(y - Xb - c)² = Syy - 2b'Sxy + b'Sxx b + n·(ȳ - x̄b - c)²
+        bias = self.mean_y - self.mean_x @ coef - intercept
+        sse = (self.syy - 2 * coef @ self.sxy + coef @ self.sxx @ coef
+               + self.count * bias ** 2)
+        sse = max(float(sse), 0.0)
+        mse = sse / self.count
+        r2 = 1 - sse / self.syy if self.syy > 0 else float("nan")
+        return r2, mse
+
+    def to_config(self):
+        """Diccionario serializable (para guardar con el modelo)"""
+        return {
+            "count": float(self.count),
+            "mean_x": self.mean_x.tolist(),
+            "mean_y": float(self.mean_y),
+            "sxx": self.sxx.tolist(),
+            "sxy": self.sxy.tolist(),
+            "syy": float(self.syy)
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls.from_statistics(
+            config["count"], config["mean_x"], config["mean_y"],
+            config["sxx"], config["sxy"], config["syy"])
+
+    def to_model(self):
+        """
+        LinearRegression con los coeficientes de solve().
+
+        Se puede guardar y usar para predecir como un modelo ajustado
+        con todas las filas a la vez.
+        """
+        return linear_model(*self.solve())
+
+
+def _sparse_products(X, y_centered, weights):
+    """
+    Media, Sxx y Sxy ponderados de un bloque disperso.
+
+    X'WX - w·x̄x̄' solo es fiable para los indicadores 0/1: con columnas
+    numéricas de magnitud grande (p. ej. segundos desde 1970) los dos
+    términos casi se cancelan. Esas columnas se densifican y se centran
+    antes de multiplicar; las demás siguen dispersas.
+    """
+    total = weights.sum()
+    weighted = sparse.diags(weights) @ X
+    mean = np.asarray(weighted.sum(axis=0)).ravel() / total
+    sxx = (X.T @ weighted).toarray() - total * np.outer(mean, mean)
+    # Restar x̄·Σw(y - ȳ), que solo es redondeo, mantiene exacta la
+    # identidad Σw(x - x̄)(y - ȳ) = X'W(y - ȳ) - x̄·Σw(y - ȳ)
+    sxy = (np.asarray(weighted.T @ y_centered).ravel()
+           - mean * (weights @ y_centered))
+
+    # Columnas con algún valor distinto de 0 y 1
+    X = X.tocsc()
+    columns = np.repeat(np.arange(X.shape[1]), np.diff(X.indptr))
+    numeric = np.unique(columns[(X.data != 0) & (X.data != 1)])
+    if numeric.size:
+        centered = X[:, numeric].toarray() - mean[numeric]
+        weighted_centered = centered * weights[:, None]
+        cross = (np.asarray(X.T @ weighted_centered)
+                 - np.outer(mean, weighted_centered.sum(axis=0)))
+        sxx[:, numeric] = cross
+        sxx[numeric, :] = cross.T
+        sxx[np.ix_(numeric, numeric)] = centered.T @ weighted_centered
+        sxy[numeric] = weighted_centered.T @ y_centered
+    return mean, sxx, sxy
+
+
+def linear_model(coef, intercept):
+    """LinearRegression ya ajustado con unos coeficientes dados"""
+    model = LinearRegression()
+    model.coef_ = np.asarray(coef, dtype=float)
+    model.intercept_ = float(intercept)
+    model.n_features_in_ = len(model.coef_)
+    return model
+
+
+def fit_chunks(chunks, output, design, fit_design=True, context=None):
+    """
+    Ajustar un modelo lineal leyendo los datos por bloques.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame or callable
+        Bloques de filas (p. ej. data_import.iter_chunks o
+        pd.read_csv(..., chunksize=n)); solo se guarda uno a la vez. Si
+        es una función sin argumentos que devuelve los bloques, el
+        diseño se ajusta con una primera pasada por todos ellos.
+    output : str
+        Columna de salida.
+    design : DesignMatrix
+        Matriz de diseño de las entradas.
+    fit_design : bool
+        Ajustar la matriz de diseño. Con bloques que solo se pueden leer
+        una vez se ajusta con el primero (se avisa con un
+        RuntimeWarning si hay codificaciones o escalado): una categoría
+        que aparezca después cae en la de referencia y las escalas salen
+        solo de ese bloque. Con False debe estar ya ajustada.
+    context : TaskContext, opcional
+        Cancelación.
+
+    Returns
+    -------
+    IncrementalLeastSquares
+    """
+    def checked(blocks):
+        for chunk in blocks:
+            if context is not None:
+                context.check()
+            yield chunk
+
+    first_chunk = False
+    if callable(chunks):
+        if fit_design:
+            design.fit_chunks(checked(chunks()), output)
+        chunks = chunks()
+    elif fit_design:
+        first_chunk = True
+        if design.encoders or design.scaler is not None:
+            warnings.warn(
+                "El diseño se ajusta solo con el primer bloque; pasa una "
+                "función que devuelva los bloques para ajustarlo con "
+                "todos.", RuntimeWarning, stacklevel=2)
+
+    least_squares = None
+    for chunk in checked(chunks):
+        if least_squares is None:
+            if first_chunk:
+                design.fit(chunk, chunk[output])
+            least_squares = IncrementalLeastSquares(
+                len(design.feature_names))
+        least_squares.update(design.transform(chunk), chunk[output])
+    if least_squares is None:
+        raise ValueError("No hay filas para ajustar el modelo.")
+    return least_squares
+
+
+def score_chunks(chunks, output, design, coef, intercept, context=None):
+    """
+    R² y ECM de un modelo sobre datos leídos por bloques.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Bloques de filas de evaluación.
+    output : str
+        Columna de salida.
+    design : DesignMatrix
+        Matriz de diseño ya ajustada.
+    coef, intercept
+        Coeficientes del modelo.
+    context : TaskContext, opcional
+        Cancelación.
+
+    Returns
+    -------
+    tuple of float
+        (r2, mse).
+    """
+    statistics = IncrementalLeastSquares(len(design.feature_names))
+    for chunk in chunks:
+        if context is not None:
+            context.check()
+        statistics.update(design.transform(chunk), chunk[output])
+    return statistics.score(coef, intercept)
@@ -0,0 +1,255 @@
+"""
+Actualización de un modelo guardado con filas nuevas (mínimos cuadrados
+recursivos).
+
+Un modelo entrenado guarda los estadísticos suficientes de su
+entrenamiento (IncrementalLeastSquares), de modo que cuando llegan filas
+nuevas no hace falta volver a leer ni a entrenar con la tabla completa:
+RecursiveLeastSquares parte de esos estadísticos y aplica a cada bloque
+de filas nuevas un paso exacto de mínimos cuadrados recursivos
+
+    S = Λ + Z P Z'
+    P' = (P - P Z' S⁻¹ Z P) / λᵐ
+    θ' = θ + P' Z' W (y - Z θ)
+
+donde θ son los coeficientes, P la inversa de la matriz de productos
+cruzados, Z el bloque de m filas y λ el factor de olvido (1 = sin
+olvido). Con olvido cada fila pesa λ^edad, donde la edad es el número
+de filas que han llegado después (W = diag(λ^(m-1-i)), Λ = λᵐ W⁻¹).
+El resultado es el mismo que reajustar con todas las filas
+ponderadas, con un coste O(m·p²) por bloque. Como el estado es denso
+(p x p), con más de MAX_RECURSIVE_FEATURES columnas de diseño el modelo
+se guarda sin él.
+
+Las filas se expresan respecto a las medias del entrenamiento
+(z = [1, x - x̄]), donde la matriz de productos cruzados inicial es
+diagonal por bloques y está tan bien condicionada como Sxx, aunque las
+columnas tengan magnitudes grandes. Si Sxx es singular (columnas
+constantes o colineales) se parte de su pseudoinversa: los coeficientes
+coinciden con los de LinearRegression y las direcciones sin variación
+en el entrenamiento no se actualizan.
+
+Los estadísticos se siguen acumulando (con el mismo olvido) para
+recalcular R² y ECM del entrenamiento sin leer los datos; los del test
+de la división original se conservan para recalcular las métricas de
+test con los coeficientes nuevos.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from .least_squares import IncrementalLeastSquares, linear_model
+
+# Filas por paso recursivo (el sistema S es de BLOCK_ROWS x BLOCK_ROWS)
+BLOCK_ROWS = 256
+
+# Columnas de diseño máximas para guardar el estado recursivo: la
+# inversa P y los estadísticos son matrices densas p x p
+MAX_RECURSIVE_FEATURES = 1_000
+
+
+class RecursiveLeastSquares:
+    """
+    Modelo lineal que se actualiza con filas nuevas.
+
+    Parameters
+    ----------
+    statistics : IncrementalLeastSquares
+        Estadísticos del entrenamiento (se copian).
+    forgetting : float
+        Factor de olvido λ en (0, 1]; 1 da el mismo peso a todas las
+        filas.
+    test_statistics : IncrementalLeastSquares, opcional
+        Estadísticos del test original, para recalcular sus métricas.
+    """
+
+    def __init__(self, statistics, forgetting=1.0, test_statistics=None):
+        if statistics.count == 0:
+            raise ValueError("No hay filas para ajustar el modelo.")
+        if not 0 < forgetting <= 1:
+            raise ValueError(
+                "El factor de olvido debe estar entre 0 (sin incluir) y 1.")
+        self.forgetting = float(forgetting)
+        self.statistics = IncrementalLeastSquares.from_config(
+            statistics.to_config())
+        self.test_statistics = test_statistics
+        self.rows_added = 0
+
+        # Base centrada: Z'Z = [[n, 0], [0, Sxx]] y Z'y = [n·ȳ, Sxy]
+        size = statistics.n_features
+        self.center = statistics.mean_x.copy()
+        self.inverse = np.zeros((size + 1, size + 1))
+        self.inverse[0, 0] = 1 / statistics.count
+        self.inverse[1:, 1:] = np.linalg.pinv(statistics.sxx,
+                                              hermitian=True)
+        self.theta = np.empty(size + 1)
+        self.theta[0] = statistics.mean_y
+        self.theta[1:] = self.inverse[1:, 1:] @ statistics.sxy
+
+    @property
+    def n_features(self):
+        return len(self.center)
+
+    @property
+    def coef(self):
+        return self.theta[1:].copy()
+
+    @property
+    def intercept(self):
+        return float(self.theta[0] - self.center @ self.theta[1:])
+
+    def update(self, X, y):
+        """
+        Añadir un bloque de filas nuevas (en orden de llegada).
+
+        Parameters
+        ----------
+        X : np.ndarray or scipy.sparse matrix
+            Matriz de diseño de las filas nuevas.
+        y : array-like
+            Salida de las filas nuevas.
+        """
+        y = np.asarray(y, dtype=float)
+        if sparse.issparse(X):
+            X = X.toarray()
+        X = np.asarray(X, dtype=float)
+        if X.shape[1] != self.n_features:
+            raise ValueError("Las filas nuevas tienen distinto número de "
+                             "columnas que el modelo.")
+        if not (np.isfinite(X).all() and np.isfinite(y).all()):
+            raise ValueError(
+                "El bloque contiene valores faltantes o infinitos.")
+
+        for start in range(0, len(y), BLOCK_ROWS):
+            self._step(X[start:start + BLOCK_ROWS],
+                       y[start:start + BLOCK_ROWS])
+        self._refine()
+        self.rows_added += len(y)
+        return self
+
+    def _step(self, X, y):
+        """Paso exacto con un bloque pequeño (Woodbury)"""
+        size = len(y)
+        powers = self.forgetting ** np.arange(size + 1)
+        # Peso de cada fila del bloque y de lo acumulado antes
+        weights = powers[size - 1::-1]
+        decay = powers[size]
+
+        Z = np.empty((size, self.n_features + 1))
+        Z[:, 0] = 1.0
+        Z[:, 1:] = X - self.center
+        PZ = self.inverse @ Z.T
+        system = Z @ PZ
+        system[np.diag_indices(size)] += powers[1:]
+        gain = np.linalg.solve(system, PZ.T).T
+        self.inverse = (self.inverse - gain @ PZ.T) / decay
+        # Simétrica aunque se acumule redondeo
+        self.inverse = (self.inverse + self.inverse.T) / 2
+        residual = y - Z @ self.theta
+        self.theta = self.theta + self.inverse @ (Z.T @ (weights * residual))
+
+        self.statistics.discount(decay)
+        self.statistics.update(X, y, weights=weights)
+
+    def _refine(self):
+        """
+        Un paso de refinamiento iterativo con los estadísticos
+        acumulados: corrige el redondeo que arrastra P cuando las
+        columnas tienen escalas muy distintas.
+        """
+        statistics = self.statistics
+        weight = statistics.count
+        shift = statistics.mean_x - self.center
+        # Z'WZ y Z'Wy en la base z = [1, x - centro]
+        gram = np.empty_like(self.inverse)
+        gram[0, 0] = weight
+        gram[0, 1:] = gram[1:, 0] = weight * shift
+        gram[1:, 1:] = statistics.sxx + weight * np.outer(shift, shift)
+        target = np.empty(len(self.theta))
+        target[0] = weight * statistics.mean_y
+        target[1:] = statistics.sxy + weight * shift * statistics.mean_y
+        self.theta = self.theta + self.inverse @ (target - gram @ self.theta)
+
+    def score(self):
+        """
+        R² y ECM sobre todas las filas acumuladas (ponderadas con el
+        olvido), con los coeficientes actuales.
+        """
+        return self.statistics.score(self.coef, self.intercept)
+
+    def test_score(self):
+        """R² y ECM del test original, o None si no se guardó"""
+        if self.test_statistics is None or self.test_statistics.count == 0:
+            return None
+        return self.test_statistics.score(self.coef, self.intercept)
+
+    def to_model(self):
+        """LinearRegression con los coeficientes actuales"""
+        return linear_model(self.coef, self.intercept)
+
+    def to_config(self):
+        """Diccionario serializable (para guardar con el modelo)"""
+        return {
+            "forgetting": self.forgetting,
+            "rows_added": int(self.rows_added),
+            "center": self.center.tolist(),
+            "theta": self.theta.tolist(),
+            "inverse": self.inverse.tolist(),
+            "statistics": self.statistics.to_config(),
+            "test_statistics": (self.test_statistics.to_config()
+                                if self.test_statistics is not None
+                                else None)
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        """Reconstruir el estado guardado con `to_config`"""
+        statistics = IncrementalLeastSquares.from_config(
+            config["statistics"])
+        test = config.get("test_statistics")
+        model = cls(statistics, config.get("forgetting", 1.0),
+                    IncrementalLeastSquares.from_config(test)
+                    if test else None)
+        # El estado recursivo puede venir de actualizaciones anteriores
+        if "theta" in config:
+            model.center = np.array(config["center"], dtype=float)
+            model.theta = np.array(config["theta"], dtype=float)
+            model.inverse = np.array(config["inverse"], dtype=float)
+        model.rows_added = int(config.get("rows_added", 0))
+        return model
+
+
+def update_chunks(model, chunks, output, design, context=None):
+    """
+    Actualizar un modelo con filas nuevas leídas por bloques.
+
+    Parameters
+    ----------
+    model : RecursiveLeastSquares
+        Modelo a actualizar (se modifica).
+    chunks : iterable of pd.DataFrame
+        Bloques de filas nuevas, ya preprocesadas.
+    output : str
+        Columna de salida.
+    design : DesignMatrix
+        Matriz de diseño ajustada con el entrenamiento original.
+    context : TaskContext, opcional
+        Cancelación.
+
+    Returns
+    -------
+    tuple of float
+        (r2, mse) de las filas nuevas con el modelo de antes de
+        actualizar (error a priori: cómo habría predicho esas filas).
+    """
+    coef, intercept = model.coef, model.intercept
+    fresh = IncrementalLeastSquares(model.n_features)
+    for chunk in chunks:
+        if context is not None:
+            context.check()
+        X = design.transform(chunk)
+        fresh.update(X, chunk[output])
+        model.update(X, chunk[output])
+    if fresh.count == 0:
+        raise ValueError("No hay filas nuevas para actualizar el modelo.")
+    return fresh.score(coef, intercept)
@@ -0,0 +1,402 @@
+"""
+Regresión regularizada (Ridge, Lasso y ElasticNet) con ruta de
+penalizaciones elegida por validación cruzada.
+
+Se minimiza
+
+    (1/2n)·||y - c - Xb||² + α·(ρ·||b||₁ + (1 - ρ)/2·||b||²)
+
+con ρ = 0 en Ridge, ρ = 1 en Lasso y 0 < ρ < 1 en ElasticNet, sobre las
+columnas estandarizadas (cada una dividida por su desviación típica,
+para que la penalización no dependa de las unidades); los coeficientes
+se devuelven en la escala original.
+
+Todo se calcula desde los estadísticos suficientes centrados
+(IncrementalLeastSquares), así que recorrer muchos valores de α no
+vuelve a leer las filas:
+
+- Ridge: una sola descomposición espectral de la matriz de correlaciones
+  C = V·diag(d)·V' da la ruta completa, b(α) = V·diag(1/(d + α))·V'·c,
+  con un coste por α de O(p²).
+- Lasso y ElasticNet: descenso por coordenadas sobre C (forma de
+  covarianza), de α grande a pequeño, empezando cada α desde la solución
+  del anterior (warm start), que suele estar ya muy cerca.
+
+Para elegir α, cada partición de la validación cruzada acumula los
+estadísticos de su entrenamiento y de sus filas de validación; la ruta
+se calcula con los primeros y el ECM de todos los α sale de los segundos
+sin predecir fila a fila. Se elige el α con menor ECM medio.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cross_validation import CrossValidation
+from .least_squares import IncrementalLeastSquares, linear_model
+
+PENALTIES = ("ridge", "lasso", "elasticnet")
+
+PENALTY_NAMES = {
+    "ridge": "Ridge",
+    "lasso": "Lasso",
+    "elasticnet": "ElasticNet"
+}
+
+# Valores de α de la ruta
+N_ALPHAS = 50
+# Cociente α_min / α_max en Lasso y ElasticNet
+LASSO_EPS = 1e-3
+# Extremos de la ruta Ridge respecto a la traza de C
+RIDGE_RANGE = (1e3, 1e-5)
+# Descenso por coordenadas: brecha de dualidad relativa y barridos
+CD_TOL = 1e-4
+CD_MAX_ITER = 1000
+
+
+class RegularizedRegression:
+    """
+    Ruta de regularización con selección de α por validación cruzada.
+
+    Parameters
+    ----------
+    penalty : str
+        Uno de PENALTIES.
+    l1_ratio : float
+        Peso ρ de la penalización L1 en ElasticNet (se ignora en Ridge y
+        Lasso).
+    n_alphas : int
+        Valores de α de la ruta.
+    validation : CrossValidation, opcional
+        Particiones para elegir α (por defecto k-fold con k = 5).
+    """
+
+    def __init__(self, penalty="ridge", l1_ratio=0.5, n_alphas=N_ALPHAS,
+                 validation=None):
+        if penalty not in PENALTIES:
+            raise ValueError(f"Penalización no válida: {penalty}")
+        if penalty == "elasticnet" and not 0 < l1_ratio <= 1:
+            raise ValueError(
+                "La mezcla L1 debe estar entre 0 (sin incluir) y 1.")
+        if n_alphas < 2:
+            raise ValueError("Se necesitan al menos 2 valores de α.")
+        self.penalty = penalty
+        self.l1_ratio = {"ridge": 0.0, "lasso": 1.0}.get(
+            penalty, float(l1_ratio))
+        self.n_alphas = int(n_alphas)
+        self.validation = (validation if validation is not None
+                           else CrossValidation("kfold", 5, seed=0))
+
+    def describe(self):
+        text = PENALTY_NAMES[self.penalty]
+        if self.penalty == "elasticnet":
+            text += f" (mezcla L1 = {self.l1_ratio:g})"
+        return text
+
+    def alphas(self, statistics):
+        """
+        Valores de α de la ruta, de mayor a menor.
+
+        En Lasso y ElasticNet el mayor es el primero con todos los
+        coeficientes a cero; en Ridge se toman relativos a la traza de C
+        (la suma de sus valores propios).
+        """
+        _, matrix, target = _standardized(statistics)
+        if self.penalty == "ridge":
+            top = np.trace(matrix)
+            if top == 0:
+                raise ValueError("Todas las entradas son constantes.")
+            high, low = top * RIDGE_RANGE[0], top * RIDGE_RANGE[1]
+        else:
+            high = np.abs(target).max() / self.l1_ratio
+            if high == 0:
+                raise ValueError(
+                    "La salida no está correlacionada con ninguna entrada.")
+            low = high * LASSO_EPS
+        return np.logspace(np.log10(high), np.log10(low), self.n_alphas)
+
+    def path(self, statistics, alphas):
+        """
+        Coeficientes para cada α.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (coeficientes de forma (n_alphas, p), términos
+            independientes).
+        """
+        if self.penalty == "ridge":
+            return ridge_path(statistics, alphas)
+        return elastic_net_path(statistics, alphas, self.l1_ratio)
+
+    def fit(self, X, y, strata=None, groups=None, context=None):
+        """
+        Calcular la ruta con todas las filas y elegir α por validación
+        cruzada.
+
+        Parameters
+        ----------
+        X : np.ndarray or scipy.sparse matrix
+            Matriz de diseño del entrenamiento.
+        y : array-like
+            Salida del entrenamiento.
+        strata, groups : np.ndarray of int, opcional
+            Estrato o grupo de cada fila para las particiones.
+        context : TaskContext, opcional
+            Cancelación y ejecución paralela.
+
+        Returns
+        -------
+        RegularizationPath
+        """
+        y = np.asarray(y, dtype=float)
+        statistics = IncrementalLeastSquares(X.shape[1]).update(X, y)
+        alphas = self.alphas(statistics)
+        folds = list(self.validation.folds(len(y), strata, groups))
+
+        def evaluate(item):
+            _, split = item
+            if context is not None:
+                context.check()
+            train = IncrementalLeastSquares(X.shape[1]).update(
+                X[split.train], y[split.train])
+            held_out = IncrementalLeastSquares(X.shape[1]).update(
+                X[split.test], y[split.test])
+            return path_mse(held_out, *self.path(train, alphas))
+
+        if context is not None:
+            errors = context.map(evaluate, folds)
+        else:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                errors = list(pool.map(evaluate, folds))
+
+        coefs, intercepts = self.path(statistics, alphas)
+        scale = _standardized(statistics)[0]
+        return RegularizationPath(self, alphas, coefs, intercepts,
+                                  np.column_stack(errors), scale)
+
+
+class RegularizationPath:
+    """
+    Ruta de coeficientes y error de validación de cada α.
+
+    Attributes
+    ----------
+    regularization : RegularizedRegression
+        Configuración con la que se calculó.
+    alphas : np.ndarray
+        Valores de α, de mayor a menor.
+    coefs : np.ndarray
+        Coeficientes (escala original), una fila por α.
+    intercepts : np.ndarray
+        Término independiente de cada α.
+    cv_mse : np.ndarray
+        ECM de validación, una fila por α y una columna por partición.
+    scale : np.ndarray
+        Desviación típica de cada columna (para dibujar la ruta con los
+        coeficientes estandarizados).
+    feature_names : list
+        Nombres de las columnas (los asigna quien conoce el diseño).
+    """
+
+    def __init__(self, regularization, alphas, coefs, intercepts, cv_mse,
+                 scale):
+        self.regularization = regularization
+        self.alphas = alphas
+        self.coefs = coefs
+        self.intercepts = intercepts
+        self.cv_mse = cv_mse
+        self.scale = scale
+        self.feature_names = [f"x{i}" for i in range(coefs.shape[1])]
+
+    @property
+    def best_index(self):
+        """Posición del α con menor ECM medio de validación"""
+        return int(np.argmin(self.cv_mse.mean(axis=1)))
+
+    @property
+    def alpha(self):
+        return float(self.alphas[self.best_index])
+
+    @property
+    def coef(self):
+        return self.coefs[self.best_index]
+
+    @property
+    def intercept(self):
+        return float(self.intercepts[self.best_index])
+
+    def to_model(self):
+        """LinearRegression con los coeficientes del α elegido"""
+        return linear_model(self.coef, self.intercept)
+
+    def summary(self):
+        """ECM de validación (media y desviación) y coeficientes no nulos"""
+        return pd.DataFrame({
+            "alpha": self.alphas,
+            "mse": self.cv_mse.mean(axis=1),
+            "desviación": (self.cv_mse.std(axis=1, ddof=1)
+                           if self.cv_mse.shape[1] > 1 else np.nan),
+            "no_nulos": (self.coefs != 0).sum(axis=1)
+        })
+
+    def describe(self):
+        return (f"{self.regularization.describe()}, α = {self.alpha:.4g} "
+                f"(validación: {self.regularization.validation.describe()})")
+
+    def to_config(self):
+        """Resumen serializable (para guardar con el modelo)"""
+        row = self.summary().iloc[self.best_index]
+        return {
+            "penalty": self.regularization.penalty,
+            "l1_ratio": self.regularization.l1_ratio,
+            "alpha": self.alpha,
+            "description": self.describe(),
+            "mse": [float(row["mse"]), float(row["desviación"])]
+        }
+
+
+def ridge_path(statistics, alphas):
+    """
+    Ruta Ridge con una sola descomposición espectral.
+
+    Parameters
+    ----------
+    statistics : IncrementalLeastSquares
+        Estadísticos de las filas de ajuste.
+    alphas : array-like
+        Valores de α.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (coeficientes, términos independientes).
+    """
+    scale, matrix, target = _standardized(statistics)
+    values, vectors = np.linalg.eigh(matrix)
+    values = np.clip(values, 0, None)
+    projected = vectors.T @ target
+    alphas = np.asarray(alphas, dtype=float)
+    coefs = (vectors @ (projected[:, None]
+                        / (values[:, None] + alphas))).T / scale
+    return coefs, statistics.mean_y - coefs @ statistics.mean_x
+
+
+def elastic_net_path(statistics, alphas, l1_ratio, tol=CD_TOL,
+                     max_iter=CD_MAX_ITER):
+    """
+    Ruta Lasso / ElasticNet por descenso por coordenadas con warm start.
+
+    Cada α se da por convergido cuando la brecha de dualidad baja de
+    tol·Syy/n (el mismo criterio que scikit-learn), que no depende de
+    lo despacio que se muevan los coeficientes de columnas colineales.
+
+    Parameters
+    ----------
+    statistics : IncrementalLeastSquares
+        Estadísticos de las filas de ajuste.
+    alphas : array-like
+        Valores de α, de mayor a menor.
+    l1_ratio : float
+        Peso de la penalización L1 (1 = Lasso).
+    tol : float
+        Brecha de dualidad relativa para dar un α por convergido.
+    max_iter : int
+        Barridos máximos por α.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (coeficientes, términos independientes).
+    """
+    scale, matrix, target = _standardized(statistics)
+    size = len(target)
+    diagonal = np.diag(matrix).copy()
+    variable = np.flatnonzero(diagonal > 0)
+    total = statistics.syy / statistics.count
+    coef = np.zeros(size)
+    # C·b se actualiza con cada cambio en lugar de recalcularse
+    fitted = np.zeros(size)
+    coefs = np.empty((len(alphas), size))
+
+    for k, alpha in enumerate(alphas):
+        l1, l2 = alpha * l1_ratio, alpha * (1 - l1_ratio)
+        for _ in range(max_iter):
+            for j in variable:
+                old = coef[j]
+                rho = target[j] - fitted[j] + diagonal[j] * old
+                new = (np.sign(rho) * max(abs(rho) - l1, 0.0)
+                       / (diagonal[j] + l2))
+                if new != old:
+                    fitted += matrix[:, j] * (new - old)
+                    coef[j] = new
+            if _duality_gap(coef, fitted, target, total, l1, l2) <= (
+                    tol * total):
+                break
+        coefs[k] = coef
+
+    coefs = coefs / scale
+    return coefs, statistics.mean_y - coefs @ statistics.mean_x
+
+
+def _duality_gap(coef, fitted, target, total, l1, l2):
+    """Brecha de dualidad del problema estandarizado (forma de Gram)"""
+    residual_norm = total - 2 * coef @ target + coef @ fitted
+    dual_norm = np.abs(target - fitted - l2 * coef).max()
+    if dual_norm > l1:
+        const = l1 / dual_norm
+        gap = 0.5 * residual_norm * (1 + const ** 2)
+    else:
+        const = 1.0
+        gap = residual_norm
+    return (gap + l1 * np.abs(coef).sum() - const * (total - coef @ target)
+            + 0.5 * l2 * (1 + const ** 2) * coef @ coef)
+
+
+def path_mse(statistics, coefs, intercepts):
+    """
+    ECM de cada fila de coeficientes sobre las filas acumuladas.
+
+    Parameters
+    ----------
+    statistics : IncrementalLeastSquares
+        Estadísticos de las filas de evaluación.
+    coefs : np.ndarray
+        Coeficientes, una fila por modelo.
+    intercepts : np.ndarray
+        Término independiente de cada modelo.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if statistics.count == 0:
+        raise ValueError("No hay filas para evaluar el modelo.")
+    # Σ(y - Xb - c)² = Syy - 2b'Sxy + b'Sxx b + n·(ȳ - x̄b - c)²
+    bias = statistics.mean_y - coefs @ statistics.mean_x - intercepts
+    sse = (statistics.syy - 2 * coefs @ statistics.sxy
+           + np.einsum("kp,pq,kq->k", coefs, statistics.sxx, coefs)
+           + statistics.count * bias ** 2)
+    return np.clip(sse, 0, None) / statistics.count
+
+
+def _standardized(statistics):
+    """
+    Escalas y productos cruzados de las columnas estandarizadas.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (desviación típica de cada columna (1 si es constante), matriz
+        de correlaciones C, covarianzas con la salida c).
+    """
+    if statistics.count == 0:
+        raise ValueError("No hay filas para ajustar el modelo.")
+    scale = np.sqrt(np.clip(np.diag(statistics.sxx), 0, None)
+                    / statistics.count)
+    scale[scale == 0] = 1.0
+    matrix = statistics.sxx / statistics.count / np.outer(scale, scale)
+    target = statistics.sxy / statistics.count / scale
+    return scale, matrix, target
@@ -0,0 +1,352 @@
+"""
+División de las filas en entrenamiento y test.
+
+La división no copia los datos: guarda solo las posiciones (enteros) de
+las filas de cada conjunto sobre el DataFrame preprocesado. Al entrenar
+o evaluar se reúnen únicamente las columnas que usa el modelo, así que
+dividir cuesta lo mismo con 2 columnas que con 200 y no duplica la
+memoria del dataset.
+
+Además de la división aleatoria hay dos variantes:
+
+- Estratificada: la salida se agrupa en intervalos por cuantiles y cada
+  intervalo se reparte en la misma proporción, para que los valores
+  extremos de una salida asimétrica no acaben todos en un lado.
+- Por grupos: todas las filas de un mismo grupo (cliente, región...)
+  van al mismo conjunto, para que el test no comparta grupos con el
+  entrenamiento.
+
+Ambas se calculan con una permutación, un ordenamiento estable y
+bincount/cumsum sobre los códigos enteros de los estratos o grupos, sin
+bucles por fila ni por grupo.
+
+Para elegir entre modelos sin mirar el test, holdout separa además una
+parte de las filas de entrenamiento como validación.
+
+Para datos ordenados en el tiempo, la división temporal ordena las filas
+por una columna de fechas y deja en test la fracción más reciente, de
+modo que el modelo nunca se entrena con datos posteriores a los que
+evalúa.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from preprocessing.datetime_features import datetime_ints
+
+# Intervalos de cuantiles por defecto al estratificar por la salida
+DEFAULT_BINS = 10
+
+# Fracción del entrenamiento que se reserva para validar (DataSplit.holdout)
+VALIDATION_FRACTION = 0.2
+
+
+class DataSplit:
+    """
+    Posiciones de las filas de entrenamiento y test.
+
+    Parameters
+    ----------
+    train, test : array-like of int
+        Posiciones (no etiquetas del índice) de cada conjunto.
+    n_rows : int
+        Filas del DataFrame dividido.
+    """
+
+    def __init__(self, train, test, n_rows):
+        self.train = np.sort(np.asarray(train, dtype=np.intp))
+        self.test = np.sort(np.asarray(test, dtype=np.intp))
+        self.n_rows = int(n_rows)
+
+    @property
+    def n_train(self):
+        return len(self.train)
+
+    @property
+    def n_test(self):
+        return len(self.test)
+
+    def holdout(self, fraction=VALIDATION_FRACTION, seed=None):
+        """
+        Reservar una parte del entrenamiento para validar.
+
+        Returns
+        -------
+        DataSplit
+            División de las filas de entrenamiento: `train` son las que
+            se usan para ajustar y `test` las de validación. Las filas de
+            test originales no entran en ninguno de los dos.
+        """
+        inner = random_split(self.n_train, 1 - fraction, seed)
+        return DataSplit(self.train[inner.train], self.train[inner.test],
+                         self.n_rows)
+
+    def train_mask(self):
+        """Máscara booleana de las filas de entrenamiento"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.train] = True
+        return mask
+
+    def train_frame(self, dataframe, columns=None):
+        """Filas de entrenamiento de las columnas indicadas"""
+        return gather(dataframe, self.train, columns)
+
+    def test_frame(self, dataframe, columns=None):
+        """Filas de test de las columnas indicadas"""
+        return gather(dataframe, self.test, columns)
+
+
+def gather(dataframe, positions, columns=None):
+    """
+    Reunir unas filas de algunas columnas sin copiar el resto.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos completos.
+    positions : np.ndarray of int
+        Posiciones de las filas.
+    columns : list, opcional
+        Columnas a reunir (por defecto todas).
+
+    Returns
+    -------
+    pd.DataFrame
+        Nuevo DataFrame con el índice original de esas filas.
+    """
+    columns = list(dataframe.columns) if columns is None else list(columns)
+    # Columna a columna: nunca se crea una copia intermedia completa
+    return pd.DataFrame(
+        {column: dataframe[column].take(positions) for column in columns},
+        index=dataframe.index.take(positions)
+    )
+
+
+def quantile_bins(values, n_bins=DEFAULT_BINS):
+    """
+    Código del intervalo de cuantiles de cada valor.
+
+    Parameters
+    ----------
+    values : array-like
+        Valores numéricos (normalmente la salida).
+    n_bins : int
+        Número de intervalos.
+
+    Returns
+    -------
+    np.ndarray of int
+        Código en 0..n_bins-1; los valores faltantes forman el intervalo
+        n_bins.
+    """
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if missing.all():
+        return np.full(len(values), n_bins, dtype=np.intp)
+    # Con muchos valores repetidos algunos cortes coinciden y esos
+    # intervalos quedan vacíos
+    edges = np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+    codes = np.searchsorted(edges, values, side="right")
+    codes[missing] = n_bins
+    return codes
+
+
+def group_codes(groups):
+    """Código entero de cada grupo (los faltantes forman su propio grupo)"""
+    codes, _ = pd.factorize(np.asarray(groups), use_na_sentinel=False)
+    return codes
+
+
+def _ranks_within(codes, order):
+    """
+    Ordenar las filas por estrato manteniendo el orden aleatorio dentro
+    de cada uno.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (filas ordenadas, rango de cada una dentro de su estrato,
+        tamaño de cada estrato).
+    """
+    keys = codes[order]
+    if keys.max(initial=0) < 2 ** 16:
+        # NumPy ordena los enteros de 16 bits por radix (tiempo lineal)
+        keys = keys.astype(np.uint16)
+    rows = order[np.argsort(keys, kind="stable")]
+    sizes = np.bincount(codes)
+    starts = np.cumsum(sizes) - sizes
+    ranks = np.arange(len(rows)) - starts[codes[rows]]
+    return rows, ranks, sizes
+
+
+def _group_positions(codes, rng):
+    """
+    Orden aleatorio de los grupos y filas acumuladas antes de cada uno.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (grupos en orden aleatorio, filas de los grupos anteriores).
+    """
+    sizes = np.bincount(codes)
+    order = rng.permutation(len(sizes))
+    before = np.cumsum(sizes[order]) - sizes[order]
+    return order, before
+
+
+def random_split(n_rows, train_size, seed=None, strata=None, groups=None):
+    """
+    División aleatoria reproducible.
+
+    Sin estratos ni grupos se barajan solo las posiciones 0..n-1 con
+    train_test_split, de modo que con la misma semilla las filas
+    elegidas son las mismas que al dividir el DataFrame completo.
+
+    Parameters
+    ----------
+    n_rows : int
+        Filas del DataFrame.
+    train_size : float
+        Fracción de entrenamiento (0, 1).
+    seed : int, opcional
+        Semilla aleatoria.
+    strata : np.ndarray of int, opcional
+        Estrato de cada fila (p. ej. quantile_bins de la salida); cada
+        estrato se reparte con la misma proporción.
+    groups : np.ndarray of int, opcional
+        Grupo de cada fila (ver group_codes); cada grupo va entero a un
+        conjunto.
+
+    Returns
+    -------
+    DataSplit
+    """
+    if strata is None and groups is None:
+        train, test = train_test_split(
+            np.arange(n_rows), train_size=train_size, random_state=seed,
+            shuffle=True)
+        return DataSplit(train, test, n_rows)
+
+    rng = np.random.default_rng(seed)
+    if groups is not None:
+        codes = np.asarray(groups)
+        order, before = _group_positions(codes, rng)
+        if len(order) < 2:
+            raise ValueError("Se necesitan al menos 2 grupos para dividir.")
+        # Grupos completos hasta alcanzar la fracción de entrenamiento,
+        # dejando siempre al menos uno para test
+        in_train = np.zeros(len(order), dtype=bool)
+        in_train[order] = before < train_size * n_rows
+        in_train[order[-1]] = False
+        train_mask = in_train[codes]
+        return DataSplit(np.flatnonzero(train_mask),
+                         np.flatnonzero(~train_mask), n_rows)
+
+    codes = np.asarray(strata)
+    rows, ranks, sizes = _ranks_within(codes, rng.permutation(n_rows))
+    n_train = np.rint(sizes * train_size).astype(np.intp)
+    selected = ranks < n_train[codes[rows]]
+    return DataSplit(rows[selected], rows[~selected], n_rows)
+
+
+def fold_labels(n_rows, n_splits, rng, strata=None, groups=None):
+    """
+    Partición (0..n_splits-1) de cada fila para un k-fold.
+
+    Parameters
+    ----------
+    n_rows : int
+        Filas del DataFrame.
+    n_splits : int
+        Número de particiones.
+    rng : np.random.Generator
+        Generador aleatorio.
+    strata, groups : np.ndarray of int, opcional
+        Como en random_split: con estratos cada uno se reparte por igual
+        entre las particiones; con grupos cada grupo cae entero en una.
+
+    Returns
+    -------
+    np.ndarray of int
+    """
+    order = rng.permutation(n_rows)
+    labels = np.empty(n_rows, dtype=np.intp)
+
+    if groups is not None:
+        codes = np.asarray(groups)
+        groups_order, before = _group_positions(codes, rng)
+        if len(groups_order) < n_splits:
+            raise ValueError(
+                f"Se necesitan al menos {n_splits} grupos para "
+                f"{n_splits} particiones.")
+        # Grupos consecutivos hasta completar ~n/k filas por partición
+        group_fold = np.empty(len(groups_order), dtype=np.intp)
+        group_fold[groups_order] = before * n_splits // n_rows
+        return group_fold[codes]
+
+    if strata is not None:
+        rows, _, _ = _ranks_within(np.asarray(strata), order)
+        # Turnos 0, 1, ..., k-1, 0, 1... sobre las filas ordenadas por
+        # estrato: cada estrato se reparte por igual entre particiones
+        labels[rows] = np.arange(n_rows) % n_splits
+        return labels
+
+    labels[order] = np.arange(n_rows) * n_splits // n_rows
+    return labels
+
+
+def time_order(times):
+    """
+    Posiciones de las filas ordenadas de la fecha más antigua a la más
+    reciente.
+
+    Parameters
+    ----------
+    times : pd.Series
+        Fechas de cada fila (datetime64 o texto convertible). Con zona
+        horaria se ordena por el instante UTC.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (posiciones ordenadas sin las fechas faltantes, nanosegundos
+        desde 1970 de esas filas en el mismo orden).
+    """
+    _, utc, missing = datetime_ints(times)
+    valid = np.flatnonzero(~missing)
+    keys = utc[valid]
+    order = np.argsort(keys, kind="stable")
+    return valid[order], keys[order]
+
+
+def temporal_split(times, train_size):
+    """
+    Entrenamiento con las filas más antiguas y test con las más recientes.
+
+    Las filas con la misma fecha quedan en el mismo conjunto y las filas
+    sin fecha no entran en ninguno.
+
+    Parameters
+    ----------
+    times : pd.Series
+        Fecha de cada fila.
+    train_size : float
+        Fracción de entrenamiento (0, 1) sobre las filas con fecha.
+
+    Returns
+    -------
+    DataSplit
+    """
+    rows, keys = time_order(times)
+    if len(rows) < 2:
+        raise ValueError("Se necesitan al menos 2 filas con fecha.")
+    cut = min(max(int(round(len(rows) * train_size)), 1), len(rows) - 1)
+    # Sin partir una misma fecha: sus filas pasan a test y, si con eso
+    # no queda entrenamiento, a entrenamiento
+    cut = np.searchsorted(keys, keys[cut], side="left")
+    if cut == 0:
+        cut = np.searchsorted(keys, keys[0], side="right")
+    if cut == len(rows):
+        raise ValueError("Todas las filas tienen la misma fecha.")
+    return DataSplit(rows[:cut], rows[cut:], len(times))
@@ -0,0 +1,479 @@
+"""
+Búsqueda de las mejores entradas sobre la matriz de Gram en caché.
+
+- "forward": parte de ninguna entrada y añade en cada paso la que más
+  mejora el criterio.
+- "backward": parte de todas (las linealmente independientes) y quita en
+  cada paso la que menos empeora el criterio.
+- "exhaustive": todos los subconjuntos de hasta `max_size` entradas.
+
+Ningún candidato se ajusta con los datos: todo sale de la matriz de
+productos cruzados centrada C del entrenamiento (GramCache). Para el
+conjunto actual S se mantiene el factor de Cholesky L de C[S, S] y
+z = L⁻¹·C[S, y], con lo que SSE(S) = Syy - z·z. Añadir una entrada j es
+añadir una fila a L (w = L⁻¹·C[S, j], pivote d = C[j, j] - w·w) y quitar
+una es un update de rango uno del bloque que queda debajo. Todos los
+candidatos de un paso se evalúan a la vez con operaciones matriciales,
+y en la búsqueda exhaustiva los subárboles (uno por primera entrada) se
+reparten entre hilos.
+
+Criterios (con n filas de entrenamiento y k entradas):
+
+- "adj_r2": R² ajustado = 1 - (SSE / (n-k-1)) / (Syy / (n-1)) (mayor es
+  mejor).
+- "aic": n·ln(SSE/n) + 2(k+1).
+- "bic": n·ln(SSE/n) + (k+1)·ln(n).
+- "val_mse": ECM en las filas de validación, una parte del
+  entrenamiento que no se usa para ajustar (DataSplit.holdout; en la
+  GUI, app.search_gram y app.validation_gram). El test queda intacto.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from math import comb
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+
+SEARCH_METHODS = ("forward", "backward", "exhaustive")
+
+SEARCH_NAMES = {
+    "forward": "hacia delante",
+    "backward": "hacia atrás",
+    "exhaustive": "todos los subconjuntos"
+}
+
+CRITERIA = ("adj_r2", "aic", "bic", "val_mse")
+
+CRITERION_NAMES = {
+    "adj_r2": "R² ajustado",
+    "aic": "AIC",
+    "bic": "BIC",
+    "val_mse": "ECM de validación"
+}
+
+# Columna de la tabla de resultados con cada criterio
+CRITERION_COLUMNS = {
+    "adj_r2": "r2_ajustado",
+    "aic": "aic",
+    "bic": "bic",
+    "val_mse": "mse_validación"
+}
+
+# Límite de subconjuntos de la búsqueda exhaustiva
+MAX_SUBSETS = 500_000
+
+# Pivote mínimo (relativo a C[j, j]) para que una entrada no se
+# considere combinación lineal de las ya elegidas
+COLLINEAR_TOL = 1e-10
+
+
+class FeatureSearch:
+    """
+    Búsqueda de entradas para una salida.
+
+    Parameters
+    ----------
+    gram : GramCache
+        Productos cruzados de las filas con las que se ajusta.
+    output : str
+        Columna de salida.
+    candidates : list, opcional
+        Entradas candidatas (por defecto, todas las columnas numéricas
+        sin faltantes salvo la salida).
+    criterion : str
+        Uno de CRITERIA; decide qué conjunto es mejor.
+    validation : GramCache, opcional
+        Productos cruzados de las filas de validación, separadas de las
+        de `gram` (p. ej. las dos cachés de DataSplit.holdout);
+        necesaria con "val_mse" y, si se da, se informa con cualquier
+        criterio.
+    """
+
+    def __init__(self, gram, output, candidates=None, criterion="bic",
+                 validation=None):
+        if criterion not in CRITERIA:
+            raise ValueError(f"Criterio no válido: {criterion}")
+        if not gram.supports([output]):
+            raise ValueError(
+                "La salida no es numérica o tiene valores faltantes.")
+        if candidates is None:
+            candidates = gram.columns
+        self.candidates = [column for column in candidates
+                           if column != output and gram.supports([column])]
+        if not self.candidates:
+            raise ValueError("No hay entradas numéricas candidatas.")
+        self.output = output
+        self.criterion = criterion
+        self.n_rows = gram.n_rows
+
+        columns = self.candidates + [output]
+        mean, cross = gram.statistics(columns)
+        self._mean = mean
+        self._cross = cross[:-1, :-1]
+        self._cxy = cross[:-1, -1]
+        self._syy = cross[-1, -1]
+
+        self._validation = None
+        if validation is not None and validation.n_rows > 0 and (
+                validation.supports(columns)):
+            self._validation = (*validation.statistics(columns),
+                                validation.n_rows)
+        if criterion == "val_mse" and self._validation is None:
+            raise ValueError(
+                "El ECM de validación necesita filas de validación sin "
+                "valores faltantes.")
+
+    # ------------------------------------------------------------
+    # Búsquedas
+    # ------------------------------------------------------------
+
+    def run(self, method, max_size=None, top=10, context=None):
+        """Ejecutar una de SEARCH_METHODS (ver cada método)"""
+        if method == "forward":
+            return self.forward(max_size, context)
+        if method == "backward":
+            return self.backward(context=context)
+        if method == "exhaustive":
+            return self.exhaustive(max_size or 3, top, context)
+        raise ValueError(f"Búsqueda no válida: {method}")
+
+    def forward(self, max_features=None, context=None):
+        """
+        Selección hacia delante.
+
+        Parameters
+        ----------
+        max_features : int, opcional
+            Entradas máximas (por defecto, todas).
+        context : TaskContext, opcional
+            Cancelación y progreso.
+
+        Returns
+        -------
+        pd.DataFrame
+            Un conjunto por paso, ordenados del mejor al peor.
+        """
+        limit = self._size_limit(max_features)
+        selected, L, z = [], np.zeros((0, 0)), np.zeros(0)
+        sse = self._syy
+        steps = []
+
+        while len(selected) < limit:
+            if context is not None:
+                context.report(len(selected) / limit)
+            remaining = np.setdiff1d(np.arange(len(self.candidates)),
+                                     selected)
+            child = self._extend(selected, L, z, sse, remaining)
+            if not child["valid"].any():
+                break
+            objective = self._objective(
+                child["sse"], len(selected) + 1, child["coef"])
+            objective[~child["valid"]] = np.inf
+            best = int(np.argmin(objective))
+
+            L, z = _append_row(L, child["w"][:, best], child["pivot"][best],
+                               z, child["z"][best])
+            selected.append(int(remaining[best]))
+            sse = child["sse"][best]
+            steps.append((tuple(selected), sse, child["coef"][:, best]))
+
+        return self._table(steps)
+
+    def backward(self, min_features=1, context=None):
+        """
+        Eliminación hacia atrás.
+
+        Empieza con todas las entradas linealmente independientes (en el
+        orden de `candidates`) y quita una por paso actualizando el
+        factor de Cholesky (update de rango uno).
+
+        Returns
+        -------
+        pd.DataFrame
+            Un conjunto por paso, ordenados del mejor al peor.
+        """
+        selected, L, z = self._independent_set()
+        sse = self._syy - z @ z
+        steps = [(tuple(selected), sse, self._full_coef(selected, L, z))]
+        start = len(selected)
+
+        while len(selected) > max(min_features, 1):
+            if context is not None:
+                context.report((start - len(selected)) / start)
+            # Quitar la entrada i: SSE sube b_i² / (C⁻¹)_ii y el resto
+            # de coeficientes cambia en -C⁻¹[:, i]·b_i / (C⁻¹)_ii
+            inverse_l = solve_triangular(
+                L, np.eye(len(selected)), lower=True)
+            inverse = inverse_l.T @ inverse_l
+            coef = inverse_l.T @ z
+            diagonal = np.diag(inverse)
+            sse_drop = sse + coef ** 2 / diagonal
+            reduced = coef[:, None] - inverse * (coef / diagonal)[None, :]
+            np.fill_diagonal(reduced, 0.0)
+            full = np.zeros((len(self.candidates), len(selected)))
+            full[selected] = reduced
+
+            objective = self._objective(sse_drop, len(selected) - 1, full)
+            position = int(np.argmin(objective))
+
+            L = _cholesky_delete(L, position)
+            del selected[position]
+            z = solve_triangular(L, self._cxy[selected], lower=True)
+            sse = self._syy - z @ z
+            steps.append((tuple(selected), sse, full[:, position]))
+
+        return self._table(steps)
+
+    def exhaustive(self, max_size=3, top=10, context=None):
+        """
+        Todos los subconjuntos de 1 a `max_size` entradas.
+
+        Cada subárbol (subconjuntos cuya primera entrada es una dada) se
+        recorre en profundidad extendiendo el factor de Cholesky, y los
+        subárboles se reparten entre hilos (o con el map del contexto).
+
+        Parameters
+        ----------
+        max_size : int
+            Entradas máximas por subconjunto.
+        top : int
+            Número de conjuntos a devolver.
+        context : TaskContext, opcional
+            Cancelación, progreso y ejecución paralela.
+
+        Returns
+        -------
+        pd.DataFrame
+            Los `top` mejores conjuntos, del mejor al peor.
+        """
+        n_candidates = len(self.candidates)
+        max_size = self._size_limit(max_size)
+        total = sum(comb(n_candidates, size)
+                    for size in range(1, max_size + 1))
+        if total > MAX_SUBSETS:
+            raise ValueError(
+                f"Hay {total} subconjuntos posibles (máximo {MAX_SUBSETS});"
+                " reduzca el número de entradas por subconjunto.")
+
+        def explore(first):
+            found = []
+            root = self._extend([], np.zeros((0, 0)), np.zeros(0),
+                                self._syy, np.array([first]))
+            if not root["valid"][0]:
+                return found
+            self._collect(found, [], np.array([first]), root)
+
+            def visit(selected, L, z, sse):
+                if context is not None:
+                    context.check()
+                remaining = np.arange(selected[-1] + 1, n_candidates)
+                if len(selected) >= max_size or not remaining.size:
+                    return
+                child = self._extend(selected, L, z, sse, remaining)
+                self._collect(found, selected, remaining, child)
+                if len(selected) + 1 >= max_size:
+                    return
+                for i in np.flatnonzero(child["valid"]):
+                    new_l, new_z = _append_row(
+                        L, child["w"][:, i], child["pivot"][i], z,
+                        child["z"][i])
+                    visit(selected + [int(remaining[i])], new_l, new_z,
+                          child["sse"][i])
+
+            L, z = _append_row(np.zeros((0, 0)), np.zeros(0),
+                               root["pivot"][0], np.zeros(0), root["z"][0])
+            visit([first], L, z, root["sse"][0])
+            return found
+
+        firsts = range(n_candidates)
+        if context is not None:
+            parts = context.map(explore, firsts)
+        else:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                parts = list(pool.map(explore, firsts))
+
+        subsets, sse, validation = [], [], []
+        for part in parts:
+            for block_subsets, block_sse, block_validation in part:
+                subsets.extend(block_subsets)
+                sse.append(block_sse)
+                validation.append(block_validation)
+        if not subsets:
+            raise ValueError("Ninguna entrada es linealmente independiente.")
+        sse = np.concatenate(sse)
+        validation = np.concatenate(validation)
+        sizes = np.array([len(subset) for subset in subsets])
+
+        objective = self._objective(sse, sizes, validation=validation)
+        best = np.argsort(objective, kind="stable")[:top]
+        return self._frame([subsets[i] for i in best], sse[best],
+                           sizes[best], validation[best])
+
+    # ------------------------------------------------------------
+    # Factorización
+    # ------------------------------------------------------------
+
+    def _extend(self, selected, L, z, sse, remaining):
+        """
+        Evaluar a la vez la adición de cada entrada de `remaining`.
+
+        Returns
+        -------
+        dict
+            w (k x m), pivot, z y sse (m) de cada candidato, valid (no
+            colineal) y coef (coeficientes p x m del conjunto ampliado).
+        """
+        cross = self._cross
+        diagonal = cross[remaining, remaining]
+        if selected:
+            w = solve_triangular(
+                L, cross[np.ix_(selected, remaining)], lower=True)
+        else:
+            w = np.zeros((0, len(remaining)))
+        pivot_sq = diagonal - (w ** 2).sum(axis=0)
+        valid = pivot_sq > COLLINEAR_TOL * np.maximum(diagonal, 1e-300)
+        pivot = np.sqrt(np.where(valid, pivot_sq, 1.0))
+        z_new = (self._cxy[remaining] - w.T @ z) / pivot
+
+        # Coeficientes: el último es z_new / pivote y los anteriores se
+        # corrigen con L⁻ᵀ·w
+        last = z_new / pivot
+        coef = np.zeros((len(self.candidates), len(remaining)))
+        if selected:
+            base = solve_triangular(L.T, z, lower=False)
+            shift = solve_triangular(L.T, w, lower=False)
+            coef[selected] = base[:, None] - shift * last[None, :]
+        coef[remaining, np.arange(len(remaining))] = last
+        return {"w": w, "pivot": pivot, "z": z_new,
+                "sse": np.where(valid, sse - z_new ** 2, np.inf),
+                "valid": valid, "coef": coef}
+
+    def _independent_set(self):
+        """Entradas linealmente independientes y su factor de Cholesky"""
+        selected, L, z = [], np.zeros((0, 0)), np.zeros(0)
+        for j in range(len(self.candidates)):
+            child = self._extend(selected, L, z, self._syy, np.array([j]))
+            if child["valid"][0]:
+                L, z = _append_row(L, child["w"][:, 0], child["pivot"][0],
+                                   z, child["z"][0])
+                selected.append(j)
+        if not selected:
+            raise ValueError("Ninguna entrada es linealmente independiente.")
+        return selected, L, z
+
+    def _full_coef(self, selected, L, z):
+        coef = np.zeros(len(self.candidates))
+        coef[selected] = solve_triangular(L.T, z, lower=False)
+        return coef
+
+    # ------------------------------------------------------------
+    # Criterios y resultados
+    # ------------------------------------------------------------
+
+    def _size_limit(self, size):
+        """Entradas máximas (deja al menos un grado de libertad)"""
+        limit = len(self.candidates) if size is None else int(size)
+        return max(1, min(limit, len(self.candidates), self.n_rows - 2))
+
+    def _metrics(self, sse, sizes):
+        n = self.n_rows
+        sse = np.maximum(np.asarray(sse, dtype=float), 1e-300)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adjusted = 1 - (sse / (n - sizes - 1)) / (self._syy / (n - 1))
+        log_mse = n * np.log(sse / n)
+        return {
+            "r2": 1 - sse / self._syy,
+            "r2_ajustado": adjusted,
+            "aic": log_mse + 2 * (sizes + 1),
+            "bic": log_mse + (sizes + 1) * np.log(n)
+        }
+
+    def _objective(self, sse, sizes, coef=None, validation=None):
+        """Valor a minimizar según el criterio"""
+        if self.criterion == "val_mse":
+            if validation is None:
+                validation = self._validation_mse(coef)
+            return np.where(np.isfinite(sse), validation, np.inf)
+        value = self._metrics(sse, np.asarray(sizes))[
+            CRITERION_COLUMNS[self.criterion]]
+        value = -value if self.criterion == "adj_r2" else value
+        return np.where(np.isfinite(sse), value, np.inf)
+
+    def _validation_mse(self, coef):
+        """
+        ECM de validación de cada columna de coeficientes (p x m), con el
+        término independiente del entrenamiento.
+        """
+        coef = np.asarray(coef, dtype=float).reshape(len(self.candidates), -1)
+        if self._validation is None:
+            return np.full(coef.shape[1], np.nan)
+        mean, cross, n_rows = self._validation
+        intercept = self._mean[-1] - self._mean[:-1] @ coef
+        bias = mean[-1] - mean[:-1] @ coef - intercept
+        sse = (cross[-1, -1] - 2 * cross[:-1, -1] @ coef
+               + (coef * (cross[:-1, :-1] @ coef)).sum(axis=0)
+               + n_rows * bias ** 2)
+        return np.maximum(sse, 0.0) / n_rows
+
+    def _collect(self, found, selected, remaining, child):
+        """Guardar los candidatos válidos de un paso de la exhaustiva"""
+        valid = np.flatnonzero(child["valid"])
+        if not valid.size:
+            return
+        subsets = [tuple(selected) + (int(remaining[i]),) for i in valid]
+        found.append((subsets, child["sse"][valid],
+                      self._validation_mse(child["coef"][:, valid])))
+
+    def _table(self, steps):
+        subsets = [subset for subset, _, _ in steps]
+        sse = np.array([value for _, value, _ in steps])
+        coef = np.column_stack([value for _, _, value in steps])
+        sizes = np.array([len(subset) for subset in subsets])
+        validation = self._validation_mse(coef)
+        frame = self._frame(subsets, sse, sizes, validation)
+        frame.insert(0, "paso", np.arange(1, len(steps) + 1))
+        objective = self._objective(sse, sizes, validation=validation)
+        return frame.iloc[np.argsort(objective, kind="stable")].reset_index(
+            drop=True)
+
+    def _frame(self, subsets, sse, sizes, validation):
+        metrics = self._metrics(sse, sizes)
+        return pd.DataFrame({
+            "entradas": [tuple(self.candidates[i] for i in subset)
+                         for subset in subsets],
+            "n_entradas": sizes,
+            **metrics,
+            "mse_validación": validation
+        })
+
+
+def _append_row(L, w, pivot, z, z_last):
+    """Factor de Cholesky y z ampliados con una entrada"""
+    size = len(z)
+    new_l = np.zeros((size + 1, size + 1))
+    new_l[:size, :size] = L
+    new_l[size, :size] = w
+    new_l[size, size] = pivot
+    return new_l, np.append(z, z_last)
+
+
+def _cholesky_delete(L, position):
+    """
+    Factor de Cholesky tras quitar una fila y columna de la matriz.
+
+    El bloque bajo la entrada quitada recibe un update de rango uno con
+    su columna: L33·L33' + l32·l32'.
+    """
+    column = L[position + 1:, position].copy()
+    reduced = np.delete(np.delete(L, position, axis=0), position, axis=1)
+    block = reduced[position:, position:]
+    for k in range(len(column)):
+        radius = np.hypot(block[k, k], column[k])
+        cos, sin = radius / block[k, k], column[k] / block[k, k]
+        block[k, k] = radius
+        block[k + 1:, k] = (block[k + 1:, k] + sin * column[k + 1:]) / cos
+        column[k + 1:] = cos * column[k + 1:] - sin * block[k + 1:, k]
+    reduced[position:, position:] = block
+    return reduced
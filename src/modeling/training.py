@@ -0,0 +1,207 @@
+"""
+Entrenamiento y evaluación del modelo lineal fuera de la interfaz.
+
+train_linear_model hace todo el cálculo (reunir columnas, matriz de
+diseño, ajuste, predicciones, métricas y validación cruzada) sin tocar
+Tk, así que la GUI puede ejecutarlo en el TaskRunner y dibujar el
+resultado después en el hilo principal. Entre etapas se comprueba la
+cancelación del contexto.
+
+Si se le pasa una GramCache y las entradas son numéricas sin
+transformar, el ajuste se resuelve desde la caché sin recorrer el
+entrenamiento; solo el test se transforma y se predice.
+
+Los estadísticos suficientes del entrenamiento y del test
+(IncrementalLeastSquares), que se guardan con el modelo para poder
+actualizarlo después solo con filas nuevas (ver recursive), no se
+calculan al entrenar: TrainingResult.sufficient_statistics los construye
+cuando se piden, normalmente al guardar.
+
+Con una RegularizedRegression el modelo es Ridge, Lasso o ElasticNet:
+se calcula la ruta de penalizaciones y la validación cruzada indicada
+sirve para elegir α (ver regularization).
+"""
+
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+from .least_squares import IncrementalLeastSquares
+
+
+class TrainingResult:
+    """
+    Modelo ajustado y sus métricas.
+
+    Attributes
+    ----------
+    model : LinearRegression
+        Modelo ajustado con el entrenamiento.
+    design : DesignMatrix
+        Matriz de diseño ajustada con el entrenamiento.
+    train, test : pd.DataFrame
+        Filas de cada conjunto (solo las columnas del modelo).
+    y_pred_test : np.ndarray
+        Predicciones del test.
+    r2, mse : list of float
+        [entrenamiento, test].
+    cv_result : CrossValidationResult o None
+        Resultado de la validación cruzada, si se pidió y fue posible.
+    cv_error : ValueError o None
+        Motivo por el que no se pudo hacer la validación cruzada.
+    path : RegularizationPath o None
+        Ruta de regularización, si el modelo es regularizado.
+    gram : GramCache o None
+        Caché con la que se ajustó el modelo, si se usó.
+    """
+
+    def __init__(self, model, design, train, test, y_pred_test, r2, mse,
+                 cv_result=None, cv_error=None, path=None, gram=None):
+        self.model = model
+        self.design = design
+        self.train = train
+        self.test = test
+        self.y_pred_test = y_pred_test
+        self.r2 = r2
+        self.mse = mse
+        self.cv_result = cv_result
+        self.cv_error = cv_error
+        self.path = path
+        self.gram = gram
+        self._statistics = None
+
+    def sufficient_statistics(self, output, context=None):
+        """
+        Estadísticos suficientes del entrenamiento y del test.
+
+        Son matrices densas p x p de las columnas de diseño, así que se
+        calculan la primera vez que se piden y no en cada entrenamiento.
+
+        Parameters
+        ----------
+        output : str
+            Columna de salida.
+        context : TaskContext, opcional
+            Cancelación (se calculan en segundo plano al guardar).
+
+        Returns
+        -------
+        tuple of IncrementalLeastSquares or None
+            (entrenamiento, test), o None si el modelo es regularizado
+            (la actualización recursiva es de mínimos cuadrados).
+        """
+        if self.path is not None:
+            return None
+        if self._statistics is None:
+            names = list(self.design.feature_names)
+            if self.gram is not None:
+                # Las columnas de diseño son las propias entradas
+                mean, cross = self.gram.statistics(names + [output])
+                train = IncrementalLeastSquares.from_statistics(
+                    self.gram.n_rows, mean[:-1], mean[-1], cross[:-1, :-1],
+                    cross[:-1, -1], cross[-1, -1])
+            else:
+                train = IncrementalLeastSquares(len(names)).update(
+                    self.design.transform(self.train), self.train[output])
+            if context is not None:
+                context.check()
+            test = IncrementalLeastSquares(len(names)).update(
+                self.design.transform(self.test), self.test[output])
+            self._statistics = (train, test)
+        return self._statistics
+
+
+def train_linear_model(dataframe, split, inputs, output, make_design,
+                       validation=None, context=None, gram=None,
+                       regularization=None):
+    """
+    Ajustar el modelo con el entrenamiento y evaluarlo con el test.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos preprocesados.
+    split : DataSplit
+        Posiciones de entrenamiento y test.
+    inputs : list
+        Columnas de entrada.
+    output : str
+        Columna de salida.
+    make_design : callable
+        Devuelve una DesignMatrix nueva (sin ajustar).
+    validation : CrossValidation o RollingOrigin, opcional
+        Evaluación adicional por particiones (con regularización no se
+        hace: las particiones de la regularización eligen α).
+    context : TaskContext, opcional
+        Cancelación y progreso.
+    gram : GramCache, opcional
+        Productos cruzados del entrenamiento de esta división.
+    regularization : RegularizedRegression, opcional
+        Ajustar Ridge, Lasso o ElasticNet en lugar de mínimos cuadrados.
+
+    Returns
+    -------
+    TrainingResult
+    """
+    def step(fraction, message):
+        if context is not None:
+            context.report(fraction, message)
+
+    step(0.0, "Reuniendo los datos...")
+    columns = list(dict.fromkeys(list(inputs) + [output]))
+    train = split.train_frame(dataframe, columns)
+    test = split.test_frame(dataframe, columns)
+    y_train = train[output]
+    y_test = test[output]
+
+    # Las codificaciones se aprenden solo con entrenamiento
+    step(0.1, "Construyendo la matriz de diseño...")
+    design = make_design()
+    path = None
+    if regularization is not None:
+        gram = None
+        X_train = design.fit_transform(train, y_train)
+        step(0.3, "Calculando la ruta de regularización...")
+        # Estratos o grupos de las filas de entrenamiento
+        strata, groups = regularization.validation.labels(dataframe, output)
+        path = regularization.fit(
+            X_train, y_train,
+            strata[split.train] if strata is not None else None,
+            groups[split.train] if groups is not None else None,
+            context)
+        path.feature_names = list(design.feature_names)
+        model = path.to_model()
+        y_pred_train = model.predict(X_train)
+        r2_train = r2_score(y_train, y_pred_train)
+        mse_train = mean_squared_error(y_train, y_pred_train)
+    elif (gram is not None and not design.transformers
+            and design.scaler is None and gram.supports(columns)):
+        step(0.3, "Ajustando el modelo...")
+        design.fit(train, y_train)
+        model, r2_train, mse_train = gram.fit(inputs, output)
+    else:
+        gram = None
+        X_train = design.fit_transform(train, y_train)
+        step(0.3, "Ajustando el modelo...")
+        model = LinearRegression().fit(X_train, y_train)
+        y_pred_train = model.predict(X_train)
+        r2_train = r2_score(y_train, y_pred_train)
+        mse_train = mean_squared_error(y_train, y_pred_train)
+
+    step(0.6, "Evaluando el modelo...")
+    X_test = design.transform(test)
+    y_pred_test = model.predict(X_test)
+    r2 = [r2_train, r2_score(y_test, y_pred_test)]
+    mse = [mse_train, mean_squared_error(y_test, y_pred_test)]
+
+    cv_result = cv_error = None
+    if validation is not None and regularization is None:
+        step(0.7, "Validación cruzada...")
+        try:
+            cv_result = validation.evaluate(
+                dataframe, inputs, output, make_design, context=context)
+        except ValueError as error:
+            # P. ej. menos grupos que particiones
+            cv_error = error
+
+    return TrainingResult(model, design, train, test, y_pred_test, r2, mse,
+                          cv_result, cv_error, path, gram)
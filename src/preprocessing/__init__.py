@@ -0,0 +1,71 @@
+"""
+Paquete preprocessing
+---------------------
+Módulo encargado del preprocesado de los datos, independiente de la GUI.
+
+Módulos:
+- pipeline.py: pasos de preprocesado y pipeline que los ejecuta sin
+  copias intermedias y los repite sobre datos nuevos.
+- imputation.py: motor de imputación de NaN en una sola pasada (media,
+  mediana, constante, moda, relleno hacia delante/atrás, interpolación).
+- knn_imputer.py: imputación por vecinos más cercanos con KD-tree.
+- history.py: deshacer/rehacer con cambios compactos y memoria limitada.
+- outliers.py: límites de valores atípicos (z, IQR, MAD) vectorizados.
+- duplicates.py: filas duplicadas mediante un hash vectorizado por fila.
+- encoding.py: codificación de columnas categóricas (one-hot dispersa,
+  ordinal y media del objetivo).
+- scaling.py: escalado (estandarización, min-max) en una sola pasada.
+- datetime_features.py: variables numéricas a partir de fechas
+  (segundos, calendario y codificación cíclica).
+- features.py: matriz de diseño del modelo a partir de las entradas.
+
+Clases principales expuestas:
+- PreprocessingPipeline(steps=None)
+- DropMissingRows(columns)
+- FillMissing(columns, strategy, value=None)
+- KNNFill(columns, k=5)
+- OutlierFilter(columns, method="iqr", threshold=None, action="drop")
+- DropDuplicates(columns=None)
+- KNNImputer(k=5, max_reference=None, seed=0)
+- PreprocessingHistory(pipeline, max_bytes=DEFAULT_MAX_BYTES)
+- CategoricalEncoder(column, method="onehot", smoothing=10.0)
+- FeatureScaler(method="standard")
+- DatetimeExpander(column, features=DATETIME_FEATURES)
+- DesignMatrix(columns, encodings=None, scaling=None, datetimes=None)
+
+Funciones principales expuestas:
+- impute(columns, strategies, values=None, constant=None, rows=None)
+- count_outliers(dataframe, columns, method, threshold=None)
+- count_duplicates(dataframe, columns=None)
+- datetime_features(series, features=DATETIME_FEATURES)
+"""
+
+from .datetime_features import (
+    DATETIME_FEATURES, DATETIME_FEATURE_NAMES, DatetimeExpander,
+    datetime_features
+)
+from .duplicates import count_duplicates
+from .encoding import ENCODINGS, ENCODING_NAMES, CategoricalEncoder
+from .features import DesignMatrix
+from .scaling import SCALINGS, SCALING_NAMES, FeatureScaler
+from .imputation import NUMERIC_ONLY, STRATEGIES, STRATEGY_NAMES, impute
+from .history import PreprocessingHistory
+from .knn_imputer import KNNImputer
+from .outliers import (
+    DEFAULT_THRESHOLDS, OUTLIER_METHODS, OUTLIER_NAMES, count_outliers
+)
+from .pipeline import (
+    PreprocessingPipeline, PreprocessingStep, DropMissingRows, FillMissing,
+    KNNFill, OutlierFilter, DropDuplicates
+)
+
+__all__ = [
+    "PreprocessingPipeline", "PreprocessingStep", "DropMissingRows",
+    "FillMissing", "KNNFill", "OutlierFilter", "DropDuplicates", "KNNImputer",
+    "PreprocessingHistory", "CategoricalEncoder", "FeatureScaler",
+    "DatetimeExpander", "DesignMatrix", "impute", "count_outliers",
+    "count_duplicates", "datetime_features", "STRATEGIES", "STRATEGY_NAMES",
+    "NUMERIC_ONLY", "OUTLIER_METHODS", "OUTLIER_NAMES", "DEFAULT_THRESHOLDS",
+    "ENCODINGS", "ENCODING_NAMES", "SCALINGS", "SCALING_NAMES",
+    "DATETIME_FEATURES", "DATETIME_FEATURE_NAMES"
+]
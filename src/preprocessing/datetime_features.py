@@ -0,0 +1,197 @@
+"""
+Variables numéricas a partir de columnas de fecha y hora.
+
+`coerce_dtypes` convierte en datetime64 las columnas de texto con forma
+de fecha. Para usarlas como entradas del modelo se expanden en:
+
+- "epoch": segundos desde 1970-01-01 (tendencia temporal).
+- "year", "month", "dayofweek", "hour": componentes del calendario
+  (lunes = 0).
+- "cyclic": seno y coseno del mes, del día de la semana y de la hora
+  del día, para que diciembre quede junto a enero y las 23:00 junto a
+  las 00:00.
+
+Todo se calcula con operaciones NumPy sobre la representación int64 de
+las fechas (nanosegundos desde 1970), sin recorrer las filas. Las
+fechas con zona horaria usan la hora local para el calendario y UTC
+para los segundos. Las fechas faltantes dan NaN en todas las variables.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+DATETIME_FEATURES = ("epoch", "year", "month", "dayofweek", "hour", "cyclic")
+
+DATETIME_FEATURE_NAMES = {
+    "epoch": "segundos",
+    "year": "año",
+    "month": "mes",
+    "dayofweek": "día semana",
+    "hour": "hora",
+    "cyclic": "cíclicas"
+}
+
+# Periodos de las variables cíclicas (nombre, periodo)
+CYCLES = (("mes", 12), ("día semana", 7), ("hora", 24))
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# 1970-01-01 fue jueves (lunes = 0)
+EPOCH_WEEKDAY = 3
+
+
+def datetime_ints(series):
+    """
+    Nanosegundos desde 1970 de cada fecha.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Fechas (datetime64 o texto convertible).
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (hora local en int64, UTC en int64, máscara de faltantes).
+    """
+    series = pd.Series(series)
+    if not is_datetime64_any_dtype(series):
+        series = pd.to_datetime(series, errors="coerce", format="mixed")
+
+    local = utc = series
+    if series.dt.tz is not None:
+        local = series.dt.tz_localize(None)
+        utc = series.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    def as_int(values):
+        return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    return as_int(local), as_int(utc), series.isna().to_numpy()
+
+
+def datetime_features(series, features=DATETIME_FEATURES):
+    """
+    Expandir una columna de fechas en variables numéricas.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Fechas a expandir.
+    features : sequence of str
+        Variables a calcular (ver DATETIME_FEATURES), en orden.
+
+    Returns
+    -------
+    dict
+        Nombre de la variable -> np.ndarray de float (NaN si falta la
+        fecha), en el orden de `features`.
+    """
+    local, utc, missing = datetime_ints(series)
+    days = local // NS_PER_DAY
+    day_fraction = (local - days * NS_PER_DAY) / NS_PER_DAY
+    # Meses desde 1970 (NumPy trunca al mes en C sobre el mismo int64)
+    months = local.view("datetime64[ns]").astype("datetime64[M]").view(
+        np.int64)
+
+    parts = {
+        "epoch": utc // NS_PER_SECOND,
+        "year": months // 12 + 1970,
+        "month": months % 12 + 1,
+        "dayofweek": (days + EPOCH_WEEKDAY) % 7,
+        "hour": np.floor(day_fraction * 24)
+    }
+    # Fase de cada ciclo en [0, 1)
+    phases = {
+        "mes": (months % 12) / 12,
+        "día semana": ((days + EPOCH_WEEKDAY) % 7 + day_fraction) / 7,
+        "hora": day_fraction
+    }
+
+    result = {}
+    for feature in features:
+        if feature == "cyclic":
+            for name, _ in CYCLES:
+                angle = 2 * np.pi * phases[name]
+                result[f"sin {name}"] = np.sin(angle)
+                result[f"cos {name}"] = np.cos(angle)
+        else:
+            result[DATETIME_FEATURE_NAMES[feature]] = parts[feature]
+
+    for name, values in result.items():
+        values = values.astype(float)
+        values[missing] = np.nan
+        result[name] = values
+    return result
+
+
+class DatetimeExpander:
+    """
+    Expansión de una columna de fechas como entradas del modelo.
+
+    No aprende nada de los datos: las mismas fechas dan siempre las
+    mismas variables, así que se puede repetir al predecir.
+
+    Parameters
+    ----------
+    column : str
+        Nombre de la columna.
+    features : sequence of str, opcional
+        Variables a generar (por defecto todas las de DATETIME_FEATURES).
+    """
+
+    sparse = False
+
+    def __init__(self, column, features=DATETIME_FEATURES):
+        features = list(features)
+        unknown = [name for name in features
+                   if name not in DATETIME_FEATURES]
+        if unknown or not features:
+            raise ValueError(f"Variables de fecha no válidas: {unknown}")
+        self.column = column
+        self.features = features
+
+    @property
+    def feature_names(self):
+        """Nombres de las columnas que produce la expansión"""
+        names = []
+        for feature in self.features:
+            if feature == "cyclic":
+                names.extend(f"{self.column}[{kind} {name}]"
+                             for name, _ in CYCLES
+                             for kind in ("sin", "cos"))
+            else:
+                names.append(
+                    f"{self.column}[{DATETIME_FEATURE_NAMES[feature]}]")
+        return names
+
+    def fit(self, series, y=None):
+        return self
+
+    def transform(self, series):
+        """
+        Expandir una columna.
+
+        Returns
+        -------
+        np.ndarray
+            Matriz n x len(feature_names).
+        """
+        values = datetime_features(series, self.features)
+        return np.column_stack(list(values.values()))
+
+    def fit_transform(self, series, y=None):
+        return self.fit(series, y).transform(series)
+
+    def describe(self):
+        names = ", ".join(
+            DATETIME_FEATURE_NAMES[feature] for feature in self.features)
+        return f"{self.column}: fecha expandida ({names})"
+
+    def to_config(self):
+        return {"column": self.column, "features": list(self.features)}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config["column"], config["features"])
@@ -0,0 +1,114 @@
+"""
+Detección de filas duplicadas mediante un hash por fila.
+
+Cada columna se convierte en un hash de 64 bits por valor
+(pd.util.hash_pandas_object, en C) y los hashes de las columnas se
+combinan fila a fila con operaciones NumPy. Las filas repetidas se
+encuentran con una tabla hash sobre ese único entero (coste lineal), sin
+comparar filas entre sí. Las posibles colisiones se descartan al final
+comparando cada duplicado con la primera aparición de su hash; si en un
+hash hay filas distintas (colisión), las filas de ese hash se comparan
+entre sí con DataFrame.duplicated.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Multiplicador para combinar los hashes de las columnas
+HASH_MULTIPLIER = np.uint64(1_000_003)
+
+
+def row_hashes(columns):
+    """
+    Hash de 64 bits de cada fila.
+
+    Parameters
+    ----------
+    columns : list of pd.Series
+        Columnas con el mismo número de filas.
+
+    Returns
+    -------
+    np.ndarray of uint64
+    """
+    hashes = np.zeros(len(columns[0]), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for series in columns:
+            values = pd.util.hash_pandas_object(series, index=False)
+            hashes *= HASH_MULTIPLIER
+            hashes ^= values.to_numpy()
+    return hashes
+
+
+def duplicate_mask(columns, rows=None):
+    """
+    Marcar las filas que repiten una fila anterior.
+
+    Parameters
+    ----------
+    columns : list of pd.Series
+        Columnas que se comparan.
+    rows : np.ndarray of bool, opcional
+        Filas a considerar (las demás nunca se marcan).
+
+    Returns
+    -------
+    np.ndarray of bool
+        True en cada repetición (la primera aparición se conserva).
+    """
+    n = len(columns[0])
+    positions = np.arange(n) if rows is None else np.flatnonzero(rows)
+    hashes = row_hashes(columns)[positions]
+
+    # factorize numera los hashes por orden de aparición: una fila es
+    # nueva si su código supera a todos los anteriores
+    codes, _ = pd.factorize(hashes)
+    previous = np.maximum.accumulate(np.concatenate([[-1], codes[:-1]]))
+    repeated = codes <= previous
+    mask = np.zeros(n, dtype=bool)
+    if not repeated.any():
+        return mask
+
+    # Primera aparición de cada hash para confirmar las repeticiones
+    first = np.flatnonzero(~repeated)
+    candidates = positions[repeated]
+    originals = positions[first[codes[repeated]]]
+
+    equal = np.ones(candidates.size, dtype=bool)
+    for series in columns:
+        a = series.take(candidates).reset_index(drop=True)
+        b = series.take(originals).reset_index(drop=True)
+        same = (a == b).fillna(False) | (a.isna() & b.isna())
+        equal &= same.to_numpy(dtype=bool)
+
+    mask[candidates[equal]] = True
+
+    # Colisión: el hash agrupa filas distintas y una fila puede repetir
+    # a otra que no es la primera del grupo
+    colliding = np.unique(codes[repeated][~equal])
+    if colliding.size:
+        members = positions[np.isin(codes, colliding)]
+        frame = pd.DataFrame({
+            i: series.take(members).reset_index(drop=True)
+            for i, series in enumerate(columns)
+        })
+        mask[members] = frame.duplicated(keep="first").to_numpy()
+    return mask
+
+
+def count_duplicates(dataframe, columns=None):
+    """
+    Número de filas repetidas (sin contar la primera aparición).
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Datos actuales.
+    columns : list, opcional
+        Columnas que se comparan (por defecto todas).
+    """
+    columns = list(dataframe.columns) if columns is None else list(columns)
+    if not columns or dataframe.empty:
+        return 0
+    return int(duplicate_mask(
+        [dataframe[column] for column in columns]).sum())
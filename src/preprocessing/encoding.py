@@ -0,0 +1,188 @@
+"""
+Codificación de columnas categóricas como variables de entrada.
+
+Todas las codificaciones parten de los códigos enteros de la columna
+(pd.factorize al ajustar y pd.Categorical al transformar), así que el
+coste es lineal en el número de filas y no depende de cuántas
+categorías haya:
+
+- "onehot": una columna 0/1 por categoría salvo la primera (que queda
+  como referencia en el término independiente). Se devuelve como matriz
+  dispersa scipy.sparse, con un único valor por fila.
+- "ordinal": el código de la categoría como una sola columna numérica.
+- "target": la media de la salida en cada categoría, suavizada hacia la
+  media global para las categorías con pocas filas.
+
+Las categorías aprendidas se guardan con el modelo; una categoría nueva
+(o un valor faltante) se codifica como la de referencia en one-hot, -1
+en ordinal y la media global en target.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+ENCODINGS = ("onehot", "ordinal", "target")
+
+ENCODING_NAMES = {
+    "onehot": "one-hot",
+    "ordinal": "ordinal",
+    "target": "media del objetivo"
+}
+
+# Filas equivalentes de la media global en la codificación target
+TARGET_SMOOTHING = 10.0
+
+
+class CategoricalEncoder:
+    """
+    Codificador de una columna categórica.
+
+    Parameters
+    ----------
+    column : str
+        Nombre de la columna.
+    method : str
+        Uno de ENCODINGS.
+    smoothing : float
+        Suavizado de la codificación target.
+    """
+
+    def __init__(self, column, method="onehot", smoothing=TARGET_SMOOTHING):
+        if method not in ENCODINGS:
+            raise ValueError(f"Codificación no válida: {method}")
+        self.column = column
+        self.method = method
+        self.smoothing = float(smoothing)
+        self.categories = None
+        self.target_values = None
+        self.target_mean = None
+
+    @property
+    def feature_names(self):
+        """Nombres de las columnas que produce la codificación"""
+        if self.method != "onehot":
+            return [self.column]
+        return [f"{self.column}[{category}]"
+                for category in self.categories[1:]]
+
+    @property
+    def sparse(self):
+        return self.method == "onehot"
+
+    def fit(self, series, y=None):
+        """
+        Aprender las categorías (y la media por categoría si es target).
+
+        Parameters
+        ----------
+        series : pd.Series
+            Valores de la columna en el conjunto de entrenamiento.
+        y : array-like, opcional
+            Salida del entrenamiento (obligatoria para "target").
+        """
+        return self.fit_counts(self.category_counts(series, y))
+
+    def category_counts(self, series, y=None):
+        """
+        Filas y suma de la salida por categoría de un bloque.
+
+        Los resultados de varios bloques se suman (p. ej. con
+        pd.concat(...).groupby(level=0).sum()) y se pasan a fit_counts,
+        así se ajusta con datos que se leen por partes.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columnas "count" y "sum" indexadas por categoría (solo
+            cuentan las filas con salida; sin salida, "count" cuenta
+            todas).
+        """
+        codes, categories = pd.factorize(series)
+        size = len(categories)
+        if self.method == "target" and y is None:
+            raise ValueError(
+                "La codificación target necesita la columna de salida.")
+        if y is None:
+            known, y = codes >= 0, np.zeros(len(codes))
+        else:
+            y = np.asarray(y, dtype=float)
+            known = (codes >= 0) & ~np.isnan(y)
+        return pd.DataFrame({
+            "count": np.bincount(codes[known], minlength=size),
+            "sum": np.bincount(codes[known], weights=y[known],
+                               minlength=size)
+        }, index=categories)
+
+    def fit_counts(self, counts):
+        """
+        Ajustar con las filas y sumas por categoría (category_counts).
+        """
+        _, categories = pd.factorize(counts.index, sort=True)
+        counts = counts.loc[categories]
+        self.categories = list(categories)
+
+        if self.method == "target":
+            total = counts["count"].sum()
+            self.target_mean = (float(counts["sum"].sum() / total)
+                                if total else 0.0)
+            self.target_values = (
+                (counts["sum"] + self.smoothing * self.target_mean)
+                / (counts["count"] + self.smoothing)
+            ).tolist()
+        return self
+
+    def codes(self, series):
+        """Código de cada valor según las categorías aprendidas (-1 si no)"""
+        return pd.Categorical(series, categories=self.categories).codes
+
+    def transform(self, series):
+        """
+        Codificar una columna.
+
+        Returns
+        -------
+        np.ndarray or scipy.sparse.csr_matrix
+            Matriz n x len(feature_names).
+        """
+        codes = self.codes(series).astype(np.int64)
+        n = len(codes)
+
+        if self.method == "onehot":
+            rows = np.flatnonzero(codes > 0)
+            return sparse.csr_matrix(
+                (np.ones(rows.size), (rows, codes[rows] - 1)),
+                shape=(n, max(len(self.categories) - 1, 0))
+            )
+        if self.method == "ordinal":
+            return codes.astype(float).reshape(n, 1)
+
+        values = np.append(self.target_values, self.target_mean)
+        # Los códigos -1 toman la última posición: la media global
+        return values[codes].reshape(n, 1)
+
+    def fit_transform(self, series, y=None):
+        return self.fit(series, y).transform(series)
+
+    def describe(self):
+        return (f"{self.column}: {ENCODING_NAMES[self.method]} "
+                f"({len(self.categories)} categorías)")
+
+    def to_config(self):
+        return {
+            "column": self.column,
+            "method": self.method,
+            "smoothing": self.smoothing,
+            "categories": list(self.categories),
+            "target_values": self.target_values,
+            "target_mean": self.target_mean
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        encoder = cls(config["column"], config["method"],
+                      config.get("smoothing", TARGET_SMOOTHING))
+        encoder.categories = list(config["categories"])
+        encoder.target_values = config.get("target_values")
+        encoder.target_mean = config.get("target_mean")
+        return encoder
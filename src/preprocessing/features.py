@@ -0,0 +1,222 @@
+"""
+Matriz de diseño del modelo a partir de las columnas de entrada.
+
+Las columnas numéricas pasan tal cual (o escaladas con un FeatureScaler),
+las categóricas se codifican con un CategoricalEncoder y las de fecha se
+expanden en variables numéricas con un DatetimeExpander. Si alguna
+codificación es one-hot el resultado es una matriz dispersa CSR
+(LinearRegression la acepta directamente); si no, una matriz densa.
+Todo lo aprendido (categorías, medias, escalas) se ajusta solo con el
+conjunto de entrenamiento y se guarda con el modelo para repetir la
+transformación al predecir.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .datetime_features import DATETIME_FEATURES, DatetimeExpander
+from .encoding import CategoricalEncoder
+from .scaling import SCALING_NAMES, FeatureScaler, block_moments
+
+
+class DesignMatrix:
+    """
+    Transformación columnas de entrada -> matriz de diseño.
+
+    Parameters
+    ----------
+    columns : list
+        Columnas de entrada, en orden.
+    encodings : dict, opcional
+        Columna categórica -> codificación (ver encoding.ENCODINGS).
+    scaling : str, opcional
+        Escalado de las columnas numéricas (ver scaling.SCALINGS). Los
+        indicadores one-hot y los códigos no se escalan.
+    datetimes : dict, opcional
+        Columna de fecha -> variables a generar (ver
+        datetime_features.DATETIME_FEATURES; None para todas).
+    """
+
+    # Prefijo de las columnas escaladas en la fórmula
+    SCALED_PREFIX = {"standard": "z", "minmax": "mm"}
+
+    def __init__(self, columns, encodings=None, scaling=None,
+                 datetimes=None):
+        self.columns = list(columns)
+        self.encoders = {
+            column: CategoricalEncoder(column, method)
+            for column, method in (encodings or {}).items()
+        }
+        self.expanders = {
+            column: DatetimeExpander(column, features or DATETIME_FEATURES)
+            for column, features in (datetimes or {}).items()
+        }
+        self.scaler = FeatureScaler(scaling) if scaling else None
+
+    @property
+    def transformers(self):
+        """Codificadores y expansiones de fecha por columna"""
+        return {**self.encoders, **self.expanders}
+
+    @property
+    def numeric_columns(self):
+        """Columnas que pasan sin transformar (las que se escalan)"""
+        transformers = self.transformers
+        return [column for column in self.columns
+                if column not in transformers]
+
+    @property
+    def feature_names(self):
+        """Nombre de cada columna de la matriz, en orden"""
+        names = []
+        transformers = self.transformers
+        for column in self.columns:
+            if column in transformers:
+                names.extend(transformers[column].feature_names)
+            elif self.scaler is not None:
+                prefix = self.SCALED_PREFIX[self.scaler.method]
+                names.append(f"{prefix}({column})")
+            else:
+                names.append(column)
+        return names
+
+    @property
+    def sparse(self):
+        """Indica si la matriz resultante es dispersa"""
+        return any(encoder.sparse for encoder in self.encoders.values())
+
+    def fit(self, dataframe, y=None):
+        """
+        Ajustar las codificaciones con el conjunto de entrenamiento.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Datos de entrenamiento.
+        y : array-like, opcional
+            Salida (necesaria para la codificación target).
+        """
+        for column, encoder in self.encoders.items():
+            encoder.fit(dataframe[column], y)
+        if self.scaler is not None and self.numeric_columns:
+            self.scaler.fit(
+                dataframe[self.numeric_columns].to_numpy(dtype=float))
+        return self
+
+    def fit_chunks(self, chunks, output=None):
+        """
+        Ajustar las codificaciones con un entrenamiento leído por bloques.
+
+        Equivale a fit con todas las filas: las categorías, las medias
+        por categoría y los momentos del escalado se acumulan bloque a
+        bloque, así que una categoría que solo aparece en bloques
+        posteriores tiene su propia columna.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Bloques de filas de entrenamiento.
+        output : str, opcional
+            Columna de salida (necesaria para la codificación target).
+        """
+        counts = dict.fromkeys(self.encoders)
+        numeric = self.numeric_columns
+        scaled = self.scaler is not None and bool(numeric)
+
+        def numeric_blocks():
+            for chunk in chunks:
+                y = chunk[output] if output is not None else None
+                for column, encoder in self.encoders.items():
+                    block = encoder.category_counts(chunk[column], y)
+                    if counts[column] is not None:
+                        block = pd.concat([counts[column], block]).groupby(
+                            level=0, sort=False).sum()
+                    counts[column] = block
+                yield (chunk[numeric].to_numpy(dtype=float) if scaled
+                       else None)
+
+        if scaled:
+            self.scaler.fit_moments(
+                *block_moments(numeric_blocks(), len(numeric)))
+        else:
+            for _ in numeric_blocks():
+                pass
+        for column, encoder in self.encoders.items():
+            if counts[column] is None:
+                raise ValueError("No hay filas para ajustar el diseño.")
+            encoder.fit_counts(counts[column])
+        return self
+
+    def transform(self, dataframe):
+        """
+        Construir la matriz de diseño.
+
+        Returns
+        -------
+        np.ndarray or scipy.sparse.csr_matrix
+            Matriz n x len(feature_names).
+        """
+        blocks = []
+        numeric = []
+        transformers = self.transformers
+        positions = {
+            column: i for i, column in enumerate(self.numeric_columns)}
+
+        def flush():
+            # Columnas numéricas consecutivas en un único bloque
+            if numeric:
+                block = dataframe[numeric].to_numpy(dtype=float)
+                if self.scaler is not None:
+                    block = self.scaler.transform(
+                        block, [positions[column] for column in numeric])
+                blocks.append(block)
+                numeric.clear()
+
+        for column in self.columns:
+            if column in transformers:
+                flush()
+                blocks.append(
+                    transformers[column].transform(dataframe[column]))
+            else:
+                numeric.append(column)
+        flush()
+
+        if self.sparse:
+            return sparse.hstack(blocks, format="csr")
+        return np.hstack(blocks) if len(blocks) > 1 else blocks[0]
+
+    def fit_transform(self, dataframe, y=None):
+        return self.fit(dataframe, y).transform(dataframe)
+
+    def describe(self):
+        """Descripción legible de las transformaciones y el escalado"""
+        lines = [transformer.describe()
+                 for transformer in self.transformers.values()]
+        if self.scaler is not None and self.numeric_columns:
+            lines.append(f"{SCALING_NAMES[self.scaler.method]}: "
+                         f"{', '.join(self.numeric_columns)}")
+        return lines
+
+    def to_config(self):
+        return {
+            "columns": list(self.columns),
+            "encoders": [
+                encoder.to_config() for encoder in self.encoders.values()],
+            "scaler": self.scaler.to_config() if self.scaler else None,
+            "datetimes": [
+                expander.to_config() for expander in self.expanders.values()]
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        design = cls(config["columns"])
+        for encoder_config in config.get("encoders", []):
+            encoder = CategoricalEncoder.from_config(encoder_config)
+            design.encoders[encoder.column] = encoder
+        for expander_config in config.get("datetimes", []):
+            expander = DatetimeExpander.from_config(expander_config)
+            design.expanders[expander.column] = expander
+        if config.get("scaler"):
+            design.scaler = FeatureScaler.from_config(config["scaler"])
+        return design
@@ -0,0 +1,199 @@
+"""
+Historial de deshacer/rehacer del preprocesado.
+
+En lugar de guardar una copia completa del DataFrame antes de cada
+paso, cada entrada guarda solo lo que el paso cambió:
+
+- las posiciones y el contenido de las filas eliminadas;
+- para cada columna modificada, las posiciones de las celdas cambiadas
+  y su valor anterior (si todos eran NaN, solo las posiciones);
+- el tipo de dato original de esas columnas.
+
+Deshacer reconstruye el estado anterior a partir de esos datos y rehacer
+vuelve a ejecutar los pasos (ya ajustados) sobre el estado actual, así
+que ambas operaciones cuestan lo mismo que el propio paso. El total de
+memoria de las entradas está limitado: al superarlo se olvidan las más
+antiguas (sus pasos siguen aplicados, pero ya no se pueden deshacer).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Memoria máxima por defecto de las entradas de deshacer (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+
+class _Delta:
+    """
+    Cambios de una ejecución del pipeline respecto al estado anterior.
+
+    Parameters
+    ----------
+    plan : _Plan
+        Plan ejecutado (máscara de filas y columnas sustituidas).
+    steps : list
+        Pasos que produjeron el cambio.
+    """
+
+    def __init__(self, plan, steps):
+        before = plan.dataframe
+        self.steps = list(steps)
+        self.length = len(before)
+
+        self.dropped = np.flatnonzero(~plan.keep)
+        self.dropped_rows = (before.take(self.dropped)
+                             if self.dropped.size else None)
+
+        # Celdas cambiadas en las filas que se conservan
+        self.changes = {}
+        for column, series in plan.replaced.items():
+            old = before[column]
+            old_missing = old.isna().to_numpy()
+            new_missing = series.isna().to_numpy()
+
+            # Solo se comparan valores donde ninguno de los dos falta
+            changed = old_missing != new_missing
+            both = np.flatnonzero(~old_missing & ~new_missing)
+            changed[both] = old.to_numpy()[both] != series.to_numpy()[both]
+            positions = np.flatnonzero(changed & plan.keep)
+
+            prior = None
+            if not old_missing[positions].all():
+                prior = old.to_numpy()[positions]
+            self.changes[column] = (positions, prior, old.dtype)
+
+        self.nbytes = self._measure()
+
+    def _measure(self):
+        """Memoria aproximada ocupada por la entrada"""
+        total = self.dropped.nbytes
+        if self.dropped_rows is not None:
+            total += int(self.dropped_rows.memory_usage(deep=True).sum())
+        for positions, prior, _ in self.changes.values():
+            total += positions.nbytes
+            if prior is not None:
+                total += prior.nbytes
+        return total
+
+    def revert(self, dataframe):
+        """
+        Reconstruir el DataFrame anterior al cambio.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Resultado del cambio (estado actual).
+        """
+        if self.dropped.size:
+            keep = np.ones(self.length, dtype=bool)
+            keep[self.dropped] = False
+            positions = np.concatenate([np.flatnonzero(keep), self.dropped])
+            combined = pd.concat([dataframe, self.dropped_rows])
+            result = combined.take(np.argsort(positions, kind="stable"))
+        else:
+            result = dataframe.copy(deep=False)
+
+        for column, (positions, prior, dtype) in self.changes.items():
+            series = result[column]
+            if prior is None and series.dtype == dtype:
+                values = series.to_numpy(copy=True)
+            else:
+                values = series.to_numpy(dtype=object, copy=True)
+            values[positions] = np.nan if prior is None else prior
+            restored = pd.Series(values, index=result.index, name=column)
+            if restored.dtype != dtype:
+                restored = restored.astype(dtype)
+            result[column] = restored
+
+        return result
+
+
+class PreprocessingHistory:
+    """
+    Pila de deshacer/rehacer asociada a un PreprocessingPipeline.
+
+    Parameters
+    ----------
+    pipeline : PreprocessingPipeline
+        Pipeline cuyos pasos se deshacen y rehacen.
+    max_bytes : int
+        Memoria máxima de las entradas de deshacer.
+    """
+
+    def __init__(self, pipeline, max_bytes=DEFAULT_MAX_BYTES):
+        self.pipeline = pipeline
+        self.max_bytes = max_bytes
+        self._undo = []
+        self._redo = []
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @property
+    def nbytes(self):
+        """Memoria usada por las entradas de deshacer"""
+        return sum(delta.nbytes for delta in self._undo)
+
+    def apply(self, dataframe, context=None):
+        """
+        Ejecutar los pasos pendientes del pipeline registrando el cambio.
+
+        Un cambio nuevo descarta lo que se podía rehacer. `context` es el
+        mismo que en PreprocessingPipeline.fit_transform.
+        """
+        result, plan, steps = self.pipeline._fit(dataframe, context)
+        if steps:
+            self._redo.clear()
+            self._push(_Delta(plan, steps))
+        return result
+
+    def undo(self, dataframe):
+        """
+        Deshacer el último cambio.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Estado actual (resultado del último cambio).
+
+        Returns
+        -------
+        pd.DataFrame
+            Estado anterior al cambio.
+        """
+        if not self._undo:
+            raise IndexError("No hay cambios que deshacer.")
+
+        delta = self._undo.pop()
+        previous = delta.revert(dataframe)
+        del self.pipeline.steps[-len(delta.steps):]
+        self._redo.append(delta.steps)
+        return previous
+
+    def redo(self, dataframe, context=None):
+        """Volver a aplicar el último cambio deshecho"""
+        if not self._redo:
+            raise IndexError("No hay cambios que rehacer.")
+
+        steps = self._redo[-1]
+        plan = self.pipeline._run(dataframe, steps, False, context)
+        self._redo.pop()
+        self.pipeline.steps.extend(steps)
+        self._push(_Delta(plan, steps))
+        return plan.materialize()
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def _push(self, delta):
+        """Guardar una entrada y olvidar las más antiguas si no caben"""
+        self._undo.append(delta)
+        total = self.nbytes
+        while self._undo and total > self.max_bytes:
+            total -= self._undo.pop(0).nbytes
@@ -0,0 +1,259 @@
+"""
+Motor de imputación de valores faltantes en una sola pasada.
+
+Las columnas numéricas seleccionadas se copian una vez a una matriz
+NumPy y la máscara de NaN se calcula una sola vez. Sobre ella se
+obtienen todas las estadísticas necesarias (media, mediana, moda) y se
+rellenan todas las columnas en el sitio, aunque cada una use una
+estrategia distinta. Las columnas de texto (moda, constante o relleno
+hacia delante/atrás) se tratan aparte con pandas.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+STRATEGIES = (
+    "mean", "median", "constant", "mode", "ffill", "bfill", "interpolate"
+)
+
+# Estrategias con un valor aprendido al ajustar (se reutiliza al repetir
+# el preprocesado); las demás dependen de los datos que se rellenan
+LEARNED = ("mean", "median", "mode", "constant")
+
+# Estrategias que solo tienen sentido en columnas numéricas
+NUMERIC_ONLY = ("mean", "median", "interpolate")
+
+STRATEGY_NAMES = {
+    "mean": "media",
+    "median": "mediana",
+    "constant": "constante",
+    "mode": "moda",
+    "ffill": "valor anterior",
+    "bfill": "valor siguiente",
+    "interpolate": "interpolación lineal"
+}
+
+
+def impute(columns, strategies, values=None, constant=None, rows=None):
+    """
+    Rellenar los NaN de varias columnas con una estrategia por columna.
+
+    Parameters
+    ----------
+    columns : dict
+        Nombre de columna -> pd.Series (todas con el mismo índice).
+    strategies : dict
+        Nombre de columna -> estrategia (ver STRATEGIES).
+    values : dict, opcional
+        Valores ya aprendidos para las estrategias de LEARNED. Si es None
+        se calculan a partir de los datos.
+    constant : object, opcional
+        Valor de relleno para la estrategia "constant".
+    rows : np.ndarray of bool, opcional
+        Filas válidas (p. ej. las que no ha eliminado un paso anterior).
+        Solo ellas se usan para las estadísticas y como origen de los
+        rellenos hacia delante/atrás y la interpolación.
+
+    Returns
+    -------
+    tuple of (dict, dict)
+        Columnas rellenadas (solo las que tenían NaN) y valores
+        aprendidos por columna.
+    """
+    for name, strategy in strategies.items():
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Estrategia de relleno no válida para {name}: {strategy}")
+
+    fit = values is None
+    values = {} if fit else dict(values)
+    if fit and constant is not None:
+        values.update({
+            name: constant for name, strategy in strategies.items()
+            if strategy == "constant"
+        })
+
+    numeric = []
+    other = []
+    for name in strategies:
+        if _is_numeric_fill(columns[name], strategies[name], values.get(name)):
+            numeric.append(name)
+        else:
+            other.append(name)
+
+    filled = {}
+    if numeric:
+        filled.update(
+            _impute_numeric(columns, numeric, strategies, values, fit, rows))
+    for name in other:
+        series = _impute_other(
+            columns[name], strategies[name], values, name, fit, rows)
+        if series is not None:
+            filled[name] = series
+
+    return filled, values
+
+
+def _is_numeric_fill(series, strategy, value):
+    """Indica si la columna se puede rellenar en la matriz numérica"""
+    if not is_numeric_dtype(series) or is_bool_dtype(series):
+        return False
+    if strategy == "constant":
+        return isinstance(value, (int, float, np.number)) and not isinstance(
+            value, bool)
+    return True
+
+
+def _impute_numeric(columns, names, strategies, values, fit, rows):
+    """Rellenar el bloque numérico con una sola matriz y una sola máscara"""
+    index = columns[names[0]].index
+
+    # Orden Fortran: cada columna queda contigua y se devuelve sin copiar
+    X = np.empty((len(index), len(names)), order="F")
+    for j, name in enumerate(names):
+        X[:, j] = columns[name].to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(X)
+    has_missing = missing.any(axis=0)
+    valid = ~missing
+    if rows is not None:
+        valid &= rows[:, None]
+
+    kinds = np.array([strategies[name] for name in names])
+
+    # ---- Estadísticas (todas sobre la misma máscara) ----
+    if fit:
+        learned = _learn_numeric(X, valid, kinds, names, values)
+        values.update(learned)
+
+    # ---- Rellenos con valor fijo: una única operación ----
+    fixed = np.isin(kinds, LEARNED)
+    if fixed.any():
+        fill_row = np.array([
+            values.get(name, np.nan) if is_fixed else np.nan
+            for name, is_fixed in zip(names, fixed)
+        ], dtype=float)
+        np.copyto(X, fill_row, where=missing & fixed)
+
+    # ---- Rellenos que dependen de la posición ----
+    n = len(X)
+    positions = np.arange(n)[:, None]
+    directions = (("ffill", _forward_source), ("bfill", _backward_source))
+    for kind, find_source in directions:
+        cols = np.flatnonzero(kinds == kind)
+        if cols.size:
+            source = find_source(valid[:, cols], positions, n)
+            found = (source >= 0) & (source < n)
+            block = X[:, cols]
+            taken = np.take_along_axis(block, np.clip(source, 0, n - 1), 0)
+            X[:, cols] = np.where(missing[:, cols] & found, taken, block)
+
+    for col in np.flatnonzero(kinds == "interpolate"):
+        X[:, col] = _interpolate(X[:, col], valid[:, col], missing[:, col])
+
+    return {
+        name: pd.Series(X[:, j], index=index, name=name)
+        for j, name in enumerate(names) if has_missing[j]
+    }
+
+
+def _learn_numeric(X, valid, kinds, names, known):
+    """Medias, medianas y modas del bloque en una pasada por estadística"""
+    learned = {}
+    counts = valid.sum(axis=0)
+
+    cols = np.flatnonzero(kinds == "mean")
+    if cols.size:
+        sums = np.where(valid[:, cols], X[:, cols], 0.0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts[cols]
+        learned.update({names[j]: float(m) for j, m in zip(cols, means)})
+
+    cols = np.flatnonzero(kinds == "median")
+    if cols.size:
+        block = np.where(valid[:, cols], X[:, cols], np.nan)
+        medians = _nanmedian(block)
+        learned.update({names[j]: float(m) for j, m in zip(cols, medians)})
+
+    for j in np.flatnonzero(kinds == "mode"):
+        learned[names[j]] = _mode(X[valid[:, j], j])
+
+    for j in np.flatnonzero(kinds == "constant"):
+        learned[names[j]] = known.get(names[j])
+
+    return learned
+
+
+def _nanmedian(block):
+    """Mediana por columna ignorando NaN (NaN si la columna está vacía)"""
+    result = np.full(block.shape[1], np.nan)
+    nonempty = ~np.isnan(block).all(axis=0)
+    if nonempty.any():
+        result[nonempty] = np.nanmedian(block[:, nonempty], axis=0)
+    return result
+
+
+def _mode(values):
+    """Valor más frecuente (el menor en caso de empate, como pandas)"""
+    if values.size == 0:
+        return np.nan
+    unique, counts = np.unique(values, return_counts=True)
+    return float(unique[np.argmax(counts)])
+
+
+def _forward_source(valid, positions, n):
+    """Fila del último valor válido anterior (o -1 si no hay)"""
+    source = np.where(valid, positions, -1)
+    return np.maximum.accumulate(source, axis=0)
+
+
+def _backward_source(valid, positions, n):
+    """Fila del siguiente valor válido (o n si no hay)"""
+    source = np.where(valid, positions, n)[::-1]
+    return np.minimum.accumulate(source, axis=0)[::-1]
+
+
+def _interpolate(values, valid, missing):
+    """
+    Interpolación lineal por posición, como Series.interpolate().
+
+    Los NaN al final toman el último valor; los del principio se quedan
+    sin rellenar porque no hay valor anterior.
+    """
+    known = np.flatnonzero(valid)
+    if known.size == 0:
+        return values
+
+    targets = np.flatnonzero(missing & (np.arange(len(values)) > known[0]))
+    result = values.copy()
+    result[targets] = np.interp(targets, known, values[known])
+    return result
+
+
+def _impute_other(series, strategy, values, name, fit, rows):
+    """Rellenar una columna no numérica con pandas"""
+    if not series.isna().any():
+        if fit and strategy == "mode":
+            values[name] = _series_mode(series, rows)
+        return None
+
+    if strategy in NUMERIC_ONLY:
+        raise ValueError(
+            f"La columna {name} no es numérica: no se puede rellenar con "
+            f"{STRATEGY_NAMES[strategy]}.")
+
+    if strategy in LEARNED:
+        if fit and strategy == "mode":
+            values[name] = _series_mode(series, rows)
+        return series.fillna(values.get(name))
+
+    # Relleno por posición usando solo las filas válidas como origen
+    source = series if rows is None else series.where(rows)
+    filled = source.ffill() if strategy == "ffill" else source.bfill()
+    return series.fillna(filled)
+
+
+def _series_mode(series, rows):
+    values = series if rows is None else series[rows]
+    mode = values.mode(dropna=True)
+    return mode.iloc[0] if len(mode) else None
@@ -0,0 +1,179 @@
+"""
+Imputación por vecinos más cercanos con un índice espacial.
+
+Los valores faltantes de una fila se rellenan con la media de sus k
+vecinos más cercanos entre las filas completas, medida solo en las
+columnas que la fila sí tiene. Las filas se agrupan por patrón de
+valores faltantes: para cada patrón se construye un único KD-tree
+(scipy.spatial.cKDTree) sobre esas columnas de las filas completas y
+las consultas se hacen por lotes y en paralelo. Nunca se calcula una
+matriz de distancias n x n.
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Filas consultadas en cada llamada al árbol (limita la memoria usada)
+QUERY_BATCH = 65_536
+
+# Filas de referencia que se guardan con el modelo para repetir la
+# imputación sobre datos nuevos
+REPLAY_REFERENCE_ROWS = 20_000
+
+
+class KNNImputer:
+    """
+    Imputador KNN sobre una matriz numérica.
+
+    Parameters
+    ----------
+    k : int
+        Número de vecinos.
+    max_reference : int, opcional
+        Máximo de filas completas usadas como referencia (muestra
+        aleatoria reproducible). Por defecto se usan todas.
+    seed : int
+        Semilla de la muestra de referencia.
+    """
+
+    def __init__(self, k=5, max_reference=None, seed=0):
+        if k < 1:
+            raise ValueError("k debe ser al menos 1.")
+        self.k = int(k)
+        self.max_reference = max_reference
+        self.seed = seed
+        self.reference = None
+        self.mean = None
+        self.scale = None
+        self._trees = {}
+
+    def fit(self, X):
+        """
+        Guardar las filas completas de X como referencia.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Matriz n x p con NaN en los valores faltantes.
+        """
+        X = np.asarray(X, dtype=float)
+        reference = X[~np.isnan(X).any(axis=1)]
+        if len(reference) == 0:
+            raise ValueError(
+                "No hay filas completas para buscar vecinos (KNN).")
+
+        if self.max_reference and len(reference) > self.max_reference:
+            rng = np.random.default_rng(self.seed)
+            chosen = rng.choice(
+                len(reference), self.max_reference, replace=False)
+            reference = reference[np.sort(chosen)]
+
+        self._set_reference(reference)
+        return self
+
+    def transform(self, X, rows=None, callback=None):
+        """
+        Rellenar los NaN de X con la media de los k vecinos.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Matriz n x p con las mismas columnas que en `fit`.
+        rows : np.ndarray of bool, opcional
+            Filas a rellenar (por defecto todas).
+        callback : callable, opcional
+            callback(filas_hechas, filas_totales) tras cada lote de
+            consultas (puede lanzar CancelledError para interrumpir).
+
+        Returns
+        -------
+        np.ndarray
+            Copia de X con los valores faltantes rellenados.
+        """
+        X = np.array(X, dtype=float)
+        missing = np.isnan(X)
+        targets = missing.any(axis=1)
+        if rows is not None:
+            targets &= rows
+        targets = np.flatnonzero(targets)
+        if targets.size == 0:
+            return X
+
+        patterns, groups = np.unique(
+            missing[targets], axis=0, return_inverse=True)
+        groups = groups.ravel()
+
+        done = 0
+        for number, pattern in enumerate(patterns):
+            members = targets[groups == number]
+            available = ~pattern
+            if not available.any():
+                # Sin ninguna coordenada conocida: media de la referencia
+                X[np.ix_(members, pattern)] = self.mean[pattern]
+            else:
+                X[np.ix_(members, pattern)] = self._neighbour_means(
+                    X[members], available, pattern, callback, done,
+                    targets.size)
+            done += members.size
+
+        return X
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def get_state(self, max_rows=REPLAY_REFERENCE_ROWS):
+        """
+        Estado serializable para repetir la imputación más tarde.
+
+        Si la referencia es mayor que `max_rows` se guarda una muestra.
+        """
+        reference = self.reference
+        if max_rows and len(reference) > max_rows:
+            rng = np.random.default_rng(self.seed)
+            chosen = np.sort(rng.choice(len(reference), max_rows,
+                                        replace=False))
+            reference = reference[chosen]
+        return {"k": self.k, "seed": self.seed, "reference": reference}
+
+    @classmethod
+    def from_state(cls, state):
+        imputer = cls(k=state["k"], seed=state.get("seed", 0))
+        imputer._set_reference(np.asarray(state["reference"], dtype=float))
+        return imputer
+
+    def _set_reference(self, reference):
+        self.reference = reference
+        self.mean = reference.mean(axis=0)
+        scale = reference.std(axis=0)
+        # Columnas constantes: no aportan a la distancia
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self._trees = {}
+
+    def _tree(self, available):
+        """KD-tree de la referencia en las columnas disponibles (en caché)"""
+        key = available.tobytes()
+        if key not in self._trees:
+            scaled = ((self.reference[:, available] - self.mean[available])
+                      / self.scale[available])
+            self._trees[key] = cKDTree(scaled)
+        return self._trees[key]
+
+    def _neighbour_means(self, rows, available, pattern, callback=None,
+                         offset=0, total=0):
+        """Media de los vecinos en las columnas `pattern` para cada fila"""
+        tree = self._tree(available)
+        k = min(self.k, len(self.reference))
+        points = ((rows[:, available] - self.mean[available])
+                  / self.scale[available])
+        targets = self.reference[:, pattern]
+
+        result = np.empty((len(rows), int(pattern.sum())))
+        for start in range(0, len(points), QUERY_BATCH):
+            batch = points[start:start + QUERY_BATCH]
+            _, neighbours = tree.query(batch, k=k, workers=-1)
+            neighbours = neighbours.reshape(len(batch), k)
+            result[start:start + len(batch)] = targets[neighbours].mean(
+                axis=1)
+            if callback is not None:
+                callback(offset + start + len(batch), total)
+        return result
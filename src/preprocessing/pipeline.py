@@ -0,0 +1,592 @@
+"""
+Pipeline declarativo de preprocesado.
+
+Cada opción del panel de preprocesado se guarda como un paso (eliminar
+filas con NaN, rellenar NaN...). El panel ejecuta cada paso al
+aplicarlo, porque muestra el resultado enseguida. Cada ejecución, sea de
+uno o de varios pasos, solo lee las columnas implicadas y construye el
+resultado una vez (máscara de filas + columnas sustituidas), sin crear
+un DataFrame intermedio por paso.
+
+Los valores aprendidos al ajustar (medias, medianas...) quedan en cada
+paso, así que el mismo plan se puede volver a aplicar sobre datos nuevos
+(por ejemplo, al predecir con un modelo guardado) sin la interfaz.
+
+La ejecución acepta un "contexto" opcional (ver GUI.tasks.TaskContext)
+con check() para cancelar, report(fracción) para el progreso y
+map(función, elementos) para repartir bloques de columnas en paralelo.
+Sin contexto todo se ejecuta en serie.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from .imputation import STRATEGIES, STRATEGY_NAMES, impute
+from .duplicates import duplicate_mask
+from .knn_imputer import KNNImputer
+from .outliers import (
+    DEFAULT_THRESHOLDS, OUTLIER_METHODS, OUTLIER_NAMES, numeric_matrix,
+    outlier_bounds, outlier_mask
+)
+
+
+# Columnas por bloque al repartir el trabajo en paralelo
+COLUMN_CHUNK = 4
+
+
+class _SerialContext:
+    """Contexto por defecto: sin cancelación, progreso ni paralelismo"""
+
+    def check(self):
+        pass
+
+    def report(self, fraction, message=None):
+        pass
+
+    def map(self, function, items):
+        return [function(item) for item in items]
+
+
+class _Plan:
+    """
+    Estado intermedio de una ejecución fusionada.
+
+    Los pasos no crean DataFrames: marcan filas a eliminar y sustituyen
+    columnas completas; `materialize` construye el resultado al final.
+    """
+
+    def __init__(self, dataframe, context=None):
+        self.dataframe = dataframe
+        self.context = context or _SerialContext()
+        self.keep = np.ones(len(dataframe), dtype=bool)
+        self.replaced = {}
+
+    def chunks(self, columns):
+        """Repartir columnas en bloques para procesarlos en paralelo"""
+        return [columns[i:i + COLUMN_CHUNK]
+                for i in range(0, len(columns), COLUMN_CHUNK)]
+
+    def column(self, name):
+        """Valores actuales de una columna (todas las filas)"""
+        if name in self.replaced:
+            return self.replaced[name]
+        return self.dataframe[name]
+
+    def replace(self, name, series):
+        self.replaced[name] = series
+
+    def drop(self, mask):
+        """Eliminar las filas donde `mask` es True"""
+        self.keep &= ~mask
+
+    def materialize(self):
+        """Construir el DataFrame resultante con una sola copia"""
+        if self.keep.all():
+            if not self.replaced:
+                return self.dataframe
+            # Copia superficial: solo se sustituyen las columnas cambiadas
+            result = self.dataframe.copy(deep=False)
+            for name, series in self.replaced.items():
+                result[name] = series.array
+            return result
+
+        result = self.dataframe.take(np.flatnonzero(self.keep))
+        for name, series in self.replaced.items():
+            result[name] = series.array[self.keep]
+        return result
+
+
+class PreprocessingStep(ABC):
+    """
+    Paso de preprocesado sobre un conjunto de columnas.
+
+    Las subclases definen `kind` (nombre en la configuración), `run` y
+    `describe`; una subclase sin ellos no se puede instanciar.
+
+    Parameters
+    ----------
+    columns : list
+        Columnas a las que afecta el paso.
+    """
+
+    kind = None
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.fitted = False
+
+    @abstractmethod
+    def run(self, plan, fit):
+        """
+        Aplicar el paso sobre el plan.
+
+        Parameters
+        ----------
+        plan : _Plan
+            Estado de la ejecución en curso.
+        fit : bool
+            Si es True se aprenden los valores del paso a partir de los
+            datos; si es False se reutilizan los ya aprendidos.
+        """
+
+    @abstractmethod
+    def describe(self):
+        """Descripción legible del paso"""
+
+    def to_config(self):
+        """Configuración serializable del paso (incluye lo aprendido)"""
+        return {"step": self.kind, "columns": list(self.columns)}
+
+    @classmethod
+    def from_config(cls, config):
+        step = cls(config["columns"])
+        step.fitted = True
+        return step
+
+
+class DropMissingRows(PreprocessingStep):
+    """Eliminar las filas con algún NaN en las columnas indicadas"""
+
+    kind = "drop_na"
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.rows_removed = 0
+
+    def run(self, plan, fit):
+        before = int(plan.keep.sum())
+
+        def missing_rows(columns):
+            mask = np.zeros(len(plan.keep), dtype=bool)
+            for column in columns:
+                mask |= plan.column(column).isna().to_numpy()
+            return mask
+
+        for mask in plan.context.map(missing_rows, plan.chunks(self.columns)):
+            plan.drop(mask)
+        if fit:
+            self.rows_removed = before - int(plan.keep.sum())
+
+    def describe(self):
+        return f"Eliminar filas con N/A en: {', '.join(self.columns)}"
+
+
+class FillMissing(PreprocessingStep):
+    """
+    Rellenar los NaN de cada columna (motor de imputación en una pasada).
+
+    Parameters
+    ----------
+    columns : list
+        Columnas a rellenar.
+    strategy : str or dict
+        Estrategia común (ver imputation.STRATEGIES) o un diccionario
+        columna -> estrategia para mezclar estrategias por columna.
+    value : object, opcional
+        Valor de relleno para la estrategia "constant".
+    """
+
+    kind = "fill"
+
+    def __init__(self, columns, strategy, value=None):
+        super().__init__(columns)
+        if isinstance(strategy, dict):
+            self.strategies = {col: strategy[col] for col in self.columns}
+        else:
+            self.strategies = {col: strategy for col in self.columns}
+
+        for column, name in self.strategies.items():
+            if name not in STRATEGIES:
+                raise ValueError(f"Estrategia de relleno no válida: {name}")
+
+        self.value = value
+        self.values = {}
+        self.filled = []
+
+    def run(self, plan, fit):
+        rows = None if plan.keep.all() else plan.keep
+
+        # Cada bloque de columnas se imputa en una pasada independiente
+        def fill_chunk(names):
+            return impute(
+                {name: plan.column(name) for name in names},
+                {name: self.strategies[name] for name in names},
+                values=None if fit else self.values,
+                constant=self.value,
+                rows=rows
+            )
+
+        results = plan.context.map(fill_chunk, plan.chunks(self.columns))
+
+        values = {}
+        self.filled = []
+        for filled, chunk_values in results:
+            values.update(chunk_values)
+            for column, series in filled.items():
+                plan.replace(column, series)
+                self.filled.append(column)
+        if fit:
+            self.values = values
+
+    def describe(self):
+        kinds = set(self.strategies.values())
+        if len(kinds) == 1:
+            name = self._strategy_name(kinds.pop())
+            return f"Rellenar N/A con {name} en: {', '.join(self.columns)}"
+
+        detail = ", ".join(
+            f"{column} ({self._strategy_name(strategy)})"
+            for column, strategy in self.strategies.items()
+        )
+        return f"Rellenar N/A por columna: {detail}"
+
+    def _strategy_name(self, strategy):
+        name = STRATEGY_NAMES[strategy]
+        if strategy == "constant":
+            name += f" '{self.value}'"
+        return name
+
+    def to_config(self):
+        config = super().to_config()
+        config.update({
+            "strategy": dict(self.strategies),
+            "value": self.value,
+            "values": dict(self.values)
+        })
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        step = cls(config["columns"], config["strategy"], config.get("value"))
+        step.values = dict(config.get("values", {}))
+        step.fitted = True
+        return step
+
+
+class KNNFill(PreprocessingStep):
+    """
+    Rellenar los NaN con la media de los k vecinos más cercanos.
+
+    La distancia se mide sobre las propias columnas del paso (todas
+    numéricas), así que conviene incluir las columnas relacionadas con
+    la que tiene valores faltantes.
+
+    Parameters
+    ----------
+    columns : list
+        Columnas numéricas usadas como coordenadas y a rellenar.
+    k : int
+        Número de vecinos.
+    """
+
+    kind = "knn"
+
+    def __init__(self, columns, k=5):
+        super().__init__(columns)
+        self.k = int(k)
+        self.imputer = None
+        self.filled = []
+
+    def run(self, plan, fit):
+        index = plan.dataframe.index
+        X = np.empty((len(index), len(self.columns)), order="F")
+        for j, column in enumerate(self.columns):
+            X[:, j] = plan.column(column).to_numpy(
+                dtype=float, na_value=np.nan)
+
+        if fit:
+            self.imputer = KNNImputer(self.k).fit(X[plan.keep])
+
+        had_missing = np.isnan(X).any(axis=0)
+        X = self.imputer.transform(
+            X, rows=plan.keep,
+            callback=lambda done, total: plan.context.report(done / total))
+
+        self.filled = []
+        for j, column in enumerate(self.columns):
+            if had_missing[j]:
+                plan.replace(
+                    column, pd.Series(X[:, j], index=index, name=column))
+                self.filled.append(column)
+
+    def describe(self):
+        return (f"Rellenar N/A con {self.k} vecinos más cercanos en: "
+                f"{', '.join(self.columns)}")
+
+    def to_config(self):
+        config = super().to_config()
+        config.update({
+            "k": self.k,
+            "state": self.imputer.get_state() if self.imputer else None
+        })
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        step = cls(config["columns"], config.get("k", 5))
+        if config.get("state") is not None:
+            step.imputer = KNNImputer.from_state(config["state"])
+        step.fitted = True
+        return step
+
+
+class OutlierFilter(PreprocessingStep):
+    """
+    Eliminar o recortar los valores atípicos de columnas numéricas.
+
+    Los límites se aprenden al ajustar y se guardan, así que al repetir
+    el paso sobre datos nuevos se usan los mismos.
+
+    Parameters
+    ----------
+    columns : list
+        Columnas numéricas a revisar.
+    method : str
+        "zscore", "iqr" o "mad" (ver outliers.OUTLIER_METHODS).
+    threshold : float, opcional
+        Umbral del método (por defecto el habitual de cada uno).
+    action : str
+        "drop" elimina las filas con algún atípico; "clip" lleva cada
+        atípico al límite más cercano.
+    """
+
+    kind = "outliers"
+    ACTIONS = ("drop", "clip")
+
+    def __init__(self, columns, method="iqr", threshold=None, action="drop"):
+        super().__init__(columns)
+        if method not in OUTLIER_METHODS:
+            raise ValueError(
+                f"Método de valores atípicos no válido: {method}")
+        if action not in self.ACTIONS:
+            raise ValueError(f"Acción no válida para atípicos: {action}")
+
+        self.method = method
+        self.threshold = float(
+            DEFAULT_THRESHOLDS[method] if threshold is None else threshold)
+        self.action = action
+        self.low = None
+        self.high = None
+        self.rows_removed = 0
+        self.clipped = 0
+
+    def run(self, plan, fit):
+        X = numeric_matrix([plan.column(column) for column in self.columns])
+        if fit:
+            low, high = outlier_bounds(
+                X[plan.keep], self.method, self.threshold)
+            self.low, self.high = low.tolist(), high.tolist()
+
+        low, high = np.array(self.low), np.array(self.high)
+        mask = outlier_mask(X, low, high)
+
+        if self.action == "drop":
+            before = int(plan.keep.sum())
+            plan.drop(mask.any(axis=1))
+            if fit:
+                self.rows_removed = before - int(plan.keep.sum())
+            return
+
+        if fit:
+            self.clipped = int(mask[plan.keep].sum())
+        clipped = np.clip(X, low, high)
+        index = plan.dataframe.index
+        for j in np.flatnonzero(mask.any(axis=0)):
+            column = self.columns[j]
+            plan.replace(
+                column, pd.Series(clipped[:, j], index=index, name=column))
+
+    def describe(self):
+        verb = "Eliminar filas con" if self.action == "drop" else "Recortar"
+        return (f"{verb} valores atípicos ({OUTLIER_NAMES[self.method]}, "
+                f"umbral {self.threshold:g}) en: {', '.join(self.columns)}")
+
+    def to_config(self):
+        config = super().to_config()
+        config.update({
+            "method": self.method,
+            "threshold": self.threshold,
+            "action": self.action,
+            "low": self.low,
+            "high": self.high
+        })
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        step = cls(config["columns"], config["method"],
+                   config.get("threshold"), config.get("action", "drop"))
+        step.low = config["low"]
+        step.high = config["high"]
+        step.fitted = True
+        return step
+
+
+class DropDuplicates(PreprocessingStep):
+    """
+    Eliminar las filas repetidas (se conserva la primera aparición).
+
+    Parameters
+    ----------
+    columns : list, opcional
+        Columnas que se comparan. Por defecto todas las del DataFrame.
+    """
+
+    kind = "drop_duplicates"
+
+    def __init__(self, columns=None):
+        super().__init__(columns or [])
+        self.all_columns = columns is None
+        self.rows_removed = 0
+
+    def run(self, plan, fit):
+        columns = (list(plan.dataframe.columns) if self.all_columns
+                   else self.columns)
+        before = int(plan.keep.sum())
+        if columns and before:
+            plan.drop(duplicate_mask(
+                [plan.column(column) for column in columns], plan.keep))
+        if fit:
+            self.rows_removed = before - int(plan.keep.sum())
+
+    def describe(self):
+        if self.all_columns:
+            return "Eliminar filas duplicadas (todas las columnas)"
+        return f"Eliminar filas duplicadas en: {', '.join(self.columns)}"
+
+    def to_config(self):
+        config = super().to_config()
+        config["all_columns"] = self.all_columns
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        step = cls(None if config.get("all_columns") else config["columns"])
+        step.fitted = True
+        return step
+
+
+# Pasos disponibles por nombre (para reconstruir desde la configuración)
+STEP_TYPES = {
+    step.kind: step
+    for step in (DropMissingRows, FillMissing, KNNFill, OutlierFilter,
+                 DropDuplicates)
+}
+
+
+class PreprocessingPipeline:
+    """
+    Lista ordenada de pasos de preprocesado.
+
+    `add` solo registra el paso; `fit_transform` ejecuta los pendientes
+    (en la GUI, el que se acaba de añadir). `transform` repite todos los
+    pasos ya ajustados sobre datos nuevos en una sola ejecución.
+
+    Parameters
+    ----------
+    steps : list, opcional
+        Pasos iniciales.
+    """
+
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def pending(self):
+        """Pasos añadidos que aún no se han ejecutado"""
+        return [step for step in self.steps if not step.fitted]
+
+    def add(self, step):
+        """Añadir un paso al final (sin ejecutarlo)"""
+        self.steps.append(step)
+        return self
+
+    def discard_pending(self):
+        """Quitar los pasos que no se han llegado a ejecutar"""
+        self.steps = [step for step in self.steps if step.fitted]
+
+    def fit_transform(self, dataframe, context=None):
+        """
+        Ejecutar los pasos pendientes aprendiendo sus valores.
+
+        Los pasos ya ajustados se consideran aplicados a `dataframe`. Si
+        algún paso falla, los pasos pendientes se descartan y los datos
+        no cambian.
+
+        Parameters
+        ----------
+        dataframe : pd.DataFrame
+            Datos actuales.
+        context : TaskContext, opcional
+            Cancelación, progreso y ejecución paralela.
+
+        Returns
+        -------
+        pd.DataFrame
+            Datos preprocesados (el mismo objeto si no hay cambios).
+        """
+        result, _, _ = self._fit(dataframe, context)
+        return result
+
+    def _fit(self, dataframe, context=None):
+        """
+        Ajustar y ejecutar los pasos pendientes.
+
+        Returns
+        -------
+        tuple
+            (resultado, plan ejecutado o None, pasos ejecutados).
+        """
+        pending = self.pending
+        if not pending:
+            return dataframe, None, []
+
+        try:
+            plan = self._run(dataframe, pending, fit=True, context=context)
+        except Exception:
+            self.discard_pending()
+            raise
+        for step in pending:
+            step.fitted = True
+        return plan.materialize(), plan, pending
+
+    def transform(self, dataframe, context=None):
+        """Repetir los pasos ya ajustados sobre datos nuevos"""
+        fitted = [step for step in self.steps if step.fitted]
+        if not fitted:
+            return dataframe
+        return self._run(dataframe, fitted, False, context).materialize()
+
+    def describe(self):
+        """Descripción legible de cada paso, en orden"""
+        return [step.describe() for step in self.steps]
+
+    def to_config(self):
+        """Lista serializable de pasos (para guardar con el modelo)"""
+        return [step.to_config() for step in self.steps if step.fitted]
+
+    @classmethod
+    def from_config(cls, config):
+        """Reconstruir un pipeline ajustado a partir de `to_config`"""
+        steps = []
+        for step_config in config or []:
+            kind = step_config["step"]
+            if kind not in STEP_TYPES:
+                raise ValueError(f"Paso de preprocesado desconocido: {kind}")
+            steps.append(STEP_TYPES[kind].from_config(step_config))
+        return cls(steps)
+
+    @staticmethod
+    def _run(dataframe, steps, fit, context=None):
+        """Aplicar los pasos sobre un plan sin construir el resultado"""
+        plan = _Plan(dataframe, context)
+        for number, step in enumerate(steps, start=1):
+            plan.context.check()
+            step.run(plan, fit)
+            plan.context.report(number / len(steps))
+        return plan
@@ -0,0 +1,144 @@
+"""
+Escalado de las columnas numéricas de entrada.
+
+- "standard": (x - media) / desviación típica.
+- "minmax": (x - mínimo) / (máximo - mínimo), en [0, 1].
+
+Las estadísticas (media, varianza, mínimo y máximo) se obtienen en una
+sola pasada por bloques de filas sobre el conjunto de entrenamiento:
+cada bloque calcula sus momentos y se combinan con la fórmula de Chan,
+así que no hace falta una segunda lectura para la varianza. Se guardan
+con el modelo para escalar igual los datos al predecir.
+"""
+
+import numpy as np
+
+SCALINGS = ("standard", "minmax")
+
+SCALING_NAMES = {
+    "standard": "estandarización",
+    "minmax": "min-max"
+}
+
+# Filas por bloque al calcular las estadísticas
+CHUNK_ROWS = 65_536
+
+
+def column_moments(X, chunk_rows=CHUNK_ROWS):
+    """
+    Media, varianza, mínimo y máximo por columna en una pasada.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Matriz n x p sin valores faltantes.
+    chunk_rows : int
+        Filas por bloque.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (media, varianza, mínimo, máximo).
+    """
+    blocks = (X[start:start + chunk_rows]
+              for start in range(0, len(X), chunk_rows))
+    return block_moments(blocks, X.shape[1])
+
+
+def block_moments(blocks, p):
+    """
+    Como column_moments, pero con los bloques ya separados (p. ej. los
+    bloques de un archivo leído por partes).
+
+    Parameters
+    ----------
+    blocks : iterable of np.ndarray
+        Bloques de filas con p columnas.
+    p : int
+        Número de columnas.
+    """
+    count = 0
+    mean = np.zeros(p)
+    m2 = np.zeros(p)
+    low = np.full(p, np.inf)
+    high = np.full(p, -np.inf)
+
+    for block in blocks:
+        size = len(block)
+        if size == 0:
+            continue
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+
+        # Combinar los momentos del bloque con los acumulados
+        total = count + size
+        delta = block_mean - mean
+        mean += delta * size / total
+        m2 += block_m2 + delta ** 2 * count * size / total
+        count = total
+
+        np.minimum(low, block.min(axis=0), out=low)
+        np.maximum(high, block.max(axis=0), out=high)
+
+    variance = m2 / count if count else np.full(p, np.nan)
+    return mean, variance, low, high
+
+
+class FeatureScaler:
+    """
+    Escalado de columnas aprendido con el conjunto de entrenamiento.
+
+    Parameters
+    ----------
+    method : str
+        Uno de SCALINGS.
+    """
+
+    def __init__(self, method="standard"):
+        if method not in SCALINGS:
+            raise ValueError(f"Escalado no válido: {method}")
+        self.method = method
+        self.offset = None
+        self.scale = None
+
+    def fit(self, X):
+        return self.fit_moments(
+            *column_moments(np.asarray(X, dtype=float)))
+
+    def fit_moments(self, mean, variance, low, high):
+        """Ajustar con los momentos ya calculados (ver block_moments)"""
+        if self.method == "standard":
+            offset, scale = mean, np.sqrt(variance)
+        else:
+            offset, scale = low, high - low
+        # Columnas constantes: solo se desplazan
+        self.offset = offset.tolist()
+        self.scale = np.where(scale > 0, scale, 1.0).tolist()
+        return self
+
+    def transform(self, X, columns=None):
+        """
+        Escalar X (o solo sus columnas `columns`, índices del ajuste).
+        """
+        offset = np.asarray(self.offset)
+        scale = np.asarray(self.scale)
+        if columns is not None:
+            offset, scale = offset[columns], scale[columns]
+        return (np.asarray(X, dtype=float) - offset) / scale
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def to_config(self):
+        return {
+            "method": self.method,
+            "offset": self.offset,
+            "scale": self.scale
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        scaler = cls(config["method"])
+        scaler.offset = list(config["offset"])
+        scaler.scale = list(config["scale"])
+        return scaler
@@ -0,0 +1,54 @@
+import queue
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# ============================================================
+# APP FALSA PARA EL TASKRUNNER
+# ============================================================
+
+class DummyApp:
+    """Sustituye a la ventana: guarda las llamadas de `after`"""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+
+    def after(self, delay, callback):
+        self.calls.put(callback)
+
+    def run_pending(self, timeout=5):
+        """Ejecutar la primera llamada pendiente (hilo principal)"""
+        self.calls.get(timeout=timeout)()
+
+
+@pytest.fixture
+def dummy_app():
+    return DummyApp()
+
+
+# ============================================================
+# DATOS DE REGRESIÓN
+# ============================================================
+
+def regression_df(n=3_000, seed=0):
+    """
+    Salida lineal en una entrada normal, otra de magnitud grande y una
+    categórica de tres valores, con ruido normal.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x1": rng.normal(size=n),
+        "x2": rng.uniform(0, 1e4, n),
+        "zona": rng.choice(["norte", "sur", "este"], n),
+    })
+    df["y"] = (1.5 * df["x1"] - 0.002 * df["x2"]
+               + 4.0 * (df["zona"] == "sur") + rng.normal(size=n))
+    return df
+
+
+@pytest.fixture
+def make_regression_df():
+    """Constructor de regression_df (cada prueba elige tamaño y semilla)"""
+    return regression_df
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from modeling import IncrementalLeastSquares, RollingOrigin
+from preprocessing import DesignMatrix
+
+
+def make_df(n=600):
+    rng = np.random.default_rng(4)
+    dates = pd.date_range("2024-01-01", periods=n, freq="h")
+    x = rng.normal(size=n)
+    zona = rng.choice(["norte", "sur"], n)
+    # Filas desordenadas: el backtest debe ordenarlas por fecha
+    order = rng.permutation(n)
+    return pd.DataFrame({
+        "fecha": dates.to_numpy()[order],
+        "x": x,
+        "zona": zona,
+        "y": 2.0 * x - 1.0 * (zona == "sur") + rng.normal(0, 0.1, n)
+    })
+
+
+def test_incremental_fit_matches_full_fit():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1_000, 3))
+    # Una columna de gran magnitud (segundos desde 1970)
+    X[:, 0] = 1.7e9 + rng.uniform(0, 1e7, 1_000)
+    y = X @ [1e-6, 2.0, 3.0] + 5.0 + rng.normal(size=1_000)
+
+    least_squares = IncrementalLeastSquares(3)
+    for start in range(0, 1_000, 137):
+        least_squares.update(X[start:start + 137], y[start:start + 137])
+    coef, intercept = least_squares.solve()
+
+    model = LinearRegression().fit(X, y)
+    np.testing.assert_allclose(coef, model.coef_, rtol=1e-6)
+    assert intercept == pytest.approx(model.intercept_, rel=1e-6)
+
+
+def test_incremental_fit_with_sparse_blocks():
+    rng = np.random.default_rng(1)
+    X = sparse.csr_matrix((rng.random((500, 4)) < 0.3).astype(float))
+    y = X @ [1.0, 2.0, 3.0, 4.0] + rng.normal(size=500)
+
+    least_squares = IncrementalLeastSquares(4)
+    for start in range(0, 500, 100):
+        least_squares.update(X[start:start + 100], y[start:start + 100])
+    coef, _ = least_squares.solve()
+
+    np.testing.assert_allclose(coef, LinearRegression().fit(X, y).coef_)
+
+
+def test_rolling_origin_refits_on_growing_window():
+    df = make_df()
+    inputs = ["x", "zona"]
+    validation = RollingOrigin("fecha", n_origins=4)
+    result = validation.evaluate(
+        df, inputs, "y",
+        lambda: DesignMatrix(inputs, encodings={"zona": "onehot"}))
+
+    scores = result.scores
+    assert scores["n_train"].tolist() == [120, 240, 360, 480]
+    assert (scores["n_test"] == 120).all()
+    assert (scores["r2"] > 0.99).all()
+
+    # El último origen coincide con un ajuste completo de sus filas
+    ordered = df.sort_values("fecha").iloc[:480]
+    X = np.column_stack([ordered["x"], ordered["zona"] == "sur"])
+    model = LinearRegression().fit(X, ordered["y"])
+    np.testing.assert_allclose(
+        result.coefficients.iloc[-1][["x", "zona[sur]"]], model.coef_)
+    assert result.coefficients.iloc[-1]["const"] == pytest.approx(
+        model.intercept_)
+
+
+def test_rolling_origin_rejects_too_few_rows():
+    df = make_df(3)
+    with pytest.raises(ValueError):
+        RollingOrigin("fecha", n_origins=5).evaluate(
+            df, ["x"], "y", lambda: DesignMatrix(["x"]))
+    with pytest.raises(ValueError):
+        RollingOrigin("fecha", n_origins=0)
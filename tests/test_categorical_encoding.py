@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from GUI.predict_model import predict_result
+from preprocessing import CategoricalEncoder, DesignMatrix
+
+
+def make_df():
+    return pd.DataFrame({
+        "rooms": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        "ocean": ["NEAR", "INLAND", "NEAR", "ISLAND", "INLAND", "NEAR"],
+        "price": [12.0, 4.0, 16.0, 34.0, 8.0, 20.0]
+    })
+
+
+def test_onehot_is_sparse_and_drops_reference_category():
+    encoder = CategoricalEncoder("ocean", "onehot")
+    X = encoder.fit_transform(make_df()["ocean"])
+
+    assert sparse.issparse(X)
+    assert encoder.categories == ["INLAND", "ISLAND", "NEAR"]
+    assert encoder.feature_names == ["ocean[ISLAND]", "ocean[NEAR]"]
+    assert X.nnz == 4
+    np.testing.assert_array_equal(X.toarray()[0], [0, 1])
+
+    # Categoría nueva o faltante: todo ceros (como la de referencia)
+    unseen = encoder.transform(pd.Series(["BAY", None]))
+    assert unseen.nnz == 0
+
+
+def test_ordinal_and_target_encodings():
+    df = make_df()
+    ordinal = CategoricalEncoder("ocean", "ordinal").fit_transform(
+        df["ocean"])
+    np.testing.assert_array_equal(ordinal.ravel(), [2, 0, 2, 1, 0, 2])
+
+    encoder = CategoricalEncoder("ocean", "target", smoothing=0.0)
+    target = encoder.fit_transform(df["ocean"], df["price"])
+    assert target[1, 0] == pytest.approx(6.0)
+    assert target[0, 0] == pytest.approx(16.0)
+    # Categoría desconocida: media global
+    unseen = encoder.transform(pd.Series(["BAY"]))
+    assert unseen[0, 0] == pytest.approx(df["price"].mean())
+
+    with pytest.raises(ValueError):
+        CategoricalEncoder("ocean", "target").fit(df["ocean"])
+
+
+def test_design_matrix_trains_and_predicts_with_saved_config():
+    df = make_df()
+    design = DesignMatrix(["rooms", "ocean"], {"ocean": "onehot"})
+    X = design.fit_transform(df, df["price"])
+
+    assert sparse.issparse(X)
+    assert X.shape == (6, 3)
+    assert design.feature_names == ["rooms", "ocean[ISLAND]", "ocean[NEAR]"]
+
+    model = LinearRegression().fit(X, df["price"])
+    restored = DesignMatrix.from_config(design.to_config())
+    np.testing.assert_allclose(
+        model.predict(restored.transform(df)), model.predict(X))
+
+    result = predict_result(["rooms", "ocean"], ["3", "NEAR"],
+                            "price = ...", model, restored)
+    assert result.startswith("price = ")
+    assert float(result.split(" = ")[1]) == pytest.approx(
+        model.predict(X[2])[0])
+
+
+def test_numeric_inputs_stay_dense():
+    df = make_df()
+    X = DesignMatrix(["rooms"]).fit_transform(df)
+
+    assert isinstance(X, np.ndarray)
+    np.testing.assert_array_equal(X.ravel(), df["rooms"])
@@ -0,0 +1,60 @@
+from GUI.selection_columns import ColumnListModel
+
+
+def make_model():
+    columns = [f"sensor_{i}" for i in range(2000)] + ["precio", "Precio_m2"]
+    return ColumnListModel(columns)
+
+
+def test_selection_is_kept_in_dataframe_order():
+    model = make_model()
+
+    model.toggle("precio")
+    model.toggle("sensor_5")
+    model.toggle("sensor_1")
+    model.toggle("sensor_5")
+
+    assert model.get() == ["sensor_1", "precio"]
+    assert model.selected == {"sensor_1", "precio"}
+
+
+def test_filter_is_incremental_and_case_insensitive():
+    model = make_model()
+
+    model.filter("PRE")
+    assert model.visible_columns(0, 10) == ["precio", "Precio_m2"]
+
+    model.filter("precio_")
+    assert model.visible_columns(0, 10) == ["Precio_m2"]
+
+    # Al borrar texto se vuelve a filtrar sobre todas las columnas
+    model.filter("sensor_199")
+    assert len(model.visible) == 11
+
+
+def test_visible_window():
+    model = make_model()
+
+    assert model.visible_columns(10, 3) == [
+        "sensor_10", "sensor_11", "sensor_12"]
+    assert model.visible_columns(2001, 5) == ["Precio_m2"]
+
+
+def test_set_ignores_unknown_columns():
+    model = make_model()
+
+    model.set(["precio", "no_existe"])
+
+    assert model.get() == ["precio"]
+
+
+def test_reorder_keeps_selection_order_and_filter():
+    model = make_model()
+    model.toggle("sensor_3")
+    model.toggle("precio")
+    model.filter("precio")
+
+    model.reorder(["Precio_m2", "sensor_0"])
+
+    assert model.visible_columns(0, 5) == ["Precio_m2", "precio"]
+    assert model.get() == ["sensor_3", "precio"]
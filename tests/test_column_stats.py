@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from data_analysis import ColumnStatsCache, column_stats, histogram_sparkline
+
+
+def make_df():
+    return pd.DataFrame({
+        "x": [1.0, 2.0, None, 4.0, 4.0],
+        "texto": ["a", "b", "a", None, "c"]
+    })
+
+
+def test_numeric_column_stats():
+    stats = ColumnStatsCache(make_df()).get("x")
+
+    assert stats["min"] == 1.0
+    assert stats["max"] == 4.0
+    assert stats["mean"] == (1 + 2 + 4 + 4) / 4
+    assert stats["nan"] == 1
+    assert stats["distinct"] == 3
+    assert stats["histogram"].sum() == 4
+
+
+def test_text_column_stats():
+    stats = ColumnStatsCache(make_df()).get("texto")
+
+    assert stats["distinct"] == 3
+    assert stats["nan"] == 1
+    assert stats["min"] is None
+    assert stats["histogram"] is None
+
+
+def test_stats_are_lazy_and_invalidated_per_column():
+    df = make_df()
+    cache = ColumnStatsCache(df)
+
+    assert not cache.is_cached("x")
+    cache.get("x")
+    cache.get("texto")
+    assert cache.is_cached("x")
+
+    df["x"] = df["x"].fillna(0.0)
+    cache.invalidate(df, ["x"])
+
+    assert not cache.is_cached("x")
+    assert cache.is_cached("texto")
+    assert cache.get("x")["nan"] == 0
+
+
+def test_invalidate_all_columns():
+    cache = ColumnStatsCache(make_df())
+    cache.get("x")
+    cache.get("texto")
+
+    cache.invalidate(make_df().dropna())
+
+    assert not cache.is_cached("x")
+    assert not cache.is_cached("texto")
+
+
+def test_histogram_sparkline():
+    assert histogram_sparkline(None) == ""
+    assert histogram_sparkline(np.array([0, 5, 10])) == "▁▅█"
+
+
+def test_stale_stats_are_not_stored(monkeypatch):
+    cache = ColumnStatsCache(make_df())
+    new = make_df().dropna()
+    compute = column_stats.compute_column_stats
+
+    def compute_and_invalidate(series):
+        # El preprocesado sustituye los datos mientras se calcula
+        cache.invalidate(new)
+        return compute(series)
+
+    monkeypatch.setattr(column_stats, "compute_column_stats",
+                        compute_and_invalidate)
+    cache.get("x")
+    assert not cache.is_cached("x")
+
+    monkeypatch.setattr(column_stats, "compute_column_stats", compute)
+    assert cache.get("x")["count"] == len(new)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from data_analysis import CorrelationRanker, pairwise_correlation
+
+
+def make_df():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200)
+    df = pd.DataFrame({
+        "fuerte": x,
+        "debil": rng.normal(size=200),
+        "con_nan": x + rng.normal(scale=0.5, size=200),
+        "texto": ["a"] * 200,
+        "y": 3 * x + rng.normal(scale=0.1, size=200)
+    })
+    df.loc[::4, "con_nan"] = np.nan
+    return df
+
+
+def test_pairwise_correlation_matches_pandas():
+    df = make_df().drop(columns="texto")
+    values = df.to_numpy()
+
+    corr = pairwise_correlation(values, values)
+
+    assert np.allclose(corr, df.corr().to_numpy())
+
+
+def test_ranking_orders_by_correlation_and_missing_rate():
+    ranking = CorrelationRanker(make_df()).rank("y")
+
+    assert list(ranking.index) == ["fuerte", "con_nan", "debil"]
+    assert "texto" not in ranking.index
+    assert ranking.loc["con_nan", "missing"] == 0.25
+
+
+def test_spearman_ranking():
+    df = make_df()
+    ranking = CorrelationRanker(df).rank("y", method="spearman")
+
+    expected = df["fuerte"].corr(df["y"], method="spearman")
+    assert np.isclose(ranking.loc["fuerte", "corr"], expected)
+
+
+def test_ranking_is_cached_per_output():
+    ranker = CorrelationRanker(make_df())
+
+    first = ranker.rank("y")
+    assert ranker.rank("y") is first
+    assert ranker.rank("fuerte") is not first
+
+    ranker.invalidate()
+    assert ranker.rank("y") is not first
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modeling import CrossValidation
+from preprocessing import DesignMatrix
+
+
+def make_df(n=300):
+    rng = np.random.default_rng(3)
+    x1 = rng.normal(size=n)
+    x2 = rng.normal(size=n)
+    zona = rng.choice(["norte", "sur"], n)
+    noise = rng.normal(0, 0.1, n)
+    return pd.DataFrame({
+        "x1": x1,
+        "x2": x2,
+        "zona": zona,
+        "y": 1.5 * x1 - 2.0 * x2 + 3.0 * (zona == "sur") + noise
+    })
+
+
+def test_kfold_tests_every_row_once():
+    validation = CrossValidation("kfold", n_splits=4, seed=0)
+    folds = [split for _, split in validation.folds(103)]
+
+    assert len(folds) == 4
+    tested = np.sort(np.concatenate([split.test for split in folds]))
+    np.testing.assert_array_equal(tested, np.arange(103))
+    for split in folds:
+        assert split.n_train + split.n_test == 103
+        assert np.intersect1d(split.train, split.test).size == 0
+
+
+def test_repeated_and_shuffle_split_sizes():
+    repeated = CrossValidation("repeated", n_splits=3, n_repeats=2, seed=1)
+    repeats = [repeat for repeat, _ in repeated.folds(30)]
+    assert repeats == [0, 0, 0, 1, 1, 1]
+    assert repeated.n_folds == 6
+
+    shuffle = CrossValidation("shuffle", n_splits=4, test_size=0.25, seed=1)
+    sizes = {split.n_test for _, split in shuffle.folds(40)}
+    assert sizes == {10}
+
+
+def test_evaluate_reports_fold_metrics_and_coefficient_spread():
+    df = make_df()
+    validation = CrossValidation("repeated", n_splits=5, n_repeats=2, seed=0)
+    inputs = ["x1", "x2", "zona"]
+    result = validation.evaluate(
+        df, inputs, "y",
+        lambda: DesignMatrix(inputs, encodings={"zona": "onehot"}))
+
+    assert len(result.scores) == 10
+    assert (result.scores["r2"] > 0.99).all()
+    spread = result.coefficient_spread()
+    assert spread.loc["x1", "media"] == pytest.approx(1.5, abs=0.02)
+    assert spread.loc["zona[sur]", "media"] == pytest.approx(3.0, abs=0.05)
+    assert spread.loc["x2", "desviación"] < 0.02
+
+    # Con la misma semilla el resultado no depende del orden de los hilos
+    again = validation.evaluate(df, inputs, "y", lambda: DesignMatrix(
+        inputs, encodings={"zona": "onehot"}))
+    pd.testing.assert_frame_equal(result.scores, again.scores)
+    assert result.to_config()["r2"][0] == pytest.approx(
+        result.scores["r2"].mean())
+
+
+def test_invalid_settings_raise():
+    with pytest.raises(ValueError):
+        CrossValidation("loo")
+    with pytest.raises(ValueError):
+        CrossValidation("kfold", n_splits=1)
+    with pytest.raises(ValueError):
+        list(CrossValidation("kfold", n_splits=5).folds(3))
+
+
+def test_grouped_cross_validation_keeps_groups_together():
+    df = make_df()
+    df["cliente"] = np.arange(len(df)) // 10
+    validation = CrossValidation("kfold", n_splits=5, seed=0,
+                                 group_column="cliente")
+    _, groups = validation.labels(df, "y")
+
+    for _, split in validation.folds(len(df), groups=groups):
+        train = set(df["cliente"].to_numpy()[split.train])
+        assert train.isdisjoint(df["cliente"].to_numpy()[split.test])
+
+    with pytest.raises(ValueError):
+        CrossValidation("kfold", n_splits=5, group_column="zona").evaluate(
+            df, ["x1"], "y", lambda: DesignMatrix(["x1"]))
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from modeling import (
+    DataSplit, fold_labels, gather, group_codes, quantile_bins, random_split,
+    temporal_split
+)
+
+
+def make_df(n=50):
+    return pd.DataFrame({
+        "x": np.arange(n, dtype=float),
+        "y": np.arange(n, dtype=float) * 2,
+        "texto": [f"fila {i}" for i in range(n)]
+    }, index=np.arange(n) * 10)
+
+
+def test_same_rows_as_splitting_the_whole_frame():
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=42)
+    train_df, test_df = train_test_split(
+        df, train_size=0.8, random_state=42, shuffle=True)
+
+    train = split.train_frame(df)
+    pd.testing.assert_frame_equal(train, train_df.sort_index())
+    pd.testing.assert_frame_equal(split.test_frame(df), test_df.sort_index())
+
+
+def test_positions_partition_all_rows():
+    split = random_split(101, 0.7, seed=0)
+
+    assert split.n_train + split.n_test == 101
+    assert np.intersect1d(split.train, split.test).size == 0
+    mask = split.train_mask()
+    np.testing.assert_array_equal(np.flatnonzero(mask), split.train)
+
+
+def test_gather_only_reads_selected_columns():
+    df = make_df()
+    split = DataSplit([3, 1], [0, 2], len(df))
+    train = split.train_frame(df, ["y"])
+
+    assert list(train.columns) == ["y"]
+    assert train.index.tolist() == [10, 30]
+    assert train["y"].tolist() == [2.0, 6.0]
+    # Las filas reunidas no comparten memoria con el original
+    frame = gather(df, np.array([0]), ["x"])
+    frame.loc[0, "x"] = -1.0
+    assert df.loc[0, "x"] == 0.0
+
+
+def test_stratified_split_keeps_proportion_in_every_bin():
+    y = np.random.default_rng(1).lognormal(size=2_000)
+    bins = quantile_bins(y, 10)
+    split = random_split(len(y), 0.8, seed=0, strata=bins)
+
+    share = np.bincount(bins, weights=split.train_mask()) / np.bincount(bins)
+    np.testing.assert_allclose(share, 0.8)
+    # El 10 % más alto de la salida también queda repartido
+    top = y >= np.quantile(y, 0.9)
+    assert split.train_mask()[top].mean() == 0.8
+
+
+def test_missing_output_forms_its_own_bin():
+    bins = quantile_bins([1.0, np.nan, 3.0, 2.0], 2)
+    assert bins[1] == 2
+    assert set(bins[[0, 2, 3]]) <= {0, 1}
+
+
+def test_group_split_never_shares_groups():
+    groups = np.repeat(np.arange(40), np.arange(1, 41))
+    codes = group_codes(groups.astype(str))
+    split = random_split(len(groups), 0.7, seed=3, groups=codes)
+
+    assert np.intersect1d(groups[split.train], groups[split.test]).size == 0
+    assert 0.6 < split.n_train / len(groups) < 0.8
+
+
+def test_group_and_stratified_folds():
+    rng = np.random.default_rng(0)
+    groups = group_codes(rng.integers(0, 30, 600))
+    labels = fold_labels(600, 5, rng, groups=groups)
+    for fold in range(5):
+        inside = np.unique(groups[labels == fold])
+        assert np.intersect1d(inside, groups[labels != fold]).size == 0
+
+    strata = quantile_bins(rng.normal(size=600), 4)
+    labels = fold_labels(600, 5, rng, strata=strata)
+    counts = np.bincount(strata * 5 + labels)
+    assert counts.max() - counts.min() <= 1
+
+
+def test_temporal_split_tests_on_most_recent_rows():
+    rng = np.random.default_rng(2)
+    dates = pd.Series(pd.date_range("2024-01-01", periods=100, freq="D")
+                      .to_numpy()[rng.permutation(100)])
+    dates[[5, 17]] = pd.NaT
+    split = temporal_split(dates, 0.75)
+
+    assert split.n_train + split.n_test == 98
+    assert dates.iloc[split.train].max() < dates.iloc[split.test].min()
+    assert split.n_test == 24
+
+
+def test_temporal_split_keeps_equal_dates_together():
+    dates = pd.Series(pd.to_datetime(
+        ["2024-01-01"] * 3 + ["2024-01-02"] * 4 + ["2024-01-03"] * 3))
+    split = temporal_split(dates, 0.5)
+
+    assert split.train.tolist() == [0, 1, 2]
+    assert split.n_test == 7
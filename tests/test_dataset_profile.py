@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pandas as pd
+import pytest
+from data_analysis import DatasetProfile
+
+
+def make_df():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200)
+    df = pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(scale=0.1, size=200),
+        "z": rng.normal(size=200),
+        "flag": rng.integers(0, 2, size=200).astype(bool),
+        "texto": ["a", "b"] * 100
+    })
+    df.loc[[3, 7], "z"] = np.nan
+    df.loc[5, "texto"] = None
+    return df
+
+
+def test_warm_up_fills_every_cache():
+    df = make_df()
+    profile = DatasetProfile(df)
+
+    profile.warm_up()
+
+    assert profile.nan_counts().to_dict() == {
+        "x": 0, "y": 0, "z": 2, "flag": 0, "texto": 1}
+    assert profile.numeric_columns() == ["x", "y", "z"]
+    assert profile.is_numeric("flag")
+    assert not profile.is_numeric("texto")
+    assert all(profile.column_stats.is_cached(c) for c in df.columns)
+
+    expected = df[["x", "y", "z"]].corr()
+    np.testing.assert_allclose(
+        profile.correlation_matrix().to_numpy(), expected.to_numpy())
+    assert profile.ranker.correlation_matrix is profile.correlation_matrix()
+    # La matriz de Gram no la usa nadie tras cargar: solo bajo demanda
+    assert profile._gram is None
+
+
+def test_gram_matrix_uses_complete_rows():
+    df = make_df()
+    gram, n = DatasetProfile(df).gram_matrix()
+
+    complete = df[["x", "y", "z"]].dropna()
+    design = np.column_stack([np.ones(len(complete)), complete.to_numpy()])
+
+    assert n == len(complete)
+    assert list(gram.index) == ["const", "x", "y", "z"]
+    np.testing.assert_allclose(gram.to_numpy(), design.T @ design)
+
+
+def test_ranking_from_precomputed_matrix_matches_direct():
+    df = make_df()
+    profile = DatasetProfile(df)
+    direct = profile.ranker.rank("y")
+
+    profile.correlation_matrix()
+    profile.ranker.invalidate()
+    profile.ranker.correlation_matrix = profile.correlation_matrix()
+
+    pd.testing.assert_frame_equal(profile.ranker.rank("y"), direct)
+
+
+def test_warm_up_can_be_cancelled():
+    profile = DatasetProfile(make_df())
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        profile.warm_up(cancel)
+
+
+def test_invalidate_per_column():
+    df = make_df()
+    profile = DatasetProfile(df)
+    profile.warm_up()
+
+    df["z"] = df["z"].fillna(0.0)
+    profile.invalidate(df, ["z"])
+
+    assert profile.nan_counts(["z", "texto"]).to_dict() == {
+        "z": 0, "texto": 1}
+    assert not profile.column_stats.is_cached("z")
+    assert profile.column_stats.is_cached("x")
+    assert profile.ranker.correlation_matrix is None
+
+
+def test_stale_result_is_not_stored():
+    df = make_df()
+    profile = DatasetProfile(df)
+
+    # Simula un cálculo que termina después de invalidar el perfil
+    version = profile._version
+    profile.invalidate(df)
+    profile._store(version, lambda: profile._nan_counts.update({"x": 99}))
+
+    assert profile.nan_counts(["x"])["x"] == 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from GUI.predict_model import predict_batch, predict_result
+from preprocessing import DatetimeExpander, DesignMatrix, datetime_features
+
+
+def make_dates():
+    return pd.Series(pd.to_datetime([
+        "2024-12-31 23:30", "1969-07-20 20:17", "2000-02-29 06:00", None,
+        "2023-01-01 00:00"
+    ], format="mixed"), name="fecha")
+
+
+def test_calendar_parts_match_pandas_accessors():
+    dates = make_dates()
+    features = datetime_features(
+        dates, ["epoch", "year", "month", "dayofweek", "hour"])
+
+    valid = dates.notna().to_numpy()
+    np.testing.assert_array_equal(
+        features["segundos"][valid],
+        dates[valid].astype("int64") // 10 ** 9)
+    for name, part in [("año", "year"), ("mes", "month"),
+                       ("día semana", "dayofweek"), ("hora", "hour")]:
+        np.testing.assert_array_equal(
+            features[name][valid], getattr(dates.dt, part)[valid])
+    # Fecha faltante: NaN en todas las variables
+    assert all(np.isnan(values[3]) for values in features.values())
+
+
+def test_cyclic_encoding_joins_period_ends():
+    dates = pd.Series(pd.to_datetime(["2024-12-01", "2024-01-01"]))
+    features = datetime_features(dates, ["cyclic"])
+
+    point = np.column_stack([features["sin mes"], features["cos mes"]])
+    # Diciembre y enero quedan a un paso (1/12 de vuelta)
+    assert np.linalg.norm(point[0] - point[1]) == pytest.approx(
+        2 * np.sin(np.pi / 12))
+    np.testing.assert_allclose(np.hypot(*point.T), 1.0)
+
+
+def test_timezone_uses_local_calendar_and_utc_seconds():
+    dates = pd.Series(pd.date_range(
+        "2024-01-01", periods=3, freq="7h", tz="Europe/Madrid"))
+    features = datetime_features(dates, ["epoch", "hour"])
+
+    np.testing.assert_array_equal(features["hora"], [0, 7, 14])
+    np.testing.assert_array_equal(
+        features["segundos"], dates.astype("int64") // 10 ** 9)
+
+
+def test_design_expands_dates_and_predicts_from_text():
+    rng = np.random.default_rng(0)
+    dates = pd.Series(pd.date_range("2020-01-01", periods=400, freq="17h"))
+    df = pd.DataFrame({
+        "fecha": dates,
+        "x": rng.normal(size=400),
+    })
+    df["y"] = 2.0 * df["x"] + 0.5 * dates.dt.hour + rng.normal(0, 0.01, 400)
+
+    design = DesignMatrix(["fecha", "x"], datetimes={"fecha": ["hour"]})
+    model = LinearRegression().fit(design.fit_transform(df), df["y"])
+    assert design.feature_names == ["fecha[hora]", "x"]
+    assert model.coef_ == pytest.approx([0.5, 2.0], abs=1e-2)
+
+    restored = DesignMatrix.from_config(design.to_config())
+    np.testing.assert_allclose(predict_batch(df, model, restored),
+                               model.predict(design.transform(df)))
+
+    result = predict_result(["fecha", "x"], ["2025-06-01 10:00", "1.0"],
+                            "y = ...", model, restored)
+    assert float(result.split(" = ")[1]) == pytest.approx(
+        model.intercept_ + 0.5 * 10 + 2.0, abs=0.05)
+
+
+def test_invalid_features_raise():
+    with pytest.raises(ValueError):
+        DatetimeExpander("fecha", ["minute"])
+    with pytest.raises(ValueError):
+        DatetimeExpander("fecha", [])
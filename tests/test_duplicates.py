@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from preprocessing import (
+    DropDuplicates, DropMissingRows, PreprocessingHistory,
+    PreprocessingPipeline, count_duplicates
+)
+from preprocessing import duplicates
+from preprocessing.duplicates import duplicate_mask
+
+
+def make_df():
+    return pd.DataFrame({
+        "a": [1.0, 2.0, 1.0, np.nan, np.nan, 2.0, 3.0],
+        "b": ["x", "y", "x", "z", "z", "w", None],
+        "c": [10, 20, 10, 30, 30, 20, 40]
+    })
+
+
+def test_mask_matches_pandas_duplicated():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 5, 5_000),
+        "b": rng.choice(["x", "y", "z"], 5_000),
+        "c": rng.integers(0, 4, 5_000).astype(float)
+    })
+    mask = duplicate_mask([df[column] for column in df.columns])
+
+    np.testing.assert_array_equal(mask, df.duplicated().to_numpy())
+
+
+def test_missing_values_compare_equal():
+    df = make_df()
+
+    # Filas 2 y 4 repiten a la 0 y a la 3 (NaN == NaN)
+    assert count_duplicates(df) == 2
+    assert count_duplicates(df) == int(df.duplicated().sum())
+    # Solo "a" y "c": la fila 5 también repite a la 1
+    assert count_duplicates(df, ["a", "c"]) == 3
+
+
+def test_step_keeps_first_occurrence_and_can_be_undone():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+    history.pipeline.add(DropDuplicates())
+    cleaned = history.apply(df)
+
+    assert history.pipeline.steps[-1].rows_removed == 2
+    assert cleaned.index.tolist() == [0, 1, 3, 5, 6]
+    pd.testing.assert_frame_equal(history.undo(cleaned), df)
+
+
+def test_rows_already_dropped_are_not_original_rows():
+    df = make_df()
+    df.loc[0, "c"] = np.nan
+    pipeline = PreprocessingPipeline()
+    pipeline.add(DropMissingRows(["c"]))
+    pipeline.add(DropDuplicates(["a", "b"]))
+    cleaned = pipeline.fit_transform(df)
+
+    # La fila 0 se elimina antes, así que la 2 pasa a ser la primera
+    assert cleaned.index.tolist() == [1, 2, 3, 5, 6]
+
+
+def test_config_roundtrip():
+    pipeline = PreprocessingPipeline()
+    pipeline.add(DropDuplicates(["a", "c"]))
+    pipeline.add(DropDuplicates())
+    pipeline.fit_transform(make_df())
+
+    replay = PreprocessingPipeline.from_config(pipeline.to_config())
+    assert [step.all_columns for step in replay.steps] == [False, True]
+    assert replay.transform(make_df()).index.tolist() == [0, 1, 3, 6]
+
+
+def test_hash_collisions_compare_every_row_of_the_bucket(monkeypatch):
+    # Todas las filas con el mismo hash: la 4.ª repite a la 2.ª, no a la 1.ª
+    df = pd.DataFrame({"a": [1, 2, 3, 2, 1, 5]})
+    monkeypatch.setattr(duplicates, "row_hashes",
+                        lambda columns: np.zeros(len(columns[0]), np.uint64))
+    mask = duplicate_mask([df["a"]])
+    np.testing.assert_array_equal(mask, df.duplicated().to_numpy())
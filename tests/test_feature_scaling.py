@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from GUI.predict_model import predict_batch, predict_result
+from preprocessing import DesignMatrix, FeatureScaler
+from preprocessing.scaling import column_moments
+
+
+def make_df(n=500):
+    rng = np.random.default_rng(1)
+    rooms = rng.uniform(100, 40_000, n)
+    income = rng.uniform(0.5, 15, n)
+    return pd.DataFrame({
+        "total_rooms": rooms,
+        "median_income": income,
+        "value": 0.002 * rooms + 3.0 * income + rng.normal(0, 0.1, n)
+    })
+
+
+def test_chunked_moments_match_numpy():
+    X = np.random.default_rng(0).normal(5, 3, size=(1_001, 3))
+    mean, variance, low, high = column_moments(X, chunk_rows=100)
+
+    np.testing.assert_allclose(mean, X.mean(axis=0))
+    np.testing.assert_allclose(variance, X.var(axis=0))
+    np.testing.assert_array_equal(low, X.min(axis=0))
+    np.testing.assert_array_equal(high, X.max(axis=0))
+
+
+@pytest.mark.parametrize("method", ["standard", "minmax"])
+def test_scaler_uses_training_statistics(method):
+    train = np.array([[0.0, 5.0], [2.0, 5.0], [4.0, 5.0]])
+    scaler = FeatureScaler(method).fit(train)
+    scaled = scaler.transform(train)
+
+    if method == "standard":
+        np.testing.assert_allclose(scaled[:, 0].mean(), 0.0, atol=1e-12)
+        np.testing.assert_allclose(scaled[:, 0].std(), 1.0)
+    else:
+        np.testing.assert_allclose(scaled[:, 0], [0.0, 0.5, 1.0])
+    # Columna constante: sin división por cero
+    np.testing.assert_allclose(scaled[:, 1], 0.0)
+
+    # Datos nuevos: mismas estadísticas, sin recalcular
+    new = scaler.transform(np.array([[8.0, 5.0]]))
+    expected = (8.0 - 2.0) / train[:, 0].std() if method == "standard" else 2.0
+    assert new[0, 0] == pytest.approx(expected)
+
+
+def test_saved_design_reapplies_scaling_at_prediction():
+    df = make_df()
+    train, test = df.iloc[:400], df.iloc[400:]
+    inputs = ["total_rooms", "median_income"]
+
+    design = DesignMatrix(inputs, scaling="standard")
+    model = LinearRegression().fit(
+        design.fit_transform(train), train["value"])
+    assert design.feature_names == ["z(total_rooms)", "z(median_income)"]
+
+    restored = DesignMatrix.from_config(design.to_config())
+    expected = model.predict(design.transform(test))
+    np.testing.assert_allclose(
+        predict_batch(test, model, restored), expected)
+
+    row = test.iloc[0]
+    result = predict_result(
+        inputs, [str(row["total_rooms"]), str(row["median_income"])],
+        "value = ...", model, restored)
+    assert float(result.split(" = ")[1]) == pytest.approx(expected[0])
+
+
+def test_invalid_scaling_raises():
+    with pytest.raises(ValueError):
+        FeatureScaler("robust")
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from modeling import GramCache, random_split, train_linear_model
+from preprocessing import DesignMatrix
+
+
+def make_df(n=3_000):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    df["a"] += 1e6
+    df["y"] = 2 * df["a"] - df["b"] + 0.5 * df["c"] + rng.normal(size=n)
+    df["texto"] = "x"
+    df["huecos"] = np.where(rng.random(n) < 0.1, np.nan, 1.0)
+    return df
+
+
+@pytest.mark.parametrize("inputs, output", [
+    (["a", "b", "c"], "y"),
+    (["b"], "y"),
+    (["c", "d", "y"], "a"),
+])
+def test_any_subset_matches_a_fresh_fit(inputs, output):
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=0)
+    cache = GramCache(df, split)
+    model, r2, mse = cache.fit(inputs, output)
+
+    train = split.train_frame(df)
+    reference = LinearRegression().fit(train[inputs], train[output])
+    np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-7)
+    assert model.intercept_ == pytest.approx(reference.intercept_)
+    predicted = reference.predict(train[inputs])
+    assert r2 == pytest.approx(r2_score(train[output], predicted))
+    assert mse == pytest.approx(mean_squared_error(train[output], predicted))
+
+
+def test_only_complete_numeric_columns_are_served():
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=0)
+    cache = GramCache(df, split)
+
+    assert cache.supports(["a", "y"])
+    assert not cache.supports(["a", "huecos"])
+    assert not cache.supports(["texto"])
+    with pytest.raises(ValueError):
+        cache.fit(["huecos"], "y")
+
+
+def test_cache_is_tied_to_data_and_split():
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=0)
+    cache = GramCache(df, split)
+
+    assert cache.matches(df, random_split(len(df), 0.8, seed=0))
+    assert not cache.matches(df, random_split(len(df), 0.8, seed=1))
+    assert not cache.matches(df.copy(), split)
+
+
+def test_training_from_cache_matches_regular_training():
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=0)
+    inputs = ["a", "b"]
+
+    def make_design():
+        return DesignMatrix(inputs)
+
+    cached = train_linear_model(df, split, inputs, "y", make_design,
+                                gram=GramCache(df, split))
+    regular = train_linear_model(df, split, inputs, "y", make_design)
+    np.testing.assert_allclose(cached.model.coef_, regular.model.coef_)
+    np.testing.assert_allclose(cached.r2, regular.r2)
+    np.testing.assert_allclose(cached.mse, regular.mse)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import FillMissing, PreprocessingPipeline, impute
+
+
+def make_df():
+    return pd.DataFrame({
+        "a": [np.nan, 1.0, np.nan, 4.0, 4.0, np.nan],
+        "b": [2.0, np.nan, 6.0, np.nan, 10.0, np.nan],
+        "c": [1.0, 1.0, np.nan, 3.0, 3.0, 3.0],
+        "texto": ["x", None, "y", "y", None, "x"]
+    })
+
+
+def columns_of(df):
+    return {name: df[name] for name in df.columns}
+
+
+@pytest.mark.parametrize("strategy, expected", [
+    ("mean", lambda s: s.fillna(s.mean())),
+    ("median", lambda s: s.fillna(s.median())),
+    ("mode", lambda s: s.fillna(s.mode().iloc[0])),
+    ("ffill", lambda s: s.ffill()),
+    ("bfill", lambda s: s.bfill()),
+    ("interpolate", lambda s: s.interpolate()),
+])
+def test_numeric_strategies_match_pandas(strategy, expected):
+    df = make_df()[["a", "b", "c"]]
+    filled, _ = impute(columns_of(df), dict.fromkeys(df.columns, strategy))
+
+    for name in df.columns:
+        pd.testing.assert_series_equal(
+            filled[name], expected(df[name]), check_names=False)
+
+
+def test_mixed_strategies_in_one_call():
+    df = make_df()
+    strategies = {"a": "median", "b": "interpolate", "c": "constant",
+                  "texto": "mode"}
+
+    filled, values = impute(columns_of(df), strategies, constant=0.0)
+
+    assert filled["a"].tolist() == [4.0, 1.0, 4.0, 4.0, 4.0, 4.0]
+    assert filled["b"].tolist() == [2.0, 4.0, 6.0, 8.0, 10.0, 10.0]
+    assert filled["c"].tolist() == [1.0, 1.0, 0.0, 3.0, 3.0, 3.0]
+    assert filled["texto"].tolist() == ["x", "x", "y", "y", "x", "x"]
+    assert values == {"a": 4.0, "c": 0.0, "texto": "x"}
+
+
+def test_rows_restrict_statistics_and_sources():
+    df = make_df()
+    rows = np.array([True, True, True, False, True, True])
+
+    filled, values = impute(
+        columns_of(df), {"a": "mean", "b": "ffill"}, rows=rows)
+
+    # La fila 3 (eliminada) no cuenta para la media ni como origen
+    assert values["a"] == 2.5
+    assert filled["b"].iloc[5] == 10.0
+
+
+def test_learned_values_are_reused():
+    df = make_df()
+    _, values = impute(columns_of(df), {"a": "mean"})
+
+    new = pd.DataFrame({"a": [np.nan, 100.0]})
+    filled, _ = impute(columns_of(new), {"a": "mean"}, values=values)
+
+    assert filled["a"].iloc[0] == 3.0
+
+
+def test_text_column_rejects_numeric_strategy():
+    df = make_df()
+
+    with pytest.raises(ValueError):
+        impute(columns_of(df), {"texto": "mean"})
+
+
+def test_pipeline_step_with_strategy_mix():
+    step = FillMissing(["a", "texto"], {"a": "mean", "texto": "bfill"})
+    result = PreprocessingPipeline([step]).fit_transform(make_df())
+
+    assert step.filled == ["a", "texto"]
+    assert result["a"].isna().sum() == 0
+    assert result["texto"].tolist() == ["x", "y", "y", "y", "x", "x"]
+    assert "por columna" in step.describe()
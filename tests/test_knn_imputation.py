@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import KNNFill, KNNImputer, PreprocessingPipeline
+
+
+def make_housing(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    households = rng.uniform(100, 1000, n)
+    rooms = households * rng.uniform(4, 6, n)
+    bedrooms = rooms * 0.2 + rng.normal(0, 5, n)
+    df = pd.DataFrame({
+        "total_rooms": rooms,
+        "households": households,
+        "total_bedrooms": bedrooms
+    })
+    missing = rng.choice(n, 100, replace=False)
+    truth = df.loc[missing, "total_bedrooms"].copy()
+    df.loc[missing, "total_bedrooms"] = np.nan
+    return df, truth
+
+
+def brute_force_knn(reference, row, available, k):
+    mean = reference.mean(axis=0)
+    scale = reference.std(axis=0)
+    scaled = (reference[:, available] - mean[available]) / scale[available]
+    point = (row[available] - mean[available]) / scale[available]
+    order = np.argsort(((scaled - point) ** 2).sum(axis=1), kind="stable")
+    return reference[order[:k]].mean(axis=0)
+
+
+def test_matches_brute_force_neighbours():
+    df, _ = make_housing(300)
+    X = df.to_numpy()
+    imputer = KNNImputer(k=3).fit(X)
+
+    filled = imputer.transform(X)
+
+    reference = X[~np.isnan(X).any(axis=1)]
+    for i in np.flatnonzero(np.isnan(X).any(axis=1))[:10]:
+        available = ~np.isnan(X[i])
+        expected = brute_force_knn(reference, X[i], available, 3)
+        np.testing.assert_allclose(filled[i, ~available],
+                                   expected[~available])
+
+
+def test_knn_beats_mean_fill_on_related_columns():
+    df, truth = make_housing()
+
+    result = PreprocessingPipeline([
+        KNNFill(list(df.columns), k=5)]).fit_transform(df)
+
+    knn_error = np.abs(result.loc[truth.index, "total_bedrooms"] - truth)
+    mean_error = np.abs(df["total_bedrooms"].mean() - truth)
+    assert result["total_bedrooms"].isna().sum() == 0
+    assert knn_error.mean() < mean_error.mean() / 3
+
+
+def test_rows_without_known_coordinates_use_reference_mean():
+    X = np.array([[1.0, 2.0], [3.0, 4.0], [np.nan, np.nan]])
+
+    filled = KNNImputer(k=1).fit_transform(X)
+
+    np.testing.assert_allclose(filled[2], [2.0, 3.0])
+
+
+def test_replay_from_saved_state():
+    df, _ = make_housing(500)
+    pipeline = PreprocessingPipeline([KNNFill(list(df.columns), k=4)])
+    pipeline.fit_transform(df)
+
+    restored = PreprocessingPipeline.from_config(pipeline.to_config())
+    new = pd.DataFrame({"total_rooms": [2500.0], "households": [500.0],
+                        "total_bedrooms": [np.nan]})
+    result = restored.transform(new)
+
+    assert 350 < result["total_bedrooms"].iloc[0] < 650
+
+
+def test_failed_step_is_discarded():
+    df = pd.DataFrame({"a": [1.0, np.nan], "b": [np.nan, 2.0]})
+    pipeline = PreprocessingPipeline()
+    pipeline.add(KNNFill(["a", "b"]))
+
+    with pytest.raises(ValueError):
+        pipeline.fit_transform(df)
+    assert len(pipeline) == 0
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import (
+    OutlierFilter, PreprocessingHistory, PreprocessingPipeline,
+    count_outliers
+)
+from preprocessing.outliers import outlier_bounds
+
+
+def make_df():
+    values = np.linspace(0.0, 10.0, 101)
+    values[[5, 50]] = [1_000.0, -500.0]
+    other = np.ones(101)
+    other[7] = np.nan
+    return pd.DataFrame({"a": values, "b": other, "texto": ["x"] * 101})
+
+
+@pytest.mark.parametrize("method", ["zscore", "iqr", "mad"])
+def test_spikes_are_detected_by_every_method(method):
+    counts, rows = count_outliers(make_df(), ["a", "b"], method)
+
+    assert counts["a"] == 2
+    # Columna constante (con un NaN): sin dispersión, sin atípicos
+    assert counts["b"] == 0
+    assert rows == 2
+
+
+def test_iqr_bounds_match_quantiles():
+    X = np.array([[1.0], [2.0], [3.0], [4.0], [np.nan]])
+    low, high = outlier_bounds(X, "iqr", 1.5)
+
+    q1, q3 = np.quantile([1.0, 2.0, 3.0, 4.0], [0.25, 0.75])
+    assert low[0] == pytest.approx(q1 - 1.5 * (q3 - q1))
+    assert high[0] == pytest.approx(q3 + 1.5 * (q3 - q1))
+
+
+def test_drop_and_clip_actions():
+    df = make_df()
+
+    dropped = PreprocessingPipeline([OutlierFilter(["a"], "mad")])
+    result = dropped.fit_transform(df)
+    assert len(result) == 99
+    assert dropped.steps[0].rows_removed == 2
+
+    step = OutlierFilter(["a", "b"], "iqr", action="clip")
+    clipped = PreprocessingPipeline([step]).fit_transform(df)
+    assert len(clipped) == len(df)
+    assert clipped["a"].max() == pytest.approx(step.high[0])
+    assert clipped["a"].min() == pytest.approx(step.low[0])
+    assert np.isnan(clipped.loc[7, "b"])
+    assert step.clipped == 2
+
+
+def test_bounds_are_reused_on_new_data_and_clip_can_be_undone():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+    history.pipeline.add(OutlierFilter(["a"], "zscore", 2.0, "clip"))
+    clipped = history.apply(df)
+
+    config = history.pipeline.to_config()
+    replay = PreprocessingPipeline.from_config(config)
+    new = pd.DataFrame({"a": [0.0, 1e6]})
+    assert replay.transform(new)["a"].iloc[1] == pytest.approx(
+        config[0]["high"][0])
+
+    pd.testing.assert_frame_equal(history.undo(clipped), df)
+
+
+def test_invalid_settings_raise():
+    with pytest.raises(ValueError):
+        OutlierFilter(["a"], "percentil")
+    with pytest.raises(ValueError):
+        OutlierFilter(["a"], action="marcar")
+    with pytest.raises(ValueError):
+        count_outliers(make_df(), ["a"], "iqr", threshold=0)
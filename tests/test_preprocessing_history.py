@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import (
+    DropMissingRows, FillMissing, PreprocessingHistory, PreprocessingPipeline
+)
+
+
+def make_df():
+    return pd.DataFrame({
+        "a": [1.0, np.nan, 3.0, np.nan, 5.0],
+        "b": [np.nan, 2.0, 2.0, 4.0, 6.0],
+        "texto": ["x", "y", None, "z", "w"]
+    }, index=[10, 11, 12, 13, 14])
+
+
+def apply(history, df, step):
+    history.pipeline.add(step)
+    return history.apply(df)
+
+
+def test_undo_drop_restores_rows_in_place():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+
+    dropped = apply(history, df, DropMissingRows(["a", "b"]))
+    restored = history.undo(dropped)
+
+    assert len(dropped) == 2
+    pd.testing.assert_frame_equal(restored, df)
+    assert len(history.pipeline) == 0
+
+
+def test_undo_fill_restores_nan_and_dtype():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+
+    filled = apply(history, df, FillMissing(["a"], "constant", "falta"))
+    assert filled["a"].dtype == object
+
+    restored = history.undo(filled)
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_redo_reapplies_fitted_steps():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+
+    step1 = apply(history, df, FillMissing(["a"], "mean"))
+    step2 = apply(history, step1, DropMissingRows(["texto"]))
+
+    back = history.undo(history.undo(step2))
+    pd.testing.assert_frame_equal(back, df)
+    assert history.can_redo and not history.can_undo
+
+    again = history.redo(history.redo(back))
+    pd.testing.assert_frame_equal(again, step2)
+    assert len(history.pipeline) == 2
+
+
+def test_new_step_clears_redo():
+    df = make_df()
+    history = PreprocessingHistory(PreprocessingPipeline())
+
+    filled = apply(history, df, FillMissing(["a"], "median"))
+    history.undo(filled)
+    apply(history, df, DropMissingRows(["b"]))
+
+    assert not history.can_redo
+    with pytest.raises(IndexError):
+        history.redo(df)
+
+
+def test_deltas_are_compact_and_budget_is_respected():
+    n = 100_000
+    df = pd.DataFrame({"x": np.arange(n, dtype=float),
+                       "y": np.ones(n)})
+    df.loc[::1000, "x"] = np.nan
+    history = PreprocessingHistory(PreprocessingPipeline())
+
+    result = apply(history, df, FillMissing(["x"], "mean"))
+
+    # Solo las posiciones rellenadas, no una copia de los datos
+    assert history.nbytes < df.memory_usage().sum() / 50
+
+    history.max_bytes = history.nbytes
+    apply(history, result, DropMissingRows(["x"]))
+    apply(history, result, FillMissing(["y"], "mean"))
+    assert history.nbytes <= history.max_bytes
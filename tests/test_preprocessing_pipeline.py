@@ -0,0 +1,96 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import DropMissingRows, FillMissing, PreprocessingPipeline
+from preprocessing.pipeline import PreprocessingStep
+
+
+def make_df():
+    return pd.DataFrame({
+        "a": [1.0, None, 3.0, None, 5.0],
+        "b": [None, 2.0, 2.0, 4.0, 6.0],
+        "texto": ["x", "y", None, "z", "w"]
+    })
+
+
+def test_steps_are_lazy_until_fit_transform():
+    df = make_df()
+    pipeline = PreprocessingPipeline()
+
+    pipeline.add(FillMissing(["a"], "mean")).add(DropMissingRows(["b"]))
+
+    assert len(pipeline.pending) == 2
+    assert df["a"].isna().sum() == 2
+
+    result = pipeline.fit_transform(df)
+
+    assert pipeline.pending == []
+    assert list(result.index) == [1, 2, 3, 4]
+    assert result["a"].tolist() == [3.0, 3.0, 3.0, 5.0]
+    # El DataFrame original no se modifica
+    assert df["a"].isna().sum() == 2
+
+
+def test_statistics_use_rows_kept_by_previous_steps():
+    df = make_df()
+    pipeline = PreprocessingPipeline([
+        DropMissingRows(["b"]),
+        FillMissing(["a"], "median")
+    ])
+
+    result = pipeline.fit_transform(df)
+
+    # Tras eliminar la fila 0 la mediana de "a" es la de [3, 5]
+    assert result["a"].tolist() == [4.0, 3.0, 4.0, 5.0]
+
+
+def test_untouched_columns_are_not_copied():
+    df = make_df()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = PreprocessingPipeline([
+            FillMissing(["a"], "constant", 0.0)
+        ]).fit_transform(df)
+
+    assert result is not df
+    assert np.shares_memory(result["b"].to_numpy(), df["b"].to_numpy())
+    assert result["a"].tolist() == [1.0, 0.0, 3.0, 0.0, 5.0]
+
+
+def test_replay_on_new_data_with_config():
+    pipeline = PreprocessingPipeline()
+    pipeline.add(FillMissing(["a", "b"], "mean"))
+    pipeline.add(DropMissingRows(["texto"]))
+    pipeline.fit_transform(make_df())
+
+    restored = PreprocessingPipeline.from_config(pipeline.to_config())
+    new = pd.DataFrame({
+        "a": [None, 10.0], "b": [1.0, None], "texto": ["q", "r"]})
+    result = restored.transform(new)
+
+    # Se usan las medias aprendidas, no las de los datos nuevos
+    assert result["a"].tolist() == [3.0, 10.0]
+    assert result["b"].tolist() == [1.0, 3.5]
+    assert restored.describe() == pipeline.describe()
+
+
+def test_drop_reports_removed_rows():
+    step = DropMissingRows(["a", "b"])
+    result = PreprocessingPipeline([step]).fit_transform(make_df())
+
+    assert step.rows_removed == 3
+    assert len(result) == 2
+
+
+def test_incomplete_step_cannot_be_created():
+    class NoRun(PreprocessingStep):
+        kind = "sin_run"
+
+        def describe(self):
+            return "sin run"
+
+    with pytest.raises(TypeError):
+        NoRun(["a"])
@@ -0,0 +1,165 @@
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from modeling import (
+    GramCache, IncrementalLeastSquares, RecursiveLeastSquares, random_split,
+    train_linear_model, update_chunks
+)
+from preprocessing import DesignMatrix
+
+
+def design_for(df):
+    design = DesignMatrix(["x1", "x2", "zona"], encodings={"zona": "onehot"})
+    return design.fit(df, df["y"])
+
+
+def test_update_matches_refit_with_all_rows(make_regression_df):
+    df = make_regression_df()
+    old, new = df.iloc[:2_000], df.iloc[2_000:]
+    design = design_for(old)
+    statistics = IncrementalLeastSquares(len(design.feature_names)).update(
+        design.transform(old), old["y"])
+
+    model = RecursiveLeastSquares(statistics)
+    # Varias llegadas de tamaños distintos
+    for start, end in [(0, 1), (1, 300), (300, 1_000)]:
+        rows = new.iloc[start:end]
+        model.update(design.transform(rows), rows["y"])
+
+    X = design.transform(df).toarray()
+    reference = LinearRegression().fit(X, df["y"])
+    np.testing.assert_allclose(model.coef, reference.coef_, rtol=1e-8)
+    assert model.intercept == pytest.approx(reference.intercept_)
+    assert model.rows_added == 1_000
+
+    r2, mse = model.score()
+    predicted = reference.predict(X)
+    assert r2 == pytest.approx(r2_score(df["y"], predicted))
+    assert mse == pytest.approx(mean_squared_error(df["y"], predicted))
+
+
+def test_forgetting_matches_weighted_fit(make_regression_df):
+    df = make_regression_df(seed=1)
+    inputs = ["x1", "x2"]
+    X, y = df[inputs].to_numpy(), df["y"].to_numpy()
+    statistics = IncrementalLeastSquares(2).update(X[:1_000], y[:1_000])
+
+    model = RecursiveLeastSquares(statistics, forgetting=0.995)
+    model.update(X[1_000:2_500], y[1_000:2_500])
+    model.update(X[2_500:], y[2_500:])
+
+    # Cada fila pesa λ^(filas llegadas después)
+    ages = np.r_[np.full(1_000, 2_000), np.arange(1_999, -1, -1)]
+    weights = 0.995 ** ages
+    reference = LinearRegression().fit(X, y, sample_weight=weights)
+    np.testing.assert_allclose(model.coef, reference.coef_, rtol=1e-7)
+    assert model.intercept == pytest.approx(reference.intercept_)
+
+    coef, intercept = model.statistics.solve()
+    np.testing.assert_allclose(coef, model.coef, rtol=1e-7)
+
+
+def test_weighted_statistics_match_weighted_fit(make_regression_df):
+    df = make_regression_df(500, seed=2)
+    X, y = df[["x1", "x2"]].to_numpy(), df["y"].to_numpy()
+    weights = np.random.default_rng(3).uniform(0.1, 2.0, len(y))
+
+    statistics = IncrementalLeastSquares(2)
+    statistics.update(X[:200], y[:200], weights=weights[:200])
+    statistics.update(X[200:], y[200:], weights=weights[200:])
+    coef, intercept = statistics.solve()
+
+    reference = LinearRegression().fit(X, y, sample_weight=weights)
+    np.testing.assert_allclose(coef, reference.coef_, rtol=1e-9)
+    assert intercept == pytest.approx(reference.intercept_)
+    assert statistics.count == pytest.approx(weights.sum())
+
+
+def test_saved_state_continues_the_same_updates(make_regression_df):
+    df = make_regression_df(seed=4)
+    X, y = df[["x1", "x2"]].to_numpy(), df["y"].to_numpy()
+    statistics = IncrementalLeastSquares(2).update(X[:1_000], y[:1_000])
+    model = RecursiveLeastSquares(statistics, forgetting=0.99)
+    model.update(X[1_000:2_000], y[1_000:2_000])
+
+    restored = RecursiveLeastSquares.from_config(model.to_config())
+    model.update(X[2_000:], y[2_000:])
+    restored.update(X[2_000:], y[2_000:])
+    np.testing.assert_allclose(restored.coef, model.coef)
+    assert restored.intercept == pytest.approx(model.intercept)
+    assert restored.rows_added == 2_000
+
+
+def test_update_chunks_scores_new_rows_with_previous_model(make_regression_df):
+    df = make_regression_df(seed=5)
+    split = random_split(len(df), 0.8, seed=0)
+    result = train_linear_model(
+        df, split, ["x1", "zona"], "y",
+        lambda: DesignMatrix(["x1", "zona"], encodings={"zona": "onehot"}))
+    statistics, test_statistics = result.sufficient_statistics("y")
+    model = RecursiveLeastSquares(statistics,
+                                  test_statistics=test_statistics)
+    # Sin filas nuevas, las métricas son las del entrenamiento
+    np.testing.assert_allclose(model.score(), [result.r2[0], result.mse[0]])
+    np.testing.assert_allclose(model.test_score(),
+                               [result.r2[1], result.mse[1]])
+
+    new = make_regression_df(1_000, seed=6)
+    chunks = [new.iloc[:400], new.iloc[400:]]
+    r2_new, mse_new = update_chunks(model, chunks, "y", result.design)
+    predicted = result.model.predict(result.design.transform(new))
+    assert r2_new == pytest.approx(r2_score(new["y"], predicted))
+    assert mse_new == pytest.approx(mean_squared_error(new["y"], predicted))
+    assert model.rows_added == 1_000
+
+    with pytest.raises(ValueError):
+        update_chunks(model, [], "y", result.design)
+
+
+def test_training_statistics_from_gram_cache(make_regression_df):
+    df = make_regression_df(seed=7)
+    split = random_split(len(df), 0.7, seed=1)
+    inputs = ["x1", "x2"]
+    direct = train_linear_model(df, split, inputs, "y",
+                                lambda: DesignMatrix(inputs))
+    cached = train_linear_model(df, split, inputs, "y",
+                                lambda: DesignMatrix(inputs),
+                                gram=GramCache(df, split))
+    assert cached.gram is not None and direct.gram is None
+    # Se calculan al pedirlos y solo una vez
+    statistics, _ = cached.sufficient_statistics("y")
+    assert cached.sufficient_statistics("y")[0] is statistics
+    reference, _ = direct.sufficient_statistics("y")
+    assert statistics.count == reference.count
+    np.testing.assert_allclose(statistics.sxx, reference.sxx)
+    np.testing.assert_allclose(statistics.sxy, reference.sxy)
+
+
+def test_invalid_forgetting_and_rows_are_rejected():
+    statistics = IncrementalLeastSquares(1).update([[0.0], [1.0]], [0, 1])
+    with pytest.raises(ValueError):
+        RecursiveLeastSquares(statistics, forgetting=0)
+    model = RecursiveLeastSquares(statistics)
+    with pytest.raises(ValueError):
+        model.update([[np.nan]], [1.0])
+    with pytest.raises(ValueError):
+        model.update([[1.0, 2.0]], [1.0])
+
+
+def test_statistics_stop_when_cancelled(make_regression_df):
+    class Cancelled:
+        def check(self):
+            raise CancelledError()
+
+    df = make_regression_df(seed=8)
+    split = random_split(len(df), 0.8, seed=2)
+    result = train_linear_model(df, split, ["x1", "x2"], "y",
+                                lambda: DesignMatrix(["x1", "x2"]))
+    with pytest.raises(CancelledError):
+        result.sufficient_statistics("y", Cancelled())
+    # Sin guardar nada a medias: se pueden pedir otra vez
+    statistics, test_statistics = result.sufficient_statistics("y")
+    assert statistics.count + test_statistics.count == len(df)
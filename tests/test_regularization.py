@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import ElasticNet, Lasso, Ridge
+from modeling import (
+    CrossValidation, IncrementalLeastSquares, RegularizedRegression,
+    elastic_net_path, path_mse, random_split, ridge_path, train_linear_model
+)
+from preprocessing import DesignMatrix
+
+
+def make_data(n=2_000, p=8, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, p)) * rng.uniform(0.1, 100, p)
+    # Dos columnas casi colineales
+    X[:, 1] = 3 * X[:, 0] + rng.normal(scale=0.3 * X[:, 0].std(), size=n)
+    coef = np.zeros(p)
+    coef[:4] = rng.normal(size=4) / X[:, :4].std(axis=0)
+    y = X @ coef + 5.0 + rng.normal(size=n)
+    return X, y
+
+
+def test_ridge_path_matches_ridge_on_standardized_columns():
+    X, y = make_data()
+    statistics = IncrementalLeastSquares(X.shape[1]).update(X, y)
+    alphas = np.array([10.0, 0.1, 1e-3])
+    coefs, intercepts = ridge_path(statistics, alphas)
+
+    scale = X.std(axis=0)
+    for k, alpha in enumerate(alphas):
+        # (1/2n)·||r||² + α/2·||b||²  <=>  ||r||² + n·α·||b||²
+        reference = Ridge(alpha=len(y) * alpha).fit(X / scale, y)
+        np.testing.assert_allclose(coefs[k], reference.coef_ / scale,
+                                   rtol=1e-8)
+        assert intercepts[k] == pytest.approx(reference.intercept_)
+
+
+@pytest.mark.parametrize("l1_ratio", [1.0, 0.5])
+def test_elastic_net_path_matches_coordinate_descent(l1_ratio):
+    X, y = make_data(seed=1)
+    statistics = IncrementalLeastSquares(X.shape[1]).update(X, y)
+    penalty = "lasso" if l1_ratio == 1 else "elasticnet"
+    regularization = RegularizedRegression(penalty, l1_ratio)
+    alphas = regularization.alphas(statistics)
+    coefs, intercepts = elastic_net_path(statistics, alphas, l1_ratio,
+                                         tol=1e-10)
+
+    # El primer α deja todos los coeficientes a cero
+    assert not coefs[0].any()
+    assert intercepts[0] == pytest.approx(y.mean())
+
+    scale = X.std(axis=0)
+    for k in (10, 30, len(alphas) - 1):
+        reference = (Lasso(alpha=alphas[k], tol=1e-10, max_iter=100_000)
+                     if penalty == "lasso" else
+                     ElasticNet(alpha=alphas[k], l1_ratio=l1_ratio,
+                                tol=1e-10, max_iter=100_000))
+        reference.fit(X / scale, y)
+        np.testing.assert_allclose(coefs[k] * scale, reference.coef_,
+                                   atol=1e-4)
+
+
+def test_path_mse_matches_direct_errors():
+    X, y = make_data(500, seed=2)
+    statistics = IncrementalLeastSquares(X.shape[1]).update(X, y)
+    coefs, intercepts = ridge_path(statistics, [1.0, 0.01])
+    expected = [np.mean((y - X @ coef - intercept) ** 2)
+                for coef, intercept in zip(coefs, intercepts)]
+    np.testing.assert_allclose(path_mse(statistics, coefs, intercepts),
+                               expected)
+
+
+@pytest.mark.parametrize("penalty", ["ridge", "lasso", "elasticnet"])
+def test_fit_selects_alpha_with_lowest_validation_error(penalty):
+    X, y = make_data(seed=3)
+    validation = CrossValidation("kfold", 4, seed=0)
+    path = RegularizedRegression(penalty, validation=validation).fit(X, y)
+
+    assert path.cv_mse.shape == (len(path.alphas), 4)
+    summary = path.summary()
+    assert path.alpha == summary["alpha"][summary["mse"].idxmin()]
+    np.testing.assert_allclose(path.to_model().coef_, path.coef)
+
+    # Mismo ECM que ajustar y evaluar la primera partición a mano
+    _, split = next(validation.folds(len(y)))
+    train = IncrementalLeastSquares(X.shape[1]).update(
+        X[split.train], y[split.train])
+    coefs, intercepts = RegularizedRegression(penalty).path(
+        train, path.alphas)
+    held_out = X[split.test] @ coefs.T + intercepts
+    np.testing.assert_allclose(
+        path.cv_mse[:, 0],
+        ((y[split.test, None] - held_out) ** 2).mean(axis=0))
+
+
+def test_training_with_regularization(make_regression_df):
+    df = make_regression_df(1_500, seed=4)
+    split = random_split(len(df), 0.8, seed=0)
+    inputs = ["x1", "x2", "zona"]
+
+    result = train_linear_model(
+        df, split, inputs, "y",
+        lambda: DesignMatrix(inputs, encodings={"zona": "onehot"}),
+        validation=CrossValidation("kfold", 3, seed=0),
+        regularization=RegularizedRegression(
+            "lasso", validation=CrossValidation("kfold", 3, seed=0)))
+
+    path = result.path
+    assert path.feature_names == list(result.design.feature_names)
+    np.testing.assert_allclose(result.model.coef_, path.coef)
+    # Las particiones solo eligen α y el modelo no es de mínimos cuadrados
+    assert result.cv_result is None
+    assert result.sufficient_statistics("y") is None
+    assert result.r2[1] > 0.8
+    config = path.to_config()
+    assert config["penalty"] == "lasso"
+    assert config["alpha"] == pytest.approx(path.alpha)
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        RegularizedRegression("bridge")
+    with pytest.raises(ValueError):
+        RegularizedRegression("elasticnet", l1_ratio=0)
+    statistics = IncrementalLeastSquares(2).update(
+        np.ones((5, 2)), np.arange(5.0))
+    with pytest.raises(ValueError):
+        RegularizedRegression("ridge").alphas(statistics)
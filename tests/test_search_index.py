@@ -0,0 +1,50 @@
+import pandas as pd
+from data_analysis import DatasetSearchIndex
+
+
+def make_df():
+    return pd.DataFrame({
+        "id": [1, 2, 42, 42, None],
+        "nombre": ["Ana", "bob", "ANA", None, "Zoe"],
+        "fecha": pd.to_datetime(["2020-01-01", "2020-01-02",
+                                 "2020-01-01", None, "2020-01-03"])
+    })
+
+
+def test_exact_search_numeric():
+    index = DatasetSearchIndex(make_df())
+
+    assert index.find("42", exact=True).tolist() == [2, 3]
+    assert index.find("42.0", columns=["id"], exact=True).tolist() == [2, 3]
+    assert index.find("7", exact=True).tolist() == []
+
+
+def test_exact_search_text_and_dates():
+    index = DatasetSearchIndex(make_df())
+
+    assert index.find("Ana", exact=True).tolist() == [0]
+    assert index.find("2020-01-01", columns=["fecha"],
+                      exact=True).tolist() == [0, 2]
+
+
+def test_substring_search_ignores_case_and_nan():
+    index = DatasetSearchIndex(make_df())
+
+    assert index.find("an", columns=["nombre"]).tolist() == [0, 2]
+    # Los valores faltantes no coinciden con el texto "nan"
+    assert index.find("nan", columns=["nombre"]).tolist() == []
+
+
+def test_index_is_reused_between_queries():
+    index = DatasetSearchIndex(make_df())
+
+    index.find("42", columns=["id"], exact=True)
+    cached = index._exact["id"]
+    index.find("1", columns=["id"], exact=True)
+
+    assert index._exact["id"] is cached
+
+
+def test_empty_query_returns_no_rows():
+    index = DatasetSearchIndex(make_df())
+    assert len(index.find("   ")) == 0
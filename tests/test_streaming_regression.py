@@ -0,0 +1,145 @@
+import sqlite3
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from data_import import iter_chunks
+from modeling import IncrementalLeastSquares, fit_chunks, score_chunks
+from preprocessing import DesignMatrix
+
+
+def test_csv_chunks_match_linear_regression(tmp_path, make_regression_df):
+    df = make_regression_df(5_000)
+    path = tmp_path / "datos.csv"
+    df.to_csv(path, index=False)
+    inputs = ["x1", "x2"]
+
+    chunks = list(iter_chunks(path, inputs + ["y"], chunksize=700))
+    assert len(chunks) == 8
+    assert list(chunks[0].columns) == ["x1", "x2", "y"]
+
+    least_squares = fit_chunks(
+        iter_chunks(path, inputs + ["y"], chunksize=700), "y",
+        DesignMatrix(inputs))
+    coef, intercept = least_squares.solve()
+    model = LinearRegression().fit(df[inputs], df["y"])
+    np.testing.assert_allclose(coef, model.coef_, rtol=1e-9)
+    assert intercept == pytest.approx(model.intercept_)
+
+    r2, mse = least_squares.score(coef, intercept)
+    predicted = model.predict(df[inputs])
+    assert r2 == pytest.approx(r2_score(df["y"], predicted))
+    assert mse == pytest.approx(mean_squared_error(df["y"], predicted))
+
+
+def test_sqlite_chunks_with_encoded_design_and_test_scoring(
+        tmp_path, make_regression_df):
+    train = make_regression_df(5_000, seed=1)
+    test = make_regression_df(2_000, seed=2)
+    path = tmp_path / "datos.db"
+    with sqlite3.connect(path) as conn:
+        train.to_sql("ventas", conn, index=False)
+    inputs = ["x1", "zona"]
+    design = DesignMatrix(inputs, encodings={"zona": "onehot"})
+
+    least_squares = fit_chunks(
+        lambda: iter_chunks(path, inputs + ["y"], chunksize=1_000), "y",
+        design)
+    model = least_squares.to_model()
+    reference = LinearRegression().fit(design.transform(train), train["y"])
+    np.testing.assert_allclose(model.coef_, reference.coef_)
+
+    chunks = (test.iloc[i:i + 300] for i in range(0, len(test), 300))
+    r2, mse = score_chunks(
+        chunks, "y", design, model.coef_, model.intercept_)
+    predicted = model.predict(design.transform(test))
+    assert r2 == pytest.approx(r2_score(test["y"], predicted))
+    assert mse == pytest.approx(mean_squared_error(test["y"], predicted))
+
+
+def test_design_is_fitted_with_every_chunk(make_regression_df):
+    df = make_regression_df(5_000, seed=4)
+    # Una categoría que solo aparece en el último bloque
+    df.loc[4_500:, "zona"] = "oeste"
+    df.loc[4_500:, "y"] += 10.0
+    inputs = ["x1", "x2", "zona"]
+
+    def new_design(method):
+        return DesignMatrix(inputs, encodings={"zona": method},
+                            scaling="standard")
+
+    def chunks():
+        return (df.iloc[i:i + 1_000] for i in range(0, len(df), 1_000))
+
+    for method in ("onehot", "target"):
+        design = new_design(method)
+        least_squares = fit_chunks(chunks, "y", design)
+        reference = new_design(method).fit(df, df["y"])
+        assert design.feature_names == reference.feature_names
+        np.testing.assert_allclose(design.scaler.offset,
+                                   reference.scaler.offset)
+        np.testing.assert_allclose(design.scaler.scale,
+                                   reference.scaler.scale)
+        X = reference.transform(df)
+        model = LinearRegression().fit(X, df["y"])
+        np.testing.assert_allclose(least_squares.solve()[0], model.coef_,
+                                   rtol=1e-8)
+
+    # Con bloques que solo se leen una vez se ajusta con el primero
+    with pytest.warns(RuntimeWarning):
+        least_squares = fit_chunks(chunks(), "y", new_design("onehot"))
+    assert least_squares.n_features == 4
+
+
+def test_sparse_block_with_large_numeric_column():
+    rng = np.random.default_rng(5)
+    n = 2_000
+    seconds = 1.7e9 + rng.uniform(0, 1e4, n)
+    zona = rng.integers(0, 2, n).astype(float)
+    y = 1e-3 * seconds + 2 * zona + rng.normal(size=n)
+    X = np.column_stack([seconds, zona])
+
+    dense = IncrementalLeastSquares(2).update(X, y)
+    csr = IncrementalLeastSquares(2).update(sparse.csr_matrix(X), y)
+    np.testing.assert_allclose(csr.sxx, dense.sxx, rtol=1e-10)
+    np.testing.assert_allclose(csr.sxy, dense.sxy, rtol=1e-10)
+    np.testing.assert_allclose(csr.solve()[0], dense.solve()[0],
+                               rtol=1e-10)
+
+    weights = rng.uniform(0.5, 2.0, n)
+    dense = IncrementalLeastSquares(2).update(X, y, weights=weights)
+    csr = IncrementalLeastSquares(2).update(sparse.csr_matrix(X), y,
+                                            weights=weights)
+    np.testing.assert_allclose(csr.sxx, dense.sxx, rtol=1e-10)
+    np.testing.assert_allclose(csr.sxy, dense.sxy, rtol=1e-10)
+
+
+def test_merge_and_raw_statistics():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(300, 2)) + 10
+    y = X @ [2.0, -1.0] + rng.normal(size=300)
+
+    left = IncrementalLeastSquares(2).update(X[:120], y[:120])
+    right = IncrementalLeastSquares(2).update(X[120:], y[120:])
+    merged = left.merge(right)
+    np.testing.assert_allclose(
+        merged.solve()[0], LinearRegression().fit(X, y).coef_)
+
+    xtx, xty, yty, sum_x, sum_y = merged.gram()
+    np.testing.assert_allclose(xtx, X.T @ X)
+    np.testing.assert_allclose(xty, X.T @ y)
+    assert yty == pytest.approx(y @ y)
+    np.testing.assert_allclose(sum_x, X.sum(axis=0))
+    assert sum_y == pytest.approx(y.sum())
+
+
+def test_missing_values_and_unsupported_formats(tmp_path):
+    with pytest.raises(ValueError):
+        IncrementalLeastSquares(1).update(np.array([[1.0], [np.nan]]),
+                                          [1.0, 2.0])
+    path = tmp_path / "datos.xlsx"
+    path.write_bytes(b"")
+    with pytest.raises(RuntimeError):
+        list(iter_chunks(path))
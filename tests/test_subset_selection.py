@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from modeling import FeatureSearch, GramCache, random_split
+
+
+def make_data(n=2_000):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n, 7))
+    df = pd.DataFrame(X, columns=[f"x{i}" for i in range(7)])
+    # x5 es combinación lineal exacta de x0 y x1
+    df["x5"] = df["x0"] + df["x1"]
+    df["y"] = 3 * df["x0"] - 2 * df["x3"] + 0.5 * df["x6"] + rng.normal(
+        size=n)
+    # Ajuste y validación salen del entrenamiento; el test no se usa
+    split = random_split(n, 0.8, seed=0).holdout(seed=0)
+    return (df, split, GramCache(df, split),
+            GramCache(df, split, rows="test"))
+
+
+def reference(df, split, inputs):
+    """SSE de entrenamiento y ECM de test de un ajuste completo"""
+    train, test = split.train_frame(df), split.test_frame(df)
+    model = LinearRegression().fit(train[list(inputs)], train["y"])
+    residual = train["y"] - model.predict(train[list(inputs)])
+    return ((residual ** 2).sum(),
+            mean_squared_error(test["y"], model.predict(test[list(inputs)])))
+
+
+@pytest.mark.parametrize("method", ["forward", "backward", "exhaustive"])
+def test_every_reported_set_matches_a_full_fit(method):
+    df, split, gram, validation = make_data()
+    search = FeatureSearch(gram, "y", validation=validation)
+    table = search.run(method, max_size=3, top=1_000)
+    syy = ((split.train_frame(df)["y"] - split.train_frame(df)["y"].mean())
+           ** 2).sum()
+
+    for row in table.itertuples(index=False):
+        sse, test_mse = reference(df, split, row.entradas)
+        assert (1 - row.r2) * syy == pytest.approx(sse, rel=1e-8)
+        assert row.mse_validación == pytest.approx(test_mse)
+
+
+def test_holdout_leaves_the_test_rows_out():
+    split = random_split(1_000, 0.8, seed=1)
+    holdout = split.holdout(0.25, seed=2)
+    assert holdout.n_train == 600 and holdout.n_test == 200
+    np.testing.assert_array_equal(
+        np.union1d(holdout.train, holdout.test), split.train)
+    assert not np.intersect1d(holdout.test, split.test).size
+    assert holdout.n_rows == split.n_rows
+
+
+def test_all_criteria_find_the_true_inputs():
+    _, _, gram, validation = make_data()
+    for criterion in ["bic", "aic", "adj_r2", "val_mse"]:
+        search = FeatureSearch(gram, "y", criterion=criterion,
+                               validation=validation)
+        for method in ["forward", "exhaustive"]:
+            best = search.run(method, max_size=3).iloc[0]
+            assert set(best["entradas"]) == {"x0", "x3", "x6"}
+    best = FeatureSearch(gram, "y").backward().iloc[0]
+    assert set(best["entradas"]) == {"x0", "x3", "x6"}
+
+
+def test_exhaustive_skips_collinear_sets_and_respects_limits():
+    _, _, gram, _ = make_data()
+    table = FeatureSearch(gram, "y").exhaustive(3, top=1_000)
+
+    # 7 + 21 + 35 subconjuntos menos {x0, x1, x5}
+    assert len(table) == 62
+    assert ("x0", "x1", "x5") not in set(table["entradas"])
+    # La tabla sale ordenada por el criterio (BIC, menor es mejor)
+    assert table["bic"].is_monotonic_increasing
+
+    with pytest.raises(ValueError):
+        FeatureSearch(gram, "y", criterion="val_mse")
+    with pytest.raises(ValueError):
+        FeatureSearch(gram, "y", candidates=["y"])
@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from GUI.tasks import TaskRunner
+from preprocessing import (
+    DropMissingRows, FillMissing, PreprocessingHistory, PreprocessingPipeline
+)
+
+
+def make_df(n=2_000, columns=10):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(n, columns))
+    data[rng.random((n, columns)) < 0.1] = np.nan
+    return pd.DataFrame(data, columns=[f"c{i}" for i in range(columns)])
+
+
+def test_parallel_context_matches_serial_run(dummy_app):
+    df = make_df()
+    columns = list(df.columns)
+    runner = TaskRunner(dummy_app, max_workers=3)
+    results = []
+
+    def build():
+        return PreprocessingPipeline([
+            DropMissingRows(columns[:2]), FillMissing(columns, "median")])
+
+    serial = build().fit_transform(df)
+    pipeline = build()
+    runner.submit(lambda context: pipeline.fit_transform(df, context),
+                  on_done=results.append)
+    dummy_app.run_pending()
+    runner.shutdown()
+
+    pd.testing.assert_frame_equal(results[0], serial)
+    assert not pipeline.pending
+
+
+def test_cancel_keeps_data_and_discards_pending_steps(dummy_app):
+    df = make_df()
+    runner = TaskRunner(dummy_app)
+    history = PreprocessingHistory(PreprocessingPipeline())
+    history.pipeline.add(FillMissing(["c0"], "mean"))
+    started = threading.Event()
+    outcome = []
+
+    def target(context):
+        started.set()
+        while True:
+            context.check()
+
+    handle = runner.submit(target, on_done=outcome.append,
+                           on_cancel=lambda: outcome.append("cancelled"))
+    started.wait(timeout=5)
+
+    # En cola detrás de la primera: se cancela antes de empezar
+    queued = runner.submit(
+        lambda context: history.apply(df, context=context),
+        on_done=outcome.append,
+        on_cancel=history.pipeline.discard_pending)
+    queued.cancel()
+    handle.cancel()
+    dummy_app.run_pending()
+    dummy_app.run_pending()
+    runner.shutdown()
+
+    assert outcome == ["cancelled"]
+    assert len(history.pipeline) == 0
+    assert not history.can_undo
+
+
+def test_progress_is_reported_on_main_thread(dummy_app):
+    runner = TaskRunner(dummy_app, max_workers=2)
+    progress = []
+    results = []
+
+    def target(context):
+        return context.map(lambda x: x * 2, range(4))
+
+    runner.submit(target, on_done=results.append,
+                  on_progress=lambda fraction, message: progress.append(
+                      fraction))
+    while not results:
+        dummy_app.run_pending()
+    runner.shutdown()
+
+    assert results == [[0, 2, 4, 6]]
+    assert progress and progress[-1] == 1
@@ -0,0 +1,89 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from GUI.tasks import TaskRunner
+from modeling import CrossValidation, random_split, train_linear_model
+from preprocessing import DesignMatrix
+
+
+def make_df(n=400):
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=n)
+    zona = rng.choice(["norte", "sur"], n)
+    return pd.DataFrame({
+        "x": x,
+        "zona": zona,
+        "otra": rng.normal(size=n),
+        "y": 3.0 * x + 2.0 * (zona == "sur") + rng.normal(0, 0.1, n)
+    })
+
+
+def make_design():
+    return DesignMatrix(["x", "zona"], encodings={"zona": "onehot"})
+
+
+def test_training_matches_direct_fit():
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=1)
+    result = train_linear_model(df, split, ["x", "zona"], "y", make_design)
+
+    train = split.train_frame(df)
+    X = np.column_stack([train["x"], train["zona"] == "sur"])
+    model = LinearRegression().fit(X, train["y"])
+    np.testing.assert_allclose(result.model.coef_, model.coef_)
+    assert list(result.train.columns) == ["x", "zona", "y"]
+    assert len(result.y_pred_test) == split.n_test
+    assert result.r2[1] > 0.99
+    assert result.cv_result is None and result.cv_error is None
+
+
+def test_training_in_task_runner_reports_cross_validation(dummy_app):
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=1)
+    runner = TaskRunner(dummy_app, max_workers=2)
+    results, progress = [], []
+
+    runner.submit(
+        lambda context: train_linear_model(
+            df, split, ["x", "zona"], "y", make_design,
+            CrossValidation("kfold", n_splits=4, seed=0), context),
+        on_done=results.append,
+        on_progress=lambda fraction, message: progress.append(fraction))
+    while not results:
+        dummy_app.run_pending()
+    runner.shutdown()
+
+    assert len(results[0].cv_result.scores) == 4
+    assert progress and progress[0] == 0.0
+
+    # Una validación imposible no impide entrenar el modelo
+    grouped = CrossValidation("kfold", n_splits=5, group_column="zona")
+    result = train_linear_model(
+        df, split, ["x", "zona"], "y", make_design, grouped)
+    assert result.cv_result is None
+    assert isinstance(result.cv_error, ValueError)
+
+
+def test_training_can_be_cancelled(dummy_app):
+    df = make_df()
+    split = random_split(len(df), 0.8, seed=1)
+    runner = TaskRunner(dummy_app)
+    release = threading.Event()
+    outcome = []
+
+    # La tarea en curso ocupa el ejecutor hasta que se cancela la otra
+    runner.submit(lambda context: release.wait(5))
+    handle = runner.submit(
+        lambda context: train_linear_model(
+            df, split, ["x"], "y", lambda: DesignMatrix(["x"]),
+            context=context),
+        on_done=lambda result: outcome.append("done"),
+        on_cancel=lambda: outcome.append("cancelled"))
+    handle.cancel()
+    release.set()
+    dummy_app.run_pending()
+    runner.shutdown()
+
+    assert outcome == ["cancelled"]